@@ -1,25 +1,48 @@
-from typing import Any
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable
 
+import httpx
 from dotenv import load_dotenv
 from fastapi import FastAPI, HTTPException, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.background import BackgroundTask
 
 from api.api_gateway.middleware.auth_middleware import auth_middleware
 from api.api_gateway.middleware.circuit_breaker import (
     circuit_breaker,
     circuit_breaker_middleware,
 )
+from api.api_gateway.utils.http_client import upstream_pool
 from api.api_gateway.utils.service_registry import service_registry
+from api.shared.utils.etag import ETAG_HEADER
+from api.shared.utils.pagination import NEXT_CURSOR_HEADER
 
 # Load environment variables
 load_dotenv()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Open the upstream connection pools on startup and close them on shutdown.
+
+    Args:
+        app (FastAPI): FastAPI app
+    """
+    await upstream_pool.start(service_registry.services.keys())
+    try:
+        yield
+    finally:
+        await upstream_pool.close()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="TaskHub API Gateway",
     description="API Gateway for TaskHub platform",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -29,6 +52,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, ETAG_HEADER],
 )
 
 # Add custom middlewares
@@ -36,6 +60,43 @@ app.middleware("http")(auth_middleware)
 app.middleware("http")(circuit_breaker_middleware)
 
 
+# Gateway endpoints are registered before the catch-all proxy route so they
+# are served by the gateway itself
+@app.get("/health", tags=["Health"])
+async def health_check() -> Any:
+    """
+    Health check endpoint.
+
+    Returns:
+        Dict[str, Any]: Health status
+    """
+    return {"status": "healthy"}
+
+
+@app.get("/services", tags=["Services"])
+async def get_services() -> Any:
+    """
+    Get all services.
+
+    Returns:
+
+        List[Dict[str, Any]]: List of services
+
+    """
+    return service_registry.get_all_services()
+
+
+@app.get("/gateway/pool-stats", tags=["Services"])
+async def get_pool_stats() -> Any:
+    """
+    Get upstream connection pool metrics.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Service name -> pool metrics
+    """
+    return upstream_pool.get_stats()
+
+
 @app.api_route(
     "/{path:path}", methods=["GET", "POST", "PUT", "DELETE", "PATCH", "HEAD", "OPTIONS"]
 )
@@ -75,71 +136,135 @@ async def gateway(request: Request, path: str) -> Any:
         )
 
 
+# Connection-scoped headers that must not be forwarded by a proxy (RFC 7230, 6.1)
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailer",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+}
+
+
+# Statuses whose responses never have a body (RFC 9110, 15.3.5 and 15.4.5)
+BODYLESS_STATUS_CODES = {204, 304}
+
+
+def _filter_headers(headers: Any, extra: Iterable[str] = ()) -> Dict[str, str]:
+    """
+    Drop hop-by-hop headers, including any listed in the Connection header.
+
+    Args:
+        headers (Any): Request or response headers
+        extra (Iterable[str], optional): Additional header names to drop
+
+    Returns:
+        Dict[str, str]: Headers safe to forward
+    """
+    excluded = HOP_BY_HOP_HEADERS | {name.lower() for name in extra}
+    connection = headers.get("connection")
+    if connection:
+        excluded |= {name.strip().lower() for name in connection.split(",")}
+
+    return {
+        name: value for name, value in headers.items() if name.lower() not in excluded
+    }
+
+
+def _has_body(request: Request) -> bool:
+    """
+    Check if a request carries a body.
+
+    Args:
+        request (Request): FastAPI request
+
+    Returns:
+        bool: True if the request has a body, False otherwise
+    """
+    content_length = request.headers.get("content-length")
+    if content_length is not None:
+        return content_length != "0"
+
+    return "transfer-encoding" in request.headers
+
+
+async def _stream_body(
+    service_name: str, response: httpx.Response
+) -> AsyncIterator[bytes]:
+    """
+    Yield the raw upstream body and release the pooled connection afterwards.
+
+    Args:
+        service_name (str): Service name
+        response (httpx.Response): Streaming upstream response
+
+    Yields:
+        bytes: Body chunks as received from the service
+    """
+    try:
+        async for chunk in response.aiter_raw():
+            yield chunk
+    finally:
+        await circuit_breaker.client_pool.close_stream(service_name, response)
+
+
 async def forward_request(
     request: Request, target_url: str, service_name: str
-) -> JSONResponse:
+) -> Response:
     """
     Forward request to service.
 
+    Request and response bodies are streamed through unchanged, so memory use
+    does not depend on payload size and bodies are never decoded. Conditional
+    request headers (If-None-Match) go through like any other, and a 304 Not
+    Modified comes back with its ETag and no body.
+
     Args:
         request (Request): FastAPI request
         target_url (str): Target URL
         service_name (str): Service name
 
     Returns:
-        JSONResponse: Response from service
+        Response: Response from service
     """
-    # Get request body
-    body = await request.body()
-
-    # Get request headers
-    headers = dict(request.headers)
+    # Get request headers; httpx sets Host for the upstream URL
+    headers = _filter_headers(request.headers, extra=("host",))
 
     # Add user ID to headers if available
     if hasattr(request.state, "user_id"):
         headers["X-User-ID"] = request.state.user_id
 
     # Forward request to service using circuit breaker
-    response = await circuit_breaker.call_service(  # type: ignore
+    response = await circuit_breaker.stream_service(
         service_name=service_name,
         url=target_url,
         method=request.method,
         headers=headers,
-        content=body,
-        params=dict(request.query_params),
+        content=request.stream() if _has_body(request) else None,
+        params=request.query_params.multi_items(),
     )
 
-    # Return response
-    return JSONResponse(
+    if response.status_code in BODYLESS_STATUS_CODES:
+        await circuit_breaker.client_pool.close_stream(service_name, response)
+        return Response(
+            status_code=response.status_code, headers=_filter_headers(response.headers)
+        )
+
+    # Stream the raw (still encoded) body back with the upstream headers
+    return StreamingResponse(
+        _stream_body(service_name, response),
         status_code=response.status_code,
-        content=response.json() if response.content else None,
-        headers=dict(response.headers),
+        headers=_filter_headers(response.headers),
+        background=BackgroundTask(
+            circuit_breaker.client_pool.close_stream, service_name, response
+        ),
     )
 
 
-@app.get("/health", tags=["Health"])
-async def health_check() -> Any:
-    """
-    Health check endpoint.
-
-    Returns:
-        Dict[str, Any]: Health status
-    """
-    return {"status": "healthy"}
-
-
-@app.get("/services", tags=["Services"])
-async def get_services() -> Any:
-    """
-    Get all services.
-
-    Returns:
-
-        List[Dict[str, Any]]: List of services
-
-    """
-    return service_registry.get_all_services()
-
 # Export para tests de integración
 # (No existen get_db ni get_current_user aquí, pero exporto auth_middleware por consistencia)
 auth_middleware = auth_middleware
@@ -1,17 +1,16 @@
-import os
-from typing import Awaitable, Callable, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional
 
-import httpx
 from dotenv import load_dotenv
 from fastapi import HTTPException, Request, status
 from fastapi.responses import JSONResponse
+from jose import ExpiredSignatureError, JWTError
+
+from api.api_gateway.utils.token_cache import revocation_list, verified_token_cache
+from api.shared.utils.jwt import decode_token
 
 # Load environment variables
 load_dotenv()
 
-# Auth service URL
-AUTH_SERVICE_URL = os.getenv("AUTH_SERVICE_URL", "http://localhost:8001")
-
 
 async def auth_middleware(
     request: Request, call_next: Callable[[Request], Awaitable[JSONResponse]]
@@ -42,13 +41,23 @@ async def auth_middleware(
 
     # Validate token
     try:
-        user_id = await _validate_token(token)
+        claims = await _validate_token(token)
 
         # Add user ID to request state
-        request.state.user_id = user_id
+        request.state.user_id = claims["sub"]
 
         # Continue with request
-        return await call_next(request)
+        response = await call_next(request)
+
+        # A successful logout revokes the token at the gateway as well
+        if (
+            request.url.path.rstrip("/") == "/auth/logout"
+            and request.method == "POST"
+            and response.status_code < 400
+        ):
+            _revoke_token(token, float(claims["exp"]))
+
+        return response
     except HTTPException as e:
         return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
     except Exception as e:
@@ -101,57 +110,67 @@ def _get_token_from_request(request: Request) -> Optional[str]:
     return None
 
 
-async def _validate_token(token: str) -> str:
+async def _validate_token(token: str) -> Dict[str, Any]:
     """
-    Validate token with auth service.
+    Validate token locally.
+
+    The signature and expiration are checked in-process with the shared JWT
+    settings, so the auth service is not called per request. Verified claims
+    are cached by token hash until the token expires. Tokens without an
+    expiration are refused, since a revocation must know when to end.
 
     Args:
         token (str): JWT token
 
     Returns:
-        str: User ID
+        Dict[str, Any]: Verified claims, with at least ``sub`` and ``exp``
 
     Raises:
-        HTTPException: If token is invalid
+        HTTPException: If token is invalid, expired or revoked
     """
-    try:
-        # Make request to auth service
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{AUTH_SERVICE_URL}/auth/validate",
-                headers={"Authorization": f"Bearer {token}"},
+    if revocation_list.is_revoked(token):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has been revoked"
+        )
+
+    claims = verified_token_cache.get(token)
+
+    if claims is None:
+        try:
+            claims = decode_token(token)
+        except ExpiredSignatureError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Token has expired"
+            )
+        except JWTError:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
+            )
+
+        if not claims.get("sub"):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token, user_id not in token",
             )
 
-            # Check response
-            if response.status_code != 200:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
-                )
+        if claims.get("exp") is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token, expiration not in token",
+            )
 
-            # Parse response
-            data = response.json()
+        verified_token_cache.set(token, claims)
 
-            # Extract user ID from token
-            # In a real application, you would decode the token and extract the user ID
-            # For simplicity, we'll assume the auth service returns the user ID
-            user_id = data.get("user_id")
+    return claims
 
-            if not user_id:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid token, user_id not in response",
-                )
 
-            return user_id
-    except httpx.RequestError as e:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Auth service unavailable: {str(e)}",
-        )
-    except Exception as e:
-        # It's good practice to log the error here
-        # logger.error(f"Unexpected error during token validation with auth service: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred while validating the token.",
-        )
+def _revoke_token(token: str, expires_at: float) -> None:
+    """
+    Revoke a token and drop it from the verified-token cache.
+
+    Args:
+        token (str): JWT token
+        expires_at (float): Expiration of the token, from its verified ``exp`` claim
+    """
+    revocation_list.revoke(token, expires_at)
+    verified_token_cache.invalidate(token)
@@ -1,12 +1,14 @@
 import asyncio
 from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Awaitable, Callable, Dict
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 import httpx
 from fastapi import HTTPException, Request, status
 from fastapi.responses import JSONResponse
 
+from api.api_gateway.utils.http_client import UpstreamClientPool, upstream_pool
+
 
 class CircuitState(str, Enum):
     """Enum for circuit breaker states"""
@@ -24,6 +26,7 @@ class CircuitBreaker:
         failure_threshold: int = 5,
         recovery_timeout: int = 30,
         timeout: float = 5.0,
+        client_pool: Optional[UpstreamClientPool] = None,
     ):
         """
         Initialize CircuitBreaker.
@@ -32,6 +35,7 @@ class CircuitBreaker:
             failure_threshold (int, optional): Number of failures before opening circuit. Defaults to 5.
             recovery_timeout (int, optional): Seconds to wait before trying again. Defaults to 30.
             timeout (float, optional): Request timeout in seconds. Defaults to 5.0.
+            client_pool (UpstreamClientPool, optional): Pooled upstream clients. Defaults to the global pool.
         """
         self.failure_threshold = failure_threshold
         self.recovery_timeout = recovery_timeout
@@ -40,6 +44,7 @@ class CircuitBreaker:
         self.failure_count = 0
         self.last_failure_time = None
         self.services = {}  # Service name -> CircuitBreaker state
+        self.client_pool = client_pool or upstream_pool
 
     def get_service_circuit(self, service_name: str) -> Dict[str, Any]:
         """
@@ -147,14 +152,62 @@ class CircuitBreaker:
             )
 
         try:
-            # Make request
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await getattr(client, method.lower())(url, **kwargs)
+            # Make request through the service's pooled keep-alive client
+            response = await self.client_pool.request(
+                service_name, method, url, **kwargs
+            )
+
+            # Record success
+            self.record_success(service_name)
+
+            return response
+        except (httpx.RequestError, asyncio.TimeoutError) as e:
+            # Record failure
+            self.record_failure(service_name)
+
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Service {service_name} is unavailable: {str(e)}",
+            )
+
+    async def stream_service(
+        self, service_name: str, url: str, method: str, **kwargs
+    ) -> httpx.Response:
+        """
+        Call a service with circuit breaker protection without reading the body.
+
+        The caller must hand the response to ``client_pool.close_stream`` once
+        the body has been consumed.
+
+        Args:
+            service_name (str): Service name
+            url (str): Request URL
+            method (str): HTTP method
+            **kwargs: Additional arguments for httpx
+
+        Returns:
+            httpx.Response: Streaming response
+
+        Raises:
+            HTTPException: If circuit is open or request fails
+        """
+        # Check if circuit is open
+        if self.is_circuit_open(service_name):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Service {service_name} is unavailable",
+            )
+
+        try:
+            # Only the response head is read here; the body is streamed later
+            response = await self.client_pool.stream(
+                service_name, method, url, **kwargs
+            )
 
-                # Record success
-                self.record_success(service_name)
+            # Record success
+            self.record_success(service_name)
 
-                return response
+            return response
         except (httpx.RequestError, asyncio.TimeoutError) as e:
             # Record failure
             self.record_failure(service_name)
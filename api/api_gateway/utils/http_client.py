@@ -0,0 +1,295 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, Iterable, Optional, Set
+
+import httpx
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+# Upstream connection pool configuration
+GATEWAY_MAX_CONNECTIONS = int(os.getenv("GATEWAY_MAX_CONNECTIONS", "100"))
+GATEWAY_MAX_KEEPALIVE_CONNECTIONS = int(
+    os.getenv("GATEWAY_MAX_KEEPALIVE_CONNECTIONS", "20")
+)
+GATEWAY_KEEPALIVE_EXPIRY = float(os.getenv("GATEWAY_KEEPALIVE_EXPIRY", "30.0"))
+GATEWAY_HTTP2 = os.getenv("GATEWAY_HTTP2", "false").lower() in ("1", "true", "yes")
+GATEWAY_TIMEOUT = float(os.getenv("GATEWAY_TIMEOUT", "5.0"))
+
+
+def _service_env_key(service_name: str) -> str:
+    """
+    Build the environment variable suffix for a service.
+
+    Args:
+        service_name (str): Service name (e.g. "external-tools")
+
+    Returns:
+        str: Upper-case suffix (e.g. "EXTERNAL_TOOLS")
+    """
+    return service_name.upper().replace("-", "_")
+
+
+class UpstreamClientPool:
+    """Long-lived, per-service pool of keep-alive HTTP clients for the gateway"""
+
+    def __init__(
+        self,
+        max_connections: int = GATEWAY_MAX_CONNECTIONS,
+        max_keepalive_connections: int = GATEWAY_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry: float = GATEWAY_KEEPALIVE_EXPIRY,
+        http2: bool = GATEWAY_HTTP2,
+        timeout: float = GATEWAY_TIMEOUT,
+        service_timeouts: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Initialize UpstreamClientPool.
+
+        Args:
+            max_connections (int, optional): Max connections per service. Defaults to GATEWAY_MAX_CONNECTIONS.
+            max_keepalive_connections (int, optional): Max idle keep-alive connections per service. Defaults to GATEWAY_MAX_KEEPALIVE_CONNECTIONS.
+            keepalive_expiry (float, optional): Seconds an idle connection is kept open. Defaults to GATEWAY_KEEPALIVE_EXPIRY.
+            http2 (bool, optional): Whether to negotiate HTTP/2 with upstreams. Defaults to GATEWAY_HTTP2.
+            timeout (float, optional): Default request timeout in seconds. Defaults to GATEWAY_TIMEOUT.
+            service_timeouts (Dict[str, float], optional): Per-service timeout overrides. Defaults to None.
+        """
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.keepalive_expiry = keepalive_expiry
+        self.http2 = http2
+        self.timeout = timeout
+        self.service_timeouts = dict(service_timeouts or {})
+        self.clients: Dict[str, httpx.AsyncClient] = {}
+        self.metrics: Dict[str, Dict[str, Any]] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._open_streams: Set[int] = set()
+
+    def get_timeout(self, service_name: str) -> float:
+        """
+        Get request timeout for a service.
+
+        Per-service overrides are read from ``GATEWAY_TIMEOUT_<SERVICE>``
+        (e.g. ``GATEWAY_TIMEOUT_EXTERNAL_TOOLS``) unless given explicitly.
+
+        Args:
+            service_name (str): Service name
+
+        Returns:
+            float: Timeout in seconds
+        """
+        if service_name in self.service_timeouts:
+            return self.service_timeouts[service_name]
+
+        env_timeout = os.getenv(f"GATEWAY_TIMEOUT_{_service_env_key(service_name)}")
+        if env_timeout:
+            return float(env_timeout)
+
+        return self.timeout
+
+    def get_client(self, service_name: str) -> httpx.AsyncClient:
+        """
+        Get or create the pooled client for a service.
+
+        Args:
+            service_name (str): Service name
+
+        Returns:
+            httpx.AsyncClient: Pooled client
+        """
+        client = self.clients.get(service_name)
+
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                timeout=self.get_timeout(service_name),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+                http2=self.http2,
+            )
+            self.clients[service_name] = client
+            self._semaphores[service_name] = asyncio.Semaphore(self.max_connections)
+            self.metrics.setdefault(
+                service_name,
+                {
+                    "requests": 0,
+                    "in_use": 0,
+                    "wait_time_total": 0.0,
+                    "wait_time_max": 0.0,
+                },
+            )
+
+        return client
+
+    async def start(self, service_names: Iterable[str]) -> None:
+        """
+        Create the clients for all known services.
+
+        Args:
+            service_names (Iterable[str]): Service names
+        """
+        for service_name in service_names:
+            self.get_client(service_name)
+
+    async def close(self) -> None:
+        """Close all pooled clients and their connections"""
+        clients = list(self.clients.values())
+        self.clients = {}
+        self._semaphores = {}
+
+        for client in clients:
+            await client.aclose()
+
+    async def request(
+        self, service_name: str, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Send a request to a service through its pooled client.
+
+        Args:
+            service_name (str): Service name
+            method (str): HTTP method
+            url (str): Request URL
+            **kwargs: Additional arguments for httpx
+
+        Returns:
+            httpx.Response: Response
+        """
+        client = self.get_client(service_name)
+        await self._acquire(service_name)
+
+        try:
+            return await client.request(method, url, **kwargs)
+        finally:
+            self._release(service_name)
+
+    async def stream(
+        self, service_name: str, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Send a request and return the response with its body still unread.
+
+        The pooled connection stays checked out until ``close_stream`` is called.
+
+        Args:
+            service_name (str): Service name
+            method (str): HTTP method
+            url (str): Request URL
+            **kwargs: Additional arguments for httpx
+
+        Returns:
+            httpx.Response: Streaming response
+        """
+        client = self.get_client(service_name)
+        await self._acquire(service_name)
+
+        try:
+            request = client.build_request(method, url, **kwargs)
+            response = await client.send(request, stream=True)
+        except BaseException:
+            self._release(service_name)
+            raise
+
+        self._open_streams.add(id(response))
+        return response
+
+    async def close_stream(self, service_name: str, response: httpx.Response) -> None:
+        """
+        Close a response returned by ``stream`` and give its connection back.
+
+        Safe to call more than once for the same response.
+
+        Args:
+            service_name (str): Service name
+            response (httpx.Response): Streaming response
+        """
+        if id(response) not in self._open_streams:
+            return
+
+        self._open_streams.discard(id(response))
+        try:
+            await response.aclose()
+        finally:
+            self._release(service_name)
+
+    async def _acquire(self, service_name: str) -> None:
+        """
+        Wait for a free connection slot and record the wait time.
+
+        Args:
+            service_name (str): Service name
+        """
+        metrics = self.metrics[service_name]
+
+        # Waiting here means every pooled connection is busy
+        wait_start = time.perf_counter()
+        await self._semaphores[service_name].acquire()
+        wait_time = time.perf_counter() - wait_start
+
+        metrics["requests"] += 1
+        metrics["wait_time_total"] += wait_time
+        metrics["wait_time_max"] = max(metrics["wait_time_max"], wait_time)
+        metrics["in_use"] += 1
+
+    def _release(self, service_name: str) -> None:
+        """
+        Release a connection slot.
+
+        Args:
+            service_name (str): Service name
+        """
+        self.metrics[service_name]["in_use"] -= 1
+        semaphore = self._semaphores.get(service_name)
+        if semaphore is not None:
+            semaphore.release()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get pool metrics for every service.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Service name -> pool metrics
+        """
+        stats: Dict[str, Dict[str, Any]] = {}
+
+        for service_name, client in self.clients.items():
+            metrics = self.metrics[service_name]
+            connections = self._get_pool_connections(client)
+            idle = sum(1 for connection in connections if connection.is_idle())
+            requests = metrics["requests"]
+
+            stats[service_name] = {
+                "in_use": metrics["in_use"],
+                "idle": idle,
+                "open_connections": len(connections),
+                "max_connections": self.max_connections,
+                "requests": requests,
+                "wait_time_avg": (
+                    metrics["wait_time_total"] / requests if requests else 0.0
+                ),
+                "wait_time_max": metrics["wait_time_max"],
+                "timeout": self.get_timeout(service_name),
+                "http2": self.http2,
+            }
+
+        return stats
+
+    def _get_pool_connections(self, client: httpx.AsyncClient) -> list[Any]:
+        """
+        Get the open connections of a client's transport pool.
+
+        Args:
+            client (httpx.AsyncClient): Client
+
+        Returns:
+            list[Any]: Open connections, empty if the transport has no pool
+        """
+        pool = getattr(getattr(client, "_transport", None), "_pool", None)
+        return list(getattr(pool, "connections", []))
+
+
+# Create global upstream client pool
+upstream_pool = UpstreamClientPool()
@@ -1,5 +1,6 @@
 import os
-from typing import Any, Dict, List
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
 from dotenv import load_dotenv
 import requests
@@ -18,12 +19,33 @@ EXTERNAL_TOOLS_SERVICE_URL = os.getenv(
     "EXTERNAL_TOOLS_SERVICE_URL", "http://localhost:8005"
 )
 
+# Number of resolved (method, path) lookups kept in memory
+GATEWAY_ROUTE_CACHE_SIZE = int(os.getenv("GATEWAY_ROUTE_CACHE_SIZE", "1024"))
+
+
+class RouteNode:
+    """Node of the compiled route table, one per path segment"""
+
+    def __init__(self):
+        """Initialize RouteNode"""
+        self.children: Dict[str, "RouteNode"] = {}
+        self.param_child: Optional["RouteNode"] = None
+        self.param_name: Optional[str] = None
+        self.handlers: Dict[str, Tuple[str, str]] = {}  # Method -> (service, route path)
+
 
 class ServiceRegistry:
     """Registry for microservices"""
 
-    def __init__(self):
-        """Initialize ServiceRegistry"""
+    def __init__(self, route_cache_size: int = GATEWAY_ROUTE_CACHE_SIZE):
+        """
+        Initialize ServiceRegistry.
+
+        Args:
+            route_cache_size (int, optional): Max cached path resolutions. Defaults to GATEWAY_ROUTE_CACHE_SIZE.
+        """
+        self.route_cache_size = route_cache_size
+        self.route_cache: "OrderedDict[Tuple[str, str], Dict[str, Any]]" = OrderedDict()
         self.services = {
             "auth": {
                 "url": AUTH_SERVICE_URL,
@@ -34,7 +56,6 @@ class ServiceRegistry:
                     {"path": "/auth/refresh", "methods": ["POST"]},
                     {"path": "/auth/logout", "methods": ["POST"]},
                     {"path": "/auth/profile", "methods": ["GET"]},
-                    {"path": "/health", "methods": ["GET"]},
                 ],
             },
             "projects": {
@@ -45,6 +66,9 @@ class ServiceRegistry:
                         "path": "/projects/{project_id}",
                         "methods": ["GET", "PUT", "DELETE"],
                     },
+                    {"path": "/projects/{project_id}/deletion", "methods": ["GET"]},
+                    {"path": "/projects/{project_id}/stats", "methods": ["GET"]},
+                    {"path": "/projects/{project_id}/stats:rebuild", "methods": ["POST"]},
                     {
                         "path": "/projects/{project_id}/members",
                         "methods": ["GET", "POST"],
@@ -57,6 +81,7 @@ class ServiceRegistry:
                         "path": "/projects/{project_id}/tasks",
                         "methods": ["GET", "POST"],
                     },
+                    {"path": "/projects/{project_id}/tasks:batch", "methods": ["POST"]},
                     {
                         "path": "/projects/{project_id}/tasks/{task_id}",
                         "methods": ["GET", "PUT", "DELETE"],
@@ -66,6 +91,7 @@ class ServiceRegistry:
                         "methods": ["GET", "POST"],
                     },
                     {"path": "/projects/{project_id}/activities", "methods": ["GET"]},
+                    {"path": "/projects/{project_id}/search", "methods": ["GET"]},
                     {
                         "path": "/projects/{project_id}/tasks/{task_id}/assign",
                         "methods": ["POST"],
@@ -82,7 +108,6 @@ class ServiceRegistry:
                         "path": "/projects/{project_id}/tasks/{task_id}/redo",
                         "methods": ["POST"],
                     },
-                    {"path": "/health", "methods": ["GET"]},
                 ],
             },
             "documents": {
@@ -95,6 +120,8 @@ class ServiceRegistry:
                     },
                     {"path": "/projects/{project_id}/documents", "methods": ["GET"]},
                     {"path": "/documents/upload", "methods": ["POST"]},
+                    {"path": "/documents/convert", "methods": ["POST"]},
+                    {"path": "/documents/convert/{job_id}", "methods": ["GET"]},
                     {
                         "path": "/documents/{document_id}/versions",
                         "methods": ["GET", "POST"],
@@ -111,7 +138,6 @@ class ServiceRegistry:
                         "path": "/documents/{document_id}/permissions/{permission_id}",
                         "methods": ["PUT", "DELETE"],
                     },
-                    {"path": "/health", "methods": ["GET"]},
                 ],
             },
             "notifications": {
@@ -127,7 +153,6 @@ class ServiceRegistry:
                     {"path": "/notifications/read-all", "methods": ["PUT"]},
                     {"path": "/notifications/{notification_id}", "methods": ["DELETE"]},
                     {"path": "/notification-preferences", "methods": ["GET", "PUT"]},
-                    {"path": "/health", "methods": ["GET"]},
                 ],
             },
             "external-tools": {
@@ -150,10 +175,53 @@ class ServiceRegistry:
                         "path": "/connections/{connection_id}/revoke",
                         "methods": ["POST"],
                     },
-                    {"path": "/health", "methods": ["GET"]},
                 ],
             },
         }
+        self.route_table = self.build_route_table()
+
+    def build_route_table(self) -> RouteNode:
+        """
+        Compile the routes of all services into a segment trie.
+
+        Returns:
+            RouteNode: Root of the route table
+
+        Raises:
+            ValueError: If two routes are ambiguous
+        """
+        root = RouteNode()
+
+        for name, service in self.services.items():
+            for route in service["routes"]:
+                node = root
+                for part in self._split_path(route["path"]):
+                    if part.startswith("{") and part.endswith("}"):
+                        param_name = part[1:-1]
+                        if node.param_child is None:
+                            node.param_child = RouteNode()
+                            node.param_name = param_name
+                        elif node.param_name != param_name:
+                            raise ValueError(
+                                f"Ambiguous route {route['path']}: parameter "
+                                f"{{{param_name}}} conflicts with {{{node.param_name}}}"
+                            )
+                        node = node.param_child
+                    else:
+                        node = node.children.setdefault(part, RouteNode())
+
+                for method in route["methods"]:
+                    if method in node.handlers:
+                        other_service, other_path = node.handlers[method]
+                        raise ValueError(
+                            f"Ambiguous route {method} {route['path']} ({name}) "
+                            f"conflicts with {other_path} ({other_service})"
+                        )
+                    node.handlers[method] = (name, route["path"])
+
+        # Resolutions computed against the previous table are stale
+        self.route_cache.clear()
+        return root
 
     def get_service_url(self, service_name: str) -> str:
         """
@@ -179,65 +247,105 @@ class ServiceRegistry:
         """
         Get service for a path and method.
 
+        Literal segments take priority over parameters, so ``/documents/upload``
+        resolves before ``/documents/{document_id}``.
+
         Args:
             path (str): Request path
             method (str): HTTP method
 
         Returns:
-            Dict[str, Any]: Service information
+            Dict[str, Any]: Service information and path parameters
 
         Raises:
             ValueError: If service not found for path and method
         """
-        # Extract service name from path
-        path_parts = path.strip("/").split("/")
-        service_name = path_parts[0] if path_parts else ""
+        cache_key = (method, path)
+        cached = self.route_cache.get(cache_key)
+        if cached is not None:
+            self.route_cache.move_to_end(cache_key)
+            return {**cached, "params": dict(cached["params"])}
+
+        path_parts = self._split_path(path)
 
         # Special case for auth service
-        if service_name == "auth":
-            return {"name": "auth", "url": self.get_service_url("auth")}
+        if path_parts and path_parts[0] == "auth":
+            service = {"name": "auth", "url": self.get_service_url("auth"), "params": {}}
+        else:
+            params: Dict[str, str] = {}
+            handler = self._lookup(self.route_table, path_parts, 0, method, params)
+            if handler is None:
+                raise ValueError(
+                    f"No service found for path {path} and method {method}"
+                )
+            service = {
+                "name": handler[0],
+                "url": self.get_service_url(handler[0]),
+                "params": params,
+            }
 
-        # Check all services for matching route
-        for name, service in self.services.items():
-            for route in service["routes"]:
-                if (
-                    self._match_route(path, route["path"])
-                    and method in route["methods"]
-                ):
-                    return {"name": name, "url": service["url"]}
+        if self.route_cache_size > 0:
+            self.route_cache[cache_key] = service
+            if len(self.route_cache) > self.route_cache_size:
+                self.route_cache.popitem(last=False)
 
-        raise ValueError(f"No service found for path {path} and method {method}")
+        return {**service, "params": dict(service["params"])}
 
-    def _match_route(self, path: str, route_path: str) -> bool:
+    def _lookup(
+        self,
+        node: RouteNode,
+        path_parts: List[str],
+        index: int,
+        method: str,
+        params: Dict[str, str],
+    ) -> Optional[Tuple[str, str]]:
         """
-        Check if a path matches a route path.
+        Walk the route table, trying literal segments before parameters.
 
         Args:
-            path (str): Request path
-            route_path (str): Route path
+            node (RouteNode): Current node
+            path_parts (List[str]): Request path segments
+            index (int): Index of the segment to match
+            method (str): HTTP method
+            params (Dict[str, str]): Collected path parameters
 
         Returns:
-            bool: True if path matches route path, False otherwise
+            Optional[Tuple[str, str]]: (service, route path), None if no route matches
         """
-        # Split paths into parts
-        path_parts = path.strip("/").split("/")
-        route_parts = route_path.strip("/").split("/")
+        if index == len(path_parts):
+            return node.handlers.get(method)
 
-        # Check if number of parts match
-        if len(path_parts) != len(route_parts):
-            return False
+        part = path_parts[index]
+
+        child = node.children.get(part)
+        if child is not None:
+            handler = self._lookup(child, path_parts, index + 1, method, params)
+            if handler is not None:
+                return handler
 
-        # Check if parts match
-        for i, route_part in enumerate(route_parts):
-            # If route part is a parameter (e.g., {project_id}), it matches any value
-            if route_part.startswith("{") and route_part.endswith("}"):
-                continue
+        if node.param_child is not None and part:
+            params[node.param_name] = part
+            handler = self._lookup(
+                node.param_child, path_parts, index + 1, method, params
+            )
+            if handler is not None:
+                return handler
+            del params[node.param_name]
 
-            # Otherwise, parts must match exactly
-            if route_part != path_parts[i]:
-                return False
+        return None
+
+    def _split_path(self, path: str) -> List[str]:
+        """
+        Split a path into segments.
 
-        return True
+        Args:
+            path (str): Path
+
+        Returns:
+            List[str]: Path segments
+        """
+        stripped = path.strip("/")
+        return stripped.split("/") if stripped else []
 
     def get_all_services(self) -> List[Dict[str, Any]]:
         """
@@ -0,0 +1,176 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from api.shared.utils.jwt import hash_token
+
+# Load environment variables
+load_dotenv()
+
+# Verified-token cache configuration
+GATEWAY_TOKEN_CACHE_SIZE = int(os.getenv("GATEWAY_TOKEN_CACHE_SIZE", "10000"))
+GATEWAY_TOKEN_CACHE_TTL = float(os.getenv("GATEWAY_TOKEN_CACHE_TTL", "300"))
+
+
+class TokenRevocationList:
+    """
+    Tokens revoked before their expiration, e.g. on logout.
+
+    This is the revocation hook used by the gateway. The default implementation
+    keeps revoked token hashes in the memory of one gateway process: a token
+    logged out through one worker is still accepted by the others, and by
+    restarted workers, until it expires. A deployment with several gateway
+    workers must subclass it and back ``revoke``/``is_revoked`` with a shared
+    store.
+    """
+
+    def __init__(self):
+        """Initialize TokenRevocationList"""
+        self._revoked: Dict[str, float] = {}  # Token hash -> expiration timestamp
+        self._lock = threading.Lock()
+
+    def revoke(self, token: str, expires_at: float) -> None:
+        """
+        Revoke a token.
+
+        Args:
+            token (str): JWT token
+            expires_at (float): Token expiration timestamp. Once it has passed
+                the token is rejected anyway, so the entry can be dropped.
+        """
+        with self._lock:
+            self._purge_expired()
+            self._revoked[hash_token(token)] = expires_at
+
+    def is_revoked(self, token: str) -> bool:
+        """
+        Check if a token has been revoked.
+
+        Args:
+            token (str): JWT token
+
+        Returns:
+            bool: True if token is revoked, False otherwise
+        """
+        with self._lock:
+            expires_at = self._revoked.get(hash_token(token))
+            return expires_at is not None and expires_at > time.time()
+
+    def _purge_expired(self) -> None:
+        """Drop entries for tokens that have expired on their own"""
+        now = time.time()
+        for token_hash in [h for h, exp in self._revoked.items() if exp <= now]:
+            del self._revoked[token_hash]
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+
+class VerifiedTokenCache:
+    """Bounded LRU cache of verified token claims keyed by token hash"""
+
+    def __init__(
+        self,
+        max_size: int = GATEWAY_TOKEN_CACHE_SIZE,
+        ttl: float = GATEWAY_TOKEN_CACHE_TTL,
+    ):
+        """
+        Initialize VerifiedTokenCache.
+
+        Args:
+            max_size (int, optional): Max cached tokens. Defaults to GATEWAY_TOKEN_CACHE_SIZE.
+            ttl (float, optional): Max seconds a token stays cached, capped by its
+                ``exp`` claim. Defaults to GATEWAY_TOKEN_CACHE_TTL.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the verified claims of a token.
+
+        Args:
+            token (str): JWT token
+
+        Returns:
+            Optional[Dict[str, Any]]: Claims, None if not cached or expired
+        """
+        token_hash = hash_token(token)
+
+        with self._lock:
+            entry = self._entries.get(token_hash)
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    del self._entries[token_hash]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(token_hash)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, token: str, claims: Dict[str, Any]) -> None:
+        """
+        Cache the claims of a verified token until its expiration.
+
+        Args:
+            token (str): JWT token
+            claims (Dict[str, Any]): Verified claims
+        """
+        if self.max_size <= 0:
+            return
+
+        expires_at = time.time() + self.ttl
+        exp = claims.get("exp")
+        if exp is not None:
+            expires_at = min(expires_at, float(exp))
+
+        token_hash = hash_token(token)
+
+        with self._lock:
+            self._entries[token_hash] = (claims, expires_at)
+            self._entries.move_to_end(token_hash)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token: str) -> None:
+        """
+        Remove a token from the cache.
+
+        Args:
+            token (str): JWT token
+        """
+        with self._lock:
+            self._entries.pop(hash_token(token), None)
+
+    def clear(self) -> None:
+        """Remove all cached tokens"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dict[str, Any]: Size, hits and misses
+        """
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Create global token cache and revocation list
+verified_token_cache = VerifiedTokenCache()
+revocation_list = TokenRevocationList()
@@ -1,6 +1,7 @@
 from functools import wraps
-from typing import Any, Callable, Dict
+from typing import Any, Callable
 
+from api.document_service.app.services.document_cache import document_cache
 from api.shared.exceptions.document_exceptions import (
     DocumentNotFoundException,
     InsufficientDocumentPermissionException,
@@ -87,10 +88,7 @@ def log_document_activity(action: str) -> Callable[..., Any]:
                 self.db.query(Document).filter(Document.id == document_id).first()
             )
 
-            # Call function
-            result = func(self, document_id, user_id, *args, **kwargs)
-
-            # Log activity
+            # Log activity before the call, so it is committed with its changes
             if document:
                 from api.project_service.app.services.activity_service import (
                     ActivityService,
@@ -106,6 +104,9 @@ def log_document_activity(action: str) -> Callable[..., Any]:
                     details={"name": document.name},
                 )
 
+            # Call function
+            result = func(self, document_id, user_id, *args, **kwargs)
+
             # Return result
             return result
 
@@ -116,7 +117,11 @@ def log_document_activity(action: str) -> Callable[..., Any]:
 
 def cache_document(func: Callable[..., Any]) -> Callable[..., Any]:
     """
-    Decorator to cache document.
+    Decorator to cache document reads in the global document cache.
+
+    The key holds every argument, including the user ID, so results are only
+    served to the user they were computed for. Writes must call
+    ``document_cache.invalidate`` after their commit.
 
     Args:
         func (Callable): Function to decorate
@@ -124,22 +129,21 @@ def cache_document(func: Callable[..., Any]) -> Callable[..., Any]:
     Returns:
         Callable: Decorated function
     """
-    # This is a placeholder for a real caching implementation
-    # In a real application, you would use Redis or another caching solution
-    cache: Dict[str, Any] = {}
 
     @wraps(func)
     def wrapper(self: Any, document_id: str, *args: Any, **kwargs: Any) -> Any:
         # Check if document is in cache
-        cache_key = f"document:{document_id}"
-        if cache_key in cache:
-            return cache[cache_key]
+        cache_key = (func.__qualname__, document_id, args, tuple(sorted(kwargs.items())))
+        cached, result = document_cache.get(cache_key)
+        if cached:
+            return result
 
         # Call function
+        generation = document_cache.generation
         result = func(self, document_id, *args, **kwargs)
 
         # Cache result
-        cache[cache_key] = result
+        document_cache.set(cache_key, document_id, result, generation)
 
         # Return result
         return result
@@ -1,21 +1,26 @@
-from typing import Any, List, Optional
+import asyncio
+from typing import Any, List, Optional, Tuple
 
 from dotenv import load_dotenv
 from fastapi import (
     Depends,
     FastAPI,
     Form,
+    Header,
     Path,
     Query,
+    Response,
     Security,
     UploadFile,
     File,
 )
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from api.document_service.app.schemas.document import (
+    ConversionJobResponseDTO,
     DocumentCreateDTO,
     DocumentPermissionCreateDTO,
     DocumentPermissionDTO,
@@ -25,12 +30,20 @@ from api.document_service.app.schemas.document import (
     DocumentUploadResponseDTO,
     DocumentVersionDTO,
 )
+from api.document_service.app.services.conversion_cache import conversion_cache
+from api.document_service.app.services.conversion_jobs import (
+    conversion_lifespan,
+    conversion_queue,
+)
 from api.document_service.app.services.document_service import DocumentService
 from api.shared.exceptions.auth_exceptions import InvalidTokenException
-from api.shared.utils.db import get_db
+from api.shared.utils.content_store import content_store
+from api.shared.utils.db import get_async_db, get_db
+from api.shared.utils.etag import ETAG_HEADER, etag_matches, not_modified
 from api.shared.utils.jwt import decode_token
+from api.shared.utils.membership_cache import membership_cache
+from api.document_service.app.services.document_cache import document_cache
 from api.shared.middleware.auth_middleware import auth_middleware
-from api.external_tools_service.app.services.document_tools import process_document_with_libreoffice
 
 # Load environment variables
 load_dotenv()
@@ -40,6 +53,7 @@ app = FastAPI(
     title="TaskHub Document Service",
     description="Document management service for TaskHub platform",
     version="1.0.0",
+    lifespan=conversion_lifespan,
 )
 
 # Add CORS middleware
@@ -84,7 +98,7 @@ def get_current_user(token: str = Security(oauth2_scheme)) -> str:
 @app.post("/documents", response_model=DocumentResponseDTO, tags=["Documents"])
 async def create_document(
     document_data: DocumentCreateDTO,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -92,37 +106,58 @@ async def create_document(
 
     Args:
         document_data (DocumentCreateDTO): Document data
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         DocumentResponseDTO: Created document
     """
-    document_service = DocumentService(db)
-    return document_service.create_document(document_data, user_id)
+    return await db.run_sync(
+        lambda session: DocumentService(session).create_document(document_data, user_id)
+    )
 
 
 @app.get(
     "/documents/{document_id}", response_model=DocumentResponseDTO, tags=["Documents"]
 )
 async def get_document(
+    response: Response,
     document_id: str = Path(..., description="Document ID"),
-    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None, description="ETags the client has"),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
     Get a document.
 
+    The ETag header versions the document; sent back in If-None-Match, it
+    gets a 304 Not Modified while the document is unchanged.
+
     Args:
+        response (Response): Response
         document_id (str): Document ID
-        db (Session): Database session
+        if_none_match (Optional[str]): ETags the client has
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         DocumentResponseDTO: Document
     """
-    document_service = DocumentService(db)
-    return document_service.get_document(document_id, user_id)
+
+    def get_document_if_modified(session: Session) -> Tuple[str, Any]:
+        service = DocumentService(session)
+        etag = service.get_document_etag(document_id, user_id)
+        if etag_matches(if_none_match, etag):
+            return etag, None
+        # The ETag also tells whether the cached document is current
+        return etag, service.get_fresh_document(document_id, user_id, etag)
+
+    etag, document = await db.run_sync(get_document_if_modified)
+    if document is None:
+        return not_modified(etag)
+
+    response.headers[ETAG_HEADER] = etag
+    return document
 
 
 @app.put(
@@ -131,7 +166,7 @@ async def get_document(
 async def update_document(
     document_data: DocumentUpdateDTO,
     document_id: str = Path(..., description="Document ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -140,20 +175,23 @@ async def update_document(
     Args:
         document_data (DocumentUpdateDTO): Document data
         document_id (str): Document ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         DocumentResponseDTO: Updated document
     """
-    document_service = DocumentService(db)
-    return document_service.update_document(document_id, document_data, user_id)
+    return await db.run_sync(
+        lambda session: DocumentService(session).update_document(
+            document_id, document_data, user_id
+        )
+    )
 
 
 @app.delete("/documents/{document_id}", tags=["Documents"])
 async def delete_document(
     document_id: str = Path(..., description="Document ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -161,14 +199,15 @@ async def delete_document(
 
     Args:
         document_id (str): Document ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         Dict[str, Any]: Delete response
     """
-    document_service = DocumentService(db)
-    return document_service.delete_document(document_id, user_id)
+    return await db.run_sync(
+        lambda session: DocumentService(session).delete_document(document_id, user_id)
+    )
 
 
 @app.get(
@@ -179,7 +218,7 @@ async def delete_document(
 async def get_project_documents(
     project_id: str = Path(..., description="Project ID"),
     parent_id: Optional[str] = Query(None, description="Parent document ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -188,14 +227,17 @@ async def get_project_documents(
     Args:
         project_id (str): Project ID
         parent_id (Optional[str], optional): Parent document ID. Defaults to None.
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         List[DocumentResponseDTO]: List of documents
     """
-    document_service = DocumentService(db)
-    return document_service.get_project_documents(project_id, user_id, parent_id)
+    return await db.run_sync(
+        lambda session: DocumentService(session).get_project_documents(
+            project_id, user_id, parent_id
+        )
+    )
 
 
 @app.post(
@@ -203,7 +245,7 @@ async def get_project_documents(
 )
 async def upload_document(
     document_data: DocumentCreateDTO,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -211,14 +253,15 @@ async def upload_document(
 
     Args:
         document_data (DocumentCreateDTO): Document data
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         DocumentUploadResponseDTO: Upload response
     """
-    document_service = DocumentService(db)
-    return document_service.upload_document(document_data, user_id)
+    return await db.run_sync(
+        lambda session: DocumentService(session).upload_document(document_data, user_id)
+    )
 
 
 # Document version endpoints
@@ -230,27 +273,39 @@ async def upload_document(
 async def create_document_version(
     content_type: str = Form(..., description="Content type"),
     changes: str = Form(..., description="Changes description"),
+    file: Optional[UploadFile] = File(None, description="Content of the version"),
     document_id: str = Path(..., description="Document ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
     Create a new document version.
 
+    Content identical to an earlier version's is not uploaded again.
+
     Args:
         content_type (str): Content type
         changes (str): Changes description
+        file (Optional[UploadFile]): Content of the version
         document_id (str): Document ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         DocumentVersionDTO: Created document version
     """
-    document_service = DocumentService(db)
-    return document_service.create_document_version(
-        document_id, content_type, changes, user_id
-    )
+    content = None
+    if file is not None:
+        content = await asyncio.to_thread(content_store.spool, file.file)
+    try:
+        return await db.run_sync(
+            lambda session: DocumentService(session).create_document_version(
+                document_id, content_type, changes, user_id, content
+            )
+        )
+    finally:
+        if content is not None:
+            await asyncio.to_thread(content_store.discard, content.path)
 
 
 @app.get(
@@ -260,7 +315,7 @@ async def create_document_version(
 )
 async def get_document_versions(
     document_id: str = Path(..., description="Document ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -268,14 +323,17 @@ async def get_document_versions(
 
     Args:
         document_id (str): Document ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         List[DocumentVersionDTO]: List of document versions
     """
-    document_service = DocumentService(db)
-    return document_service.get_document_versions(document_id, user_id)
+    return await db.run_sync(
+        lambda session: DocumentService(session).get_document_versions(
+            document_id, user_id
+        )
+    )
 
 
 @app.get(
@@ -286,7 +344,7 @@ async def get_document_versions(
 async def get_document_version(
     document_id: str = Path(..., description="Document ID"),
     version: int = Path(..., description="Version number"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -295,14 +353,17 @@ async def get_document_version(
     Args:
         document_id (str): Document ID
         version (int): Version number
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         DocumentVersionDTO: Document version
     """
-    document_service = DocumentService(db)
-    return document_service.get_document_version(document_id, version, user_id)
+    return await db.run_sync(
+        lambda session: DocumentService(session).get_document_version(
+            document_id, version, user_id
+        )
+    )
 
 
 # Document permission endpoints
@@ -314,7 +375,7 @@ async def get_document_version(
 async def add_document_permission(
     permission_data: DocumentPermissionCreateDTO,
     document_id: str = Path(..., description="Document ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -323,15 +384,16 @@ async def add_document_permission(
     Args:
         permission_data (DocumentPermissionCreateDTO): Permission data
         document_id (str): Document ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         DocumentPermissionDTO: Added document permission
     """
-    document_service = DocumentService(db)
-    return document_service.add_document_permission(
-        document_id, permission_data, user_id
+    return await db.run_sync(
+        lambda session: DocumentService(session).add_document_permission(
+            document_id, permission_data, user_id
+        )
     )
 
 
@@ -344,7 +406,7 @@ async def update_document_permission(
     permission_data: DocumentPermissionUpdateDTO,
     document_id: str = Path(..., description="Document ID"),
     permission_id: str = Path(..., description="Permission ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -354,15 +416,16 @@ async def update_document_permission(
         permission_data (DocumentPermissionUpdateDTO): Permission data
         document_id (str): Document ID
         permission_id (str): Permission ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         DocumentPermissionDTO: Updated document permission
     """
-    document_service = DocumentService(db)
-    return document_service.update_document_permission(
-        document_id, permission_id, permission_data, user_id
+    return await db.run_sync(
+        lambda session: DocumentService(session).update_document_permission(
+            document_id, permission_id, permission_data, user_id
+        )
     )
 
 
@@ -373,7 +436,7 @@ async def update_document_permission(
 async def delete_document_permission(
     document_id: str = Path(..., description="Document ID"),
     permission_id: str = Path(..., description="Permission ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -382,15 +445,16 @@ async def delete_document_permission(
     Args:
         document_id (str): Document ID
         permission_id (str): Permission ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         Dict[str, Any]: Delete response
     """
-    document_service = DocumentService(db)
-    return document_service.delete_document_permission(
-        document_id, permission_id, user_id
+    return await db.run_sync(
+        lambda session: DocumentService(session).delete_document_permission(
+            document_id, permission_id, user_id
+        )
     )
 
 
@@ -401,7 +465,7 @@ async def delete_document_permission(
 )
 async def get_document_permissions(
     document_id: str = Path(..., description="Document ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -409,36 +473,101 @@ async def get_document_permissions(
 
     Args:
         document_id (str): Document ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         List[DocumentPermissionDTO]: List of document permissions
     """
-    document_service = DocumentService(db)
-    return document_service.get_document_permissions(document_id, user_id)
+    return await db.run_sync(
+        lambda session: DocumentService(session).get_document_permissions(
+            document_id, user_id
+        )
+    )
 
 
-@app.post("/documents/convert", tags=["Documents"])
+@app.post(
+    "/documents/convert",
+    response_model=ConversionJobResponseDTO,
+    status_code=202,
+    tags=["Documents"],
+)
 async def convert_document(
     file: UploadFile = File(...),
     output_format: str = "pdf",
     supabase_bucket: str = "documents",
-    supabase_path: str = None,
+    supabase_path: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
-    Convierte un documento usando LibreOffice Online y lo sube a Supabase Storage.
+    Queue the conversion of a document with LibreOffice Online.
+
+    The converted file is uploaded to Supabase Storage in the background;
+    poll GET /documents/convert/{job_id} for its URL.
+
+    Args:
+        file (UploadFile): File to convert
+        output_format (str): Output format
+        supabase_bucket (str): Storage bucket of the output
+        supabase_path (Optional[str]): Output path in the bucket. Defaults to the
+            conversion cache, which skips inputs already converted.
+        db (AsyncSession): Async database session
+        user_id (str): User ID
+
+    Returns:
+        ConversionJobResponseDTO: Queued conversion job
+    """
+    input_path = await asyncio.to_thread(conversion_queue.spool, file.file)
+    return await db.run_sync(
+        lambda session: DocumentService(session).convert_document(
+            input_path,
+            file.filename or "document",
+            output_format,
+            supabase_bucket,
+            supabase_path,
+            user_id,
+        )
+    )
+
+
+@app.get(
+    "/documents/convert/{job_id}",
+    response_model=ConversionJobResponseDTO,
+    tags=["Documents"],
+)
+async def get_conversion_job(
+    job_id: str = Path(..., description="Conversion job ID"),
+    wait: float = Query(
+        0, ge=0, le=30, description="Seconds to wait for the job to finish"
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user),
+):
     """
-    import tempfile
-    import shutil
-    if not supabase_path:
-        supabase_path = f"converted/{file.filename}.{output_format}"
-    with tempfile.NamedTemporaryFile(delete=False) as tmp:
-        shutil.copyfileobj(file.file, tmp)
-        tmp_path = tmp.name
-    url = process_document_with_libreoffice(tmp_path, output_format, supabase_bucket, supabase_path)
-    return {"url": url}
+    Get a conversion job.
+
+    With ``wait``, the response is held until the job finishes or the wait
+    runs out, so clients can long-poll instead of polling in a loop.
+
+    Args:
+        job_id (str): Conversion job ID
+        wait (float): Seconds to wait for the job to finish
+        db (AsyncSession): Async database session
+        user_id (str): User ID
+
+    Returns:
+        ConversionJobResponseDTO: Conversion job
+    """
+    job = await db.run_sync(
+        lambda session: DocumentService(session).get_conversion_job(job_id, user_id)
+    )
+    if wait and job.status in ("queued", "running"):
+        await asyncio.to_thread(conversion_queue.wait, job_id, wait)
+        job = await db.run_sync(
+            lambda session: DocumentService(session).get_conversion_job(job_id, user_id)
+        )
+    return job
 
 
 @app.get("/health", tags=["Health"])
@@ -451,7 +580,70 @@ async def health_check() -> Any:
     """
     return {"status": "healthy"}
 
+
+@app.get("/membership-cache/stats", tags=["Health"])
+async def get_membership_cache_stats() -> Any:
+    """
+    Get membership cache metrics of this worker.
+
+    Returns:
+        Dict[str, Any]: Cache size, hits, misses and invalidations
+    """
+    return membership_cache.get_stats()
+
+
+@app.get("/document-cache/stats", tags=["Health"])
+async def get_document_cache_stats() -> Any:
+    """
+    Get document cache metrics of this worker.
+
+    Returns:
+        Dict[str, Any]: Cache size, bytes, hits, misses, evictions and invalidations
+    """
+    return document_cache.get_stats()
+
+
+@app.get("/conversion-queue/stats", tags=["Health"])
+async def get_conversion_queue_stats() -> Any:
+    """
+    Get conversion queue metrics of this worker.
+
+    Returns:
+        Dict[str, Any]: Workers, pending jobs, and submitted, completed, failed and rejected counts
+    """
+    return conversion_queue.get_stats()
+
+
+@app.get("/conversion-cache/stats", tags=["Health"])
+async def get_conversion_cache_stats(db: AsyncSession = Depends(get_async_db)) -> Any:
+    """
+    Get conversion cache metrics.
+
+    Args:
+        db (AsyncSession): Async database session
+
+    Returns:
+        Dict[str, Any]: Entries and bytes stored, and this worker's hits, misses, hit rate and evictions
+    """
+    return await db.run_sync(conversion_cache.get_stats)
+
+
+@app.get("/document-blobs/stats", tags=["Health"])
+async def get_document_blob_stats(db: AsyncSession = Depends(get_async_db)) -> Any:
+    """
+    Get content-addressed storage metrics.
+
+    Args:
+        db (AsyncSession): Async database session
+
+    Returns:
+        Dict[str, Any]: Blobs and bytes stored, versions and bytes they stand for,
+            and this worker's uploads, deduplicated stores and collected blobs
+    """
+    return await db.run_sync(content_store.get_stats)
+
 # Export para tests de integración
 get_db = get_db
+get_async_db = get_async_db
 get_current_user = get_current_user
 auth_middleware = auth_middleware
@@ -111,3 +111,21 @@ class DocumentUploadResponseDTO(BaseModel):
 
     document: DocumentResponseDTO
     upload_url: str  # Presigned URL for direct upload to storage
+
+
+class ConversionJobResponseDTO(BaseModel):
+    """DTO for a document conversion job"""
+
+    id: str
+    status: str  # 'queued', 'running', 'done', 'failed'
+    filename: str
+    output_format: str
+    bucket: str
+    path: str
+    url: Optional[str] = None  # Converted file, once done
+    size: Optional[int] = None
+    error: Optional[str] = None
+    cache_hit: bool = False  # Served from the conversion cache, without converting
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
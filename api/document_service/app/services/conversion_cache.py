@@ -0,0 +1,320 @@
+import hashlib
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, func, select, tuple_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from api.shared.models.document import ConversionCacheEntry, ConversionJob
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Conversion cache configuration; a budget of 0 disables the cache
+CONVERSION_CACHE_BUCKET = os.getenv("CONVERSION_CACHE_BUCKET", "conversion-cache")
+CONVERSION_CACHE_MAX_BYTES = int(
+    os.getenv("CONVERSION_CACHE_MAX_BYTES", str(1024 * 1024 * 1024))
+)
+# Bytes read at a time when hashing inputs
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(path: str) -> str:
+    """
+    Hash a file without loading it in memory.
+
+    Args:
+        path (str): File path
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ConversionCache:
+    """
+    Converted files, stored once per input content hash and output format.
+
+    Outputs live in their own bucket at a path derived from the hash, with a
+    ConversionCacheEntry row recording their size and last access. Once the
+    entries exceed ``max_bytes``, the least recently accessed ones are
+    evicted, rows first, then their files; the jobs pointing at an evicted
+    file are marked expired.
+
+    An entry stays locked (SELECT ... FOR UPDATE) from its lookup or addition
+    until the caller commits the job pointing at it, and eviction skips
+    locked entries, so a job is never done with a file that is being evicted.
+    """
+
+    def __init__(
+        self,
+        bucket: str = CONVERSION_CACHE_BUCKET,
+        max_bytes: int = CONVERSION_CACHE_MAX_BYTES,
+    ):
+        """
+        Initialize ConversionCache.
+
+        Args:
+            bucket (str, optional): Storage bucket of the outputs. Defaults to CONVERSION_CACHE_BUCKET.
+            max_bytes (int, optional): Max bytes of outputs kept. Defaults to CONVERSION_CACHE_MAX_BYTES.
+        """
+        self.bucket = bucket
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._bucket_created = False
+
+    @property
+    def enabled(self) -> bool:
+        """Whether conversions should go through the cache"""
+        return self.max_bytes > 0
+
+    def path(self, content_hash: str, output_format: str) -> str:
+        """
+        Get the storage path of a converted file.
+
+        Args:
+            content_hash (str): SHA-256 of the input
+            output_format (str): Output format
+
+        Returns:
+            str: Path in the cache bucket
+        """
+        return f"{content_hash[:2]}/{content_hash}.{output_format}"
+
+    def lookup(
+        self, db: Session, content_hash: str, output_format: str
+    ) -> Optional[ConversionCacheEntry]:
+        """
+        Find a converted file, recording the access.
+
+        The entry stays locked until the caller commits.
+
+        Args:
+            db (Session): Database session
+            content_hash (str): SHA-256 of the input
+            output_format (str): Output format
+
+        Returns:
+            Optional[ConversionCacheEntry]: Entry, None on a miss
+        """
+        entry = self._lock_entry(db, content_hash, output_format)
+
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        entry.hits += 1
+        entry.last_accessed_at = datetime.now(timezone.utc)
+        return entry
+
+    def add(
+        self,
+        db: Session,
+        storage: Any,
+        content_hash: str,
+        output_format: str,
+        output_path: str,
+        size: int,
+        content_type: str,
+    ) -> ConversionCacheEntry:
+        """
+        Evict entries to make room for a converted file, then store it.
+
+        The entry stays locked until the caller commits.
+
+        Args:
+            db (Session): Database session
+            storage (Any): Storage to upload to
+            content_hash (str): SHA-256 of the input
+            output_format (str): Output format
+            output_path (str): Converted file on disk
+            size (int): Its size in bytes
+            content_type (str): Its content type
+
+        Returns:
+            ConversionCacheEntry: Entry
+        """
+        self._ensure_bucket(storage)
+        path = self.path(content_hash, output_format)
+        # Content-addressed: a concurrent upload of the same path is identical
+        with open(output_path, "rb") as output:
+            storage.upload_file(self.bucket, path, output, content_type, upsert=True)
+
+        # Before adding, so the new entry is never the one evicted
+        self.evict(db, storage, incoming=size)
+        while True:
+            entry = ConversionCacheEntry(
+                content_hash=content_hash,
+                output_format=output_format,
+                bucket=self.bucket,
+                path=path,
+                url=storage.get_file_url(self.bucket, path),
+                size=size,
+                last_accessed_at=datetime.now(timezone.utc),
+            )
+            try:
+                with db.begin_nested():
+                    db.add(entry)
+                return entry
+            except IntegrityError:
+                # Another worker cached the same conversion first
+                entry = self._lock_entry(db, content_hash, output_format)
+                if entry is not None:
+                    return entry
+
+    def evict(self, db: Session, storage: Any, incoming: int = 0) -> int:
+        """
+        Evict the least recently accessed entries until under the byte budget.
+
+        Entries locked by a pending lookup or addition are skipped. The jobs
+        pointing at the evicted files are marked expired in the same
+        transaction, and the files removed once it commits.
+
+        Args:
+            db (Session): Database session
+            storage (Any): Storage holding the files
+            incoming (int, optional): Bytes about to be added. Defaults to 0.
+
+        Returns:
+            int: Number of entries evicted
+        """
+        excess = (
+            db.scalar(select(func.coalesce(func.sum(ConversionCacheEntry.size), 0)))
+            + incoming
+            - self.max_bytes
+        )
+        if excess <= 0:
+            return 0
+
+        ids: List[str] = []
+        keys: List[Tuple[str, str]] = []
+        paths: List[str] = []
+        for entry_id, content_hash, output_format, path, size in db.execute(
+            select(
+                ConversionCacheEntry.id,
+                ConversionCacheEntry.content_hash,
+                ConversionCacheEntry.output_format,
+                ConversionCacheEntry.path,
+                ConversionCacheEntry.size,
+            )
+            .order_by(ConversionCacheEntry.last_accessed_at, ConversionCacheEntry.id)
+            .with_for_update(skip_locked=True)
+        ):
+            if excess <= 0:
+                break
+            ids.append(entry_id)
+            keys.append((content_hash, output_format))
+            paths.append(path)
+            excess -= size
+
+        if not ids:
+            db.rollback()
+            return 0
+
+        db.execute(delete(ConversionCacheEntry).where(ConversionCacheEntry.id.in_(ids)))
+        db.execute(
+            update(ConversionJob)
+            .where(
+                tuple_(ConversionJob.content_hash, ConversionJob.output_format).in_(keys),
+                ConversionJob.bucket == self.bucket,
+                ConversionJob.status == "done",
+            )
+            .values(status="expired", url=None)
+        )
+        db.commit()
+        with self._lock:
+            self.evictions += len(ids)
+
+        try:
+            storage.delete_files(self.bucket, paths)
+        except Exception as e:
+            # The rows are gone, so the files are never served again
+            logger.error(f"Failed to delete evicted conversions: {e}")
+        return len(ids)
+
+    def get_stats(self, db: Session) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Args:
+            db (Session): Database session
+
+        Returns:
+            Dict[str, Any]: Entries and bytes stored, and this worker's hits, misses, hit rate and evictions
+        """
+        entries, size = db.execute(
+            select(
+                func.count(ConversionCacheEntry.id),
+                func.coalesce(func.sum(ConversionCacheEntry.size), 0),
+            )
+        ).one()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+    def _lock_entry(
+        self, db: Session, content_hash: str, output_format: str
+    ) -> Optional[ConversionCacheEntry]:
+        """
+        Get the entry of a conversion, locking its row until the transaction ends.
+
+        Args:
+            db (Session): Database session
+            content_hash (str): SHA-256 of the input
+            output_format (str): Output format
+
+        Returns:
+            Optional[ConversionCacheEntry]: Entry, None if not cached
+        """
+        return db.scalar(
+            select(ConversionCacheEntry)
+            .where(
+                ConversionCacheEntry.content_hash == content_hash,
+                ConversionCacheEntry.output_format == output_format,
+            )
+            .with_for_update()
+        )
+
+    def _ensure_bucket(self, storage: Any) -> None:
+        """
+        Create the cache bucket on first use.
+
+        Args:
+            storage (Any): Storage
+        """
+        if self._bucket_created:
+            return
+        try:
+            storage.create_bucket(self.bucket)
+        except Exception:
+            # Bucket may already exist
+            pass
+        self._bucket_created = True
+
+
+# Create global conversion cache
+conversion_cache = ConversionCache()
@@ -0,0 +1,392 @@
+import asyncio
+import logging
+import mimetypes
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy.orm import Session
+
+from api.document_service.app.services.conversion_cache import (
+    ConversionCache,
+    conversion_cache,
+    file_sha256,
+)
+from api.external_tools_service.app.services.document_tools import (
+    convert_document_to_file,
+)
+from api.project_service.app.services.activity_writer import activity_lifespan
+from api.shared.exceptions.document_exceptions import ConversionQueueFullException
+from api.shared.models.document import ConversionCacheEntry, ConversionJob
+from api.shared.utils.db import SessionLocal
+from api.shared.utils.supabase import SupabaseManager
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Document conversion configuration
+DOCUMENT_CONVERSION_WORKERS = int(os.getenv("DOCUMENT_CONVERSION_WORKERS", "4"))
+# Jobs queued or running at once; submissions beyond it are refused
+DOCUMENT_CONVERSION_MAX_PENDING = int(os.getenv("DOCUMENT_CONVERSION_MAX_PENDING", "32"))
+DOCUMENT_CONVERSION_TIMEOUT = float(os.getenv("DOCUMENT_CONVERSION_TIMEOUT", "300"))
+DOCUMENT_CONVERSION_TMP_DIR = os.getenv(
+    "DOCUMENT_CONVERSION_TMP_DIR",
+    os.path.join(tempfile.gettempdir(), "document-conversions"),
+)
+
+
+def _remove(path: str) -> None:
+    """
+    Remove a temporary file, if it exists.
+
+    Args:
+        path (str): File path
+    """
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Failed to remove temporary file {path}: {e}")
+
+
+class ConversionQueue:
+    """
+    Runs document conversions on a bounded pool of worker threads.
+
+    Submitting a conversion records a ConversionJob and returns at once; a
+    worker converts the spooled upload, streaming the output to a temporary
+    file instead of memory, uploads that file to storage and records the
+    result on the job. At most ``max_pending`` jobs are queued or running;
+    each one is given ``timeout`` seconds to convert. Temporary files are
+    removed whatever the outcome.
+
+    Jobs without an explicit output path go through the conversion cache:
+    an input already converted to the same format is not converted again,
+    and the job points at the cached file.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        converter: Callable[[str, str, str, float], int] = convert_document_to_file,
+        storage: Optional[Any] = None,
+        cache: Optional[ConversionCache] = conversion_cache,
+        workers: int = DOCUMENT_CONVERSION_WORKERS,
+        max_pending: int = DOCUMENT_CONVERSION_MAX_PENDING,
+        timeout: float = DOCUMENT_CONVERSION_TIMEOUT,
+        tmp_dir: str = DOCUMENT_CONVERSION_TMP_DIR,
+    ):
+        """
+        Initialize ConversionQueue.
+
+        Args:
+            session_factory (Callable[[], Session], optional): Session factory for the workers. Defaults to SessionLocal.
+            converter (Callable[[str, str, str, float], int], optional): Converts an input file to an output file. Defaults to convert_document_to_file.
+            storage (Any, optional): Storage to upload to. Defaults to SupabaseManager.
+            cache (ConversionCache, optional): Conversion cache, None to always convert. Defaults to the global conversion cache.
+            workers (int, optional): Concurrent conversions. Defaults to DOCUMENT_CONVERSION_WORKERS.
+            max_pending (int, optional): Max jobs queued or running. Defaults to DOCUMENT_CONVERSION_MAX_PENDING.
+            timeout (float, optional): Max seconds per conversion. Defaults to DOCUMENT_CONVERSION_TIMEOUT.
+            tmp_dir (str, optional): Directory of the temporary files. Defaults to DOCUMENT_CONVERSION_TMP_DIR.
+        """
+        self.session_factory = session_factory
+        self.converter = converter
+        self.storage = storage
+        self.cache = cache
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.tmp_dir = tmp_dir
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        # Started on the first submission, again after each shutdown
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        # Job ID -> (future, input path, finished event), while queued or running
+        self._pending: Dict[str, Tuple[Future, str, threading.Event]] = {}
+
+    def spool(self, file: BinaryIO) -> str:
+        """
+        Copy an upload to a temporary file for a worker to convert.
+
+        Blocking; call it off the event loop.
+
+        Args:
+            file (BinaryIO): Uploaded file
+
+        Returns:
+            str: Path of the temporary file
+        """
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=self.tmp_dir, prefix="input-", delete=False
+        ) as tmp:
+            try:
+                shutil.copyfileobj(file, tmp)
+            except Exception:
+                tmp.close()
+                _remove(tmp.name)
+                raise
+        return tmp.name
+
+    def submit(
+        self,
+        db: Session,
+        input_path: str,
+        filename: str,
+        output_format: str,
+        bucket: str,
+        path: Optional[str],
+        user_id: str,
+    ) -> ConversionJob:
+        """
+        Queue the conversion of a spooled upload.
+
+        The queue owns ``input_path`` from then on, and removes it.
+
+        Args:
+            db (Session): Database session
+            input_path (str): Spooled upload, from ``spool``
+            filename (str): Uploaded file name
+            output_format (str): Output format, e.g. 'pdf'
+            bucket (str): Storage bucket of the output
+            path (Optional[str]): Output path in the bucket. Defaults to the
+                conversion cache, or one path per job without it.
+            user_id (str): User ID
+
+        Returns:
+            ConversionJob: Queued job
+
+        Raises:
+            ConversionQueueFullException: If ``max_pending`` jobs are already queued or running
+        """
+        if not self._slots.acquire(blocking=False):
+            _remove(input_path)
+            with self._lock:
+                self.rejected += 1
+            raise ConversionQueueFullException()
+
+        try:
+            job_id = str(uuid.uuid4())
+            job = ConversionJob(
+                id=job_id,
+                user_id=user_id,
+                status="queued",
+                filename=filename,
+                output_format=output_format,
+                bucket=bucket,
+                path=path or f"converted/{job_id}/{filename}.{output_format}",
+            )
+            db.add(job)
+            db.commit()
+
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix="document-conversion",
+                    )
+                future = self._executor.submit(
+                    self._run, job_id, input_path, path is None
+                )
+                self._pending[job_id] = (future, input_path, threading.Event())
+        except Exception:
+            self._slots.release()
+            _remove(input_path)
+            raise
+
+        with self._lock:
+            self.submitted += 1
+        return job
+
+    def wait(self, job_id: str, timeout: float) -> bool:
+        """
+        Wait for a job of this worker to finish.
+
+        Args:
+            job_id (str): Conversion job ID
+            timeout (float): Max seconds to wait
+
+        Returns:
+            bool: False if the job is still queued or running; True otherwise,
+                including for jobs queued on other workers
+        """
+        with self._lock:
+            pending = self._pending.get(job_id)
+        return pending is None or pending[2].wait(timeout)
+
+    def shutdown(self) -> None:
+        """
+        Wait for the running jobs and fail the queued ones.
+
+        The queue stays usable: the next submission starts new workers.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        with self._lock:
+            cancelled = list(self._pending.items())
+        for job_id, (future, input_path, finished) in cancelled:
+            if not future.cancelled():
+                continue
+            try:
+                with self.session_factory() as db:
+                    job = db.get(ConversionJob, job_id)
+                    if job is not None:
+                        job.status = "failed"
+                        job.error = "Conversion cancelled by shutdown"
+                        job.finished_at = datetime.now(timezone.utc)
+                        db.commit()
+            except Exception as e:
+                logger.error(f"Failed to cancel conversion job {job_id}: {e}")
+            finally:
+                _remove(input_path)
+                self._finish(job_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get queue metrics.
+
+        Returns:
+            Dict[str, Any]: Workers, pending jobs, and submitted, completed, failed and rejected counts
+        """
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": len(self._pending),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    def _run(self, job_id: str, input_path: str, cacheable: bool = False) -> None:
+        """
+        Convert a job's input and upload the output, on a worker thread.
+
+        Args:
+            job_id (str): Conversion job ID
+            input_path (str): Spooled upload
+            cacheable (bool, optional): Whether the output may live in the conversion cache. Defaults to False.
+        """
+        output_path = f"{input_path}.out"
+        try:
+            with self.session_factory() as db:
+                job = db.get(ConversionJob, job_id)
+                if job is None:
+                    return
+                job.status = "running"
+                job.started_at = datetime.now(timezone.utc)
+                db.commit()
+
+                try:
+                    storage = self.storage or SupabaseManager()
+                    output_format = job.output_format
+                    content_type = (
+                        mimetypes.guess_type(f"output.{output_format}")[0]
+                        or f"application/{output_format}"
+                    )
+                    cache = self.cache if cacheable else None
+                    if cache is not None and not cache.enabled:
+                        cache = None
+
+                    content_hash: Optional[str] = None
+                    entry: Optional[ConversionCacheEntry] = None
+                    if cache is not None:
+                        content_hash = file_sha256(input_path)
+                        entry = cache.lookup(db, content_hash, output_format)
+                    cache_hit = entry is not None
+
+                    if entry is None:
+                        size = self.converter(
+                            input_path, output_path, output_format, self.timeout
+                        )
+                        if cache is not None and content_hash and size <= cache.max_bytes:
+                            entry = cache.add(
+                                db,
+                                storage,
+                                content_hash,
+                                output_format,
+                                output_path,
+                                size,
+                                content_type,
+                            )
+                        else:
+                            # Uploaded from disk, never held in memory
+                            with open(output_path, "rb") as output:
+                                storage.upload_file(job.bucket, job.path, output, content_type)
+                            job.url = storage.get_file_url(job.bucket, job.path)
+                            job.size = size
+
+                    if entry is not None:
+                        job.bucket = entry.bucket
+                        job.path = entry.path
+                        job.url = entry.url
+                        job.size = entry.size
+                    job.content_hash = content_hash
+                    job.cache_hit = cache_hit
+                    job.status = "done"
+                    with self._lock:
+                        self.completed += 1
+                except Exception as e:
+                    logger.error(f"Conversion job {job_id} failed: {e}")
+                    job.status = "failed"
+                    job.error = str(e) or type(e).__name__
+                    with self._lock:
+                        self.failed += 1
+
+                job.finished_at = datetime.now(timezone.utc)
+                db.commit()
+        except Exception as e:
+            logger.error(f"Failed to record conversion job {job_id}: {e}")
+        finally:
+            _remove(input_path)
+            _remove(output_path)
+            self._finish(job_id)
+
+    def _finish(self, job_id: str) -> None:
+        """
+        Free a job's slot and wake up its waiters.
+
+        Args:
+            job_id (str): Conversion job ID
+        """
+        with self._lock:
+            pending = self._pending.pop(job_id, None)
+        if pending is not None:
+            self._slots.release()
+            pending[2].set()
+
+
+# Create global conversion queue
+conversion_queue = ConversionQueue()
+
+
+@asynccontextmanager
+async def conversion_lifespan(app: Any) -> AsyncIterator[None]:
+    """
+    Activity lifespan that also stops the conversion workers on shutdown.
+
+    Args:
+        app (Any): FastAPI app
+    """
+    async with activity_lifespan(app):
+        try:
+            yield
+        finally:
+            await asyncio.to_thread(conversion_queue.shutdown)
@@ -0,0 +1,252 @@
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+from api.shared.utils.membership_cache import membership_cache
+
+# Load environment variables
+load_dotenv()
+
+# Document cache configuration; a size of 0 disables the cache
+DOCUMENT_CACHE_SIZE = int(os.getenv("DOCUMENT_CACHE_SIZE", "1000"))
+DOCUMENT_CACHE_MAX_BYTES = int(os.getenv("DOCUMENT_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+DOCUMENT_CACHE_TTL = float(os.getenv("DOCUMENT_CACHE_TTL", "30"))
+
+
+class DocumentCacheEntry:
+    """Cached result of a document read"""
+
+    __slots__ = ("value", "document_id", "project_id", "size", "expires_at")
+
+    def __init__(
+        self,
+        value: Any,
+        document_id: str,
+        project_id: Optional[str],
+        size: int,
+        expires_at: float,
+    ):
+        """
+        Initialize DocumentCacheEntry.
+
+        Args:
+            value (Any): Cached result
+            document_id (str): Document ID
+            project_id (Optional[str]): Project of the document, if known
+            size (int): Estimated size in bytes
+            expires_at (float): Expiry, as returned by time.time()
+        """
+        self.value = value
+        self.document_id = document_id
+        self.project_id = project_id
+        self.size = size
+        self.expires_at = expires_at
+
+
+class DocumentCache:
+    """
+    Bounded LRU cache of document reads, with a TTL.
+
+    Keys are built by the ``cache_document`` decorator from the method, the
+    document ID and the remaining arguments, so a result computed after one
+    user's permission check is never served to another user. The cache is
+    bounded both in entries and in estimated bytes. Document writes call
+    ``invalidate`` after their commit; membership changes drop the entries of
+    their project through the membership cache broadcaster. Other workers
+    only see document writes once the TTL expires.
+    """
+
+    def __init__(
+        self,
+        max_size: int = DOCUMENT_CACHE_SIZE,
+        max_bytes: int = DOCUMENT_CACHE_MAX_BYTES,
+        ttl: float = DOCUMENT_CACHE_TTL,
+    ):
+        """
+        Initialize DocumentCache.
+
+        Args:
+            max_size (int, optional): Max entries. Defaults to DOCUMENT_CACHE_SIZE.
+            max_bytes (int, optional): Max estimated bytes. Defaults to DOCUMENT_CACHE_MAX_BYTES.
+            ttl (float, optional): Max seconds an entry stays cached. Defaults to DOCUMENT_CACHE_TTL.
+        """
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, DocumentCacheEntry]" = OrderedDict()
+        self._keys_by_document: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        """
+        Invalidation counter, to read before computing a result.
+
+        ``set`` ignores results computed before an invalidation, which may be stale.
+        """
+        return self._generation
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """
+        Get a cached result.
+
+        Args:
+            key (Hashable): Cache key
+
+        Returns:
+            Tuple[bool, Any]: Whether the key was cached, and its result
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry.value
+            if entry is not None:
+                self._remove(key)
+                self.expirations += 1
+            self.misses += 1
+            return False, None
+
+    def set(self, key: Hashable, document_id: str, value: Any, generation: int) -> None:
+        """
+        Cache a result, evicting the least recently used entries over budget.
+
+        Args:
+            key (Hashable): Cache key
+            document_id (str): Document ID the result depends on
+            value (Any): Result
+            generation (int): ``generation`` read before the result was computed
+        """
+        if self.max_size <= 0:
+            return
+
+        size = _estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        entry = DocumentCacheEntry(
+            value,
+            document_id,
+            getattr(value, "project_id", None),
+            size,
+            time.time() + self.ttl,
+        )
+        with self._lock:
+            if generation != self._generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._keys_by_document.setdefault(document_id, set()).add(key)
+            self.bytes += size
+            while len(self._entries) > self.max_size or self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, document_id: str) -> None:
+        """
+        Drop every cached result of a document, for every user.
+
+        Call after the document change is committed.
+
+        Args:
+            document_id (str): Document ID
+        """
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            for key in list(self._keys_by_document.get(document_id, ())):
+                self._remove(key)
+
+    def invalidate_project(self, project_id: str, user_id: Optional[str] = None) -> None:
+        """
+        Drop the cached results of a project's documents.
+
+        Subscribed to membership invalidations, since roles grant document
+        permissions; the user is ignored, as entries are not indexed by user.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str, optional): User whose role changed. Unused.
+        """
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            for key in [
+                key for key, entry in self._entries.items() if entry.project_id == project_id
+            ]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        """Remove all cached results"""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_document.clear()
+            self.bytes = 0
+            self._generation += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dict[str, Any]: Size, bytes, hits, misses, evictions, expirations and invalidations
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+    def _remove(self, key: Hashable) -> None:
+        """Remove an entry and its index; lock held"""
+        entry = self._entries.pop(key)
+        self.bytes -= entry.size
+        keys = self._keys_by_document.get(entry.document_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_document[entry.document_id]
+
+
+def _estimate_size(value: Any) -> int:
+    """
+    Estimate the memory a cached result holds, from its pickled size.
+
+    Args:
+        value (Any): Result
+
+    Returns:
+        int: Size in bytes
+    """
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:
+        return sys.getsizeof(value)
+
+
+# Create global document cache
+document_cache = DocumentCache()
+membership_cache.broadcaster.subscribe(document_cache.invalidate_project)
@@ -0,0 +1,215 @@
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import and_, select
+from sqlalchemy.orm import Session
+
+from api.shared.models.document import Document, DocumentPermission
+from api.shared.utils.membership_cache import get_member_roles
+
+# Project roles granted every permission on every document of the project
+ADMIN_ROLES = ("owner", "admin")
+
+# Permission types, as checked by DocumentService
+PERMISSION_TYPES = ("view", "edit", "delete", "share")
+
+
+class DocumentAccess:
+    """Permissions of a user on a document"""
+
+    def __init__(
+        self,
+        can_view: bool = False,
+        can_edit: bool = False,
+        can_delete: bool = False,
+        can_share: bool = False,
+    ):
+        """
+        Initialize DocumentAccess.
+
+        Args:
+            can_view (bool, optional): Can view. Defaults to False.
+            can_edit (bool, optional): Can edit. Defaults to False.
+            can_delete (bool, optional): Can delete. Defaults to False.
+            can_share (bool, optional): Can share. Defaults to False.
+        """
+        self.can_view = can_view
+        self.can_edit = can_edit
+        self.can_delete = can_delete
+        self.can_share = can_share
+
+    @classmethod
+    def full(cls) -> "DocumentAccess":
+        """Every permission, for creators and project owners and admins"""
+        return cls(True, True, True, True)
+
+    def allows(self, permission_type: str) -> bool:
+        """
+        Check a permission.
+
+        Args:
+            permission_type (str): Permission type ('view', 'edit', 'delete', 'share')
+
+        Returns:
+            bool: True if granted
+        """
+        return permission_type in PERMISSION_TYPES and bool(
+            getattr(self, f"can_{permission_type}")
+        )
+
+
+class DocumentPermissionResolver:
+    """
+    Resolves a user's permissions on many documents at once.
+
+    Creators and project owners and admins get every permission; other users
+    get their direct DocumentPermission, if any. Whatever the number of
+    documents, this takes at most one query for the project roles, which
+    are cached across requests, and one for the direct permissions.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize DocumentPermissionResolver.
+
+        Args:
+            db (Session): Database session
+        """
+        self.db = db
+
+    def resolve(
+        self,
+        documents: Sequence[Document],
+        user_id: str,
+        roles: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, DocumentAccess]:
+        """
+        Resolve the permissions of a user on loaded documents.
+
+        Args:
+            documents (Sequence[Document]): Documents
+            user_id (str): User ID
+            roles (Dict[str, str], optional): Project ID -> role of the user, when
+                already known. Defaults to looking them up.
+
+        Returns:
+            Dict[str, DocumentAccess]: Document ID -> permissions
+        """
+        access: Dict[str, DocumentAccess] = {}
+        others: List[Document] = []
+        for document in documents:
+            if document.creator_id == user_id:
+                access[document.id] = DocumentAccess.full()
+            else:
+                others.append(document)
+
+        if not others:
+            return access
+
+        if roles is None:
+            roles = get_member_roles(
+                self.db, (document.project_id for document in others), user_id
+            )
+
+        # Owners and admins need no per-document lookup
+        pending: List[str] = []
+        for document in others:
+            if roles.get(document.project_id) in ADMIN_ROLES:
+                access[document.id] = DocumentAccess.full()
+            else:
+                pending.append(document.id)
+
+        permissions = self._get_direct_permissions(pending, user_id)
+        for document_id in pending:
+            access[document_id] = permissions.get(document_id) or DocumentAccess()
+        return access
+
+    def resolve_ids(
+        self, document_ids: Iterable[str], user_id: str
+    ) -> Dict[str, DocumentAccess]:
+        """
+        Resolve the permissions of a user on documents by ID.
+
+        The documents and the user's direct permissions are read in one query.
+
+        Args:
+            document_ids (Iterable[str]): Document IDs
+            user_id (str): User ID
+
+        Returns:
+            Dict[str, DocumentAccess]: Document ID -> permissions, for existing documents
+        """
+        document_ids = list(document_ids)
+        if not document_ids:
+            return {}
+
+        rows = self.db.execute(
+            select(
+                Document.id,
+                Document.project_id,
+                Document.creator_id,
+                DocumentPermission.id.label("permission_id"),
+                DocumentPermission.can_view,
+                DocumentPermission.can_edit,
+                DocumentPermission.can_delete,
+                DocumentPermission.can_share,
+            )
+            .outerjoin(
+                DocumentPermission,
+                and_(
+                    DocumentPermission.document_id == Document.id,
+                    DocumentPermission.user_id == user_id,
+                ),
+            )
+            .where(Document.id.in_(document_ids))
+        ).all()
+
+        roles = get_member_roles(
+            self.db, (row.project_id for row in rows if row.creator_id != user_id), user_id
+        )
+
+        access: Dict[str, DocumentAccess] = {}
+        for row in rows:
+            if row.creator_id == user_id or roles.get(row.project_id) in ADMIN_ROLES:
+                access[row.id] = DocumentAccess.full()
+            elif row.permission_id is not None:
+                access[row.id] = DocumentAccess(
+                    row.can_view, row.can_edit, row.can_delete, row.can_share
+                )
+            else:
+                access[row.id] = DocumentAccess()
+        return access
+
+    def _get_direct_permissions(
+        self, document_ids: List[str], user_id: str
+    ) -> Dict[str, DocumentAccess]:
+        """
+        Get the direct permissions of a user on documents.
+
+        Args:
+            document_ids (List[str]): Document IDs
+            user_id (str): User ID
+
+        Returns:
+            Dict[str, DocumentAccess]: Document ID -> permissions, where granted
+        """
+        if not document_ids:
+            return {}
+
+        rows = self.db.execute(
+            select(
+                DocumentPermission.document_id,
+                DocumentPermission.can_view,
+                DocumentPermission.can_edit,
+                DocumentPermission.can_delete,
+                DocumentPermission.can_share,
+            ).where(
+                DocumentPermission.document_id.in_(document_ids),
+                DocumentPermission.user_id == user_id,
+            )
+        )
+        return {
+            row.document_id: DocumentAccess(
+                row.can_view, row.can_edit, row.can_delete, row.can_share
+            )
+            for row in rows
+        }
@@ -1,10 +1,21 @@
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
+from sqlalchemy import and_, select
 from sqlalchemy.orm import Session
 
+from api.document_service.app.decorators.document_decorators import cache_document
 from api.document_service.app.factories.document_factory import DocumentFactory
+from api.document_service.app.services.conversion_jobs import (
+    ConversionQueue,
+    conversion_queue,
+)
+from api.document_service.app.services.document_cache import document_cache
+from api.document_service.app.services.document_permission_resolver import (
+    DocumentPermissionResolver,
+)
 from api.document_service.app.schemas.document import (
+    ConversionJobResponseDTO,
     DocumentCreateDTO,
     DocumentPermissionCreateDTO,
     DocumentPermissionDTO,
@@ -16,6 +27,8 @@ from api.document_service.app.schemas.document import (
     DocumentVersionDTO,
 )
 from api.shared.exceptions.document_exceptions import (
+    ConversionJobExpiredException,
+    ConversionJobNotFoundException,
     DocumentNotFoundException,
     DocumentPermissionNotFoundException,
     DocumentStorageException,
@@ -27,8 +40,16 @@ from api.shared.exceptions.project_exceptions import (
     NotProjectMemberException,
     ProjectNotFoundException,
 )
-from api.shared.models.document import Document, DocumentPermission, DocumentVersion
+from api.shared.models.document import (
+    ConversionJob,
+    Document,
+    DocumentPermission,
+    DocumentVersion,
+)
 from api.shared.models.project import Project, ProjectMember
+from api.shared.utils.content_store import StagedContent, content_store
+from api.shared.utils.etag import make_etag
+from api.shared.utils.membership_cache import membership_cache
 from api.shared.utils.supabase import SupabaseManager
 
 
@@ -44,7 +65,9 @@ class DocumentService:
         """
         self.db = db
         self.supabase_manager = SupabaseManager()
+        self.permission_resolver = DocumentPermissionResolver(db)
         self.document_factory = DocumentFactory()
+        self.content_store = content_store
 
     def create_document(
         self, document_data: DocumentCreateDTO, user_id: str
@@ -64,29 +87,8 @@ class DocumentService:
             NotProjectMemberException: If user is not a project member
             InvalidDocumentTypeException: If document type is invalid
         """
-        # Get project
-        project = (
-            self.db.query(Project)
-            .filter(Project.id == document_data.project_id)
-            .first()
-        )
-
-        # Check if project exists
-        if project is None:
-            raise ProjectNotFoundException()
-
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == document_data.project_id,
-                ProjectMember.user_id == user_id,
-            )
-            .first()
-        )
-
-        if project_member is None:
-            raise NotProjectMemberException()
+        # Check if project exists and user is a project member
+        self._get_member_role(document_data.project_id, user_id)
 
         # Check if parent document exists
         if document_data.parent_id:
@@ -159,6 +161,7 @@ class DocumentService:
         # Return document
         return self._document_to_dto(document)
 
+    @cache_document
     def get_document(self, document_id: str, user_id: str) -> DocumentResponseDTO:
         """
         Get a document.
@@ -182,7 +185,9 @@ class DocumentService:
             raise DocumentNotFoundException()
 
         # Check if user has permission to view document
-        if not bool(self._has_permission(document_id, user_id, "view")):
+        if not bool(
+            self._has_permission(document_id, user_id, "view", document=document)
+        ):
             raise InsufficientDocumentPermissionException(
                 "User does not have permission to view this document"
             )
@@ -190,6 +195,69 @@ class DocumentService:
         # Return document
         return self._document_to_dto(document)
 
+    def get_fresh_document(
+        self, document_id: str, user_id: str, etag: str
+    ) -> DocumentResponseDTO:
+        """
+        Get a document, reloading a cached copy older than the given ETag.
+
+        Another worker may have changed the document after this worker cached
+        it; the ETag, read from the database, tells.
+
+        Args:
+            document_id (str): Document ID
+            user_id (str): User ID
+            etag (str): Current ETag, from get_document_etag
+
+        Returns:
+            DocumentResponseDTO: Document
+
+        Raises:
+            DocumentNotFoundException: If document not found
+            InsufficientDocumentPermissionException: If user has insufficient permission
+        """
+        document = self.get_document(document_id, user_id)
+        if (
+            make_etag(document.id, document.version, document.created_at, document.updated_at)
+            != etag
+        ):
+            document_cache.invalidate(document_id)
+            document = self.get_document(document_id, user_id)
+        return document
+
+    def get_document_etag(self, document_id: str, user_id: str) -> str:
+        """
+        Get the ETag of a document without loading it.
+
+        Args:
+            document_id (str): Document ID
+            user_id (str): User ID
+
+        Returns:
+            str: ETag, changing whenever the document or its version changes
+
+        Raises:
+            DocumentNotFoundException: If document not found
+            InsufficientDocumentPermissionException: If user has insufficient permission
+        """
+        version = self.db.execute(
+            select(Document.version, Document.created_at, Document.updated_at).where(
+                Document.id == document_id
+            )
+        ).first()
+
+        # Check if document exists
+        if version is None:
+            raise DocumentNotFoundException()
+
+        # Check if user has permission to view document
+        if not bool(self._has_permission(document_id, user_id, "view")):
+            raise InsufficientDocumentPermissionException(
+                "User does not have permission to view this document"
+            )
+
+        return make_etag(document_id, *version)
+
     def update_document(
         self, document_id: str, document_data: DocumentUpdateDTO, user_id: str
     ) -> DocumentResponseDTO:
@@ -216,7 +284,9 @@ class DocumentService:
             raise DocumentNotFoundException()
 
         # Check if user has permission to edit document
-        if not bool(self._has_permission(document_id, user_id, "edit")):
+        if not bool(
+            self._has_permission(document_id, user_id, "edit", document=document)
+        ):
             raise InsufficientDocumentPermissionException(
                 "User does not have permission to edit this document"
             )
@@ -259,6 +329,7 @@ class DocumentService:
         setattr(document, 'updated_at', datetime.now(timezone.utc))
         self.db.commit()
         self.db.refresh(document)
+        document_cache.invalidate(document_id)
 
         # Return document
         return self._document_to_dto(document)
@@ -286,13 +357,28 @@ class DocumentService:
             raise DocumentNotFoundException()
 
         # Check if user has permission to delete document
-        if not bool(self._has_permission(document_id, user_id, "delete")):
+        if not bool(
+            self._has_permission(document_id, user_id, "delete", document=document)
+        ):
             raise InsufficientDocumentPermissionException(
                 "User does not have permission to delete this document"
             )
 
+        # Versions share their content with other versions, possibly of other documents
+        versions = self.db.execute(
+            select(DocumentVersion.content_hash, DocumentVersion.url).where(
+                DocumentVersion.document_id == document_id
+            )
+        ).all()
+        content_hashes = [content_hash for content_hash, _ in versions]
+        content_urls = {url for content_hash, url in versions if content_hash}
+
         # Delete document from storage if it's a file
-        if document.type == DocumentType.FILE and document.url:
+        if (
+            document.type == DocumentType.FILE
+            and document.url
+            and document.url not in content_urls
+        ):
             try:
                 # Extract bucket name and file path from URL
                 # This is a simplified example, actual implementation may vary
@@ -306,9 +392,16 @@ class DocumentService:
                 # Log error but continue with document deletion
                 print(f"Error deleting file from storage: {e}")
 
-        # Delete document
+        # Delete document and its versions
+        self.db.query(DocumentVersion).filter(
+            DocumentVersion.document_id == document_id
+        ).delete(synchronize_session=False)
         self.db.delete(document)
         self.db.commit()
+        document_cache.invalidate(document_id)
+
+        # Remove the content no other version references
+        self.content_store.collect(self.db, content_hashes)
 
         # Return success response
         return {"message": "Document deleted successfully"}
@@ -331,24 +424,8 @@ class DocumentService:
             ProjectNotFoundException: If project not found
             NotProjectMemberException: If user is not a project member
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if project is None:
-            raise ProjectNotFoundException()
-
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if project_member is None:
-            raise NotProjectMemberException()
+        # Check if project exists and user is a project member
+        role = self._get_member_role(project_id, user_id)
 
         # Get documents
         query = self.db.query(Document).filter(Document.project_id == project_id)
@@ -360,11 +437,13 @@ class DocumentService:
 
         documents = query.all()
 
-        # Filter documents based on user permissions
-        allowed_documents = []
-        for document in documents:
-            if bool(self._has_permission(document.id, user_id, "view")):
-                allowed_documents.append(document)
+        # Filter documents based on user permissions, resolved for all at once
+        access = self.permission_resolver.resolve(
+            documents, user_id, roles={project_id: role}
+        )
+        allowed_documents = [
+            document for document in documents if access[document.id].can_view
+        ]
 
         # Return documents
         return [self._document_to_dto(document) for document in allowed_documents]
@@ -421,16 +500,25 @@ class DocumentService:
             raise DocumentStorageException(f"Failed to generate upload URL: {e}")
 
     def create_document_version(
-        self, document_id: str, content_type: str, changes: str, user_id: str
+        self,
+        document_id: str,
+        content_type: str,
+        changes: str,
+        user_id: str,
+        content: Optional[StagedContent] = None,
     ) -> DocumentVersionDTO:
         """
         Create a new document version.
 
+        With content, the version points at its content-addressed blob, which
+        is only uploaded if no version has stored the same bytes before.
+
         Args:
             document_id (str): Document ID
             content_type (str): Content type
             changes (str): Changes description
             user_id (str): User ID
+            content (StagedContent, optional): Spooled upload of the version. Defaults to None.
 
         Returns:
             DocumentVersionDTO: Created document version
@@ -454,7 +542,9 @@ class DocumentService:
             )
 
         # Check if user has permission to edit document
-        if not bool(self._has_permission(document_id, user_id, "edit")):
+        if not bool(
+            self._has_permission(document_id, user_id, "edit", document=document)
+        ):
             raise InsufficientDocumentPermissionException(
                 "User does not have permission to edit this document"
             )
@@ -470,19 +560,34 @@ class DocumentService:
         # Calculate new version number
         new_version = 1 if not latest_version else latest_version.version + 1
 
-        # Generate file URL
-        bucket_name = f"project-{document.project_id}"
-        file_path = f"{document.id}/v{new_version}/{document.name}"
-        url = self.supabase_manager.get_file_url(bucket_name, file_path)
+        content_hash: Optional[str] = None
+        size: Optional[int] = None
+        if content is not None:
+            # Unchanged content is a metadata-only version
+            try:
+                blob = self.content_store.store(self.db, content, content_type)
+            except Exception as e:
+                self.db.rollback()
+                raise DocumentStorageException(f"Failed to store document version: {e}")
+            url = blob.url
+            content_hash = blob.content_hash
+            size = blob.size
+        else:
+            # Generate file URL
+            bucket_name = f"project-{document.project_id}"
+            file_path = f"{document.id}/v{new_version}/{document.name}"
+            url = self.supabase_manager.get_file_url(bucket_name, file_path)
 
         # Create document version
         document_version = DocumentVersion(
             document_id=document_id,
             version=new_version,
+            size=size,
             content_type=content_type,
             url=url,
             creator_id=user_id,
             changes=changes,
+            content_hash=content_hash,
         )
 
         # Add document version to database
@@ -492,10 +597,13 @@ class DocumentService:
         document.version = new_version
         document.content_type = content_type
         document.url = url
+        if size is not None:
+            document.size = size
         setattr(document, 'updated_at', datetime.now(timezone.utc))
 
         self.db.commit()
         self.db.refresh(document_version)
+        document_cache.invalidate(document_id)
 
         # Return document version
         return self._document_version_to_dto(document_version)
@@ -532,7 +640,9 @@ class DocumentService:
             )
 
         # Check if user has permission to view document
-        if not bool(self._has_permission(document_id, user_id, "view")):
+        if not bool(
+            self._has_permission(document_id, user_id, "view", document=document)
+        ):
             raise InsufficientDocumentPermissionException(
                 "User does not have permission to view this document"
             )
@@ -575,7 +685,9 @@ class DocumentService:
             raise DocumentNotFoundException()
 
         # Check if user has permission to view document
-        if not bool(self._has_permission(document_id, user_id, "view")):
+        if not bool(
+            self._has_permission(document_id, user_id, "view", document=document)
+        ):
             raise InsufficientDocumentPermissionException(
                 "User does not have permission to view this document"
             )
@@ -626,7 +738,9 @@ class DocumentService:
             raise DocumentNotFoundException()
 
         # Check if user has permission to share document
-        if not bool(self._has_permission(document_id, user_id, "share")):
+        if not bool(
+            self._has_permission(document_id, user_id, "share", document=document)
+        ):
             raise InsufficientDocumentPermissionException(
                 "User does not have permission to share this document"
             )
@@ -662,6 +776,7 @@ class DocumentService:
 
             self.db.commit()
             self.db.refresh(existing_permission)
+            document_cache.invalidate(document_id)
 
             return self._document_permission_to_dto(existing_permission)
 
@@ -680,6 +795,7 @@ class DocumentService:
         self.db.add(document_permission)
         self.db.commit()
         self.db.refresh(document_permission)
+        document_cache.invalidate(document_id)
 
         # Return document permission
         return self._document_permission_to_dto(document_permission)
@@ -716,7 +832,9 @@ class DocumentService:
             raise DocumentNotFoundException()
 
         # Check if user has permission to share document
-        if not bool(self._has_permission(document_id, user_id, "share")):
+        if not bool(
+            self._has_permission(document_id, user_id, "share", document=document)
+        ):
             raise InsufficientDocumentPermissionException(
                 "User does not have permission to share this document"
             )
@@ -752,6 +870,7 @@ class DocumentService:
         setattr(document_permission, 'updated_at', datetime.now(timezone.utc))
         self.db.commit()
         self.db.refresh(document_permission)
+        document_cache.invalidate(document_id)
 
         # Return document permission
         return self._document_permission_to_dto(document_permission)
@@ -783,7 +902,9 @@ class DocumentService:
             raise DocumentNotFoundException()
 
         # Check if user has permission to share document
-        if not bool(self._has_permission(document_id, user_id, "share")):
+        if not bool(
+            self._has_permission(document_id, user_id, "share", document=document)
+        ):
             raise InsufficientDocumentPermissionException(
                 "User does not have permission to share this document"
             )
@@ -811,6 +932,7 @@ class DocumentService:
         # Delete document permission
         self.db.delete(document_permission)
         self.db.commit()
+        document_cache.invalidate(document_id)
 
         # Return success response
         return {"message": "Document permission deleted successfully"}
@@ -840,7 +962,9 @@ class DocumentService:
             raise DocumentNotFoundException()
 
         # Check if user has permission to view document
-        if not bool(self._has_permission(document_id, user_id, "view")):
+        if not bool(
+            self._has_permission(document_id, user_id, "view", document=document)
+        ):
             raise InsufficientDocumentPermissionException(
                 "User does not have permission to view this document"
             )
@@ -858,94 +982,143 @@ class DocumentService:
             for permission in document_permissions
         ]
 
-    def _has_permission(
-        self, document_id: str, user_id: str, permission_type: str
-    ) -> bool:
+    def convert_document(
+        self,
+        input_path: str,
+        filename: str,
+        output_format: str,
+        bucket: str,
+        path: Optional[str],
+        user_id: str,
+        queue: Optional[ConversionQueue] = None,
+    ) -> ConversionJobResponseDTO:
         """
-        Check if user has permission for a document.
+        Queue the conversion of an uploaded file.
 
         Args:
-            document_id (str): Document ID
+            input_path (str): Upload spooled by ConversionQueue.spool, owned by the queue from then on
+            filename (str): Uploaded file name
+            output_format (str): Output format, e.g. 'pdf'
+            bucket (str): Storage bucket of the output
+            path (Optional[str]): Output path in the bucket. Defaults to the conversion cache.
             user_id (str): User ID
-            permission_type (str): Permission type ('view', 'edit', 'delete', 'share')
+            queue (ConversionQueue, optional): Queue. Defaults to the global conversion queue.
 
         Returns:
-            bool: True if user has permission, False otherwise
+            ConversionJobResponseDTO: Queued conversion job
+
+        Raises:
+            ConversionQueueFullException: If too many conversions are pending
         """
-        # Get document
-        document = self.db.query(Document).filter(Document.id == document_id).first()
+        job = (queue or conversion_queue).submit(
+            self.db, input_path, filename, output_format, bucket, path, user_id
+        )
+        return self._conversion_job_to_dto(job)
 
-        # Check if document exists
-        if document is None:
-            return False
+    def get_conversion_job(self, job_id: str, user_id: str) -> ConversionJobResponseDTO:
+        """
+        Get a conversion job.
+
+        Args:
+            job_id (str): Conversion job ID
+            user_id (str): User ID
 
-        # Check if user is document creator
-        if document.creator_id == user_id:
-            return True
+        Returns:
+            ConversionJobResponseDTO: Conversion job
 
-        # Get user's direct permission
-        user_permission = (
-            self.db.query(DocumentPermission)
-            .filter(
-                DocumentPermission.document_id == document_id,
-                DocumentPermission.user_id == user_id,
+        Raises:
+            ConversionJobNotFoundException: If the user has no such conversion job
+            ConversionJobExpiredException: If the converted file was evicted from the cache
+        """
+        job = self.db.scalar(
+            select(ConversionJob).where(
+                ConversionJob.id == job_id, ConversionJob.user_id == user_id
             )
-            .first()
         )
 
-        if user_permission:
-            if permission_type == "view" and user_permission.can_view:
-                return True
-            elif permission_type == "edit" and user_permission.can_edit:
-                return True
-            elif permission_type == "delete" and user_permission.can_delete:
-                return True
-            elif permission_type == "share" and user_permission.can_share:
-                return True
-
-        # Get user's roles
-        project_member_roles = (
-            self.db.query(ProjectMember.role)
-            .filter(
-                ProjectMember.project_id == document.project_id,
-                ProjectMember.user_id == user_id,
+        # Check if conversion job exists
+        if job is None:
+            raise ConversionJobNotFoundException()
+
+        # Check if the converted file is still stored
+        if job.status == "expired":
+            raise ConversionJobExpiredException()
+
+        return self._conversion_job_to_dto(job)
+
+    def _get_member_role(self, project_id: str, user_id: str) -> str:
+        """
+        Get the role of a user in a live project, from the membership cache when possible.
+
+        Deleting a project invalidates its cached roles, so only a miss reads
+        the project and the member, in one query.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID
+
+        Returns:
+            str: Role
+
+        Raises:
+            ProjectNotFoundException: If project not found
+            NotProjectMemberException: If user is not a project member
+        """
+        role = membership_cache.get(project_id, user_id)
+        if role is not None:
+            return role
+
+        generation = membership_cache.generation
+        row = (
+            self.db.query(Project.id, ProjectMember.role)
+            .outerjoin(
+                ProjectMember,
+                and_(
+                    ProjectMember.project_id == Project.id,
+                    ProjectMember.user_id == user_id,
+                ),
             )
+            .filter(Project.id == project_id, Project.deleted_at.is_(None))
             .first()
         )
 
-        # Check project role (owner/admin implies all permissions for this simplified check)
-        if project_member_roles and project_member_roles[0] in ["owner", "admin"]:
-            return True
-
-        # If no direct user permission, check for role-based permissions
-        # This part needs a clear definition of how `Role` and `DocumentPermission` are linked.
-        # Assuming `DocumentPermission.role_id` links to a generic `Role` model which is then linked to user via `user_roles` table.
-        # This part is complex and depends on the exact `Role` model structure and its relation to `User`.
-        # For now, let's assume a simplified check or comment it out if it's too undefined.
-
-        # Placeholder for a more complex role permission check if needed.
-        # user_app_roles = self.db.query(UserRole).filter(UserRole.user_id == user_id).all() # Hypothetical UserRole model
-        # role_ids = [app_role.role_id for app_role in user_app_roles]
-        # for role_id in role_ids:
-        #     role_permission = (
-        #         self.db.query(DocumentPermission)
-        #         .filter(
-        #             DocumentPermission.document_id == document_id,
-        #             DocumentPermission.role_id == role_id, # This role_id should match the one in DocumentPermission
-        #         )
-        #         .first()
-        #     )
-        #     if role_permission:
-        #         if permission_type == "view" and role_permission.can_view:
-        #             return True
-        #         elif permission_type == "edit" and role_permission.can_edit:
-        #             return True
-        #         elif permission_type == "delete" and role_permission.can_delete:
-        #             return True
-        #         elif permission_type == "share" and role_permission.can_share:
-        #             return True
-
-        return False
+        # Check if project exists
+        if row is None:
+            raise ProjectNotFoundException()
+
+        # Check if user is a project member
+        if row.role is None:
+            raise NotProjectMemberException()
+
+        membership_cache.set(project_id, user_id, row.role, generation)
+        return row.role
+
+    def _has_permission(
+        self,
+        document_id: str,
+        user_id: str,
+        permission_type: str,
+        document: Optional[Document] = None,
+    ) -> bool:
+        """
+        Check if user has permission for a document.
+
+        Args:
+            document_id (str): Document ID
+            user_id (str): User ID
+            permission_type (str): Permission type ('view', 'edit', 'delete', 'share')
+            document (Document, optional): Document, when already loaded. Defaults to None.
+
+        Returns:
+            bool: True if user has permission, False otherwise
+        """
+        if document is not None:
+            access = self.permission_resolver.resolve([document], user_id)
+        else:
+            access = self.permission_resolver.resolve_ids([document_id], user_id)
+
+        # Missing documents grant nothing
+        return document_id in access and access[document_id].allows(permission_type)
 
     def _document_to_dto(self, document: Document) -> DocumentResponseDTO:
         """
@@ -1023,3 +1196,29 @@ class DocumentService:
             created_at=document_permission.created_at,
             updated_at=document_permission.updated_at,
         )
+
+    def _conversion_job_to_dto(self, job: ConversionJob) -> ConversionJobResponseDTO:
+        """
+        Convert ConversionJob model to ConversionJobResponseDTO.
+
+        Args:
+            job (ConversionJob): ConversionJob model
+
+        Returns:
+            ConversionJobResponseDTO: ConversionJob DTO
+        """
+        return ConversionJobResponseDTO(
+            id=job.id,
+            status=job.status,
+            filename=job.filename,
+            output_format=job.output_format,
+            bucket=job.bucket,
+            path=job.path,
+            url=job.url,
+            size=job.size,
+            error=job.error,
+            cache_hit=bool(job.cache_hit),
+            created_at=job.created_at,
+            started_at=job.started_at,
+            finished_at=job.finished_at,
+        )
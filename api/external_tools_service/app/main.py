@@ -4,7 +4,7 @@ from dotenv import load_dotenv
 from fastapi import Depends, FastAPI, Path, Security, Body
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.external_tools_service.app.schemas.external_tools import (
     ExternalToolConnectionCreateDTO,
@@ -17,7 +17,7 @@ from api.external_tools_service.app.services.external_tools_service import (
     ExternalToolsService,
 )
 from api.shared.exceptions.auth_exceptions import InvalidTokenException
-from api.shared.utils.db import get_db
+from api.shared.utils.db import database_lifespan, get_async_db, get_db
 from api.shared.utils.jwt import decode_token
 from api.shared.middleware.auth_middleware import auth_middleware
 from api.external_tools_service.app.services.analytics_tools import get_metabase_card_data
@@ -32,6 +32,7 @@ app = FastAPI(
     title="TaskHub External Tools Service",
     description="External tools integration service for TaskHub platform",
     version="1.0.0",
+    lifespan=database_lifespan,
 )
 
 # Add CORS middleware
@@ -77,20 +78,21 @@ def get_current_user(token: str = Security(oauth2_scheme)) -> str:
     "/oauth/providers", response_model=List[OAuthProviderDTO], tags=["OAuth Providers"]
 )
 async def get_oauth_providers(
-    db: Session = Depends(get_db), user_id: str = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db), user_id: str = Depends(get_current_user)
 ):
     """
     Get OAuth providers.
 
     Args:
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         List[OAuthProviderDTO]: List of OAuth providers
     """
-    external_tools_service = ExternalToolsService(db)
-    return external_tools_service.get_oauth_providers()
+    return await db.run_sync(
+        lambda session: ExternalToolsService(session).get_oauth_providers()
+    )
 
 
 @app.get(
@@ -100,7 +102,7 @@ async def get_oauth_providers(
 )
 async def get_oauth_provider(
     provider_id: str = Path(..., description="Provider ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -108,20 +110,21 @@ async def get_oauth_provider(
 
     Args:
         provider_id (str): Provider ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         OAuthProviderDTO: OAuth provider
     """
-    external_tools_service = ExternalToolsService(db)
-    return external_tools_service.get_oauth_provider(provider_id)
+    return await db.run_sync(
+        lambda session: ExternalToolsService(session).get_oauth_provider(provider_id)
+    )
 
 
 @app.post("/oauth/authorize", response_model=str, tags=["OAuth"])
 async def get_oauth_url(
     request_data: OAuthRequestDTO,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -129,20 +132,21 @@ async def get_oauth_url(
 
     Args:
         request_data (OAuthRequestDTO): Request data
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         str: Authorization URL
     """
-    external_tools_service = ExternalToolsService(db)
-    return external_tools_service.get_oauth_url(request_data)
+    return await db.run_sync(
+        lambda session: ExternalToolsService(session).get_oauth_url(request_data)
+    )
 
 
 @app.post("/oauth/callback", response_model=ExternalToolConnectionDTO, tags=["OAuth"])
 async def handle_oauth_callback(
     callback_data: OAuthCallbackDTO,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -150,14 +154,17 @@ async def handle_oauth_callback(
 
     Args:
         callback_data (OAuthCallbackDTO): Callback data
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         ExternalToolConnectionDTO: External tool connection
     """
-    external_tools_service = ExternalToolsService(db)
-    return external_tools_service.handle_oauth_callback(callback_data, user_id)
+    return await db.run_sync(
+        lambda session: ExternalToolsService(session).handle_oauth_callback(
+            callback_data, user_id
+        )
+    )
 
 
 # External tool connection endpoints
@@ -166,7 +173,7 @@ async def handle_oauth_callback(
 )
 async def create_connection(
     connection_data: ExternalToolConnectionCreateDTO,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -174,34 +181,38 @@ async def create_connection(
 
     Args:
         connection_data (ExternalToolConnectionCreateDTO): Connection data
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         ExternalToolConnectionDTO: Created connection
     """
-    external_tools_service = ExternalToolsService(db)
-    return external_tools_service.create_connection(connection_data, user_id)
+    return await db.run_sync(
+        lambda session: ExternalToolsService(session).create_connection(
+            connection_data, user_id
+        )
+    )
 
 
 @app.get(
     "/connections", response_model=List[ExternalToolConnectionDTO], tags=["Connections"]
 )
 async def get_user_connections(
-    db: Session = Depends(get_db), user_id: str = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db), user_id: str = Depends(get_current_user)
 ):
     """
     Get connections for current user.
 
     Args:
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         List[ExternalToolConnectionDTO]: List of connections
     """
-    external_tools_service = ExternalToolsService(db)
-    return external_tools_service.get_user_connections(user_id)
+    return await db.run_sync(
+        lambda session: ExternalToolsService(session).get_user_connections(user_id)
+    )
 
 
 @app.get(
@@ -211,7 +222,7 @@ async def get_user_connections(
 )
 async def get_connection(
     connection_id: str = Path(..., description="Connection ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -219,14 +230,17 @@ async def get_connection(
 
     Args:
         connection_id (str): Connection ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         ExternalToolConnectionDTO: Connection
     """
-    external_tools_service = ExternalToolsService(db)
-    return external_tools_service.get_connection(connection_id, user_id)
+    return await db.run_sync(
+        lambda session: ExternalToolsService(session).get_connection(
+            connection_id, user_id
+        )
+    )
 
 
 @app.post(
@@ -236,7 +250,7 @@ async def get_connection(
 )
 async def refresh_connection(
     connection_id: str = Path(..., description="Connection ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -244,20 +258,23 @@ async def refresh_connection(
 
     Args:
         connection_id (str): Connection ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         ExternalToolConnectionDTO: Updated connection
     """
-    external_tools_service = ExternalToolsService(db)
-    return external_tools_service.refresh_connection(connection_id, user_id)
+    return await db.run_sync(
+        lambda session: ExternalToolsService(session).refresh_connection(
+            connection_id, user_id
+        )
+    )
 
 
 @app.post("/connections/{connection_id}/revoke", tags=["Connections"])
 async def revoke_connection(
     connection_id: str = Path(..., description="Connection ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -265,20 +282,23 @@ async def revoke_connection(
 
     Args:
         connection_id (str): Connection ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         Dict[str, Any]: Success response
     """
-    external_tools_service = ExternalToolsService(db)
-    return external_tools_service.revoke_connection(connection_id, user_id)
+    return await db.run_sync(
+        lambda session: ExternalToolsService(session).revoke_connection(
+            connection_id, user_id
+        )
+    )
 
 
 @app.delete("/connections/{connection_id}", tags=["Connections"])
 async def delete_connection(
     connection_id: str = Path(..., description="Connection ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -286,14 +306,17 @@ async def delete_connection(
 
     Args:
         connection_id (str): Connection ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         Dict[str, Any]: Success response
     """
-    external_tools_service = ExternalToolsService(db)
-    return external_tools_service.delete_connection(connection_id, user_id)
+    return await db.run_sync(
+        lambda session: ExternalToolsService(session).delete_connection(
+            connection_id, user_id
+        )
+    )
 
 
 @app.get("/health", tags=["Health"])
@@ -340,5 +363,6 @@ async def calendar_create_event(summary: str, dtstart: str, dtend: str, calendar
 
 # Export para tests de integración
 get_db = get_db
+get_async_db = get_async_db
 get_current_user = get_current_user
 auth_middleware = auth_middleware
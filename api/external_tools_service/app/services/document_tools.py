@@ -1,8 +1,12 @@
 import os
+import time
 import requests
 from typing import Optional
 from api.shared.utils.supabase import SupabaseManager
 
+# Bytes of converted output written at a time
+CONVERSION_CHUNK_SIZE = 64 * 1024
+
 def process_document_with_libreoffice(file_path: str, output_format: str = "pdf", supabase_bucket: Optional[str] = None, supabase_path: Optional[str] = None) -> Optional[str]:
     """
     Envía un documento a LibreOffice Online para conversión y opcionalmente lo sube a Supabase Storage.
@@ -24,4 +28,26 @@ def process_document_with_libreoffice(file_path: str, output_format: str = "pdf"
             return None
     except Exception as e:
         print(f"LibreOffice error: {e}")
-        return None 
\ No newline at end of file
+        return None 
+
+def convert_document_to_file(file_path: str, output_path: str, output_format: str = "pdf", timeout: float = 300) -> int:
+    """
+    Convierte un documento con LibreOffice Online escribiendo el resultado en disco
+    a medida que llega, sin cargarlo en memoria.
+    Lanza TimeoutError si la conversión supera ``timeout`` segundos, y RuntimeError
+    si LibreOffice la rechaza. Retorna el tamaño del archivo convertido en bytes.
+    """
+    lool_url = os.getenv("LIBREOFFICE_ONLINE_URL", "http://localhost:9980/lool/convert-to/")
+    deadline = time.monotonic() + timeout
+    size = 0
+    with open(file_path, "rb") as f:
+        with requests.post(f"{lool_url}{output_format}", files={"file": f}, stream=True, timeout=timeout) as response:
+            if response.status_code != 200:
+                raise RuntimeError(f"LibreOffice conversion failed with status {response.status_code}")
+            with open(output_path, "wb") as output:
+                for chunk in response.iter_content(chunk_size=CONVERSION_CHUNK_SIZE):
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"Conversion took longer than {timeout} seconds")
+                    output.write(chunk)
+                    size += len(chunk)
+    return size
@@ -0,0 +1,104 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, pool
+
+from api.shared.models import (  # noqa: F401  (register every table on Base.metadata)
+    document,
+    external_tools,
+    notification,
+    project,
+    search,
+    user,
+)
+from api.shared.models.base import Base
+from api.shared.models.search import is_search_object
+from api.shared.utils.db import DATABASE_URL
+
+# Alembic Config object, which provides access to the values within alembic.ini
+config = context.config
+
+# Interpret the config file for Python logging
+if config.config_file_name is not None and config.attributes.get(
+    "configure_logger", True
+):
+    fileConfig(config.config_file_name)
+
+# Metadata used for autogenerate support
+target_metadata = Base.metadata
+
+
+def get_url() -> str:
+    """
+    Get the database URL to migrate.
+
+    Returns:
+        str: ``sqlalchemy.url`` when set (e.g. by tests), otherwise DATABASE_URL
+    """
+    return config.get_main_option("sqlalchemy.url") or DATABASE_URL
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """
+    Leave the full-text search tables and indexes out of autogenerate.
+
+    They are not on the models (see api.shared.models.search), so they would
+    otherwise show up as removed.
+
+    Returns:
+        bool: Whether autogenerate compares the object
+    """
+    return not (name and is_search_object(name))
+
+
+def run_migrations_offline() -> None:
+    """Emit the migration SQL without connecting to a database"""
+    context.configure(
+        url=get_url(),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+        render_as_batch=get_url().startswith("sqlite"),
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    """Run migrations against a live database connection"""
+    connection = config.attributes.get("connection")
+
+    if connection is not None:
+        _run_migrations(connection)
+        return
+
+    connectable = create_engine(get_url(), poolclass=pool.NullPool)
+    with connectable.connect() as connection:
+        _run_migrations(connection)
+
+
+def _run_migrations(connection) -> None:
+    """
+    Run migrations on a connection.
+
+    Args:
+        connection (Connection): Database connection
+    """
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        include_object=include_object,
+        # SQLite cannot ALTER constraints in place
+        render_as_batch=connection.dialect.name == "sqlite",
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
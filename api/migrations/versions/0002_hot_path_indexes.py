@@ -0,0 +1,71 @@
+"""hot path indexes
+
+Composite indexes and unique keys for the columns every service filters on.
+On Postgres the indexes are built CONCURRENTLY so writes are not blocked.
+The unique indexes fail if duplicate rows already exist; remove them first.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 03:58:04.303923
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns, unique)
+INDEXES = [
+    ('uq_project_members_project_id_user_id', 'project_members', ['project_id', 'user_id'], True),
+    ('ix_project_members_user_id', 'project_members', ['user_id'], False),
+    ('ix_tasks_project_id', 'tasks', ['project_id'], False),
+    ('ix_task_comments_task_id', 'task_comments', ['task_id'], False),
+    ('ix_activity_logs_project_id_created_at', 'activity_logs', ['project_id', 'created_at'], False),
+    ('ix_activity_logs_user_id_created_at', 'activity_logs', ['user_id', 'created_at'], False),
+    (
+        'ix_activity_logs_entity_type_entity_id_created_at',
+        'activity_logs',
+        ['entity_type', 'entity_id', 'created_at'],
+        False,
+    ),
+    (
+        'ix_notifications_user_id_is_read_created_at',
+        'notifications',
+        ['user_id', 'is_read', 'created_at'],
+        False,
+    ),
+    ('ix_documents_project_id_parent_id', 'documents', ['project_id', 'parent_id'], False),
+    ('uq_document_permissions_document_id_user_id', 'document_permissions', ['document_id', 'user_id'], True),
+    ('uq_document_versions_document_id_version', 'document_versions', ['document_id', 'version'], True),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=unique,
+                postgresql_concurrently=concurrently,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=concurrently)
@@ -0,0 +1,83 @@
+"""keyset pagination indexes
+
+Extend the list indexes with the (created_at, id) pagination key so every
+page is read straight from the index, however deep the cursor is.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 05:12:41.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+NEW_INDEXES = [
+    ('ix_tasks_project_id_created_at_id', 'tasks', ['project_id', 'created_at', 'id']),
+    ('ix_task_comments_task_id_created_at_id', 'task_comments', ['task_id', 'created_at', 'id']),
+    (
+        'ix_activity_logs_project_id_created_at_id',
+        'activity_logs',
+        ['project_id', 'created_at', 'id'],
+    ),
+    ('ix_activity_logs_user_id_created_at_id', 'activity_logs', ['user_id', 'created_at', 'id']),
+    (
+        'ix_activity_logs_entity_type_entity_id_created_at_id',
+        'activity_logs',
+        ['entity_type', 'entity_id', 'created_at', 'id'],
+    ),
+    ('ix_notifications_user_id_created_at_id', 'notifications', ['user_id', 'created_at', 'id']),
+    (
+        'ix_notifications_user_id_is_read_created_at_id',
+        'notifications',
+        ['user_id', 'is_read', 'created_at', 'id'],
+    ),
+]
+
+# Indexes from 0002 that the new ones cover
+OLD_INDEXES = [
+    ('ix_tasks_project_id', 'tasks', ['project_id']),
+    ('ix_task_comments_task_id', 'task_comments', ['task_id']),
+    ('ix_activity_logs_project_id_created_at', 'activity_logs', ['project_id', 'created_at']),
+    ('ix_activity_logs_user_id_created_at', 'activity_logs', ['user_id', 'created_at']),
+    (
+        'ix_activity_logs_entity_type_entity_id_created_at',
+        'activity_logs',
+        ['entity_type', 'entity_id', 'created_at'],
+    ),
+    (
+        'ix_notifications_user_id_is_read_created_at',
+        'notifications',
+        ['user_id', 'is_read', 'created_at'],
+    ),
+]
+
+
+def _replace_indexes(create, drop) -> None:
+    """Build the new indexes before dropping the ones they replace."""
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in create:
+            op.create_index(name, table, columns, postgresql_concurrently=concurrently)
+        for name, table, _ in drop:
+            op.drop_index(name, table_name=table, postgresql_concurrently=concurrently)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _replace_indexes(NEW_INDEXES, OLD_INDEXES)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _replace_indexes(OLD_INDEXES, NEW_INDEXES)
@@ -0,0 +1,58 @@
+"""task command history
+
+Per-user, per-task undo/redo stacks of field diffs, replacing the in-memory
+command history of the project service.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17 09:02:15.604117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_command_history',
+    sa.Column('task_id', sa.String(), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('project_id', sa.String(), nullable=False),
+    sa.Column('undo_stack', sa.JSON(), nullable=False),
+    sa.Column('redo_stack', sa.JSON(), nullable=False),
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # New, empty table: no need to build the indexes concurrently
+    op.create_index(
+        'uq_task_command_history_task_id_user_id',
+        'task_command_history',
+        ['task_id', 'user_id'],
+        unique=True,
+    )
+    op.create_index(
+        'ix_task_command_history_user_id_updated_at',
+        'task_command_history',
+        ['user_id', 'updated_at'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_command_history_user_id_updated_at', table_name='task_command_history')
+    op.drop_index('uq_task_command_history_task_id_user_id', table_name='task_command_history')
+    op.drop_table('task_command_history')
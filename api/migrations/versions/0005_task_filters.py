@@ -0,0 +1,93 @@
+"""task filters
+
+Index the columns task listings filter on, and add the task_tags side table
+so tasks can be filtered by tag without reading every task's JSON tags.
+The side table is filled from the existing tasks.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17 10:41:27.932150
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns)
+TASK_INDEXES = [
+    ('ix_tasks_project_id_status', 'tasks', ['project_id', 'status']),
+    ('ix_tasks_project_id_assignee_id', 'tasks', ['project_id', 'assignee_id']),
+]
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _backfill_task_tags(task_tags: sa.Table) -> None:
+    """Copy the tags of the existing tasks into task_tags."""
+    bind = op.get_bind()
+    tasks = sa.table(
+        'tasks',
+        sa.column('id', sa.String()),
+        sa.column('project_id', sa.String()),
+        sa.column('tags', sa.JSON()),
+    )
+
+    rows = []
+    result = bind.execute(sa.select(tasks.c.id, tasks.c.project_id, tasks.c.tags))
+    for task_id, project_id, tags in result:
+        if isinstance(tags, str):
+            tags = json.loads(tags)
+        if not isinstance(tags, list):
+            continue
+        rows.extend(
+            {'task_id': task_id, 'tag': tag, 'project_id': project_id}
+            for tag in set(tags)
+        )
+        if len(rows) >= BACKFILL_BATCH_SIZE:
+            bind.execute(task_tags.insert(), rows)
+            rows = []
+
+    if rows:
+        bind.execute(task_tags.insert(), rows)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    task_tags = op.create_table('task_tags',
+    sa.Column('task_id', sa.String(), nullable=False),
+    sa.Column('tag', sa.String(), nullable=False),
+    sa.Column('project_id', sa.String(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ),
+    sa.PrimaryKeyConstraint('task_id', 'tag')
+    )
+    _backfill_task_tags(task_tags)
+    op.create_index('ix_task_tags_project_id_tag', 'task_tags', ['project_id', 'tag'])
+
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, table, columns in TASK_INDEXES:
+            op.create_index(name, table, columns, postgresql_concurrently=concurrently)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(TASK_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=concurrently)
+
+    op.drop_index('ix_task_tags_project_id_tag', table_name='task_tags')
+    op.drop_table('task_tags')
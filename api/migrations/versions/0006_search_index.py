@@ -0,0 +1,89 @@
+"""search index
+
+Full-text search indexes of tasks, task comments and documents: external
+content FTS5 tables kept in sync by triggers on SQLite, GIN indexes on the
+weighted tsvector of each table on Postgres. Mirrors api.shared.models.search.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17 13:12:48.220561
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Indexed text columns of each table, most relevant first
+SEARCH_COLUMNS = {
+    'tasks': ('title', 'description'),
+    'task_comments': ('content',),
+    'documents': ('name', 'description', 'tags'),
+}
+
+
+def _search_vector(table: str) -> str:
+    """Weighted tsvector of a table, as queried by the search service."""
+    return ' || '.join(
+        f"setweight(to_tsvector('simple', coalesce({column}::text, '')), '{weight}')"
+        for column, weight in zip(SEARCH_COLUMNS[table], 'ABC')
+    )
+
+
+def _upgrade_sqlite() -> None:
+    for table, columns in SEARCH_COLUMNS.items():
+        fts = f'{table}_fts'
+        names = ', '.join(columns)
+        new = ', '.join(f'new.{column}' for column in columns)
+        old = ', '.join(f'old.{column}' for column in columns)
+        delete = f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.rowid, {old});"
+        insert = f'INSERT INTO {fts}(rowid, {names}) VALUES (new.rowid, {new});'
+
+        op.execute(
+            f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, content='{table}', "
+            f"content_rowid='rowid', tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute(f'CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN {insert} END')
+        op.execute(f'CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN {delete} END')
+        op.execute(
+            f'CREATE TRIGGER {fts}_au AFTER UPDATE OF {names} ON {table} '
+            f'BEGIN {delete} {insert} END'
+        )
+        # Index the existing rows
+        op.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        _upgrade_sqlite()
+    elif dialect == 'postgresql':
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+        with op.get_context().autocommit_block():
+            for table in SEARCH_COLUMNS:
+                op.execute(
+                    f'CREATE INDEX CONCURRENTLY ix_{table}_search ON {table} '
+                    f'USING gin (({_search_vector(table)}))'
+                )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for table in reversed(SEARCH_COLUMNS):
+            fts = f'{table}_fts'
+            for suffix in ('au', 'ad', 'ai'):
+                op.execute(f'DROP TRIGGER {fts}_{suffix}')
+            op.execute(f'DROP TABLE {fts}')
+    elif dialect == 'postgresql':
+        with op.get_context().autocommit_block():
+            for table in reversed(SEARCH_COLUMNS):
+                op.execute(f'DROP INDEX CONCURRENTLY ix_{table}_search')
@@ -0,0 +1,71 @@
+"""project stats
+
+Add the project_stats counters table behind GET /projects/{project_id}/stats
+and fill it from the existing tasks and comments, one grouped INSERT ... SELECT
+per counter.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17 16:05:12.418903
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _backfill_project_stats() -> None:
+    """Count the existing tasks and comments into project_stats."""
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        due_day = "to_char(due_date, 'YYYY-MM-DD')"
+    else:
+        due_day = 'CAST(date(due_date) AS VARCHAR)'
+
+    # (name, key expression, extra condition) of each task counter
+    counters = [
+        ("'tasks'", "''", ''),
+        ("'status'", 'status', ''),
+        ("'assignee'", "coalesce(assignee_id, '')", ''),
+        ("'open_due'", due_day, "AND status != 'done' AND due_date IS NOT NULL"),
+    ]
+    for name, key, condition in counters:
+        bind.execute(sa.text(
+            f'INSERT INTO project_stats (project_id, name, key, value) '
+            f'SELECT project_id, {name}, {key}, count(*) FROM tasks '
+            f'WHERE project_id IS NOT NULL {condition} '
+            f'GROUP BY project_id, {key}'
+        ))
+
+    bind.execute(sa.text(
+        "INSERT INTO project_stats (project_id, name, key, value) "
+        "SELECT tasks.project_id, 'comments', '', count(*) FROM task_comments "
+        "JOIN tasks ON tasks.id = task_comments.task_id "
+        "GROUP BY tasks.project_id"
+    ))
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('project_stats',
+    sa.Column('project_id', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('key', sa.String(), nullable=False),
+    sa.Column('value', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ),
+    sa.PrimaryKeyConstraint('project_id', 'name', 'key')
+    )
+    _backfill_project_stats()
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('project_stats')
@@ -0,0 +1,46 @@
+"""comment threads
+
+Index task_comments.parent_id, which the recursive comment thread query
+joins replies on. Built CONCURRENTLY on Postgres so writes are not blocked.
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-17 17:22:48.061273
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_task_comments_parent_id',
+            'task_comments',
+            ['parent_id'],
+            postgresql_concurrently=concurrently,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    concurrently = op.get_bind().dialect.name == 'postgresql'
+
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_task_comments_parent_id',
+            table_name='task_comments',
+            postgresql_concurrently=concurrently,
+        )
@@ -0,0 +1,54 @@
+"""project deletion
+
+Soft-delete flag on projects, and the project_deletions table tracking the
+background purge of their content.
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-17 19:05:12.338104
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Nullable without a default: no table rewrite on Postgres
+    op.add_column('projects', sa.Column('deleted_at', sa.DateTime(), nullable=True))
+    op.create_table('project_deletions',
+    sa.Column('project_id', sa.String(), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('deleted_rows', sa.JSON(), nullable=False),
+    sa.Column('files_deleted', sa.Integer(), nullable=False),
+    sa.Column('files_failed', sa.Integer(), nullable=False),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # New, empty table: no need to build the index concurrently
+    op.create_index(
+        'ix_project_deletions_project_id', 'project_deletions', ['project_id']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_project_deletions_project_id', table_name='project_deletions')
+    op.drop_table('project_deletions')
+    with op.batch_alter_table('projects') as batch_op:
+        batch_op.drop_column('deleted_at')
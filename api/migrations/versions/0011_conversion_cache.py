@@ -0,0 +1,65 @@
+"""conversion cache
+
+The conversion_cache table recording converted files by input content hash
+and output format, and the cache columns of conversion_jobs.
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-17 23:02:51.847310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, Sequence[str], None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('conversion_cache',
+    sa.Column('content_hash', sa.String(), nullable=False),
+    sa.Column('output_format', sa.String(), nullable=False),
+    sa.Column('bucket', sa.String(), nullable=False),
+    sa.Column('path', sa.String(), nullable=False),
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('hits', sa.Integer(), nullable=False),
+    sa.Column('last_accessed_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # New, empty table: no need to build the indexes concurrently
+    op.create_index(
+        'uq_conversion_cache_content_hash_output_format',
+        'conversion_cache',
+        ['content_hash', 'output_format'],
+        unique=True,
+    )
+    op.create_index(
+        'ix_conversion_cache_last_accessed_at', 'conversion_cache', ['last_accessed_at']
+    )
+    op.add_column('conversion_jobs', sa.Column('content_hash', sa.String(), nullable=True))
+    # Existing jobs were never served from the cache
+    op.add_column(
+        'conversion_jobs',
+        sa.Column('cache_hit', sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('conversion_jobs') as batch_op:
+        batch_op.drop_column('cache_hit')
+        batch_op.drop_column('content_hash')
+    op.drop_index('ix_conversion_cache_last_accessed_at', table_name='conversion_cache')
+    op.drop_index('uq_conversion_cache_content_hash_output_format', table_name='conversion_cache')
+    op.drop_table('conversion_cache')
@@ -0,0 +1,60 @@
+"""document blobs
+
+Content-addressed storage of document versions: the document_blobs table,
+one row per stored SHA-256, and the content hash of each version.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 00:41:09.226583
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, Sequence[str], None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('document_blobs',
+    sa.Column('content_hash', sa.String(), nullable=False),
+    sa.Column('size', sa.Integer(), nullable=False),
+    sa.Column('content_type', sa.String(), nullable=True),
+    sa.Column('storage_key', sa.String(), nullable=False),
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # New, empty table: no need to build the index concurrently
+    op.create_index(
+        'uq_document_blobs_content_hash', 'document_blobs', ['content_hash'], unique=True
+    )
+    # Nullable without a default: no table rewrite on Postgres
+    op.add_column('document_versions', sa.Column('content_hash', sa.String(), nullable=True))
+    # Every existing row is NULL; build it without blocking version writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_document_versions_content_hash',
+            'document_versions',
+            ['content_hash'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_document_versions_content_hash', table_name='document_versions')
+    with op.batch_alter_table('document_versions') as batch_op:
+        batch_op.drop_column('content_hash')
+    op.drop_index('uq_document_blobs_content_hash', table_name='document_blobs')
+    op.drop_table('document_blobs')
@@ -0,0 +1,38 @@
+"""conversion job expiry
+
+Index the input hash of conversion jobs, so evicting a cached conversion
+can mark the jobs pointing at it expired.
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18 09:12:47.503318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, Sequence[str], None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Build it without blocking conversion job writes
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_conversion_jobs_content_hash',
+            'conversion_jobs',
+            ['content_hash'],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_conversion_jobs_content_hash', table_name='conversion_jobs')
@@ -1,10 +1,10 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, Path, Query, Security
+from fastapi import Depends, FastAPI, Path, Query, Response, Security
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.notification_service.app.schemas.notification import (
     NotificationBatchCreateDTO,
@@ -17,8 +17,9 @@ from api.notification_service.app.services.notification_service import (
     NotificationService,
 )
 from api.shared.exceptions.auth_exceptions import InvalidTokenException
-from api.shared.utils.db import get_db
+from api.shared.utils.db import database_lifespan, get_async_db, get_db
 from api.shared.utils.jwt import decode_token
+from api.shared.utils.pagination import MAX_PAGE_SIZE, set_next_cursor_header
 from api.shared.middleware.auth_middleware import auth_middleware
 
 # Load environment variables
@@ -29,6 +30,7 @@ app = FastAPI(
     title="TaskHub Notification Service",
     description="Notification service for TaskHub platform",
     version="1.0.0",
+    lifespan=database_lifespan,
 )
 
 # Add CORS middleware
@@ -75,7 +77,7 @@ def get_current_user(token: str = Security(oauth2_scheme)) -> str:
 )
 async def create_notification(
     notification_data: NotificationCreateDTO,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -83,7 +85,7 @@ async def create_notification(
 
     Args:
         notification_data (NotificationCreateDTO): Notification data
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
@@ -95,8 +97,11 @@ async def create_notification(
         # For simplicity, we'll allow it here
         pass
 
-    notification_service = NotificationService(db)
-    return notification_service.create_notification(notification_data)
+    return await db.run_sync(
+        lambda session: NotificationService(session).create_notification(
+            notification_data
+        )
+    )
 
 
 @app.post(
@@ -106,7 +111,7 @@ async def create_notification(
 )
 async def create_batch_notifications(
     notification_data: NotificationBatchCreateDTO,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -114,7 +119,7 @@ async def create_batch_notifications(
 
     Args:
         notification_data (NotificationBatchCreateDTO): Notification data
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
@@ -123,8 +128,11 @@ async def create_batch_notifications(
     # In a real application, you would check if the user has admin permissions
     # For simplicity, we'll allow it here
 
-    notification_service = NotificationService(db)
-    return notification_service.create_batch_notifications(notification_data)
+    return await db.run_sync(
+        lambda session: NotificationService(session).create_batch_notifications(
+            notification_data
+        )
+    )
 
 
 @app.get(
@@ -133,25 +141,36 @@ async def create_batch_notifications(
     tags=["Notifications"],
 )
 async def get_user_notifications(
-    limit: int = Query(100, description="Limit"),
-    offset: int = Query(0, description="Offset"),
-    db: Session = Depends(get_db),
+    response: Response,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE, description="Limit"),
+    offset: int = Query(0, ge=0, description="Offset, use cursor instead"),
+    cursor: Optional[str] = Query(None, description="Cursor of the page to get"),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
     Get notifications for current user.
 
+    The cursor of the next page is returned in the X-Next-Cursor header.
+
     Args:
+        response (Response): Response
         limit (int): Limit
-        offset (int): Offset
-        db (Session): Database session
+        offset (int): Offset, ignored when a cursor is given
+        cursor (Optional[str]): Cursor of the page to get
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         List[NotificationResponseDTO]: List of notifications
     """
-    notification_service = NotificationService(db)
-    return notification_service.get_user_notifications(user_id, limit, offset)
+    page = await db.run_sync(
+        lambda session: NotificationService(session).get_user_notifications(
+            user_id, limit, offset, cursor
+        )
+    )
+    set_next_cursor_header(response, page)
+    return page
 
 
 @app.get(
@@ -160,25 +179,36 @@ async def get_user_notifications(
     tags=["Notifications"],
 )
 async def get_unread_notifications(
-    limit: int = Query(100, description="Limit"),
-    offset: int = Query(0, description="Offset"),
-    db: Session = Depends(get_db),
+    response: Response,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE, description="Limit"),
+    offset: int = Query(0, ge=0, description="Offset, use cursor instead"),
+    cursor: Optional[str] = Query(None, description="Cursor of the page to get"),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
     Get unread notifications for current user.
 
+    The cursor of the next page is returned in the X-Next-Cursor header.
+
     Args:
+        response (Response): Response
         limit (int): Limit
-        offset (int): Offset
-        db (Session): Database session
+        offset (int): Offset, ignored when a cursor is given
+        cursor (Optional[str]): Cursor of the page to get
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         List[NotificationResponseDTO]: List of unread notifications
     """
-    notification_service = NotificationService(db)
-    return notification_service.get_unread_notifications(user_id, limit, offset)
+    page = await db.run_sync(
+        lambda session: NotificationService(session).get_unread_notifications(
+            user_id, limit, offset, cursor
+        )
+    )
+    set_next_cursor_header(response, page)
+    return page
 
 
 @app.put(
@@ -188,7 +218,7 @@ async def get_unread_notifications(
 )
 async def mark_notification_as_read(
     notification_id: str = Path(..., description="Notification ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -196,38 +226,44 @@ async def mark_notification_as_read(
 
     Args:
         notification_id (str): Notification ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         NotificationResponseDTO: Updated notification
     """
-    notification_service = NotificationService(db)
-    return notification_service.mark_notification_as_read(notification_id, user_id)
+    return await db.run_sync(
+        lambda session: NotificationService(session).mark_notification_as_read(
+            notification_id, user_id
+        )
+    )
 
 
 @app.put("/notifications/read-all", tags=["Notifications"])
 async def mark_all_notifications_as_read(
-    db: Session = Depends(get_db), user_id: str = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db), user_id: str = Depends(get_current_user)
 ):
     """
     Mark all notifications as read for current user.
 
     Args:
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         Dict[str, Any]: Success response
     """
-    notification_service = NotificationService(db)
-    return notification_service.mark_all_notifications_as_read(user_id)
+    return await db.run_sync(
+        lambda session: NotificationService(session).mark_all_notifications_as_read(
+            user_id
+        )
+    )
 
 
 @app.delete("/notifications/{notification_id}", tags=["Notifications"])
 async def delete_notification(
     notification_id: str = Path(..., description="Notification ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -235,14 +271,17 @@ async def delete_notification(
 
     Args:
         notification_id (str): Notification ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         Dict[str, Any]: Success response
     """
-    notification_service = NotificationService(db)
-    return notification_service.delete_notification(notification_id, user_id)
+    return await db.run_sync(
+        lambda session: NotificationService(session).delete_notification(
+            notification_id, user_id
+        )
+    )
 
 
 # Notification preferences endpoints
@@ -252,20 +291,23 @@ async def delete_notification(
     tags=["Notification Preferences"],
 )
 async def get_notification_preferences(
-    db: Session = Depends(get_db), user_id: str = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db), user_id: str = Depends(get_current_user)
 ):
     """
     Get notification preferences for current user.
 
     Args:
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         NotificationPreferencesDTO: Notification preferences
     """
-    notification_service = NotificationService(db)
-    return notification_service.get_notification_preferences(user_id)
+    return await db.run_sync(
+        lambda session: NotificationService(session).get_notification_preferences(
+            user_id
+        )
+    )
 
 
 @app.put(
@@ -275,7 +317,7 @@ async def get_notification_preferences(
 )
 async def update_notification_preferences(
     preferences_data: NotificationPreferencesUpdateDTO,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -283,15 +325,16 @@ async def update_notification_preferences(
 
     Args:
         preferences_data (NotificationPreferencesUpdateDTO): Preferences data
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         NotificationPreferencesDTO: Updated notification preferences
     """
-    notification_service = NotificationService(db)
-    return notification_service.update_notification_preferences(
-        user_id, preferences_data
+    return await db.run_sync(
+        lambda session: NotificationService(session).update_notification_preferences(
+            user_id, preferences_data
+        )
     )
 
 
@@ -307,5 +350,6 @@ async def health_check() -> Any:
 
 # Export para tests de integración
 get_db = get_db
+get_async_db = get_async_db
 get_current_user = get_current_user
 auth_middleware = auth_middleware
@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 from sqlalchemy.orm import Session
 
@@ -18,6 +18,7 @@ from api.notification_service.app.schemas.notification import (
     NotificationResponseDTO,
 )
 from api.shared.models.notification import Notification, NotificationPreference
+from api.shared.utils.pagination import Page, paginate
 from api.shared.utils.rabbitmq import RabbitMQManager
 
 
@@ -159,58 +160,70 @@ class NotificationService:
         return notifications
 
     def get_user_notifications(
-        self, user_id: str, limit: int = 100, offset: int = 0
-    ) -> List[NotificationResponseDTO]:
+        self,
+        user_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> Page[NotificationResponseDTO]:
         """
         Get notifications for a user.
 
         Args:
             user_id (str): User ID
             limit (int, optional): Limit. Defaults to 100.
-            offset (int, optional): Offset. Defaults to 0.
+            offset (int, optional): Offset, ignored when a cursor is given. Defaults to 0.
+            cursor (str, optional): Cursor of the page to get. Defaults to None.
 
         Returns:
-            List[NotificationResponseDTO]: List of notifications
+            Page[NotificationResponseDTO]: Notifications, newest first, and the next cursor
         """
         # Get notifications
-        notifications_db = (
-            self.db.query(Notification)
-            .filter(Notification.user_id == user_id)
-            .order_by(Notification.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
+        query = self.db.query(Notification).filter(
+            Notification.user_id == user_id
+        )
+        notifications_db = paginate(
+            query, Notification, limit, cursor, offset, descending=True
         )
 
         # Return notifications
-        return [self._notification_to_dto(n) for n in notifications_db]
+        return Page(
+            [self._notification_to_dto(n) for n in notifications_db],
+            notifications_db.next_cursor,
+        )
 
     def get_unread_notifications(
-        self, user_id: str, limit: int = 100, offset: int = 0
-    ) -> List[NotificationResponseDTO]:
+        self,
+        user_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> Page[NotificationResponseDTO]:
         """
         Get unread notifications for a user.
 
         Args:
             user_id (str): User ID
             limit (int, optional): Limit. Defaults to 100.
-            offset (int, optional): Offset. Defaults to 0.
+            offset (int, optional): Offset, ignored when a cursor is given. Defaults to 0.
+            cursor (str, optional): Cursor of the page to get. Defaults to None.
 
         Returns:
-            List[NotificationResponseDTO]: List of unread notifications
+            Page[NotificationResponseDTO]: Unread notifications, newest first, and the next cursor
         """
         # Get notifications
-        notifications_db = (
-            self.db.query(Notification)
-            .filter(Notification.user_id == user_id, Notification.is_read == False)
-            .order_by(Notification.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
+        query = self.db.query(Notification).filter(
+            Notification.user_id == user_id, Notification.is_read == False
+        )
+        notifications_db = paginate(
+            query, Notification, limit, cursor, offset, descending=True
         )
 
         # Return notifications
-        return [self._notification_to_dto(n) for n in notifications_db]
+        return Page(
+            [self._notification_to_dto(n) for n in notifications_db],
+            notifications_db.next_cursor,
+        )
 
     def mark_notification_as_read(
         self, notification_id: str, user_id: str
@@ -1,11 +1,99 @@
+import os
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from enum import Enum
+from typing import Any, Dict, List, Mapping, Optional, Sequence
 
+from dotenv import load_dotenv
+from sqlalchemy import JSON, DateTime, exists, select, update
 from sqlalchemy.orm import Session
 
-from api.shared.exceptions.project_exceptions import TaskNotFoundException
-from api.shared.models.project import Task
+from api.project_service.app.services.project_stats import (
+    STATS_FIELDS,
+    task_delta,
+    task_state,
+    update_project_stats,
+)
+from api.project_service.app.services.task_tags import set_task_tags
+from api.shared.exceptions.project_exceptions import (
+    NothingToRedoException,
+    NothingToUndoException,
+    TaskCommandConflictException,
+    TaskNotFoundException,
+)
+from api.shared.models.project import Task, TaskCommandHistory
+
+# Load environment variables
+load_dotenv()
+
+# Commands kept per user and task; the oldest are dropped beyond it
+TASK_HISTORY_MAX_DEPTH = int(os.getenv("TASK_HISTORY_MAX_DEPTH", "50"))
+# Tasks with a history kept per user; the least recently used are dropped
+TASK_HISTORY_MAX_TASKS = int(os.getenv("TASK_HISTORY_MAX_TASKS", "100"))
+
+# Field diff of one command: {field: [before, after]}, JSON serializable
+TaskDiff = Dict[str, List[Any]]
+
+# Task columns a command may change
+TASK_FIELDS = (
+    "title",
+    "description",
+    "assignee_id",
+    "due_date",
+    "priority",
+    "status",
+    "tags",
+    "meta_data",
+)
+
+
+def _to_json(value: Any) -> Any:
+    """
+    Convert a task field value to its JSON form.
+
+    Args:
+        value (Any): Field value
+
+    Returns:
+        Any: JSON serializable value
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _from_json(field: str, value: Any) -> Any:
+    """
+    Convert a value stored by _to_json back to the task field type.
+
+    Args:
+        field (str): Task field
+        value (Any): JSON value
+
+    Returns:
+        Any: Field value
+    """
+    if isinstance(value, str) and isinstance(Task.__table__.c[field].type, DateTime):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def task_diff(before: Mapping[str, Any], after: Mapping[str, Any]) -> TaskDiff:
+    """
+    Get the field diff between two states of a task.
+
+    Args:
+        before (Mapping[str, Any]): Task fields before
+        after (Mapping[str, Any]): Task fields after
+
+    Returns:
+        TaskDiff: Changed fields, in the form commands record
+    """
+    return {
+        field: [_to_json(before[field]), _to_json(after[field])]
+        for field in TASK_FIELDS
+        if before[field] != after[field]
+    }
 
 
 class Command(ABC):
@@ -21,20 +109,28 @@ class Command(ABC):
 
 
 class TaskCommand(Command):
-    """Base task command"""
+    """
+    Base task command.
 
-    def __init__(self, db: Session, task_id: str):
+    Executing the command records the fields it actually changed in
+    ``changes``, which is all that is needed to undo or redo it later.
+    Commands only change the task in the session; committing is left to the
+    caller, so the change joins the caller's transaction.
+    """
+
+    def __init__(self, db: Session, task_id: str, task: Optional[Task] = None):
         """
         Initialize TaskCommand.
 
         Args:
             db (Session): Database session
             task_id (str): Task ID
+            task (Task, optional): Task already loaded by the caller. Defaults to None.
         """
         self.db = db
         self.task_id = task_id
-        self.task = self._get_task()
-        self.previous_state = self._get_task_state()
+        self.task = task if task is not None else self._get_task()
+        self.changes: TaskDiff = {}
 
     def _get_task(self) -> Task:
         """
@@ -53,58 +149,30 @@ class TaskCommand(Command):
 
         return task
 
-    def _get_task_state(self) -> Dict[str, Any]:
-        """
-        Get task state.
-
-        Returns:
-            Dict[str, Any]: Task state
-        """
-        return {
-            "title": self.task.title,
-            "description": self.task.description,
-            "assignee_id": self.task.assignee_id,
-            "due_date": self.task.due_date,
-            "priority": self.task.priority,
-            "status": self.task.status,
-            "tags": (self.task.tags or {}),
-            "meta_data": (self.task.meta_data or {}),
-            "created_at": self.task.created_at.isoformat(),
-        }
-
-
-class UpdateTaskCommand(TaskCommand):
-    """Command to update a task"""
-
-    def __init__(self, db: Session, task_id: str, updates: Dict[str, Any]):
+    def _apply(self, values: Dict[str, Any]) -> Task:
         """
-        Initialize UpdateTaskCommand.
+        Set task fields and record the ones that changed.
 
         Args:
-            db (Session): Database session
-            task_id (str): Task ID
-            updates (Dict[str, Any]): Task updates
-        """
-        super().__init__(db, task_id)
-        self.updates = updates
-
-    def execute(self) -> Task:
-        """
-        Execute the command.
+            values (Dict[str, Any]): New field values
 
         Returns:
             Task: Updated task
         """
-        # Update task
-        for key, value in self.updates.items():
-            if hasattr(self.task, key):
+        self.changes = {}
+        for key, value in values.items():
+            if key not in TASK_FIELDS:
+                continue
+
+            if isinstance(value, Enum):
+                value = value.value
+
+            before = getattr(self.task, key)
+            if before != value:
+                self.changes[key] = [_to_json(before), _to_json(value)]
                 setattr(self.task, key, value)
 
-        # Update task in database
         self.task.updated_at = datetime.now(timezone.utc)
-        self.db.commit()
-        self.db.refresh(self.task)
-
         return self.task
 
     def undo(self) -> Task:
@@ -115,32 +183,34 @@ class UpdateTaskCommand(TaskCommand):
             Task: Restored task
         """
         # Restore task state
-        for key, value in self.previous_state.items():
-            if hasattr(self.task, key):
-                setattr(self.task, key, value)
+        for key, (before, _) in self.changes.items():
+            setattr(self.task, key, _from_json(key, before))
 
-        # Update task in database
         self.task.updated_at = datetime.now(timezone.utc)
-        self.db.commit()
-        self.db.refresh(self.task)
-
         return self.task
 
 
-class AssignTaskCommand(TaskCommand):
-    """Command to assign a task"""
+class UpdateTaskCommand(TaskCommand):
+    """Command to update a task"""
 
-    def __init__(self, db: Session, task_id: str, assignee_id: Optional[str]):
+    def __init__(
+        self,
+        db: Session,
+        task_id: str,
+        updates: Dict[str, Any],
+        task: Optional[Task] = None,
+    ):
         """
-        Initialize AssignTaskCommand.
+        Initialize UpdateTaskCommand.
 
         Args:
             db (Session): Database session
             task_id (str): Task ID
-            assignee_id (Optional[str]): Assignee ID
+            updates (Dict[str, Any]): Task updates
+            task (Task, optional): Task already loaded by the caller. Defaults to None.
         """
-        super().__init__(db, task_id)
-        self.assignee_id = assignee_id
+        super().__init__(db, task_id, task)
+        self.updates = updates
 
     def execute(self) -> Task:
         """
@@ -149,38 +219,47 @@ class AssignTaskCommand(TaskCommand):
         Returns:
             Task: Updated task
         """
-        # Update task
-        self.task.assignee_id = self.assignee_id
+        return self._apply(self.updates)
 
-        # Update task in database
-        self.task.updated_at = datetime.now(timezone.utc)
-        self.db.commit()
-        self.db.refresh(self.task)
 
-        return self.task
+class AssignTaskCommand(TaskCommand):
+    """Command to assign a task"""
 
-    def undo(self) -> Task:
+    def __init__(
+        self,
+        db: Session,
+        task_id: str,
+        assignee_id: Optional[str],
+        task: Optional[Task] = None,
+    ):
         """
-        Undo the command.
+        Initialize AssignTaskCommand.
 
-        Returns:
-            Task: Restored task
+        Args:
+            db (Session): Database session
+            task_id (str): Task ID
+            assignee_id (Optional[str]): Assignee ID
+            task (Task, optional): Task already loaded by the caller. Defaults to None.
         """
-        # Restore task state
-        self.task.assignee_id = self.previous_state["assignee_id"]
+        super().__init__(db, task_id, task)
+        self.assignee_id = assignee_id
 
-        # Update task in database
-        self.task.updated_at = datetime.now(timezone.utc)
-        self.db.commit()
-        self.db.refresh(self.task)
+    def execute(self) -> Task:
+        """
+        Execute the command.
 
-        return self.task
+        Returns:
+            Task: Updated task
+        """
+        return self._apply({"assignee_id": self.assignee_id})
 
 
 class ChangeTaskStatusCommand(TaskCommand):
     """Command to change task status"""
 
-    def __init__(self, db: Session, task_id: str, status: str):
+    def __init__(
+        self, db: Session, task_id: str, status: str, task: Optional[Task] = None
+    ):
         """
         Initialize ChangeTaskStatusCommand.
 
@@ -188,8 +267,9 @@ class ChangeTaskStatusCommand(TaskCommand):
             db (Session): Database session
             task_id (str): Task ID
             status (str): Task status
+            task (Task, optional): Task already loaded by the caller. Defaults to None.
         """
-        super().__init__(db, task_id)
+        super().__init__(db, task_id, task)
         self.status = status
 
     def execute(self) -> Task:
@@ -199,89 +279,345 @@ class ChangeTaskStatusCommand(TaskCommand):
         Returns:
             Task: Updated task
         """
-        # Update task
-        self.task.status = self.status
+        return self._apply({"status": self.status})
 
-        # Update task in database
-        self.task.updated_at = datetime.now(timezone.utc)
-        self.db.commit()
-        self.db.refresh(self.task)
 
-        return self.task
+class CommandInvoker:
+    """
+    Command invoker with a persistent undo/redo history.
+
+    Each user has a history per task in ``task_command_history``, holding the
+    field diffs of their commands rather than the commands themselves, so it
+    survives restarts and is shared by every worker. Histories are capped at
+    ``max_depth`` commands, and only the ``max_tasks`` most recently used
+    tasks of a user keep one. Nothing is committed here: the history changes
+    are part of the caller's transaction.
+
+    Undo and redo only write fields still holding the values the command
+    left; when another change got in between, the entry is dropped and
+    TaskCommandConflictException raised, and the caller should commit to
+    persist the drop.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        user_id: str,
+        max_depth: int = TASK_HISTORY_MAX_DEPTH,
+        max_tasks: int = TASK_HISTORY_MAX_TASKS,
+    ):
+        """
+        Initialize CommandInvoker.
 
-    def undo(self) -> Task:
+        Args:
+            db (Session): Database session
+            user_id (str): User whose history is used
+            max_depth (int, optional): Max commands per task. Defaults to TASK_HISTORY_MAX_DEPTH.
+            max_tasks (int, optional): Max tasks with a history. Defaults to TASK_HISTORY_MAX_TASKS.
         """
-        Undo the command.
+        self.db = db
+        self.user_id = user_id
+        self.max_depth = max_depth
+        self.max_tasks = max_tasks
 
-        Returns:
-            Task: Restored task
+    def execute_command(self, command: TaskCommand) -> Task:
         """
-        # Restore task state
-        self.task.status = self.previous_state["status"]
+        Execute a command and add it to the undo history.
 
-        # Update task in database
-        self.task.updated_at = datetime.now(timezone.utc)
-        self.db.commit()
-        self.db.refresh(self.task)
+        Args:
+            command (TaskCommand): Command to execute
 
-        return self.task
+        Returns:
+            Task: Command result
+        """
+        result = command.execute()
 
+        # Commands that changed nothing have nothing to undo
+        if command.changes:
+            history = self._get_history(command.task_id)
+            if history is None:
+                history = self._create_history(command.task)
+            history.undo_stack = self._push(history.undo_stack, command.changes)
+            history.redo_stack = []
+
+            if "tags" in command.changes:
+                set_task_tags(
+                    self.db, command.task.project_id, {command.task_id: command.task.tags}
+                )
+            if any(field in command.changes for field in STATS_FIELDS):
+                before = {
+                    **task_state(command.task),
+                    **{
+                        field: _from_json(field, diff[0])
+                        for field, diff in command.changes.items()
+                        if field in STATS_FIELDS
+                    },
+                }
+                update_project_stats(
+                    self.db,
+                    command.task.project_id,
+                    task_delta(before, task_state(command.task)),
+                )
 
-class CommandInvoker:
-    """Command invoker"""
+        return result
 
-    def __init__(self):
-        """Initialize CommandInvoker"""
-        self.history: List[Command] = []
-        self.undo_history: List[Command] = []
+    def record_changes(self, project_id: str, diffs: Dict[str, TaskDiff]) -> None:
+        """
+        Add changes written without commands, e.g. by a batch, to the undo
+        history of each task, with one statement per kind of write.
+
+        Like commands, each change clears what is left to redo. When more
+        than ``max_tasks`` tasks changed, only the last ones keep a history.
 
-    def execute_command(self, command: Command) -> Any:
+        Args:
+            project_id (str): Project ID
+            diffs (Dict[str, TaskDiff]): Task ID -> field diff, in the order written
+        """
+        task_ids = [task_id for task_id, changes in diffs.items() if changes]
+        task_ids = task_ids[-self.max_tasks :] if self.max_tasks > 0 else []
+        if not task_ids:
+            return
+
+        histories = {
+            history.task_id: history
+            for history in self.db.scalars(
+                select(TaskCommandHistory)
+                .where(
+                    TaskCommandHistory.user_id == self.user_id,
+                    TaskCommandHistory.task_id.in_(task_ids),
+                )
+                .with_for_update()
+            )
+        }
+        if len(histories) < len(task_ids):
+            self._evict_histories(self.max_tasks - len(task_ids), task_ids)
+
+        for task_id in task_ids:
+            history = histories.get(task_id)
+            if history is None:
+                history = TaskCommandHistory(
+                    task_id=task_id,
+                    user_id=self.user_id,
+                    project_id=project_id,
+                    undo_stack=[],
+                    redo_stack=[],
+                )
+                self.db.add(history)
+            history.undo_stack = self._push(history.undo_stack, diffs[task_id])
+            history.redo_stack = []
+
+    def undo(self, project_id: str, task_id: str) -> Task:
         """
-        Execute a command.
+        Undo the last command of the user on a task.
 
         Args:
-            command (Command): Command to execute
+            project_id (str): Project ID
+            task_id (str): Task ID
 
         Returns:
-            Any: Command result
+            Task: Restored task
+
+        Raises:
+            NothingToUndoException: If there are no commands to undo
+            TaskCommandConflictException: If the task changed since the command
+            TaskNotFoundException: If task not found
         """
-        result = command.execute()
-        self.history.append(command)
-        self.undo_history = []
-        return result
+        history = self._get_history(task_id, project_id)
+        if history is None or not history.undo_stack:
+            raise NothingToUndoException()
+
+        changes = history.undo_stack[-1]
+        try:
+            task = self._restore(project_id, task_id, changes, 0)
+        finally:
+            # Applied, or stale for good
+            history.undo_stack = history.undo_stack[:-1]
+        history.redo_stack = self._push(history.redo_stack, changes)
+        return task
 
-    def undo(self) -> Any:
+    def redo(self, project_id: str, task_id: str) -> Task:
         """
-        Undo the last command.
+        Redo the last undone command of the user on a task.
+
+        Args:
+            project_id (str): Project ID
+            task_id (str): Task ID
 
         Returns:
-            Any: Command result
+            Task: Updated task
 
         Raises:
-            Exception: If no commands to undo
+            NothingToRedoException: If there are no commands to redo
+            TaskCommandConflictException: If the task changed since the undo
+            TaskNotFoundException: If task not found
         """
-        if not self.history:
-            raise Exception("No commands to undo")
+        history = self._get_history(task_id, project_id)
+        if history is None or not history.redo_stack:
+            raise NothingToRedoException()
+
+        changes = history.redo_stack[-1]
+        try:
+            task = self._restore(project_id, task_id, changes, 1)
+        finally:
+            # Applied, or stale for good
+            history.redo_stack = history.redo_stack[:-1]
+        history.undo_stack = self._push(history.undo_stack, changes)
+        return task
 
-        command = self.history.pop()
-        result = command.undo()
-        self.undo_history.append(command)
-        return result
+    def _get_history(
+        self, task_id: str, project_id: Optional[str] = None
+    ) -> Optional[TaskCommandHistory]:
+        """
+        Get and lock the history of the user on a task.
 
-    def redo(self) -> Any:
+        Args:
+            task_id (str): Task ID
+            project_id (str, optional): Project the task must belong to. Defaults to None.
+
+        Returns:
+            Optional[TaskCommandHistory]: History, if any
         """
-        Redo the last undone command.
+        query = self.db.query(TaskCommandHistory).filter(
+            TaskCommandHistory.task_id == task_id,
+            TaskCommandHistory.user_id == self.user_id,
+        )
+        if project_id is not None:
+            query = query.filter(TaskCommandHistory.project_id == project_id)
+
+        return query.with_for_update().first()
+
+    def _create_history(self, task: Task) -> TaskCommandHistory:
+        """
+        Create the history of the user on a task, evicting the least
+        recently used histories beyond max_tasks.
+
+        Args:
+            task (Task): Task
+
+        Returns:
+            TaskCommandHistory: New history
+        """
+        self._evict_histories(self.max_tasks - 1)
+
+        history = TaskCommandHistory(
+            task_id=task.id,
+            user_id=self.user_id,
+            project_id=task.project_id,
+            undo_stack=[],
+            redo_stack=[],
+        )
+        self.db.add(history)
+        return history
+
+    def _evict_histories(self, keep: int, task_ids: Sequence[str] = ()) -> None:
+        """
+        Drop the least recently used histories of the user beyond ``keep``.
+
+        Args:
+            keep (int): Histories kept
+            task_ids (Sequence[str], optional): Tasks whose histories are never dropped. Defaults to none.
+        """
+        query = (
+            select(TaskCommandHistory.id)
+            .where(TaskCommandHistory.user_id == self.user_id)
+            .order_by(TaskCommandHistory.updated_at.desc())
+            .offset(max(keep, 0))
+        )
+        if task_ids:
+            query = query.where(TaskCommandHistory.task_id.not_in(task_ids))
+        stale_ids = self.db.scalars(query).all()
+        if stale_ids:
+            self.db.query(TaskCommandHistory).filter(
+                TaskCommandHistory.id.in_(stale_ids)
+            ).delete(synchronize_session=False)
+
+    def _push(self, stack: List[TaskDiff], changes: TaskDiff) -> List[TaskDiff]:
+        """
+        Push a diff onto a stack, dropping the oldest beyond max_depth.
+
+        A new list is returned so the JSON column is flagged as modified.
+
+        Args:
+            stack (List[TaskDiff]): Stack
+            changes (TaskDiff): Diff to push
+
+        Returns:
+            List[TaskDiff]: New stack
+        """
+        return (list(stack) + [changes])[-self.max_depth :]
+
+    def _restore(
+        self, project_id: str, task_id: str, changes: TaskDiff, side: int
+    ) -> Task:
+        """
+        Write one side of a diff to the task with a single UPDATE, provided
+        the task still holds the other side.
+
+        Args:
+            project_id (str): Project ID
+            task_id (str): Task ID
+            changes (TaskDiff): Diff
+            side (int): 0 to restore the values before, 1 the values after
 
         Returns:
-            Any: Command result
+            Task: Updated task
 
         Raises:
-            Exception: If no commands to redo
+            TaskCommandConflictException: If the task no longer holds the other side
+            TaskNotFoundException: If task not found
         """
-        if not self.undo_history:
-            raise Exception("No commands to redo")
+        values = {field: _from_json(field, diff[side]) for field, diff in changes.items()}
+        values["updated_at"] = datetime.now(timezone.utc)
+        expected = {
+            field: _from_json(field, diff[1 - side]) for field, diff in changes.items()
+        }
+        conditions = [Task.id == task_id, Task.project_id == project_id]
+
+        # JSON columns cannot be compared in SQL, so they are checked on the
+        # locked row, read along with the counted fields
+        json_fields = [
+            field
+            for field in changes
+            if isinstance(Task.__table__.c[field].type, JSON)
+        ]
+        for field, value in expected.items():
+            if field not in json_fields:
+                column = getattr(Task, field)
+                conditions.append(column.is_(None) if value is None else column == value)
+
+        before = None
+        stats_changed = any(field in changes for field in STATS_FIELDS)
+        if stats_changed or json_fields:
+            before = self.db.execute(
+                select(*[getattr(Task, field) for field in (*STATS_FIELDS, *json_fields)])
+                .where(Task.id == task_id, Task.project_id == project_id)
+                .with_for_update()
+            ).mappings().first()
+            if before is None:
+                raise TaskNotFoundException()
+            if any(before[field] != expected[field] for field in json_fields):
+                raise TaskCommandConflictException()
+
+        task = self.db.scalars(
+            update(Task)
+            .where(*conditions)
+            .values(**values)
+            .returning(Task),
+            execution_options={"populate_existing": True},
+        ).first()
 
-        command = self.undo_history.pop()
-        result = command.execute()
-        self.history.append(command)
-        return result
+        if not task:
+            if self.db.scalar(
+                select(exists().where(Task.id == task_id, Task.project_id == project_id))
+            ):
+                raise TaskCommandConflictException()
+            raise TaskNotFoundException()
+
+        if "tags" in values:
+            set_task_tags(self.db, project_id, {task_id: values["tags"]})
+        if stats_changed:
+            update_project_stats(
+                self.db, project_id, task_delta(before, task_state(task))
+            )
+
+        return task
@@ -1,9 +1,21 @@
-from typing import Any, List, Optional
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Union
 
 from dotenv import load_dotenv
-from fastapi import Depends, FastAPI, HTTPException, Path, Query, Security
+from fastapi import (
+    BackgroundTasks,
+    Depends,
+    FastAPI,
+    Header,
+    Path,
+    Query,
+    Request,
+    Response,
+    Security,
+)
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from api.project_service.app.commands.task_commands import (
@@ -15,25 +27,49 @@ from api.shared.middleware.auth_middleware import auth_middleware
 from api.project_service.app.schemas.activity import ActivityLogResponseDTO
 from api.project_service.app.schemas.project import (
     ProjectCreateDTO,
+    ProjectDeletionResponseDTO,
     ProjectMemberCreateDTO,
     ProjectMemberResponseDTO,
     ProjectMemberUpdateDTO,
     ProjectResponseDTO,
+    ProjectStatsDTO,
     ProjectUpdateDTO,
 )
+from api.project_service.app.schemas.search import SearchEntityType, SearchResultDTO
 from api.project_service.app.schemas.task import (
+    TaskBatchDTO,
+    TaskBatchResponseDTO,
     TaskCommentCreateDTO,
     TaskCommentResponseDTO,
+    TaskCommentThreadDTO,
     TaskCreateDTO,
+    TaskFilterDTO,
+    TaskPriority,
     TaskResponseDTO,
+    TaskStatus,
     TaskUpdateDTO,
 )
 from api.project_service.app.services.activity_service import ActivityService
+from api.project_service.app.services.activity_writer import activity_lifespan
+from api.project_service.app.services.project_authorizer import ProjectAuthorizer
+from api.project_service.app.services.project_deletion import (
+    ProjectPurger,
+    run_project_deletion,
+)
 from api.project_service.app.services.project_service import ProjectService
-from api.project_service.app.services.task_service import TaskService
+from api.project_service.app.services.search_service import SearchService
+from api.project_service.app.services.task_service import MAX_COMMENT_DEPTH, TaskService
 from api.shared.exceptions.auth_exceptions import InvalidTokenException
-from api.shared.utils.db import get_db
+from api.shared.exceptions.project_exceptions import TaskCommandConflictException
+from api.shared.utils.db import get_async_db, get_db
+from api.shared.utils.etag import ETAG_HEADER, get_if_modified, not_modified
 from api.shared.utils.jwt import decode_token
+from api.shared.utils.membership_cache import membership_cache
+from api.shared.utils.pagination import (
+    MAX_PAGE_SIZE,
+    Page,
+    set_next_cursor_header,
+)
 
 # Load environment variables
 load_dotenv()
@@ -43,6 +79,7 @@ app = FastAPI(
     title="TaskHub Project Service",
     description="Project management service for TaskHub platform",
     version="1.0.0",
+    lifespan=activity_lifespan,
 )
 
 # Add CORS middleware
@@ -57,9 +94,6 @@ app.add_middleware(
 # Create OAuth2 scheme
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
-# Create command invoker
-command_invoker = CommandInvoker()
-
 
 def get_current_user(token: str = Security(oauth2_scheme)) -> str:
     """
@@ -86,11 +120,25 @@ def get_current_user(token: str = Security(oauth2_scheme)) -> str:
         raise InvalidTokenException()
 
 
+def _split(value: Optional[str]) -> Optional[List[str]]:
+    """
+    Split a comma separated query parameter.
+
+    Args:
+        value (Optional[str]): Parameter value
+
+    Returns:
+        Optional[List[str]]: Non-empty items, or None if there are none
+    """
+    items = [item.strip() for item in (value or "").split(",") if item.strip()]
+    return items or None
+
+
 # Project endpoints
 @app.post("/projects", response_model=ProjectResponseDTO, tags=["Projects"])
 async def create_project(
     project_data: ProjectCreateDTO,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -98,60 +146,92 @@ async def create_project(
 
     Args:
         project_data (ProjectCreateDTO): Project data
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         ProjectResponseDTO: Created project
     """
-    project_service = ProjectService(db)
-    return project_service.create_project(project_data, user_id)
+    return await db.run_sync(
+        lambda session: ProjectService(session).create_project(project_data, user_id)
+    )
 
 
 @app.get("/projects", response_model=List[ProjectResponseDTO], tags=["Projects"])
 async def get_user_projects(
-    db: Session = Depends(get_db), user_id: str = Depends(get_current_user)
+    response: Response,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE, description="Limit"),
+    cursor: Optional[str] = Query(None, description="Cursor of the page to get"),
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user),
 ):
     """
     Get projects for current user.
 
+    The cursor of the next page is returned in the X-Next-Cursor header.
+
     Args:
-        db (Session): Database session
+        response (Response): Response
+        limit (int): Limit
+        cursor (Optional[str]): Cursor of the page to get
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         List[ProjectResponseDTO]: List of projects
     """
-    project_service = ProjectService(db)
-    return project_service.get_user_projects(user_id)
+    page = await db.run_sync(
+        lambda session: ProjectService(session).get_user_projects(
+            user_id, limit, cursor
+        )
+    )
+    set_next_cursor_header(response, page)
+    return page
 
 
 @app.get("/projects/{project_id}", response_model=ProjectResponseDTO, tags=["Projects"])
 async def get_project(
+    response: Response,
     project_id: str = Path(..., description="Project ID"),
-    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None, description="ETags the client has"),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
     Get a project.
 
+    The ETag header versions the project; sent back in If-None-Match, it
+    gets a 304 Not Modified while the project is unchanged.
+
     Args:
+        response (Response): Response
         project_id (str): Project ID
-        db (Session): Database session
+        if_none_match (Optional[str]): ETags the client has
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         ProjectResponseDTO: Project
     """
-    project_service = ProjectService(db)
-    return project_service.get_project(project_id, user_id)
+    etag, project = await db.run_sync(
+        lambda session: get_if_modified(
+            if_none_match,
+            lambda: ProjectService(session).get_project_etag(project_id, user_id),
+            lambda: ProjectService(session).get_project(project_id, user_id),
+        )
+    )
+    if project is None:
+        return not_modified(etag)
+
+    response.headers[ETAG_HEADER] = etag
+    return project
 
 
 @app.put("/projects/{project_id}", response_model=ProjectResponseDTO, tags=["Projects"])
 async def update_project(
     project_data: ProjectUpdateDTO,
     project_id: str = Path(..., description="Project ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -160,35 +240,134 @@ async def update_project(
     Args:
         project_data (ProjectUpdateDTO): Project data
         project_id (str): Project ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         ProjectResponseDTO: Updated project
     """
-    project_service = ProjectService(db)
-    return project_service.update_project(project_id, project_data, user_id)
+    return await db.run_sync(
+        lambda session: ProjectService(session).update_project(
+            project_id, project_data, user_id
+        )
+    )
 
 
 @app.delete("/projects/{project_id}", tags=["Projects"])
 async def delete_project(
+    background_tasks: BackgroundTasks,
     project_id: str = Path(..., description="Project ID"),
-    db: Session = Depends(get_db),
+    background: bool = Query(
+        True, description="Purge the project's content after responding"
+    ),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
     Delete a project.
 
+    The project disappears at once; its content is purged in the background,
+    with progress at GET /projects/{project_id}/deletion.
+
     Args:
+        background_tasks (BackgroundTasks): Tasks run after the response
         project_id (str): Project ID
-        db (Session): Database session
+        background (bool): Purge after responding instead of before
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         Dict[str, Any]: Delete response
     """
-    project_service = ProjectService(db)
-    return project_service.delete_project(project_id, user_id)
+    response = await db.run_sync(
+        lambda session: ProjectService(session).delete_project(project_id, user_id)
+    )
+
+    if background:
+        background_tasks.add_task(run_project_deletion, response["deletion_id"])
+    else:
+        await db.run_sync(
+            lambda session: ProjectPurger(session).purge(response["deletion_id"])
+        )
+    return response
+
+
+@app.get(
+    "/projects/{project_id}/deletion",
+    response_model=ProjectDeletionResponseDTO,
+    tags=["Projects"],
+)
+async def get_project_deletion(
+    project_id: str = Path(..., description="Project ID"),
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user),
+):
+    """
+    Get the progress of the purge of a deleted project.
+
+    Args:
+        project_id (str): Project ID
+        db (AsyncSession): Async database session
+        user_id (str): User ID, who deleted the project
+
+    Returns:
+        ProjectDeletionResponseDTO: Purge progress
+    """
+    return await db.run_sync(
+        lambda session: ProjectService(session).get_project_deletion(project_id, user_id)
+    )
+
+
+@app.get(
+    "/projects/{project_id}/stats", response_model=ProjectStatsDTO, tags=["Projects"]
+)
+async def get_project_stats(
+    project_id: str = Path(..., description="Project ID"),
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user),
+):
+    """
+    Get the dashboard counters of a project.
+
+    Args:
+        project_id (str): Project ID
+        db (AsyncSession): Async database session
+        user_id (str): User ID
+
+    Returns:
+        ProjectStatsDTO: Project counters
+    """
+    return await db.run_sync(
+        lambda session: ProjectService(session).get_project_stats(project_id, user_id)
+    )
+
+
+@app.post(
+    "/projects/{project_id}/stats:rebuild",
+    response_model=ProjectStatsDTO,
+    tags=["Projects"],
+)
+async def rebuild_project_stats(
+    project_id: str = Path(..., description="Project ID"),
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user),
+):
+    """
+    Recompute the dashboard counters of a project.
+
+    Args:
+        project_id (str): Project ID
+        db (AsyncSession): Async database session
+        user_id (str): User ID
+
+    Returns:
+        ProjectStatsDTO: Rebuilt project counters
+    """
+    return await db.run_sync(
+        lambda session: ProjectService(session).rebuild_project_stats(
+            project_id, user_id
+        )
+    )
 
 
 # Project members endpoints
@@ -200,7 +379,7 @@ async def delete_project(
 async def add_project_member(
     member_data: ProjectMemberCreateDTO,
     project_id: str = Path(..., description="Project ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -209,14 +388,17 @@ async def add_project_member(
     Args:
         member_data (ProjectMemberCreateDTO): Member data
         project_id (str): Project ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         ProjectMemberResponseDTO: Added project member
     """
-    project_service = ProjectService(db)
-    return project_service.add_project_member(project_id, member_data, user_id)
+    return await db.run_sync(
+        lambda session: ProjectService(session).add_project_member(
+            project_id, member_data, user_id
+        )
+    )
 
 
 @app.get(
@@ -226,7 +408,7 @@ async def add_project_member(
 )
 async def get_project_members(
     project_id: str = Path(..., description="Project ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -234,14 +416,15 @@ async def get_project_members(
 
     Args:
         project_id (str): Project ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         List[ProjectMemberResponseDTO]: List of project members
     """
-    project_service = ProjectService(db)
-    return project_service.get_project_members(project_id, user_id)
+    return await db.run_sync(
+        lambda session: ProjectService(session).get_project_members(project_id, user_id)
+    )
 
 
 @app.put(
@@ -253,7 +436,7 @@ async def update_project_member(
     member_data: ProjectMemberUpdateDTO,
     project_id: str = Path(..., description="Project ID"),
     member_id: str = Path(..., description="Member ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -263,15 +446,16 @@ async def update_project_member(
         member_data (ProjectMemberUpdateDTO): Member data
         project_id (str): Project ID
         member_id (str): Member ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         ProjectMemberResponseDTO: Updated project member
     """
-    project_service = ProjectService(db)
-    return project_service.update_project_member(
-        project_id, member_id, member_data, user_id
+    return await db.run_sync(
+        lambda session: ProjectService(session).update_project_member(
+            project_id, member_id, member_data, user_id
+        )
     )
 
 
@@ -279,7 +463,7 @@ async def update_project_member(
 async def remove_project_member(
     project_id: str = Path(..., description="Project ID"),
     member_id: str = Path(..., description="Member ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -288,14 +472,17 @@ async def remove_project_member(
     Args:
         project_id (str): Project ID
         member_id (str): Member ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         Dict[str, Any]: Remove response
     """
-    project_service = ProjectService(db)
-    return project_service.remove_project_member(project_id, member_id, user_id)
+    return await db.run_sync(
+        lambda session: ProjectService(session).remove_project_member(
+            project_id, member_id, user_id
+        )
+    )
 
 
 # Task endpoints
@@ -305,7 +492,7 @@ async def remove_project_member(
 async def create_task(
     task_data: TaskCreateDTO,
     project_id: str = Path(..., description="Project ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -314,37 +501,137 @@ async def create_task(
     Args:
         task_data (TaskCreateDTO): Task data
         project_id (str): Project ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         TaskResponseDTO: Created task
     """
-    task_service = TaskService(db)
-    return task_service.create_task(project_id, task_data, user_id)
+    return await db.run_sync(
+        lambda session: TaskService(session).create_task(project_id, task_data, user_id)
+    )
+
+
+@app.post(
+    "/projects/{project_id}/tasks:batch",
+    response_model=TaskBatchResponseDTO,
+    tags=["Tasks"],
+)
+async def batch_tasks(
+    batch_data: TaskBatchDTO,
+    project_id: str = Path(..., description="Project ID"),
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user),
+):
+    """
+    Create, update, move, assign and delete many tasks at once.
+
+    Args:
+        batch_data (TaskBatchDTO): Operations
+        project_id (str): Project ID
+        db (AsyncSession): Async database session
+        user_id (str): User ID
+
+    Returns:
+        TaskBatchResponseDTO: Result of each operation
+    """
+    return await db.run_sync(
+        lambda session: TaskService(session).batch_tasks(project_id, batch_data, user_id)
+    )
 
 
 @app.get(
-    "/projects/{project_id}/tasks", response_model=List[TaskResponseDTO], tags=["Tasks"]
+    "/projects/{project_id}/tasks",
+    response_model=List[Union[TaskResponseDTO, Dict[str, Any]]],
+    tags=["Tasks"],
 )
 async def get_project_tasks(
+    request: Request,
+    response: Response,
     project_id: str = Path(..., description="Project ID"),
-    db: Session = Depends(get_db),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE, description="Limit"),
+    cursor: Optional[str] = Query(None, description="Cursor of the page to get"),
+    status: Optional[List[TaskStatus]] = Query(None, description="Any of these statuses"),
+    priority: Optional[List[TaskPriority]] = Query(
+        None, description="Any of these priorities"
+    ),
+    assignee_id: Optional[str] = Query(None, description="Assignee ID"),
+    due_before: Optional[datetime] = Query(None, description="Due before"),
+    due_after: Optional[datetime] = Query(None, description="Due on or after"),
+    tag: Optional[List[str]] = Query(None, description="All of these tags"),
+    sort: Optional[str] = Query(
+        None, description="Comma separated sort keys, '-' prefixed for descending"
+    ),
+    fields: Optional[str] = Query(None, description="Comma separated fields to return"),
+    if_none_match: Optional[str] = Header(None, description="ETags the client has"),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
     Get tasks for a project.
 
+    Tasks can be filtered, sorted by any of title, status, priority, due_date,
+    created_at and updated_at, and reduced to the requested fields. The cursor
+    of the next page is returned in the X-Next-Cursor header; it is only valid
+    with the same filters and sort.
+
+    The ETag header versions the listing; sent back in If-None-Match, it gets
+    a 304 Not Modified, without the tasks being read, while no task of the
+    project was created, updated or deleted.
+
     Args:
+        request (Request): Request
+        response (Response): Response
         project_id (str): Project ID
-        db (Session): Database session
+        limit (int): Limit
+        cursor (Optional[str]): Cursor of the page to get
+        status (Optional[List[TaskStatus]]): Any of these statuses
+        priority (Optional[List[TaskPriority]]): Any of these priorities
+        assignee_id (Optional[str]): Assignee ID
+        due_before (Optional[datetime]): Due before
+        due_after (Optional[datetime]): Due on or after
+        tag (Optional[List[str]]): All of these tags
+        sort (Optional[str]): Comma separated sort keys, e.g. "-priority,due_date"
+        fields (Optional[str]): Comma separated fields, e.g. "title,status"
+        if_none_match (Optional[str]): ETags the client has
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
-        List[TaskResponseDTO]: List of tasks
+        List[Union[TaskResponseDTO, Dict[str, Any]]]: List of tasks, or of the
+            requested fields of each
     """
-    task_service = TaskService(db)
-    return task_service.get_project_tasks(project_id, user_id)
+    filters = TaskFilterDTO(
+        status=status,
+        priority=priority,
+        assignee_id=assignee_id,
+        due_before=due_before,
+        due_after=due_after,
+        tags=tag,
+    )
+    etag, page = await db.run_sync(
+        lambda session: get_if_modified(
+            if_none_match,
+            lambda: TaskService(session).get_project_tasks_etag(
+                project_id, user_id, request.url.query
+            ),
+            lambda: TaskService(session).get_project_tasks(
+                project_id,
+                user_id,
+                limit,
+                cursor,
+                filters,
+                _split(sort),
+                _split(fields),
+            ),
+        )
+    )
+    if page is None:
+        return not_modified(etag)
+
+    response.headers[ETAG_HEADER] = etag
+    set_next_cursor_header(response, page)
+    return page
 
 
 @app.get(
@@ -355,7 +642,7 @@ async def get_project_tasks(
 async def get_task(
     project_id: str = Path(..., description="Project ID"),
     task_id: str = Path(..., description="Task ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -364,14 +651,15 @@ async def get_task(
     Args:
         project_id (str): Project ID
         task_id (str): Task ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         TaskResponseDTO: Task
     """
-    task_service = TaskService(db)
-    return task_service.get_task(project_id, task_id, user_id)
+    return await db.run_sync(
+        lambda session: TaskService(session).get_task(project_id, task_id, user_id)
+    )
 
 
 @app.put(
@@ -383,7 +671,7 @@ async def update_task(
     task_data: TaskUpdateDTO,
     project_id: str = Path(..., description="Project ID"),
     task_id: str = Path(..., description="Task ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -393,21 +681,24 @@ async def update_task(
         task_data (TaskUpdateDTO): Task data
         project_id (str): Project ID
         task_id (str): Task ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         TaskResponseDTO: Updated task
     """
-    task_service = TaskService(db)
-    return task_service.update_task(project_id, task_id, task_data, user_id)
+    return await db.run_sync(
+        lambda session: TaskService(session).update_task(
+            project_id, task_id, task_data, user_id
+        )
+    )
 
 
 @app.delete("/projects/{project_id}/tasks/{task_id}", tags=["Tasks"])
 async def delete_task(
     project_id: str = Path(..., description="Project ID"),
     task_id: str = Path(..., description="Task ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -416,14 +707,15 @@ async def delete_task(
     Args:
         project_id (str): Project ID
         task_id (str): Task ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         Dict[str, Any]: Delete response
     """
-    task_service = TaskService(db)
-    return task_service.delete_task(project_id, task_id, user_id)
+    return await db.run_sync(
+        lambda session: TaskService(session).delete_task(project_id, task_id, user_id)
+    )
 
 
 # Task comments endpoints
@@ -436,7 +728,7 @@ async def add_task_comment(
     comment_data: TaskCommentCreateDTO,
     project_id: str = Path(..., description="Project ID"),
     task_id: str = Path(..., description="Task ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -446,41 +738,77 @@ async def add_task_comment(
         comment_data (TaskCommentCreateDTO): Comment data
         project_id (str): Project ID
         task_id (str): Task ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         TaskCommentResponseDTO: Added comment
     """
-    task_service = TaskService(db)
-    return task_service.add_task_comment(project_id, task_id, comment_data, user_id)
+    return await db.run_sync(
+        lambda session: TaskService(session).add_task_comment(
+            project_id, task_id, comment_data, user_id
+        )
+    )
 
 
 @app.get(
     "/projects/{project_id}/tasks/{task_id}/comments",
-    response_model=List[TaskCommentResponseDTO],
+    response_model=Union[List[TaskCommentThreadDTO], List[TaskCommentResponseDTO]],
     tags=["Task Comments"],
 )
 async def get_task_comments(
+    response: Response,
     project_id: str = Path(..., description="Project ID"),
     task_id: str = Path(..., description="Task ID"),
-    db: Session = Depends(get_db),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE, description="Limit"),
+    cursor: Optional[str] = Query(None, description="Cursor of the page to get"),
+    threaded: bool = Query(
+        False, description="Return top-level comments with their reply trees"
+    ),
+    depth: int = Query(
+        MAX_COMMENT_DEPTH,
+        ge=0,
+        le=MAX_COMMENT_DEPTH,
+        description="Deepest reply level of threads, 0 for top-level comments only",
+    ),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
     Get comments for a task.
 
+    Threaded, the page holds top-level comments and the limit counts them,
+    not their replies. The cursor of the next page is returned in the
+    X-Next-Cursor header.
+
     Args:
+        response (Response): Response
         project_id (str): Project ID
         task_id (str): Task ID
-        db (Session): Database session
+        limit (int): Limit
+        cursor (Optional[str]): Cursor of the page to get
+        threaded (bool): Return top-level comments with their reply trees
+        depth (int): Deepest reply level of threads
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
-        List[TaskCommentResponseDTO]: List of comments
+        Union[List[TaskCommentThreadDTO], List[TaskCommentResponseDTO]]: List of comments
     """
-    task_service = TaskService(db)
-    return task_service.get_task_comments(project_id, task_id, user_id)
+    if threaded:
+        page = await db.run_sync(
+            lambda session: TaskService(session).get_task_comment_threads(
+                project_id, task_id, user_id, limit, cursor, depth
+            )
+        )
+    else:
+        page = await db.run_sync(
+            lambda session: TaskService(session).get_task_comments(
+                project_id, task_id, user_id, limit, cursor
+            )
+        )
+    set_next_cursor_header(response, page)
+    return page
 
 
 # Activity endpoints
@@ -490,33 +818,91 @@ async def get_task_comments(
     tags=["Activities"],
 )
 async def get_project_activities(
+    response: Response,
     project_id: str = Path(..., description="Project ID"),
-    limit: int = Query(100, description="Limit"),
-    offset: int = Query(0, description="Offset"),
-    db: Session = Depends(get_db),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE, description="Limit"),
+    offset: int = Query(0, ge=0, description="Offset, use cursor instead"),
+    cursor: Optional[str] = Query(None, description="Cursor of the page to get"),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
     Get activities for a project.
 
+    The cursor of the next page is returned in the X-Next-Cursor header.
+
     Args:
+        response (Response): Response
         project_id (str): Project ID
         limit (int): Limit
-        offset (int): Offset
-        db (Session): Database session
+        offset (int): Offset, ignored when a cursor is given
+        cursor (Optional[str]): Cursor of the page to get
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         List[ActivityLogResponseDTO]: List of activities
     """
-    # Check if user is a project member
-    project_service = ProjectService(db)
-    project_service.get_project(
-        project_id, user_id
-    )  # This will raise an exception if user is not a project member
 
-    activity_service = ActivityService(db)
-    return activity_service.get_project_activities(project_id, limit, offset)
+    def run(session: Session) -> Page[ActivityLogResponseDTO]:
+        # Check if user is a project member
+        ProjectAuthorizer(session).authorize(project_id, user_id)
+
+        activity_service = ActivityService(session)
+        return activity_service.get_project_activities(
+            project_id, limit, offset, cursor
+        )
+
+    page = await db.run_sync(run)
+    set_next_cursor_header(response, page)
+    return page
+
+
+# Search endpoints
+@app.get(
+    "/projects/{project_id}/search",
+    response_model=List[SearchResultDTO],
+    tags=["Search"],
+)
+async def search_project(
+    response: Response,
+    project_id: str = Path(..., description="Project ID"),
+    q: str = Query(..., min_length=1, max_length=256, description="Search query"),
+    type: Optional[List[SearchEntityType]] = Query(
+        None, description="Entity types to search"
+    ),
+    limit: int = Query(20, ge=1, le=MAX_PAGE_SIZE, description="Limit"),
+    cursor: Optional[str] = Query(None, description="Cursor of the page to get"),
+    db: AsyncSession = Depends(get_async_db),
+    user_id: str = Depends(get_current_user),
+):
+    """
+    Search the tasks, comments and documents of a project.
+
+    Results are ranked, most relevant first, and only include documents the
+    user can view. The cursor of the next page is returned in the
+    X-Next-Cursor header.
+
+    Args:
+        response (Response): Response
+        project_id (str): Project ID
+        q (str): Search query; every term must match
+        type (Optional[List[SearchEntityType]]): Entity types to search
+        limit (int): Limit
+        cursor (Optional[str]): Cursor of the page to get
+        db (AsyncSession): Async database session
+        user_id (str): User ID
+
+    Returns:
+        List[SearchResultDTO]: Search results
+    """
+    page = await db.run_sync(
+        lambda session: SearchService(session).search(
+            project_id, user_id, q, limit, cursor, type
+        )
+    )
+    set_next_cursor_header(response, page)
+    return page
 
 
 # Command pattern endpoints
@@ -529,7 +915,7 @@ async def assign_task(
     assignee_id: Optional[str] = Query(None, description="Assignee ID"),
     project_id: str = Path(..., description="Project ID"),
     task_id: str = Path(..., description="Task ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -539,51 +925,39 @@ async def assign_task(
         assignee_id (Optional[str]): Assignee ID
         project_id (str): Project ID
         task_id (str): Task ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         TaskResponseDTO: Updated task
     """
-    # Check if user is a project member
-    project_service = ProjectService(db)
-    project_service.get_project(
-        project_id, user_id
-    )  # This will raise an exception if user is not a project member
-
-    # Create command
-    command = AssignTaskCommand(db, task_id, assignee_id)
-
-    # Execute command
-    task = command_invoker.execute_command(command)
-
-    # Log activity
-    activity_service = ActivityService(db)
-    activity_service.log_activity(
-        project_id=project_id,
-        user_id=user_id,
-        action="assign",
-        entity_type="task",
-        entity_id=task_id,
-        details={"assignee_id": assignee_id},
-    )
 
-    # Return task
-    return TaskResponseDTO(
-        id=task.id,
-        title=task.title,
-        description=task.description,
-        project_id=task.project_id,
-        creator_id=task.creator_id,
-        assignee_id=task.assignee_id,
-        due_date=task.due_date,
-        priority=task.priority,
-        status=task.status,
-        tags=list(task.tags) if task.tags is not None else [],
-        metadata=(task.metadata or {}),
-        created_at=task.created_at,
-        updated_at=task.updated_at,
-    )
+    def run(session: Session) -> TaskResponseDTO:
+        # Check if user is a project member and get task
+        access = ProjectAuthorizer(session).authorize_task(project_id, task_id, user_id)
+
+        # Create command
+        command = AssignTaskCommand(session, task_id, assignee_id, task=access.task)
+
+        # Execute command
+        task = CommandInvoker(session, user_id).execute_command(command)
+
+        # Log activity
+        activity_service = ActivityService(session)
+        activity_service.log_activity(
+            project_id=project_id,
+            user_id=user_id,
+            action="assign",
+            entity_type="task",
+            entity_id=task_id,
+            details={"assignee_id": assignee_id},
+        )
+        session.commit()
+
+        # Return task
+        return TaskService(session)._task_to_dto(task)
+
+    return await db.run_sync(run)
 
 
 @app.post(
@@ -595,7 +969,7 @@ async def change_task_status(
     status: str = Query(..., description="Task status"),
     project_id: str = Path(..., description="Project ID"),
     task_id: str = Path(..., description="Task ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -605,51 +979,39 @@ async def change_task_status(
         status (str): Task status
         project_id (str): Project ID
         task_id (str): Task ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         TaskResponseDTO: Updated task
     """
-    # Check if user is a project member
-    project_service = ProjectService(db)
-    project_service.get_project(
-        project_id, user_id
-    )  # This will raise an exception if user is not a project member
-
-    # Create command
-    command = ChangeTaskStatusCommand(db, task_id, status)
-
-    # Execute command
-    task = command_invoker.execute_command(command)
-
-    # Log activity
-    activity_service = ActivityService(db)
-    activity_service.log_activity(
-        project_id=project_id,
-        user_id=user_id,
-        action="change_status",
-        entity_type="task",
-        entity_id=task_id,
-        details={"status": status},
-    )
 
-    # Return task
-    return TaskResponseDTO(
-        id=task.id,
-        title=task.title,
-        description=task.description,
-        project_id=task.project_id,
-        creator_id=task.creator_id,
-        assignee_id=task.assignee_id,
-        due_date=task.due_date,
-        priority=task.priority,
-        status=task.status,
-        tags=list(task.tags) if task.tags is not None else [],
-        metadata=(task.metadata or {}),
-        created_at=task.created_at,
-        updated_at=task.updated_at,
-    )
+    def run(session: Session) -> TaskResponseDTO:
+        # Check if user is a project member and get task
+        access = ProjectAuthorizer(session).authorize_task(project_id, task_id, user_id)
+
+        # Create command
+        command = ChangeTaskStatusCommand(session, task_id, status, task=access.task)
+
+        # Execute command
+        task = CommandInvoker(session, user_id).execute_command(command)
+
+        # Log activity
+        activity_service = ActivityService(session)
+        activity_service.log_activity(
+            project_id=project_id,
+            user_id=user_id,
+            action="change_status",
+            entity_type="task",
+            entity_id=task_id,
+            details={"status": status},
+        )
+        session.commit()
+
+        # Return task
+        return TaskService(session)._task_to_dto(task)
+
+    return await db.run_sync(run)
 
 
 @app.post(
@@ -660,7 +1022,7 @@ async def change_task_status(
 async def undo_task_command(
     project_id: str = Path(..., description="Project ID"),
     task_id: str = Path(..., description="Task ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -669,24 +1031,27 @@ async def undo_task_command(
     Args:
         project_id (str): Project ID
         task_id (str): Task ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         TaskResponseDTO: Updated task
     """
-    # Check if user is a project member
-    project_service = ProjectService(db)
-    project_service.get_project(
-        project_id, user_id
-    )  # This will raise an exception if user is not a project member
 
-    try:
+    def run(session: Session) -> TaskResponseDTO:
+        # Check if user is a project member
+        ProjectAuthorizer(session).authorize(project_id, user_id)
+
         # Undo command
-        task = command_invoker.undo()
+        try:
+            task = CommandInvoker(session, user_id).undo(project_id, task_id)
+        except TaskCommandConflictException:
+            # Keep the stale entry dropped
+            session.commit()
+            raise
 
         # Log activity
-        activity_service = ActivityService(db)
+        activity_service = ActivityService(session)
         activity_service.log_activity(
             project_id=project_id,
             user_id=user_id,
@@ -695,25 +1060,12 @@ async def undo_task_command(
             entity_id=task_id,
             details=None,
         )
+        session.commit()
 
         # Return task
-        return TaskResponseDTO(
-            id=task.id,
-            title=task.title,
-            description=task.description,
-            project_id=task.project_id,
-            creator_id=task.creator_id,
-            assignee_id=task.assignee_id,
-            due_date=task.due_date,
-            priority=task.priority,
-            status=task.status,
-            tags=list(task.tags) if task.tags is not None else [],
-            metadata=(task.metadata or {}),
-            created_at=task.created_at,
-            updated_at=task.updated_at,
-        )
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        return TaskService(session)._task_to_dto(task)
+
+    return await db.run_sync(run)
 
 
 @app.post(
@@ -724,7 +1076,7 @@ async def undo_task_command(
 async def redo_task_command(
     project_id: str = Path(..., description="Project ID"),
     task_id: str = Path(..., description="Task ID"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     user_id: str = Depends(get_current_user),
 ):
     """
@@ -733,24 +1085,27 @@ async def redo_task_command(
     Args:
         project_id (str): Project ID
         task_id (str): Task ID
-        db (Session): Database session
+        db (AsyncSession): Async database session
         user_id (str): User ID
 
     Returns:
         TaskResponseDTO: Updated task
     """
-    # Check if user is a project member
-    project_service = ProjectService(db)
-    project_service.get_project(
-        project_id, user_id
-    )  # This will raise an exception if user is not a project member
 
-    try:
+    def run(session: Session) -> TaskResponseDTO:
+        # Check if user is a project member
+        ProjectAuthorizer(session).authorize(project_id, user_id)
+
         # Redo command
-        task = command_invoker.redo()
+        try:
+            task = CommandInvoker(session, user_id).redo(project_id, task_id)
+        except TaskCommandConflictException:
+            # Keep the stale entry dropped
+            session.commit()
+            raise
 
         # Log activity
-        activity_service = ActivityService(db)
+        activity_service = ActivityService(session)
         activity_service.log_activity(
             project_id=project_id,
             user_id=user_id,
@@ -759,25 +1114,12 @@ async def redo_task_command(
             entity_id=task_id,
             details=None,
         )
+        session.commit()
 
         # Return task
-        return TaskResponseDTO(
-            id=task.id,
-            title=task.title,
-            description=task.description,
-            project_id=task.project_id,
-            creator_id=task.creator_id,
-            assignee_id=task.assignee_id,
-            due_date=task.due_date,
-            priority=task.priority,
-            status=task.status,
-            tags=list(task.tags) if task.tags is not None else [],
-            metadata=(task.metadata or {}),
-            created_at=task.created_at,
-            updated_at=task.updated_at,
-        )
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+        return TaskService(session)._task_to_dto(task)
+
+    return await db.run_sync(run)
 
 
 @app.get("/health", tags=["Health"])
@@ -790,7 +1132,20 @@ async def health_check() -> Any:
     """
     return {"status": "healthy"}
 
+
+@app.get("/membership-cache/stats", tags=["Health"])
+async def get_membership_cache_stats() -> Any:
+    """
+    Get membership cache metrics of this worker.
+
+    Returns:
+        Dict[str, Any]: Cache size, hits, misses and invalidations
+    """
+    return membership_cache.get_stats()
+
+
 # Export para tests de integración
 get_db = get_db
+get_async_db = get_async_db
 get_current_user = get_current_user
 auth_middleware = auth_middleware
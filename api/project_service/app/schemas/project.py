@@ -76,3 +76,29 @@ class ProjectMemberResponseDTO(BaseModel):
     user_id: str
     role: str
     joined_at: datetime
+
+
+class ProjectStatsDTO(BaseModel):
+    """DTO for project dashboard counters"""
+
+    project_id: str
+    task_count: int = 0
+    comment_count: int = 0
+    overdue_count: int = 0  # Not done and due before today (UTC)
+    unassigned_count: int = 0
+    status_counts: Dict[str, int] = {}
+    assignee_counts: Dict[str, int] = {}
+
+
+class ProjectDeletionResponseDTO(BaseModel):
+    """DTO for the progress of a project purge"""
+
+    id: str
+    project_id: str
+    status: str  # 'pending', 'running', 'done', 'failed'
+    deleted_rows: Dict[str, int] = {}  # Rows deleted so far, by table
+    files_deleted: int = 0
+    files_failed: int = 0
+    error: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
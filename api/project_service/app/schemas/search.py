@@ -0,0 +1,23 @@
+from enum import Enum
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class SearchEntityType(str, Enum):
+    """Enum for searchable entity types"""
+
+    TASK = "task"
+    COMMENT = "comment"
+    DOCUMENT = "document"
+
+
+class SearchResultDTO(BaseModel):
+    """DTO for search result"""
+
+    entity_type: SearchEntityType
+    entity_id: str
+    task_id: Optional[str] = None  # Task of a task or comment
+    title: str  # Task title or document name
+    snippet: Optional[str] = None  # Matching text as escaped HTML, terms wrapped in <b></b>
+    score: float  # Higher is more relevant
@@ -67,6 +67,17 @@ class TaskResponseDTO(BaseModel):
     updated_at: Optional[datetime] = None
 
 
+class TaskFilterDTO(BaseModel):
+    """DTO for filtering a task listing"""
+
+    status: Optional[List[TaskStatus]] = None  # Any of
+    priority: Optional[List[TaskPriority]] = None  # Any of
+    assignee_id: Optional[str] = None
+    due_before: Optional[datetime] = None
+    due_after: Optional[datetime] = None
+    tags: Optional[List[str]] = None  # All of
+
+
 class TaskCommentCreateDTO(BaseModel):
     """DTO for creating a task comment"""
 
@@ -84,3 +95,57 @@ class TaskCommentResponseDTO(BaseModel):
     parent_id: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
+
+
+class TaskCommentThreadDTO(TaskCommentResponseDTO):
+    """DTO for a task comment with its replies, oldest first"""
+
+    depth: int = 0  # 0 for top-level comments
+    replies: List["TaskCommentThreadDTO"] = []
+
+
+class TaskBatchAction(str, Enum):
+    """Enum for task batch operation actions"""
+
+    CREATE = "create"
+    UPDATE = "update"
+    STATUS = "status"
+    ASSIGN = "assign"
+    DELETE = "delete"
+
+
+class TaskBatchOperationDTO(BaseModel):
+    """DTO for one operation of a task batch"""
+
+    action: TaskBatchAction
+    task_id: Optional[str] = None  # Every action but 'create'
+    task: Optional[TaskCreateDTO] = None  # 'create'
+    changes: Optional[TaskUpdateDTO] = None  # 'update'
+    status: Optional[TaskStatus] = None  # 'status'
+    assignee_id: Optional[str] = None  # 'assign', None to unassign
+
+
+class TaskBatchDTO(BaseModel):
+    """DTO for applying many task operations at once"""
+
+    operations: List[TaskBatchOperationDTO] = Field(..., min_length=1, max_length=1000)
+
+
+class TaskBatchResultDTO(BaseModel):
+    """DTO for the result of one operation of a task batch"""
+
+    index: int
+    action: TaskBatchAction
+    task_id: Optional[str] = None
+    success: bool
+    task: Optional[TaskResponseDTO] = None
+    error_code: Optional[str] = None
+    error: Optional[str] = None
+
+
+class TaskBatchResponseDTO(BaseModel):
+    """DTO for task batch response"""
+
+    results: List[TaskBatchResultDTO]
+    succeeded: int
+    failed: int
@@ -1,9 +1,17 @@
+import uuid
 from typing import Any, Dict, List, Optional
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
 from api.project_service.app.schemas.activity import ActivityLogResponseDTO
+from api.project_service.app.services.activity_writer import (
+    PENDING_ACTIVITIES_KEY,
+    activity_writer,
+)
+from api.shared.models.base import get_utc_now
 from api.shared.models.project import ActivityLog
+from api.shared.utils.pagination import Page, paginate
 
 
 class ActivityService:
@@ -28,7 +36,12 @@ class ActivityService:
         details: Optional[Dict[str, Any]] = None,
     ) -> ActivityLogResponseDTO:
         """
-        Log an activity.
+        Log an activity as part of the caller's unit of work.
+
+        Nothing is written until the caller commits the session, so the
+        activity is stored in the same transaction as the change it describes
+        and disappears with it on rollback. When the buffered writer is
+        running, the row is handed to it after the commit instead.
 
         Args:
             project_id (str): Project ID
@@ -41,57 +54,107 @@ class ActivityService:
         Returns:
             ActivityLogResponseDTO: Logged activity
         """
-        # Create activity log
-        activity_log = ActivityLog(
-            project_id=project_id,
-            user_id=user_id,
-            action=action,
-            entity_type=entity_type,
-            entity_id=entity_id,
-            details=details,
-        )
-
-        # Add activity log to database
-        self.db.add(activity_log)
-        self.db.commit()
-        self.db.refresh(activity_log)
+        # Set the generated columns here so no flush or refresh is needed
+        row = {
+            "id": str(uuid.uuid4()),
+            "created_at": get_utc_now(),
+            "project_id": project_id,
+            "user_id": user_id,
+            "action": action,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "details": details,
+        }
+
+        if activity_writer.running:
+            self._defer_until_commit([row])
+        else:
+            self.db.add(ActivityLog(**row))
 
         # Return activity log
-        return self._activity_log_to_dto(activity_log)
+        return ActivityLogResponseDTO(**{**row, "details": details or {}})
+
+    def log_activities(self, activities: List[Dict[str, Any]]) -> int:
+        """
+        Log many activities with one multi-row INSERT.
+
+        Like log_activity, the rows are part of the caller's unit of work.
+
+        Args:
+            activities (List[Dict[str, Any]]): Activities, each with the
+                arguments of log_activity as keys
+
+        Returns:
+            int: Number of activities logged
+        """
+        if not activities:
+            return 0
+
+        now = get_utc_now()
+        rows = [
+            {"details": None, **activity, "id": str(uuid.uuid4()), "created_at": now}
+            for activity in activities
+        ]
+
+        if activity_writer.running:
+            self._defer_until_commit(rows)
+        else:
+            self.db.execute(insert(ActivityLog), rows)
+
+        return len(rows)
+
+    def _defer_until_commit(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Hand activity rows to the buffered writer once the session commits.
+
+        Args:
+            rows (List[Dict[str, Any]]): ActivityLog column values
+        """
+        # Begin the transaction now so its commit or rollback hook fires
+        if not self.db.in_transaction():
+            self.db.begin()
+        self.db.info.setdefault(PENDING_ACTIVITIES_KEY, []).extend(rows)
 
     def get_project_activities(
-        self, project_id: str, limit: int = 100, offset: int = 0
-    ) -> List[ActivityLogResponseDTO]:
+        self,
+        project_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> Page[ActivityLogResponseDTO]:
         """
         Get activities for a project.
 
         Args:
             project_id (str): Project ID
             limit (int, optional): Limit. Defaults to 100.
-            offset (int, optional): Offset. Defaults to 0.
+            offset (int, optional): Offset, ignored when a cursor is given. Defaults to 0.
+            cursor (str, optional): Cursor of the page to get. Defaults to None.
 
         Returns:
-            List[ActivityLogResponseDTO]: List of activities
+            Page[ActivityLogResponseDTO]: Activities, newest first, and the next cursor
 
         Raises:
             ProjectNotFoundException: If project not found
         """
         # Get activities
-        activities = (
-            self.db.query(ActivityLog)
-            .filter(ActivityLog.project_id == project_id)
-            .order_by(ActivityLog.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
-        )
+        query = self.db.query(ActivityLog).filter(ActivityLog.project_id == project_id)
+        activities = paginate(query, ActivityLog, limit, cursor, offset, descending=True)
 
         # Return activities
-        return [self._activity_log_to_dto(activity) for activity in activities]
+        return Page(
+            [self._activity_log_to_dto(activity) for activity in activities],
+            activities.next_cursor,
+        )
 
     def get_entity_activities(
-        self, entity_type: str, entity_id: str, limit: int = 100, offset: int = 0
-    ) -> List[ActivityLogResponseDTO]:
+        self,
+        entity_type: str,
+        entity_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> Page[ActivityLogResponseDTO]:
         """
         Get activities for an entity.
 
@@ -99,53 +162,53 @@ class ActivityService:
             entity_type (str): Entity type
             entity_id (str): Entity ID
             limit (int, optional): Limit. Defaults to 100.
-            offset (int, optional): Offset. Defaults to 0.
+            offset (int, optional): Offset, ignored when a cursor is given. Defaults to 0.
+            cursor (str, optional): Cursor of the page to get. Defaults to None.
 
         Returns:
-            List[ActivityLogResponseDTO]: List of activities
+            Page[ActivityLogResponseDTO]: Activities, newest first, and the next cursor
         """
         # Get activities
-        activities = (
-            self.db.query(ActivityLog)
-            .filter(
-                ActivityLog.entity_type == entity_type,
-                ActivityLog.entity_id == entity_id,
-            )
-            .order_by(ActivityLog.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
+        query = self.db.query(ActivityLog).filter(
+            ActivityLog.entity_type == entity_type,
+            ActivityLog.entity_id == entity_id,
         )
+        activities = paginate(query, ActivityLog, limit, cursor, offset, descending=True)
 
         # Return activities
-        return [self._activity_log_to_dto(activity) for activity in activities]
+        return Page(
+            [self._activity_log_to_dto(activity) for activity in activities],
+            activities.next_cursor,
+        )
 
     def get_user_activities(
-        self, user_id: str, limit: int = 100, offset: int = 0
-    ) -> List[ActivityLogResponseDTO]:
+        self,
+        user_id: str,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+    ) -> Page[ActivityLogResponseDTO]:
         """
         Get activities for a user.
 
         Args:
             user_id (str): User ID
             limit (int, optional): Limit. Defaults to 100.
-            offset (int, optional): Offset. Defaults to 0.
+            offset (int, optional): Offset, ignored when a cursor is given. Defaults to 0.
+            cursor (str, optional): Cursor of the page to get. Defaults to None.
 
         Returns:
-            List[ActivityLogResponseDTO]: List of activities
+            Page[ActivityLogResponseDTO]: Activities, newest first, and the next cursor
         """
         # Get activities
-        activities = (
-            self.db.query(ActivityLog)
-            .filter(ActivityLog.user_id == user_id)
-            .order_by(ActivityLog.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-            .all()
-        )
+        query = self.db.query(ActivityLog).filter(ActivityLog.user_id == user_id)
+        activities = paginate(query, ActivityLog, limit, cursor, offset, descending=True)
 
         # Return activities
-        return [self._activity_log_to_dto(activity) for activity in activities]
+        return Page(
+            [self._activity_log_to_dto(activity) for activity in activities],
+            activities.next_cursor,
+        )
 
     def _activity_log_to_dto(self, activity_log: ActivityLog) -> ActivityLogResponseDTO:
         """
@@ -0,0 +1,214 @@
+import asyncio
+import logging
+import os
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+from api.shared.models.project import ActivityLog
+from api.shared.utils.db import async_engine, database_lifespan
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Buffered activity writer configuration
+ACTIVITY_LOG_BUFFERED = os.getenv("ACTIVITY_LOG_BUFFERED", "false").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+ACTIVITY_LOG_BATCH_SIZE = int(os.getenv("ACTIVITY_LOG_BATCH_SIZE", "500"))
+ACTIVITY_LOG_FLUSH_INTERVAL = float(os.getenv("ACTIVITY_LOG_FLUSH_INTERVAL", "1.0"))
+# Rows kept while the database is unreachable; the oldest are dropped beyond it
+ACTIVITY_LOG_MAX_BUFFER = int(os.getenv("ACTIVITY_LOG_MAX_BUFFER", "50000"))
+
+# Session.info key of the activity rows waiting for the session to commit
+PENDING_ACTIVITIES_KEY = "pending_activities"
+
+
+class BufferedActivityWriter:
+    """
+    Writes activity log rows in batches, off the request path.
+
+    Rows are inserted with one multi-row INSERT whenever ``batch_size`` rows
+    are waiting or every ``flush_interval`` seconds, whichever comes first.
+    Activities only reach the writer once the session that logged them has
+    committed, so rolled-back work never shows up in the log.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine = async_engine,
+        batch_size: int = ACTIVITY_LOG_BATCH_SIZE,
+        flush_interval: float = ACTIVITY_LOG_FLUSH_INTERVAL,
+        max_buffer: int = ACTIVITY_LOG_MAX_BUFFER,
+    ):
+        """
+        Initialize BufferedActivityWriter.
+
+        Args:
+            engine (AsyncEngine, optional): Engine to write to. Defaults to async_engine.
+            batch_size (int, optional): Rows that trigger a flush. Defaults to ACTIVITY_LOG_BATCH_SIZE.
+            flush_interval (float, optional): Max seconds between flushes. Defaults to ACTIVITY_LOG_FLUSH_INTERVAL.
+            max_buffer (int, optional): Max rows kept in memory. Defaults to ACTIVITY_LOG_MAX_BUFFER.
+        """
+        self.engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer = max_buffer
+        self.written = 0
+        self.dropped = 0
+        self._buffer: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        """Whether the background flush task is running"""
+        return self._task is not None and not self._task.done()
+
+    def add(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Queue activity rows for insertion. Safe to call from any thread.
+
+        Args:
+            rows (List[Dict[str, Any]]): ActivityLog column values
+        """
+        with self._lock:
+            self._buffer.extend(rows)
+            overflow = len(self._buffer) - self.max_buffer
+            if overflow > 0:
+                del self._buffer[:overflow]
+                self.dropped += overflow
+            full = len(self._buffer) >= self.batch_size
+
+        if overflow > 0:
+            logger.warning(f"Activity log buffer full, dropped {overflow} rows")
+
+        if full and self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def start(self) -> None:
+        """Start the background flush task"""
+        if self.running:
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background flush task and write every buffered row"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.flush()
+
+    async def flush(self) -> int:
+        """
+        Insert the buffered rows in batches.
+
+        Returns:
+            int: Number of rows written
+        """
+        written = 0
+
+        while True:
+            with self._lock:
+                batch = self._buffer[: self.batch_size]
+                del self._buffer[: self.batch_size]
+
+            if not batch:
+                return written
+
+            try:
+                async with self.engine.begin() as connection:
+                    await connection.execute(insert(ActivityLog), batch)
+            except Exception as e:
+                # Put the batch back and retry on the next flush
+                logger.error(f"Error writing activity logs: {str(e)}")
+                with self._lock:
+                    self._buffer[:0] = batch
+                return written
+
+            written += len(batch)
+            self.written += len(batch)
+
+    async def _run(self) -> None:
+        """Flush when a batch is full or the flush interval elapses"""
+        assert self._wakeup is not None
+
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+
+            self._wakeup.clear()
+            await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get writer metrics.
+
+        Returns:
+            Dict[str, Any]: Buffered, written and dropped row counts
+        """
+        return {
+            "running": self.running,
+            "buffered": len(self._buffer),
+            "written": self.written,
+            "dropped": self.dropped,
+        }
+
+
+# Create global activity writer
+activity_writer = BufferedActivityWriter()
+
+
+@event.listens_for(Session, "after_commit")
+def _hand_over_committed_activities(session: Session) -> None:
+    """Pass the activities of a committed session to the writer"""
+    rows = session.info.pop(PENDING_ACTIVITIES_KEY, None)
+    if rows:
+        activity_writer.add(rows)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_activities(session: Session) -> None:
+    """Drop the activities of a rolled back session"""
+    session.info.pop(PENDING_ACTIVITIES_KEY, None)
+
+
+@asynccontextmanager
+async def activity_lifespan(app: Any) -> AsyncIterator[None]:
+    """
+    Database lifespan that also runs the buffered activity writer.
+
+    The writer is only started when ACTIVITY_LOG_BUFFERED is set. Buffered
+    rows are written on shutdown, before the engine is disposed.
+
+    Args:
+        app (Any): FastAPI app
+    """
+    async with database_lifespan(app):
+        if ACTIVITY_LOG_BUFFERED:
+            await activity_writer.start()
+        try:
+            yield
+        finally:
+            await activity_writer.stop()
@@ -0,0 +1,220 @@
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from api.shared.exceptions.project_exceptions import (
+    NotProjectMemberException,
+    ProjectNotFoundException,
+    TaskNotFoundException,
+)
+from api.shared.models.project import Project, ProjectMember, Task
+from api.shared.utils.membership_cache import membership_cache
+
+# Session.info key of the per-request access cache
+ACCESS_CACHE_KEY = "project_access"
+
+# Roles allowed to manage a project
+ADMIN_ROLES = ("owner", "admin")
+
+
+class ProjectAccess:
+    """Result of a project authorization check"""
+
+    def __init__(
+        self,
+        project_id: str,
+        user_id: str,
+        role: str,
+        project: Optional[Project] = None,
+        task: Optional[Task] = None,
+    ):
+        """
+        Initialize ProjectAccess.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID
+            role (str): Project role of the user ('owner', 'admin', 'member')
+            project (Project, optional): Project, when it was loaded with the check
+            task (Task, optional): Task, when it was loaded with the check
+        """
+        self.project_id = project_id
+        self.user_id = user_id
+        self.role = role
+        self.project = project
+        self.task = task
+
+    @property
+    def is_owner(self) -> bool:
+        """Whether the user owns the project"""
+        return self.role == "owner"
+
+    @property
+    def is_admin(self) -> bool:
+        """Whether the user can manage the project"""
+        return self.role in ADMIN_ROLES
+
+
+class ProjectAuthorizer:
+    """
+    Resolves project existence, membership and role in a single query.
+
+    Successful checks are cached in ``Session.info``, which lives as long as
+    the request's session, so every service sharing the session reuses them.
+    Roles are also kept in the process-wide ``membership_cache``, so requests
+    that only need the role skip the query altogether.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize ProjectAuthorizer.
+
+        Args:
+            db (Session): Database session
+        """
+        self.db = db
+
+    def authorize(
+        self, project_id: str, user_id: str, load_project: bool = False
+    ) -> ProjectAccess:
+        """
+        Check that a user is a member of a project.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID
+            load_project (bool, optional): Also load the project row. Defaults to False.
+
+        Returns:
+            ProjectAccess: Role of the user, plus the project if requested
+
+        Raises:
+            ProjectNotFoundException: If project not found
+            NotProjectMemberException: If user is not a project member
+        """
+        cache = self._get_cache()
+        key = (project_id, user_id)
+
+        if not load_project:
+            if key not in cache:
+                cached_role = membership_cache.get(project_id, user_id)
+                if cached_role is not None:
+                    cache[key] = cached_role
+            if key in cache:
+                return ProjectAccess(project_id, user_id, cache[key])
+
+        generation = membership_cache.generation
+        role = self._role_column(project_id, user_id)
+        if load_project:
+            query = self.db.query(Project, role)
+        else:
+            query = self.db.query(Project.id, role)
+        row = query.filter(Project.id == project_id, Project.deleted_at.is_(None)).first()
+
+        # Check if project exists
+        if row is None:
+            raise ProjectNotFoundException()
+
+        # Check if user is a project member
+        if row.role is None:
+            raise NotProjectMemberException()
+
+        cache[key] = row.role
+        membership_cache.set(project_id, user_id, row.role, generation)
+        return ProjectAccess(
+            project_id,
+            user_id,
+            row.role,
+            project=row.Project if load_project else None,
+        )
+
+    def authorize_task(
+        self, project_id: str, task_id: str, user_id: str
+    ) -> ProjectAccess:
+        """
+        Check that a user is a member of a project and load one of its tasks.
+
+        The task, the project and the role are fetched in one query; the project
+        is only looked up separately when the task does not exist.
+
+        Args:
+            project_id (str): Project ID
+            task_id (str): Task ID
+            user_id (str): User ID
+
+        Returns:
+            ProjectAccess: Role of the user and the task
+
+        Raises:
+            ProjectNotFoundException: If project not found
+            NotProjectMemberException: If user is not a project member
+            TaskNotFoundException: If task not found
+        """
+        generation = membership_cache.generation
+        row = (
+            self.db.query(Task, self._role_column(project_id, user_id))
+            .filter(Task.id == task_id, Task.project_id == project_id)
+            .first()
+        )
+
+        if row is None:
+            # Tell a missing project or membership apart from a missing task
+            self.authorize(project_id, user_id)
+            raise TaskNotFoundException()
+
+        # Check if user is a project member
+        if row.role is None:
+            # Tell a deleted project apart from a missing membership
+            self.authorize(project_id, user_id)
+            raise NotProjectMemberException()
+
+        self._get_cache()[(project_id, user_id)] = row.role
+        membership_cache.set(project_id, user_id, row.role, generation)
+        return ProjectAccess(project_id, user_id, row.role, task=row.Task)
+
+    def invalidate(self, project_id: str, user_id: Optional[str] = None) -> None:
+        """
+        Drop cached checks after a membership change, in every worker.
+
+        Call after the change is committed, so no worker caches the old role again.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str, optional): User ID. Defaults to every user of the project.
+        """
+        cache = self._get_cache()
+        for key in list(cache):
+            if key[0] == project_id and user_id in (None, key[1]):
+                del cache[key]
+        membership_cache.invalidate(project_id, user_id)
+
+    def _get_cache(self) -> Dict[Tuple[str, str], str]:
+        """
+        Get the access cache of the current session.
+
+        Returns:
+            Dict[Tuple[str, str], str]: (project ID, user ID) -> role
+        """
+        return self.db.info.setdefault(ACCESS_CACHE_KEY, {})
+
+    def _role_column(self, project_id: str, user_id: str):
+        """
+        Build the scalar subquery selecting the role of a user in a project.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID
+
+        Returns:
+            Label: ``role`` column, NULL if the user is not a member
+        """
+        return (
+            select(ProjectMember.role)
+            .where(
+                ProjectMember.project_id == project_id,
+                ProjectMember.user_id == user_id,
+            )
+            .scalar_subquery()
+            .label("role")
+        )
@@ -0,0 +1,339 @@
+import logging
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+from api.shared.models.document import Document, DocumentPermission, DocumentVersion
+from api.shared.models.external_tools import ExternalResource
+from api.shared.models.project import (
+    ActivityLog,
+    Project,
+    ProjectDeletion,
+    ProjectMember,
+    Task,
+    TaskCommandHistory,
+    TaskComment,
+    project_stats,
+    task_tags,
+)
+from api.shared.utils.content_store import ContentStore, content_store
+from api.shared.utils.db import SessionLocal
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Project purge configuration
+PROJECT_DELETE_BATCH_SIZE = int(os.getenv("PROJECT_DELETE_BATCH_SIZE", "500"))
+PROJECT_DELETE_STORAGE_WORKERS = int(os.getenv("PROJECT_DELETE_STORAGE_WORKERS", "8"))
+# Files removed per storage request
+STORAGE_DELETE_CHUNK_SIZE = 100
+
+
+def project_bucket(project_id: str) -> str:
+    """
+    Get the storage bucket of a project's files.
+
+    Args:
+        project_id (str): Project ID
+
+    Returns:
+        str: Bucket name
+    """
+    return f"project-{project_id}"
+
+
+def storage_path(url: Optional[str], bucket_name: str) -> Optional[str]:
+    """
+    Get the path of a stored file from its public URL.
+
+    Args:
+        url (Optional[str]): File URL
+        bucket_name (str): Bucket the file should be in
+
+    Returns:
+        Optional[str]: Path in the bucket, None for URLs outside it
+    """
+    if not url or f"/{bucket_name}/" not in url:
+        return None
+    return url.split(f"/{bucket_name}/", 1)[1].split("?", 1)[0] or None
+
+
+class ProjectPurger:
+    """
+    Purges a deleted project with set-based statements.
+
+    Rows are deleted in batches of ``batch_size`` tasks, documents or
+    activities, children first, each batch in its own transaction so locks
+    stay short and progress is visible to other sessions. The files of a
+    batch of documents are removed by a thread pool while the next batches
+    are deleted. Content-addressed version content is collected once its
+    last version is gone, whichever project it was shared with. Purging is
+    idempotent: a failed purge can simply be rerun.
+    """
+
+    def __init__(
+        self,
+        db: Session,
+        storage: Any = None,
+        batch_size: int = PROJECT_DELETE_BATCH_SIZE,
+        storage_workers: int = PROJECT_DELETE_STORAGE_WORKERS,
+        content: Optional[ContentStore] = None,
+    ):
+        """
+        Initialize ProjectPurger.
+
+        Args:
+            db (Session): Database session
+            storage (Any, optional): Storage with ``delete_files`` and ``delete_bucket``. Defaults to SupabaseManager.
+            batch_size (int, optional): Parent rows deleted per transaction. Defaults to PROJECT_DELETE_BATCH_SIZE.
+            storage_workers (int, optional): Parallel storage requests. Defaults to PROJECT_DELETE_STORAGE_WORKERS.
+            content (ContentStore, optional): Store of version content. Defaults to the global content store.
+        """
+        self.db = db
+        self.storage = storage
+        self.batch_size = batch_size
+        self.storage_workers = storage_workers
+        self.content = content or content_store
+
+    def purge(self, deletion_id: str) -> ProjectDeletion:
+        """
+        Delete a project, its dependent rows and its stored files.
+
+        Args:
+            deletion_id (str): Project deletion ID
+
+        Returns:
+            ProjectDeletion: Finished deletion, 'done' or 'failed'
+        """
+        deletion = self.db.get(ProjectDeletion, deletion_id)
+        deletion.status = "running"
+        deletion.error = None
+        self.db.commit()
+
+        with ThreadPoolExecutor(
+            max_workers=self.storage_workers, thread_name_prefix="project-purge"
+        ) as executor:
+            files: List[Future] = []
+            try:
+                self._purge_rows(deletion, executor, files)
+            except Exception as e:
+                logger.error(f"Error purging project {deletion.project_id}: {str(e)}")
+                self.db.rollback()
+                deletion.status = "failed"
+                deletion.error = str(e)
+            finally:
+                for future in files:
+                    deleted, failed = future.result()
+                    deletion.files_deleted += deleted
+                    deletion.files_failed += failed
+
+        if deletion.status == "running":
+            deletion.status = "done"
+            if files:
+                self._delete_bucket(deletion.project_id)
+        deletion.finished_at = datetime.now(timezone.utc)
+        self.db.commit()
+        return deletion
+
+    def _purge_rows(
+        self, deletion: ProjectDeletion, executor: ThreadPoolExecutor, files: List[Future]
+    ) -> None:
+        """
+        Delete the rows of a project, one committed batch at a time.
+
+        Args:
+            deletion (ProjectDeletion): Deletion to report progress to
+            executor (ThreadPoolExecutor): Pool removing stored files
+            files (List[Future]): Collects the (deleted, failed) counts of file removals
+        """
+        project_id = deletion.project_id
+        bucket_name = project_bucket(project_id)
+        # Files and version content of the current batch, removed once its rows are committed
+        paths: List[str] = []
+        content_hashes: List[str] = []
+
+        def delete_tasks(task_ids: List[str]) -> Dict[Any, Any]:
+            return {
+                TaskComment: TaskComment.task_id.in_(task_ids),
+                task_tags: task_tags.c.task_id.in_(task_ids),
+                TaskCommandHistory: TaskCommandHistory.task_id.in_(task_ids),
+                Task: Task.id.in_(task_ids),
+            }
+
+        def delete_documents(document_ids: List[str]) -> Dict[Any, Any]:
+            urls = self.db.scalars(
+                select(Document.url).where(Document.id.in_(document_ids))
+            ).all() + self.db.scalars(
+                select(DocumentVersion.url).where(
+                    DocumentVersion.document_id.in_(document_ids)
+                )
+            ).all()
+            paths[:] = sorted({path for url in urls if (path := storage_path(url, bucket_name))})
+            content_hashes[:] = self.db.scalars(
+                select(DocumentVersion.content_hash)
+                .where(
+                    DocumentVersion.document_id.in_(document_ids),
+                    DocumentVersion.content_hash.is_not(None),
+                )
+                .distinct()
+            ).all()
+
+            # Detach children in later batches and links from external tools
+            self.db.execute(
+                update(Document)
+                .where(Document.parent_id.in_(document_ids))
+                .values(parent_id=None)
+            )
+            self.db.execute(
+                update(ExternalResource)
+                .where(ExternalResource.document_id.in_(document_ids))
+                .values(document_id=None)
+            )
+            return {
+                DocumentVersion: DocumentVersion.document_id.in_(document_ids),
+                DocumentPermission: DocumentPermission.document_id.in_(document_ids),
+                Document: Document.id.in_(document_ids),
+            }
+
+        def delete_files() -> None:
+            for start in range(0, len(paths), STORAGE_DELETE_CHUNK_SIZE):
+                chunk = paths[start : start + STORAGE_DELETE_CHUNK_SIZE]
+                files.append(executor.submit(self._delete_files, bucket_name, chunk))
+            # Locks blob rows, so it runs on this session rather than in the pool
+            self.content.collect(self.db, content_hashes)
+
+        def delete_activities(activity_ids: List[str]) -> Dict[Any, Any]:
+            return {ActivityLog: ActivityLog.id.in_(activity_ids)}
+
+        self._delete_in_batches(deletion, Task.id, delete_tasks)
+        self._delete_in_batches(deletion, Document.id, delete_documents, delete_files)
+        self._delete_in_batches(deletion, ActivityLog.id, delete_activities)
+
+        self.db.execute(
+            update(ExternalResource)
+            .where(ExternalResource.project_id == project_id)
+            .values(project_id=None)
+        )
+        self._delete(
+            deletion,
+            {
+                project_stats: project_stats.c.project_id == project_id,
+                ProjectMember: ProjectMember.project_id == project_id,
+                Project: Project.id == project_id,
+            },
+        )
+        self.db.commit()
+
+    def _delete_in_batches(
+        self,
+        deletion: ProjectDeletion,
+        parent_id: Any,
+        deletes: Callable[[List[str]], Dict[Any, Any]],
+        after_commit: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """
+        Delete the rows of a project's table and their children, batch by batch.
+
+        Args:
+            deletion (ProjectDeletion): Deletion to report progress to
+            parent_id (Any): ID column of the table, which must have a project_id
+            deletes (Callable[[List[str]], Dict[Any, Any]]): Maps a batch of IDs to
+                the conditions of the tables to delete from, children first
+            after_commit (Callable[[], None], optional): Called after each batch. Defaults to None.
+        """
+        table = parent_id.class_
+        while True:
+            ids = self.db.scalars(
+                select(parent_id)
+                .where(table.project_id == deletion.project_id)
+                .limit(self.batch_size)
+            ).all()
+            if not ids:
+                return
+
+            self._delete(deletion, deletes(list(ids)))
+            self.db.commit()
+            if after_commit is not None:
+                after_commit()
+
+    def _delete(self, deletion: ProjectDeletion, conditions: Dict[Any, Any]) -> None:
+        """
+        Delete rows and count them in the deletion progress.
+
+        Args:
+            deletion (ProjectDeletion): Deletion to report progress to
+            conditions (Dict[Any, Any]): Table or model -> condition, children first
+        """
+        deleted_rows = dict(deletion.deleted_rows or {})
+        for target, condition in conditions.items():
+            result = self.db.execute(
+                delete(target).where(condition),
+                execution_options={"synchronize_session": False},
+            )
+            name = getattr(target, "__tablename__", None) or target.name
+            deleted_rows[name] = deleted_rows.get(name, 0) + result.rowcount
+        deletion.deleted_rows = deleted_rows
+
+    def _get_storage(self) -> Any:
+        """
+        Get the storage client, created on first use.
+
+        Returns:
+            Any: Storage client
+        """
+        if self.storage is None:
+            from api.shared.utils.supabase import SupabaseManager
+
+            self.storage = SupabaseManager()
+        return self.storage
+
+    def _delete_files(self, bucket_name: str, file_paths: List[str]) -> Tuple[int, int]:
+        """
+        Remove stored files; runs in the storage thread pool.
+
+        Args:
+            bucket_name (str): Bucket name
+            file_paths (List[str]): File paths in the bucket
+
+        Returns:
+            Tuple[int, int]: Number of files deleted and failed
+        """
+        try:
+            self._get_storage().delete_files(bucket_name, file_paths)
+        except Exception as e:
+            logger.error(f"Error deleting files from {bucket_name}: {str(e)}")
+            return 0, len(file_paths)
+        return len(file_paths), 0
+
+    def _delete_bucket(self, project_id: str) -> None:
+        """
+        Remove the emptied storage bucket of a project.
+
+        Args:
+            project_id (str): Project ID
+        """
+        try:
+            self._get_storage().delete_bucket(project_bucket(project_id))
+        except Exception as e:
+            logger.error(f"Error deleting bucket of project {project_id}: {str(e)}")
+
+
+def run_project_deletion(
+    deletion_id: str, session_factory: Callable[[], Session] = SessionLocal
+) -> None:
+    """
+    Purge a deleted project in the background, with a session of its own.
+
+    Args:
+        deletion_id (str): Project deletion ID
+        session_factory (Callable[[], Session], optional): Session factory. Defaults to SessionLocal.
+    """
+    with session_factory() as db:
+        ProjectPurger(db).purge(deletion_id)
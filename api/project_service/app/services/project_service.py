@@ -1,24 +1,41 @@
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
 from api.project_service.app.schemas.project import (
     ProjectCreateDTO,
+    ProjectDeletionResponseDTO,
     ProjectMemberCreateDTO,
     ProjectMemberResponseDTO,
     ProjectMemberUpdateDTO,
     ProjectResponseDTO,
+    ProjectStatsDTO,
     ProjectStatus,
     ProjectUpdateDTO,
 )
 from api.project_service.app.services.activity_service import ActivityService
+from api.project_service.app.services.project_authorizer import ProjectAuthorizer
+from api.project_service.app.services.project_stats import (
+    COMMENTS,
+    TASKS,
+    UNASSIGNED,
+    StatKey,
+    get_project_stats,
+    rebuild_project_stats,
+)
 from api.shared.exceptions.project_exceptions import (
     InsufficientProjectRoleException,
-    NotProjectMemberException,
     ProjectNotFoundException,
 )
-from api.shared.models.project import Project, ProjectMember
+from api.shared.models.project import (
+    Project,
+    ProjectDeletion,
+    ProjectMember,
+)
+from api.shared.utils.etag import make_etag
+from api.shared.utils.pagination import Page, paginate
 
 
 class ProjectService:
@@ -33,6 +50,7 @@ class ProjectService:
         """
         self.db = db
         self.activity_service = ActivityService(db)
+        self.authorizer = ProjectAuthorizer(db)
 
     def create_project(
         self, project_data: ProjectCreateDTO, user_id: str
@@ -55,7 +73,7 @@ class ProjectService:
             end_date=project_data.end_date,
             status=project_data.status,
             owner_id=user_id,
-            tags=(project_data.tags or {}),
+            tags=(project_data.tags or []),
             meta_data=(project_data.meta_data or {}),
         )
 
@@ -73,8 +91,6 @@ class ProjectService:
 
         # Add project member to database
         self.db.add(project_member)
-        self.db.commit()
-        self.db.refresh(project)
 
         # Log activity
         self.activity_service.log_activity(
@@ -86,6 +102,9 @@ class ProjectService:
             details={"name": project.name},
         )
 
+        self.db.commit()
+        self.db.refresh(project)
+
         # Return project
         return self._project_to_dto(project)
 
@@ -104,27 +123,35 @@ class ProjectService:
             ProjectNotFoundException: If project not found
             NotProjectMemberException: If user is not a project member
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
+        # Check if user is a project member and get project
+        access = self.authorizer.authorize(project_id, user_id, load_project=True)
+        project = access.project
 
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
+        # Return project
+        return self._project_to_dto(project)
 
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
+    def get_project_etag(self, project_id: str, user_id: str) -> str:
+        """
+        Get the ETag of a project without loading it.
 
-        if not project_member:
-            raise NotProjectMemberException()
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID
 
-        # Return project
-        return self._project_to_dto(project)
+        Returns:
+            str: ETag, changing whenever the project is updated
+
+        Raises:
+            ProjectNotFoundException: If project not found
+            NotProjectMemberException: If user is not a project member
+        """
+        # Check if user is a project member
+        self.authorizer.authorize(project_id, user_id)
+
+        version = self.db.execute(
+            select(Project.created_at, Project.updated_at).where(Project.id == project_id)
+        ).one()
+        return make_etag(project_id, *version)
 
     def update_project(
         self, project_id: str, project_data: ProjectUpdateDTO, user_id: str
@@ -145,27 +172,12 @@ class ProjectService:
             NotProjectMemberException: If user is not a project member
             InsufficientProjectRoleException: If user has insufficient role
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
+        # Check if user is a project member and get project
+        access = self.authorizer.authorize(project_id, user_id, load_project=True)
+        project = access.project
 
         # Check if user has sufficient role
-        if project_member.role not in ["owner", "admin"]:
+        if not access.is_admin:
             raise InsufficientProjectRoleException()
 
         # Update project
@@ -192,8 +204,6 @@ class ProjectService:
 
         # Update project in database
         project.updated_at = datetime.now(timezone.utc)
-        self.db.commit()
-        self.db.refresh(project)
 
         # Log activity
         self.activity_service.log_activity(
@@ -202,9 +212,12 @@ class ProjectService:
             action="update",
             entity_type="project",
             entity_id=str(project.id),
-            details=project_data.model_dump_json(exclude_none=True),
+            details=project_data.model_dump(mode="json", exclude_none=True),
         )
 
+        self.db.commit()
+        self.db.refresh(project)
+
         # Return project
         return self._project_to_dto(project)
 
@@ -212,83 +225,101 @@ class ProjectService:
         """
         Delete a project.
 
+        The project is hidden and its members removed at once; its tasks,
+        documents, activities and files are purged by ProjectPurger, usually
+        in the background.
+
         Args:
             project_id (str): Project ID
             user_id (str): User ID
 
         Returns:
-            Dict[str, Any]: Delete response
+            Dict[str, Any]: Delete response, with the ID of the purge job
 
         Raises:
             ProjectNotFoundException: If project not found
             NotProjectMemberException: If user is not a project member
             InsufficientProjectRoleException: If user has insufficient role
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
+        # Check if user is a project member and get project
+        access = self.authorizer.authorize(project_id, user_id, load_project=True)
+        project = access.project
 
         # Check if user has sufficient role
-        if project_member.role != "owner":
+        if not access.is_owner:
             raise InsufficientProjectRoleException(
                 "Only project owner can delete the project"
             )
 
-        # Log activity before deletion
-        self.activity_service.log_activity(
-            project_id=project.id,
-            user_id=user_id,
-            action="delete",
-            entity_type="project",
-            entity_id=str(project.id),
-            details=None,
-        )
-
-        # Delete project
-        self.db.delete(project)
+        # No activity is logged: the project's log is purged with it
+        project.deleted_at = datetime.now(timezone.utc)
+        self.db.execute(delete(ProjectMember).where(ProjectMember.project_id == project_id))
+        deletion = ProjectDeletion(project_id=project_id, user_id=user_id, deleted_rows={})
+        self.db.add(deletion)
         self.db.commit()
+        self.authorizer.invalidate(project_id)
 
         # Return success response
-        return {"message": "Project deleted successfully"}
+        return {"message": "Project deleted successfully", "deletion_id": deletion.id}
 
-    def get_user_projects(self, user_id: str) -> List[ProjectResponseDTO]:
+    def get_project_deletion(
+        self, project_id: str, user_id: str
+    ) -> ProjectDeletionResponseDTO:
         """
-        Get projects for a user.
+        Get the progress of the purge of a deleted project.
 
         Args:
+            project_id (str): Project ID
             user_id (str): User ID
 
         Returns:
-            List[ProjectResponseDTO]: List of projects
+            ProjectDeletionResponseDTO: Latest deletion of the project
+
+        Raises:
+            ProjectNotFoundException: If the user did not delete the project
         """
-        # Get project members for user
-        project_members = (
-            self.db.query(ProjectMember).filter(ProjectMember.user_id == user_id).all()
+        deletion = self.db.scalar(
+            select(ProjectDeletion)
+            .where(
+                ProjectDeletion.project_id == project_id,
+                ProjectDeletion.user_id == user_id,
+            )
+            .order_by(ProjectDeletion.created_at.desc())
+            .limit(1)
         )
 
-        # Get project IDs
-        project_ids = [member.project_id for member in project_members]
+        if deletion is None:
+            raise ProjectNotFoundException("Project deletion not found")
 
-        # Get projects
-        projects = self.db.query(Project).filter(Project.id.in_(project_ids)).all()
+        return self._deletion_to_dto(deletion)
+
+    def get_user_projects(
+        self, user_id: str, limit: int = 100, cursor: Optional[str] = None
+    ) -> Page[ProjectResponseDTO]:
+        """
+        Get projects for a user.
+
+        Args:
+            user_id (str): User ID
+            limit (int, optional): Limit. Defaults to 100.
+            cursor (str, optional): Cursor of the page to get. Defaults to None.
+
+        Returns:
+            Page[ProjectResponseDTO]: Projects, oldest first, and the next cursor
+        """
+        # Get projects the user is a member of
+        query = (
+            self.db.query(Project)
+            .join(ProjectMember, ProjectMember.project_id == Project.id)
+            .filter(ProjectMember.user_id == user_id, Project.deleted_at.is_(None))
+        )
+        projects = paginate(query, Project, limit, cursor)
 
         # Return projects
-        return [self._project_to_dto(project) for project in projects]
+        return Page(
+            [self._project_to_dto(project) for project in projects],
+            projects.next_cursor,
+        )
 
     def add_project_member(
         self, project_id: str, member_data: ProjectMemberCreateDTO, user_id: str
@@ -309,27 +340,11 @@ class ProjectService:
             NotProjectMemberException: If user is not a project member
             InsufficientProjectRoleException: If user has insufficient role
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
         # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
+        access = self.authorizer.authorize(project_id, user_id)
 
         # Check if user has sufficient role
-        if project_member.role not in ["owner", "admin"]:
+        if not access.is_admin:
             raise InsufficientProjectRoleException()
 
         # Check if member already exists
@@ -345,8 +360,6 @@ class ProjectService:
         if existing_member:
             # Update role if member already exists
             existing_member.role = member_data.role
-            self.db.commit()
-            self.db.refresh(existing_member)
 
             # Log activity
             self.activity_service.log_activity(
@@ -358,6 +371,10 @@ class ProjectService:
                 details={"user_id": member_data.user_id, "role": member_data.role},
             )
 
+            self.db.commit()
+            self.authorizer.invalidate(project_id, member_data.user_id)
+            self.db.refresh(existing_member)
+
             # Return member
             return self._project_member_to_dto(existing_member)
 
@@ -371,8 +388,7 @@ class ProjectService:
 
         # Add project member to database
         self.db.add(new_member)
-        self.db.commit()
-        self.db.refresh(new_member)
+        self.db.flush()
 
         # Log activity
         self.activity_service.log_activity(
@@ -384,6 +400,10 @@ class ProjectService:
             details={"user_id": member_data.user_id, "role": member_data.role},
         )
 
+        self.db.commit()
+        self.authorizer.invalidate(project_id, member_data.user_id)
+        self.db.refresh(new_member)
+
         # Return member
         return self._project_member_to_dto(new_member)
 
@@ -411,27 +431,11 @@ class ProjectService:
             NotProjectMemberException: If user is not a project member
             InsufficientProjectRoleException: If user has insufficient role
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
         # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
+        access = self.authorizer.authorize(project_id, user_id)
 
         # Check if user has sufficient role
-        if project_member.role not in ["owner", "admin"]:
+        if not access.is_admin:
             raise InsufficientProjectRoleException()
 
         # Get member to update
@@ -449,15 +453,13 @@ class ProjectService:
         # Check if trying to change owner role
         if member_to_update.role == "owner" and member_data.role != "owner":
             # Only owner can transfer ownership
-            if project_member.role != "owner":
+            if not access.is_owner:
                 raise InsufficientProjectRoleException(
                     "Only project owner can transfer ownership"
                 )
 
         # Update member
         member_to_update.role = member_data.role
-        self.db.commit()
-        self.db.refresh(member_to_update)
 
         # Log activity
         self.activity_service.log_activity(
@@ -469,6 +471,10 @@ class ProjectService:
             details={"role": member_data.role},
         )
 
+        self.db.commit()
+        self.authorizer.invalidate(project_id, member_to_update.user_id)
+        self.db.refresh(member_to_update)
+
         # Return member
         return self._project_member_to_dto(member_to_update)
 
@@ -491,24 +497,8 @@ class ProjectService:
             NotProjectMemberException: If user is not a project member
             InsufficientProjectRoleException: If user has insufficient role
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
         # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
+        access = self.authorizer.authorize(project_id, user_id)
 
         # Get member to remove
         member_to_remove = (
@@ -527,10 +517,7 @@ class ProjectService:
             raise InsufficientProjectRoleException("Cannot remove project owner")
 
         # Check if user has sufficient role
-        if (
-            project_member.role not in ["owner", "admin"]
-            and project_member.id != member_id
-        ):
+        if not access.is_admin and member_to_remove.user_id != user_id:
             raise InsufficientProjectRoleException()
 
         # Log activity before deletion
@@ -539,13 +526,14 @@ class ProjectService:
             user_id=user_id,
             action="remove_member",
             entity_type="project_member",
-            entity_id=str(project_member.id),
+            entity_id=str(member_to_remove.id),
             details=None,
         )
 
         # Remove member
         self.db.delete(member_to_remove)
         self.db.commit()
+        self.authorizer.invalidate(project_id, member_to_remove.user_id)
 
         # Return success response
         return {"message": "Project member removed successfully"}
@@ -567,24 +555,8 @@ class ProjectService:
             ProjectNotFoundException: If project not found
             NotProjectMemberException: If user is not a project member
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
         # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
+        self.authorizer.authorize(project_id, user_id)
 
         # Get project members
         project_members = (
@@ -596,6 +568,87 @@ class ProjectService:
         # Return project members
         return [self._project_member_to_dto(member) for member in project_members]
 
+    def get_project_stats(self, project_id: str, user_id: str) -> ProjectStatsDTO:
+        """
+        Get the dashboard counters of a project.
+
+        Counters are kept up to date by every task and comment write, so this
+        reads them in one indexed query however many tasks the project has.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID
+
+        Returns:
+            ProjectStatsDTO: Project counters
+
+        Raises:
+            ProjectNotFoundException: If project not found
+            NotProjectMemberException: If user is not a project member
+        """
+        # Check if user is a project member
+        self.authorizer.authorize(project_id, user_id)
+
+        return self._stats_to_dto(project_id, get_project_stats(self.db, project_id))
+
+    def rebuild_project_stats(self, project_id: str, user_id: str) -> ProjectStatsDTO:
+        """
+        Recompute the dashboard counters of a project from its tasks and comments.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID
+
+        Returns:
+            ProjectStatsDTO: Rebuilt project counters
+
+        Raises:
+            ProjectNotFoundException: If project not found
+            NotProjectMemberException: If user is not a project member
+            InsufficientProjectRoleException: If user has insufficient role
+        """
+        # Check if user has sufficient role
+        access = self.authorizer.authorize(project_id, user_id)
+        if not access.is_admin:
+            raise InsufficientProjectRoleException()
+
+        counters = rebuild_project_stats(self.db, project_id)
+        self.db.commit()
+
+        return self._stats_to_dto(project_id, counters)
+
+    def _stats_to_dto(
+        self, project_id: str, counters: Dict[StatKey, int]
+    ) -> ProjectStatsDTO:
+        """
+        Convert project counters to ProjectStatsDTO.
+
+        Args:
+            project_id (str): Project ID
+            counters (Dict[StatKey, int]): Value by counter key
+
+        Returns:
+            ProjectStatsDTO: Project counters
+        """
+        today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+        stats = ProjectStatsDTO(
+            project_id=project_id,
+            task_count=counters.get(TASKS, 0),
+            comment_count=counters.get(COMMENTS, 0),
+        )
+        for (name, key), value in counters.items():
+            if not value:
+                continue
+            if name == "status":
+                stats.status_counts[key] = value
+            elif name == "assignee" and key == UNASSIGNED:
+                stats.unassigned_count = value
+            elif name == "assignee":
+                stats.assignee_counts[key] = value
+            elif name == "open_due" and key < today:
+                stats.overdue_count += value
+        return stats
+
     def _project_to_dto(self, project: Project) -> ProjectResponseDTO:
         """
         Convert Project model to ProjectResponseDTO.
@@ -639,3 +692,25 @@ class ProjectService:
             role=project_member.role,
             joined_at=project_member.joined_at,
         )
+
+    def _deletion_to_dto(self, deletion: ProjectDeletion) -> ProjectDeletionResponseDTO:
+        """
+        Convert ProjectDeletion model to ProjectDeletionResponseDTO.
+
+        Args:
+            deletion (ProjectDeletion): ProjectDeletion model
+
+        Returns:
+            ProjectDeletionResponseDTO: ProjectDeletion DTO
+        """
+        return ProjectDeletionResponseDTO(
+            id=deletion.id,
+            project_id=deletion.project_id,
+            status=deletion.status,
+            deleted_rows=deletion.deleted_rows or {},
+            files_deleted=deletion.files_deleted or 0,
+            files_failed=deletion.files_failed or 0,
+            error=deletion.error,
+            created_at=deletion.created_at,
+            finished_at=deletion.finished_at,
+        )
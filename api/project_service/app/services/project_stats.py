@@ -0,0 +1,218 @@
+from collections import Counter
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from sqlalchemy import String, cast, delete, func, insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from api.shared.models.project import Task, TaskComment, project_stats
+
+# Counters are keyed by (name, key):
+#   ("tasks", "")            every task
+#   ("status", status)       tasks per status
+#   ("assignee", user_id)    tasks per assignee, "" for unassigned ones
+#   ("open_due", date)       tasks not done per due date (YYYY-MM-DD), so
+#                            overdue tasks can be counted whatever the day
+#   ("comments", "")         every comment
+StatKey = Tuple[str, str]
+TASKS: StatKey = ("tasks", "")
+COMMENTS: StatKey = ("comments", "")
+UNASSIGNED = ""
+
+# Task fields the counters depend on
+STATS_FIELDS = ("status", "assignee_id", "due_date")
+
+DONE_STATUS = "done"
+
+
+def task_state(task: Task) -> Dict[str, Any]:
+    """
+    Get the fields of a task the counters depend on.
+
+    Args:
+        task (Task): Task
+
+    Returns:
+        Dict[str, Any]: Field values
+    """
+    return {field: getattr(task, field) for field in STATS_FIELDS}
+
+
+def task_counters(task: Optional[Mapping[str, Any]]) -> Counter:
+    """
+    Get the counters one task adds to.
+
+    Args:
+        task (Optional[Mapping[str, Any]]): Task fields (see STATS_FIELDS), None for no task
+
+    Returns:
+        Counter: Count by counter key
+    """
+    counters: Counter = Counter()
+    if task is None:
+        return counters
+
+    counters[TASKS] += 1
+    counters[("status", _value(task["status"]))] += 1
+    counters[("assignee", task["assignee_id"] or UNASSIGNED)] += 1
+    if task["due_date"] is not None and _value(task["status"]) != DONE_STATUS:
+        counters[("open_due", _day(task["due_date"]))] += 1
+    return counters
+
+
+def task_delta(
+    before: Optional[Mapping[str, Any]], after: Optional[Mapping[str, Any]]
+) -> Counter:
+    """
+    Get the counter changes of a task write.
+
+    Args:
+        before (Optional[Mapping[str, Any]]): Task fields before, None when created
+        after (Optional[Mapping[str, Any]]): Task fields after, None when deleted
+
+    Returns:
+        Counter: Change by counter key, possibly negative
+    """
+    delta = task_counters(after)
+    delta.subtract(task_counters(before))
+    return delta
+
+
+def update_project_stats(db: Session, project_id: str, delta: Counter) -> None:
+    """
+    Add changes to the counters of a project.
+
+    Must be called, in the same transaction, wherever tasks or comments are
+    written. Counters are incremented in place with one upsert, so concurrent
+    writers never lose each other's changes; rows are written in key order so
+    they also lock in the same order.
+
+    Args:
+        db (Session): Database session
+        project_id (str): Project ID
+        delta (Counter): Change by counter key
+    """
+    rows = [
+        {"project_id": project_id, "name": name, "key": key, "value": value}
+        for (name, key), value in sorted(delta.items())
+        if value
+    ]
+    if not rows:
+        return
+
+    dialect = db.get_bind().dialect.name
+    statement = (postgresql if dialect == "postgresql" else sqlite).insert(project_stats)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=["project_id", "name", "key"],
+            set_={"value": project_stats.c.value + statement.excluded.value},
+        ),
+        rows,
+    )
+
+
+def get_project_stats(db: Session, project_id: str) -> Dict[StatKey, int]:
+    """
+    Get the counters of a project.
+
+    Args:
+        db (Session): Database session
+        project_id (str): Project ID
+
+    Returns:
+        Dict[StatKey, int]: Value by counter key
+    """
+    rows = db.execute(
+        select(project_stats.c.name, project_stats.c.key, project_stats.c.value).where(
+            project_stats.c.project_id == project_id
+        )
+    )
+    return {(name, key): value for name, key, value in rows}
+
+
+def count_project_stats(db: Session, project_id: str) -> Counter:
+    """
+    Count the counters of a project from the tasks and comments themselves.
+
+    Args:
+        db (Session): Database session
+        project_id (str): Project ID
+
+    Returns:
+        Counter: Count by counter key
+    """
+    counters: Counter = Counter()
+
+    due_day = cast(func.date(Task.due_date), String)
+    rows = db.execute(
+        select(Task.status, Task.assignee_id, due_day, func.count())
+        .where(Task.project_id == project_id)
+        .group_by(Task.status, Task.assignee_id, due_day)
+    )
+    for status, assignee_id, due_date, count in rows:
+        task = {"status": status, "assignee_id": assignee_id, "due_date": due_date}
+        for key, value in task_counters(task).items():
+            counters[key] += value * count
+
+    counters[COMMENTS] = db.scalar(
+        select(func.count())
+        .select_from(TaskComment)
+        .join(Task, TaskComment.task_id == Task.id)
+        .where(Task.project_id == project_id)
+    )
+    return +counters
+
+
+def rebuild_project_stats(db: Session, project_id: str) -> Dict[StatKey, int]:
+    """
+    Recompute the counters of a project from scratch, repairing any drift.
+
+    Args:
+        db (Session): Database session
+        project_id (str): Project ID
+
+    Returns:
+        Dict[StatKey, int]: Value by counter key
+    """
+    counters = count_project_stats(db, project_id)
+
+    db.execute(delete(project_stats).where(project_stats.c.project_id == project_id))
+    if counters:
+        db.execute(
+            insert(project_stats),
+            [
+                {"project_id": project_id, "name": name, "key": key, "value": value}
+                for (name, key), value in sorted(counters.items())
+            ],
+        )
+    return dict(counters)
+
+
+def _value(value: Any) -> Any:
+    """
+    Get the plain value of a field, which may be an enum member.
+
+    Args:
+        value (Any): Field value
+
+    Returns:
+        Any: Plain value
+    """
+    return value.value if isinstance(value, Enum) else value
+
+
+def _day(value: Any) -> str:
+    """
+    Get the day of a due date.
+
+    Args:
+        value (Any): Datetime, date, or ISO string of either
+
+    Returns:
+        str: Day as YYYY-MM-DD
+    """
+    if isinstance(value, (datetime, date)):
+        return value.strftime("%Y-%m-%d")
+    return str(value)[:10]
@@ -0,0 +1,370 @@
+import html
+import re
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import (
+    String,
+    column,
+    exists,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    table,
+    union_all,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import ColumnElement, FromClause, Select
+
+from api.project_service.app.schemas.search import SearchEntityType, SearchResultDTO
+from api.project_service.app.services.project_authorizer import (
+    ProjectAccess,
+    ProjectAuthorizer,
+)
+from api.shared.exceptions.project_exceptions import InvalidSearchQueryException
+from api.shared.models.base import Base
+from api.shared.models.document import Document, DocumentPermission
+from api.shared.models.project import Task, TaskComment
+from api.shared.models.search import (
+    SEARCH_COLUMNS,
+    SEARCH_CONFIG,
+    fts_table,
+    search_vector,
+)
+from api.shared.utils.pagination import Page, SortKey, paginate_select
+
+# Search terms; anything else in a query is ignored, so FTS5 and tsquery
+# syntax never reaches the database
+TERM_PATTERN = re.compile(r"\w+")
+
+# Max terms of a search query
+MAX_SEARCH_TERMS = 16
+
+# bm25 column weights on SQLite, matching the A, B, C weights of ts_rank
+SEARCH_WEIGHTS = (1.0, 0.4, 0.2)
+
+# Highlighting of the matching terms in snippets. The database marks them
+# with private-use characters, which are turned into the tags once the text
+# around them is HTML-escaped
+SNIPPET_START = "<b>"
+SNIPPET_STOP = "</b>"
+SNIPPET_START_MARK = "\ue000"
+SNIPPET_STOP_MARK = "\ue001"
+SNIPPET_WORDS = 16
+
+# Indexed table of each entity type
+ENTITY_TABLES = {
+    SearchEntityType.TASK: "tasks",
+    SearchEntityType.COMMENT: "task_comments",
+    SearchEntityType.DOCUMENT: "documents",
+}
+
+# (FROM clause, match condition, score, snippet) of one searched table
+Match = Tuple[FromClause, ColumnElement, ColumnElement, ColumnElement]
+
+
+class SearchService:
+    """
+    Ranked full-text search over the tasks, comments and documents of a
+    project.
+
+    Matching and ranking run on the search indexes of
+    ``api.shared.models.search`` (FTS5 on SQLite, tsvector on Postgres), which
+    the database keeps up to date on every write. Each entity type is matched
+    separately and the union is ranked and paginated with a keyset cursor on
+    (score, entity type, ID); cursors stay valid as long as the index does not
+    change between pages. Snippets are only built for the rows of the page.
+    """
+
+    def __init__(self, db: Session):
+        """
+        Initialize SearchService.
+
+        Args:
+            db (Session): Database session
+        """
+        self.db = db
+        self.authorizer = ProjectAuthorizer(db)
+
+    def search(
+        self,
+        project_id: str,
+        user_id: str,
+        query: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        types: Optional[List[SearchEntityType]] = None,
+    ) -> Page[SearchResultDTO]:
+        """
+        Search a project.
+
+        Every term of the query must match. Documents the user cannot view are
+        left out, unless the user can manage the project.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID
+            query (str): Search query
+            limit (int, optional): Limit. Defaults to 20.
+            cursor (str, optional): Cursor of the page to get. Defaults to None.
+            types (List[SearchEntityType], optional): Entity types to search. Defaults to None (all).
+
+        Returns:
+            Page[SearchResultDTO]: Results, most relevant first, and the next cursor
+
+        Raises:
+            ProjectNotFoundException: If project not found
+            NotProjectMemberException: If user is not a project member
+            InvalidSearchQueryException: If the query has no searchable terms
+            InvalidCursorException: If the cursor is malformed
+        """
+        # Check if user is a project member
+        access = self.authorizer.authorize(project_id, user_id)
+
+        terms = TERM_PATTERN.findall(query)[:MAX_SEARCH_TERMS]
+        if not terms:
+            raise InvalidSearchQueryException()
+
+        searches = {
+            SearchEntityType.TASK: self._search_tasks,
+            SearchEntityType.COMMENT: self._search_comments,
+            SearchEntityType.DOCUMENT: self._search_documents,
+        }
+        results = union_all(
+            *[
+                searches[entity_type](access, terms)
+                for entity_type in dict.fromkeys(types or SearchEntityType)
+            ]
+        ).subquery()
+
+        rows = paginate_select(
+            self.db,
+            select(results),
+            [
+                SortKey(results.c.score, descending=True),
+                SortKey(results.c.entity_type, descending=True),
+                SortKey(results.c.entity_id, descending=True),
+            ],
+            limit,
+            cursor,
+        )
+
+        # Highlight the matches of the page only
+        snippets = {}
+        for entity_type, table_name in ENTITY_TABLES.items():
+            ids = [row["entity_id"] for row in rows if row["entity_type"] == entity_type]
+            if ids:
+                snippets.update(self._get_snippets(table_name, terms, ids))
+
+        return Page(
+            [
+                SearchResultDTO(
+                    entity_type=row["entity_type"],
+                    entity_id=row["entity_id"],
+                    task_id=row["task_id"],
+                    title=row["title"],
+                    snippet=snippets.get(row["entity_id"]),
+                    score=row["score"],
+                )
+                for row in rows
+            ],
+            rows.next_cursor,
+        )
+
+    def _search_tasks(self, access: ProjectAccess, terms: List[str]) -> Select:
+        """
+        Select the tasks of a project matching the terms.
+
+        Args:
+            access (ProjectAccess): Access of the user to the project
+            terms (List[str]): Search terms
+
+        Returns:
+            Select: Search results
+        """
+        from_clause, condition, score, _ = self._match("tasks", terms)
+        return (
+            select(
+                literal(SearchEntityType.TASK.value).label("entity_type"),
+                Task.id.label("entity_id"),
+                Task.id.label("task_id"),
+                Task.title.label("title"),
+                score.label("score"),
+            )
+            .select_from(from_clause)
+            .where(condition, self._in_project(Task.project_id, access))
+        )
+
+    def _search_comments(self, access: ProjectAccess, terms: List[str]) -> Select:
+        """
+        Select the task comments of a project matching the terms.
+
+        Args:
+            access (ProjectAccess): Access of the user to the project
+            terms (List[str]): Search terms
+
+        Returns:
+            Select: Search results
+        """
+        from_clause, condition, score, _ = self._match("task_comments", terms)
+        return (
+            select(
+                literal(SearchEntityType.COMMENT.value).label("entity_type"),
+                TaskComment.id.label("entity_id"),
+                TaskComment.task_id.label("task_id"),
+                Task.title.label("title"),
+                score.label("score"),
+            )
+            .select_from(from_clause.join(Task, TaskComment.task_id == Task.id))
+            .where(condition, self._in_project(Task.project_id, access))
+        )
+
+    def _search_documents(self, access: ProjectAccess, terms: List[str]) -> Select:
+        """
+        Select the documents of a project matching the terms that the user
+        can view.
+
+        Args:
+            access (ProjectAccess): Access of the user to the project
+            terms (List[str]): Search terms
+
+        Returns:
+            Select: Search results
+        """
+        from_clause, condition, score, _ = self._match("documents", terms)
+        statement = (
+            select(
+                literal(SearchEntityType.DOCUMENT.value).label("entity_type"),
+                Document.id.label("entity_id"),
+                literal(None, String).label("task_id"),
+                Document.name.label("title"),
+                score.label("score"),
+            )
+            .select_from(from_clause)
+            .where(condition, self._in_project(Document.project_id, access))
+        )
+
+        # Owners and admins can view every document
+        if not access.is_admin:
+            statement = statement.where(
+                or_(
+                    Document.creator_id == access.user_id,
+                    exists().where(
+                        DocumentPermission.document_id == Document.id,
+                        DocumentPermission.user_id == access.user_id,
+                        DocumentPermission.can_view.is_(True),
+                    ),
+                )
+            )
+
+        return statement
+
+    def _get_snippets(
+        self, table_name: str, terms: List[str], ids: List[str]
+    ) -> Dict[str, str]:
+        """
+        Get the highlighted matching text of rows, HTML-escaped.
+
+        Args:
+            table_name (str): Indexed table
+            terms (List[str]): Search terms
+            ids (List[str]): Row IDs
+
+        Returns:
+            Dict[str, str]: Snippet by row ID
+        """
+        from_clause, condition, _, snippet = self._match(table_name, terms)
+        id_column = Base.metadata.tables[table_name].c.id
+        return {
+            row_id: _highlight(text)
+            for row_id, text in self.db.execute(
+                select(id_column, snippet)
+                .select_from(from_clause)
+                .where(condition, id_column.in_(ids))
+            )
+            if text is not None
+        }
+
+    def _in_project(self, column: ColumnElement, access: ProjectAccess) -> ColumnElement:
+        """
+        Build the project filter of a search.
+
+        On SQLite the project_id index is hidden from the planner: using it
+        would run the full-text match once per row of the project instead of
+        once per search.
+
+        Args:
+            column (ColumnElement): Project ID column
+            access (ProjectAccess): Access of the user to the project
+
+        Returns:
+            ColumnElement: Condition
+        """
+        if self.db.get_bind().dialect.name == "sqlite":
+            column = column.op("||")("")
+        return column == access.project_id
+
+    def _match(self, table_name: str, terms: List[str]) -> Match:
+        """
+        Build the full-text match of a table for the database in use.
+
+        Args:
+            table_name (str): Indexed table
+            terms (List[str]): Search terms, all required
+
+        Returns:
+            Match: FROM clause, match condition, score and snippet
+        """
+        columns = SEARCH_COLUMNS[table_name]
+        indexed = Base.metadata.tables[table_name]
+
+        if self.db.get_bind().dialect.name == "sqlite":
+            fts = table(fts_table(table_name), column("rowid"))
+            fts_column = literal_column(fts_table(table_name))
+            return (
+                fts.join(indexed, literal_column(f"{table_name}.rowid") == fts.c.rowid),
+                fts_column.op("MATCH")(" ".join(f'"{term}"' for term in terms)),
+                # bm25 is lower for better matches
+                -func.bm25(fts_column, *SEARCH_WEIGHTS[: len(columns)]),
+                func.snippet(
+                    fts_column, -1, SNIPPET_START_MARK, SNIPPET_STOP_MARK, "…", SNIPPET_WORDS
+                ),
+            )
+
+        # Postgres: the expressions must match the GIN index for it to be used
+        config = literal_column(f"'{SEARCH_CONFIG}'")
+        vector = literal_column(f"({search_vector(table_name, qualified=True)})")
+        tsquery = func.plainto_tsquery(config, " ".join(terms))
+        text = func.concat_ws(
+            " ", *[literal_column(f"{table_name}.{name}::text") for name in columns]
+        )
+        return (
+            indexed,
+            vector.op("@@")(tsquery),
+            func.ts_rank(vector, tsquery),
+            func.ts_headline(
+                config,
+                text,
+                tsquery,
+                f"StartSel={SNIPPET_START_MARK}, StopSel={SNIPPET_STOP_MARK}, "
+                f"MaxWords={SNIPPET_WORDS}, MinWords={SNIPPET_WORDS // 2}",
+            ),
+        )
+
+
+def _highlight(text: str) -> str:
+    """
+    Escape a snippet as HTML, then turn its match marks into tags.
+
+    Args:
+        text (str): Snippet with SNIPPET_START_MARK and SNIPPET_STOP_MARK
+
+    Returns:
+        str: HTML-escaped snippet, matches wrapped in SNIPPET_START and SNIPPET_STOP
+    """
+    return (
+        html.escape(text)
+        .replace(SNIPPET_START_MARK, SNIPPET_START)
+        .replace(SNIPPET_STOP_MARK, SNIPPET_STOP)
+    )
@@ -1,27 +1,113 @@
-from datetime import datetime, timezone
-from typing import Any, Dict, List
+import uuid
+from collections import Counter
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
+from sqlalchemy import case, delete, func, insert, literal, select, tuple_, update
 from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
 
-from api.project_service.app.commands.task_commands import ChangeTaskStatusCommand
+from api.project_service.app.commands.task_commands import (
+    CommandInvoker,
+    UpdateTaskCommand,
+    task_diff,
+)
 from api.project_service.app.schemas.task import (
+    TaskBatchAction,
+    TaskBatchDTO,
+    TaskBatchOperationDTO,
+    TaskBatchResponseDTO,
+    TaskBatchResultDTO,
     TaskCommentCreateDTO,
     TaskCommentResponseDTO,
+    TaskCommentThreadDTO,
     TaskCreateDTO,
+    TaskFilterDTO,
     TaskPriority,
     TaskResponseDTO,
     TaskStatus,
     TaskUpdateDTO,
 )
 from api.project_service.app.services.activity_service import ActivityService
+from api.project_service.app.services.project_authorizer import ProjectAuthorizer
+from api.project_service.app.services.project_stats import (
+    COMMENTS,
+    task_delta,
+    task_state,
+    update_project_stats,
+)
+from api.project_service.app.services.task_tags import (
+    delete_task_tags,
+    set_task_tags,
+    tasks_with_tags,
+)
+from api.shared.exceptions.base_exceptions import BaseAPIException
 from api.shared.exceptions.project_exceptions import (
     InsufficientProjectRoleException,
+    InvalidTaskBatchOperationException,
+    InvalidTaskQueryException,
     InvalidTaskStatusTransitionException,
     NotProjectMemberException,
-    ProjectNotFoundException,
     TaskNotFoundException,
 )
-from api.shared.models.project import Project, ProjectMember, Task, TaskComment
+from api.shared.models.project import (
+    ProjectMember,
+    Task,
+    TaskCommandHistory,
+    TaskComment,
+)
+from api.shared.models.base import get_utc_now
+from api.shared.utils.etag import make_etag
+from api.shared.utils.pagination import (
+    Page,
+    SortKey,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+    paginate_select,
+)
+
+# Statuses a task can move to from each status
+VALID_STATUS_TRANSITIONS = {
+    "todo": ["in_progress"],
+    "in_progress": ["todo", "review"],
+    "review": ["in_progress", "done"],
+    "done": ["review"],
+}
+
+# Deepest comment reply level returned in threads, top-level comments being 0
+MAX_COMMENT_DEPTH = 50
+
+# Task listing sort keys; statuses and priorities sort by workflow order and
+# tasks without a due date sort after the ones with one
+NO_DUE_DATE = datetime(9999, 12, 31)
+TASK_SORT_KEYS = {
+    "title": SortKey(Task.title),
+    "status": SortKey(
+        case({status.value: i for i, status in enumerate(TaskStatus)}, value=Task.status)
+    ),
+    "priority": SortKey(
+        case(
+            {priority.value: i for i, priority in enumerate(TaskPriority)},
+            value=Task.priority,
+        )
+    ),
+    "due_date": SortKey(func.coalesce(Task.due_date, NO_DUE_DATE), is_datetime=True),
+    "created_at": SortKey(Task.created_at, is_datetime=True),
+    "updated_at": SortKey(
+        func.coalesce(Task.updated_at, Task.created_at), is_datetime=True
+    ),
+}
+
+# Activity action logged for each batch action
+BATCH_ACTIVITY_ACTIONS = {
+    TaskBatchAction.CREATE: "create_task",
+    TaskBatchAction.UPDATE: "update_task",
+    TaskBatchAction.STATUS: "change_status",
+    TaskBatchAction.ASSIGN: "assign",
+    TaskBatchAction.DELETE: "delete_task",
+}
 
 
 class TaskService:
@@ -36,6 +122,7 @@ class TaskService:
         """
         self.db = db
         self.activity_service = ActivityService(db)
+        self.authorizer = ProjectAuthorizer(db)
 
     def create_task(
         self, project_id: str, task_data: TaskCreateDTO, user_id: str
@@ -55,24 +142,8 @@ class TaskService:
             ProjectNotFoundException: If project not found
             NotProjectMemberException: If user is not a project member
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
         # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
+        self.authorizer.authorize(project_id, user_id)
 
         # Create task
         task = Task(
@@ -84,14 +155,16 @@ class TaskService:
             due_date=task_data.due_date,
             priority=task_data.priority,
             status=task_data.status,
-            tags=(task_data.tags or {}),
+            tags=(task_data.tags or []),
             meta_data=(task_data.meta_data or {}),
         )
 
         # Add task to database
         self.db.add(task)
-        self.db.commit()
-        self.db.refresh(task)
+        self.db.flush()
+        if task.tags:
+            set_task_tags(self.db, project_id, {task.id: task.tags}, new=True)
+        update_project_stats(self.db, project_id, task_delta(None, task_state(task)))
 
         # Log activity
         self.activity_service.log_activity(
@@ -100,9 +173,12 @@ class TaskService:
             action="create_task",
             entity_type="task",
             entity_id=str(task.id),
-            details=task_data.model_dump(exclude_none=True),
+            details=task_data.model_dump(mode="json", exclude_none=True),
         )
 
+        self.db.commit()
+        self.db.refresh(task)
+
         # Return task
         return self._task_to_dto(task)
 
@@ -123,35 +199,9 @@ class TaskService:
             TaskNotFoundException: If task not found
             NotProjectMemberException: If user is not a project member
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
-
-        # Get task
-        task = (
-            self.db.query(Task)
-            .filter(Task.id == task_id, Task.project_id == project_id)
-            .first()
-        )
-
-        # Check if task exists
-        if not task:
-            raise TaskNotFoundException()
+        # Check if user is a project member and get task
+        access = self.authorizer.authorize_task(project_id, task_id, user_id)
+        task = access.task
 
         # Return task
         return self._task_to_dto(task)
@@ -178,105 +228,38 @@ class TaskService:
             InsufficientProjectRoleException: If user has insufficient role
             InvalidTaskStatusTransitionException: If task status transition is invalid
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
-
-        # Get task
-        task = (
-            self.db.query(Task)
-            .filter(Task.id == task_id, Task.project_id == project_id)
-            .first()
-        )
-
-        # Check if task exists
-        if not task:
-            raise TaskNotFoundException()
+        # Check if user is a project member and get task
+        access = self.authorizer.authorize_task(project_id, task_id, user_id)
+        task = access.task
 
         # Check if user has sufficient role to update task
-        is_task_creator = task.creator_id == user_id
-        is_task_assignee = task.assignee_id == user_id
-        is_project_admin = project_member.role in ["owner", "admin"]
-
-        if not (is_task_creator or is_task_assignee or is_project_admin):
-            raise InsufficientProjectRoleException(
-                "Only task creator, assignee, or project admin can update the task"
-            )
+        self._check_can_update(
+            task.creator_id, task.assignee_id, user_id, access.is_admin
+        )
 
         # Check if status transition is valid
-        if task_data.status is not None and task_data.status != task.status:
-            # Implement status transition validation logic here
-            # For example, you can't move from 'todo' to 'done' directly
-            valid_transitions = {
-                "todo": ["in_progress"],
-                "in_progress": ["todo", "review"],
-                "review": ["in_progress", "done"],
-                "done": ["review"],
-            }
-
-            if task_data.status not in valid_transitions.get(task.status, []):
-                raise InvalidTaskStatusTransitionException(
-                    f"Cannot transition from '{task.status}' to '{task_data.status}'"
-                )
-
-        # Update task
-        if task_data.title is not None:
-            task.title = task_data.title
-
-        if task_data.description is not None:
-            task.description = task_data.description
+        if task_data.status is not None:
+            self._check_status_transition(task.status, task_data.status.value)
 
-        if task_data.assignee_id is not None:
-            # Check if assignee is a project member
-            if task_data.assignee_id:
-                assignee_member = (
-                    self.db.query(ProjectMember)
-                    .filter(
-                        ProjectMember.project_id == project_id,
-                        ProjectMember.user_id == task_data.assignee_id,
-                    )
-                    .first()
+        # Check if assignee is a project member
+        if task_data.assignee_id:
+            assignee_member = (
+                self.db.query(ProjectMember)
+                .filter(
+                    ProjectMember.project_id == project_id,
+                    ProjectMember.user_id == task_data.assignee_id,
                 )
+                .first()
+            )
 
-                if not assignee_member:
-                    raise NotProjectMemberException("Assignee is not a project member")
-
-            task.assignee_id = task_data.assignee_id
-
-        if task_data.due_date is not None:
-            task.due_date = task_data.due_date
-
-        if task_data.priority is not None:
-            task.priority = task_data.priority
-
-        if task_data.status is not None:
-            command = ChangeTaskStatusCommand(self.db, task_id, task_data.status.value)
-            task = command_invoker.execute_command(command)
-
-        if task_data.tags is not None:
-            task.tags = task_data.tags
-        if task_data.meta_data is not None:
-            task.meta_data = task_data.meta_data
+            if not assignee_member:
+                raise NotProjectMemberException("Assignee is not a project member")
 
-        # Update task in database
-        task.updated_at = datetime.now(timezone.utc)
-        self.db.commit()
-        self.db.refresh(task)
+        # Update task on the loaded row, recording the change for undo
+        command = UpdateTaskCommand(
+            self.db, task_id, task_data.model_dump(exclude_none=True), task=task
+        )
+        task = CommandInvoker(self.db, user_id).execute_command(command)
 
         # Log activity
         self.activity_service.log_activity(
@@ -285,9 +268,12 @@ class TaskService:
             action="update_task",
             entity_type="task",
             entity_id=str(task.id),
-            details=task_data.model_dump(exclude_none=True),
+            details=task_data.model_dump(mode="json", exclude_none=True),
         )
 
+        # Task, command history and activity are committed together
+        self.db.commit()
+
         # Return task
         return self._task_to_dto(task)
 
@@ -311,44 +297,12 @@ class TaskService:
             NotProjectMemberException: If user is not a project member
             InsufficientProjectRoleException: If user has insufficient role
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
-
-        # Get task
-        task = (
-            self.db.query(Task)
-            .filter(Task.id == task_id, Task.project_id == project_id)
-            .first()
-        )
-
-        # Check if task exists
-        if not task:
-            raise TaskNotFoundException()
+        # Check if user is a project member and get task
+        access = self.authorizer.authorize_task(project_id, task_id, user_id)
+        task = access.task
 
         # Check if user has sufficient role to delete task
-        is_task_creator = task.creator_id == user_id
-        is_project_admin = project_member.role in ["owner", "admin"]
-
-        if not (is_task_creator or is_project_admin):
-            raise InsufficientProjectRoleException(
-                "Only task creator or project admin can delete the task"
-            )
+        self._check_can_delete(task.creator_id, user_id, access.is_admin)
 
         # Log activity before deletion
         self.activity_service.log_activity(
@@ -360,52 +314,296 @@ class TaskService:
             details=None,
         )
 
-        # Delete task
+        # Uncount the task and its comments
+        delta = task_delta(task_state(task), None)
+        delta[COMMENTS] -= self._count_comments([task_id])
+        update_project_stats(self.db, project_id, delta)
+
+        # Delete task with its tags and undo/redo history
+        delete_task_tags(self.db, [task_id])
+        self.db.query(TaskCommandHistory).filter(
+            TaskCommandHistory.task_id == task_id
+        ).delete(synchronize_session=False)
         self.db.delete(task)
         self.db.commit()
 
         # Return success response
         return {"message": "Task deleted successfully"}
 
-    def get_project_tasks(self, project_id: str, user_id: str) -> List[TaskResponseDTO]:
+    def batch_tasks(
+        self, project_id: str, batch_data: TaskBatchDTO, user_id: str
+    ) -> TaskBatchResponseDTO:
         """
-        Get tasks for a project.
+        Apply many task operations at once.
+
+        Membership is checked once and each operation is validated with the
+        same rules as the single-task methods, in order, so later operations
+        see the effect of earlier ones. Operations that fail are reported in
+        their result and skipped. The others are written in one transaction,
+        with one bulk statement per kind of change. Updates go to the undo
+        history of the user, one entry per task, as single-task updates do.
 
         Args:
             project_id (str): Project ID
+            batch_data (TaskBatchDTO): Operations
             user_id (str): User ID
 
         Returns:
-            List[TaskResponseDTO]: List of tasks
+            TaskBatchResponseDTO: Result of each operation
 
         Raises:
             ProjectNotFoundException: If project not found
             NotProjectMemberException: If user is not a project member
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
+        # Check if user is a project member
+        access = self.authorizer.authorize(project_id, user_id)
+        operations = batch_data.operations
+
+        # Load the tasks and assignees the batch refers to, one query each
+        tasks: Dict[str, Dict[str, Any]] = {}
+        task_ids = {op.task_id for op in operations if op.task_id}
+        if task_ids:
+            rows = self.db.execute(
+                select(Task.__table__)
+                .where(Task.project_id == project_id, Task.id.in_(task_ids))
+                .with_for_update()
+            ).mappings()
+            tasks = {row["id"]: dict(row) for row in rows}
+        originals = {task_id: dict(task) for task_id, task in tasks.items()}
+
+        members: Set[str] = set()
+        assignee_ids = {
+            operation.assignee_id
+            if operation.action == TaskBatchAction.ASSIGN
+            else (operation.changes.assignee_id if operation.changes else None)
+            for operation in operations
+        } - {None, ""}
+        if assignee_ids:
+            members = set(
+                self.db.scalars(
+                    select(ProjectMember.user_id).where(
+                        ProjectMember.project_id == project_id,
+                        ProjectMember.user_id.in_(assignee_ids),
+                    )
+                )
+            )
 
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
+        now = get_utc_now()
+        created: Dict[str, Dict[str, Any]] = {}
+        updated: Dict[str, Dict[str, Any]] = {}
+        deleted: List[str] = []
+        activities: List[Dict[str, Any]] = []
+        results: List[TaskBatchResultDTO] = []
+
+        for index, operation in enumerate(operations):
+            try:
+                if operation.action == TaskBatchAction.CREATE:
+                    task = self._new_batch_task(operation, project_id, user_id, now)
+                    created[task["id"]] = tasks[task["id"]] = task
+                    details = operation.task.model_dump(
+                        mode="json", exclude_none=True
+                    )
 
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
+                elif operation.action == TaskBatchAction.DELETE:
+                    task = self._get_batch_task(tasks, operation.task_id)
+                    self._check_can_delete(task["creator_id"], user_id, access.is_admin)
+                    del tasks[task["id"]]
+                    updated.pop(task["id"], None)
+                    if created.pop(task["id"], None) is None:
+                        deleted.append(task["id"])
+                    details = None
+
+                else:
+                    task = self._get_batch_task(tasks, operation.task_id)
+                    values, details = self._get_batch_changes(operation)
+                    self._check_can_update(
+                        task["creator_id"],
+                        task["assignee_id"],
+                        user_id,
+                        access.is_admin,
+                    )
+                    if "status" in values:
+                        self._check_status_transition(task["status"], values["status"])
+                    assignee_id = values.get("assignee_id")
+                    if assignee_id and assignee_id not in members:
+                        raise NotProjectMemberException(
+                            "Assignee is not a project member"
+                        )
+
+                    values["updated_at"] = now
+                    task.update(values)
+                    if task["id"] not in created:
+                        updated.setdefault(task["id"], {}).update(values)
+
+            except BaseAPIException as e:
+                results.append(
+                    TaskBatchResultDTO(
+                        index=index,
+                        action=operation.action,
+                        task_id=operation.task_id,
+                        success=False,
+                        error_code=e.detail["error_code"],
+                        error=e.detail["message"],
+                    )
+                )
+                continue
+
+            activities.append(
+                {
+                    "project_id": project_id,
+                    "user_id": user_id,
+                    "action": BATCH_ACTIVITY_ACTIONS[operation.action],
+                    "entity_type": "task",
+                    "entity_id": task["id"],
+                    "details": details,
+                }
             )
-            .first()
+            results.append(
+                TaskBatchResultDTO(
+                    index=index,
+                    action=operation.action,
+                    task_id=task["id"],
+                    success=True,
+                    task=(
+                        None
+                        if operation.action == TaskBatchAction.DELETE
+                        else self._task_to_dto(Task(**task))
+                    ),
+                )
+            )
+
+        # Write the batch with one statement per kind of change
+        if created:
+            self.db.execute(insert(Task), list(created.values()))
+            set_task_tags(
+                self.db,
+                project_id,
+                {task_id: task["tags"] for task_id, task in created.items()},
+                new=True,
+            )
+        if updated:
+            self.db.execute(
+                update(Task),
+                [{"id": task_id, **values} for task_id, values in updated.items()],
+            )
+            set_task_tags(
+                self.db,
+                project_id,
+                {
+                    task_id: values["tags"]
+                    for task_id, values in updated.items()
+                    if "tags" in values
+                },
+            )
+        delta = Counter()
+        for task_id, task in created.items():
+            delta.update(task_delta(None, task))
+        for task_id in updated:
+            delta.update(task_delta(originals[task_id], tasks[task_id]))
+        for task_id in deleted:
+            delta.update(task_delta(originals[task_id], None))
+        if deleted:
+            delta[COMMENTS] -= self._count_comments(deleted)
+        update_project_stats(self.db, project_id, delta)
+
+        if deleted:
+            # Detach replies first, so threads of any depth go in one statement
+            self.db.execute(
+                update(TaskComment)
+                .where(TaskComment.task_id.in_(deleted))
+                .values(parent_id=None)
+            )
+            self.db.execute(
+                delete(TaskComment).where(TaskComment.task_id.in_(deleted))
+            )
+            delete_task_tags(self.db, deleted)
+            self.db.execute(
+                delete(TaskCommandHistory).where(
+                    TaskCommandHistory.task_id.in_(deleted)
+                )
+            )
+            self.db.execute(delete(Task).where(Task.id.in_(deleted)))
+
+        CommandInvoker(self.db, user_id).record_changes(
+            project_id,
+            {
+                task_id: task_diff(originals[task_id], tasks[task_id])
+                for task_id in updated
+            },
         )
+        self.activity_service.log_activities(activities)
+        self.db.commit()
+
+        succeeded = sum(1 for result in results if result.success)
+        return TaskBatchResponseDTO(
+            results=results, succeeded=succeeded, failed=len(results) - succeeded
+        )
+
+    def get_project_tasks(
+        self,
+        project_id: str,
+        user_id: str,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        filters: Optional[TaskFilterDTO] = None,
+        sort: Optional[List[str]] = None,
+        fields: Optional[List[str]] = None,
+    ) -> Page[Union[TaskResponseDTO, Dict[str, Any]]]:
+        """
+        Get tasks for a project.
+
+        Filters, order and projection are all applied in SQL, so only the
+        rows and columns of the page are read.
 
-        if not project_member:
-            raise NotProjectMemberException()
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID
+            limit (int, optional): Limit. Defaults to 100.
+            cursor (str, optional): Cursor of the page to get. Defaults to None.
+            filters (TaskFilterDTO, optional): Filters. Defaults to None.
+            sort (List[str], optional): Sort keys, '-' prefixed for descending.
+                Defaults to None (oldest first).
+            fields (List[str], optional): Fields to return. Defaults to None (all).
+
+        Returns:
+            Page[Union[TaskResponseDTO, Dict[str, Any]]]: Tasks, or only the
+                requested fields of each, and the next cursor
+
+        Raises:
+            ProjectNotFoundException: If project not found
+            NotProjectMemberException: If user is not a project member
+            InvalidTaskQueryException: If a sort key or field is unknown
+            InvalidCursorException: If the cursor is malformed
+        """
+        # Check if user is a project member
+        self.authorizer.authorize(project_id, user_id)
+
+        # Select only the requested columns
+        if fields:
+            unknown = set(fields) - set(TaskResponseDTO.model_fields)
+            if unknown:
+                raise InvalidTaskQueryException(
+                    f"Unknown fields: {', '.join(sorted(unknown))}"
+                )
+            columns = [Task.__table__.c[field] for field in dict.fromkeys(["id", *fields])]
+            statement = select(*columns)
+        else:
+            statement = select(Task)
 
         # Get tasks
-        tasks = self.db.query(Task).filter(Task.project_id == project_id).all()
+        statement = self._filter_tasks(
+            statement.where(Task.project_id == project_id), project_id, filters
+        )
+        rows = paginate_select(
+            self.db, statement, self._get_sort_keys(sort), limit, cursor
+        )
 
         # Return tasks
-        return [self._task_to_dto(task) for task in tasks]
+        if fields:
+            tasks = [{column.key: row[column.key] for column in columns} for row in rows]
+        else:
+            tasks = [self._task_to_dto(row["Task"]) for row in rows]
+        return Page(tasks, rows.next_cursor)
 
     def add_task_comment(
         self,
@@ -431,35 +629,8 @@ class TaskService:
             TaskNotFoundException: If task not found
             NotProjectMemberException: If user is not a project member
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
-
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
-
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
-            )
-            .first()
-        )
-
-        if not project_member:
-            raise NotProjectMemberException()
-
-        # Get task
-        task = (
-            self.db.query(Task)
-            .filter(Task.id == task_id, Task.project_id == project_id)
-            .first()
-        )
-
-        # Check if task exists
-        if not task:
-            raise TaskNotFoundException()
+        # Check if user is a project member and task exists
+        self.authorizer.authorize_task(project_id, task_id, user_id)
 
         # Check if parent comment exists
         if comment_data.parent_id:
@@ -485,8 +656,8 @@ class TaskService:
 
         # Add comment to database
         self.db.add(comment)
-        self.db.commit()
-        self.db.refresh(comment)
+        self.db.flush()
+        update_project_stats(self.db, project_id, Counter({COMMENTS: 1}))
 
         # Log activity
         self.activity_service.log_activity(
@@ -495,15 +666,23 @@ class TaskService:
             action="add_comment",
             entity_type="task_comment",
             entity_id=str(comment.id),
-            details=comment_data.model_dump(exclude_none=True),
+            details=comment_data.model_dump(mode="json", exclude_none=True),
         )
 
+        self.db.commit()
+        self.db.refresh(comment)
+
         # Return comment
         return self._task_comment_to_dto(comment)
 
     def get_task_comments(
-        self, project_id: str, task_id: str, user_id: str
-    ) -> List[TaskCommentResponseDTO]:
+        self,
+        project_id: str,
+        task_id: str,
+        user_id: str,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Page[TaskCommentResponseDTO]:
         """
         Get comments for a task.
 
@@ -511,52 +690,403 @@ class TaskService:
             project_id (str): Project ID
             task_id (str): Task ID
             user_id (str): User ID
+            limit (int, optional): Limit. Defaults to 100.
+            cursor (str, optional): Cursor of the page to get. Defaults to None.
 
         Returns:
-            List[TaskCommentResponseDTO]: List of comments
+            Page[TaskCommentResponseDTO]: Comments, oldest first, and the next cursor
 
         Raises:
             ProjectNotFoundException: If project not found
             TaskNotFoundException: If task not found
             NotProjectMemberException: If user is not a project member
         """
-        # Get project
-        project = self.db.query(Project).filter(Project.id == project_id).first()
+        # Check if user is a project member and task exists
+        self.authorizer.authorize_task(project_id, task_id, user_id)
 
-        # Check if project exists
-        if not project:
-            raise ProjectNotFoundException()
+        # Get comments
+        query = self.db.query(TaskComment).filter(TaskComment.task_id == task_id)
+        comments = paginate(query, TaskComment, limit, cursor)
 
-        # Check if user is a project member
-        project_member = (
-            self.db.query(ProjectMember)
-            .filter(
-                ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
+        # Return comments
+        return Page(
+            [self._task_comment_to_dto(comment) for comment in comments],
+            comments.next_cursor,
+        )
+
+    def get_task_comment_threads(
+        self,
+        project_id: str,
+        task_id: str,
+        user_id: str,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        max_depth: int = MAX_COMMENT_DEPTH,
+    ) -> Page[TaskCommentThreadDTO]:
+        """
+        Get comment threads for a task, each top-level comment with its reply tree.
+
+        A page of top-level comments and all their replies are read in one
+        recursive query, however many replies the threads have.
+
+        Args:
+            project_id (str): Project ID
+            task_id (str): Task ID
+            user_id (str): User ID
+            limit (int, optional): Max top-level comments. Defaults to 20.
+            cursor (str, optional): Cursor of the page to get. Defaults to None.
+            max_depth (int, optional): Deepest reply level to return. Defaults to MAX_COMMENT_DEPTH.
+
+        Returns:
+            Page[TaskCommentThreadDTO]: Threads, oldest first, and the next cursor
+
+        Raises:
+            ProjectNotFoundException: If project not found
+            TaskNotFoundException: If task not found
+            NotProjectMemberException: If user is not a project member
+            InvalidCursorException: If the cursor is malformed
+        """
+        # Check if user is a project member and task exists
+        self.authorizer.authorize_task(project_id, task_id, user_id)
+
+        columns = [
+            TaskComment.id,
+            TaskComment.task_id,
+            TaskComment.user_id,
+            TaskComment.content,
+            TaskComment.parent_id,
+            TaskComment.created_at,
+            TaskComment.updated_at,
+        ]
+
+        # Top-level comments of the page, plus one to tell if there is a next
+        # page; only the ones in the page are expanded
+        roots = select(
+            *columns,
+            func.row_number()
+            .over(order_by=(TaskComment.created_at, TaskComment.id))
+            .label("position"),
+        ).where(TaskComment.task_id == task_id, TaskComment.parent_id.is_(None))
+        if cursor:
+            roots = roots.where(
+                tuple_(TaskComment.created_at, TaskComment.id) > decode_cursor(cursor)
             )
-            .first()
+        roots = (
+            roots.order_by(TaskComment.created_at, TaskComment.id)
+            .limit(limit + 1)
+            .subquery("roots")
+        )
+
+        thread = select(
+            *[roots.c[column.key] for column in columns],
+            roots.c.position,
+            literal(0).label("depth"),
+        ).cte("thread", recursive=True)
+        replies = (
+            select(*columns, thread.c.position, (thread.c.depth + 1).label("depth"))
+            .join(thread, TaskComment.parent_id == thread.c.id)
+            .where(thread.c.position <= limit, thread.c.depth < max_depth)
         )
+        thread = thread.union_all(replies)
+
+        # Parents come before their replies and replies in creation order, so
+        # the trees are built in one pass
+        rows = self.db.execute(
+            select(thread).order_by(thread.c.depth, thread.c.created_at, thread.c.id)
+        ).mappings()
+
+        threads: List[TaskCommentThreadDTO] = []
+        comments: Dict[str, TaskCommentThreadDTO] = {}
+        next_cursor = None
+        for row in rows:
+            if row["position"] > limit:
+                next_cursor = encode_cursor(threads[-1].created_at, threads[-1].id)
+                continue
+            comment = TaskCommentThreadDTO(
+                **{column.key: row[column.key] for column in columns},
+                depth=row["depth"],
+            )
+            comments[comment.id] = comment
+            if comment.depth == 0:
+                threads.append(comment)
+            else:
+                comments[comment.parent_id].replies.append(comment)
+
+        return Page(threads, next_cursor)
+
+    def _check_can_update(
+        self, creator_id: str, assignee_id: Optional[str], user_id: str, is_admin: bool
+    ) -> None:
+        """
+        Check if a user can update a task.
+
+        Args:
+            creator_id (str): Task creator ID
+            assignee_id (Optional[str]): Task assignee ID
+            user_id (str): User ID
+            is_admin (bool): Whether the user is a project owner or admin
+
+        Raises:
+            InsufficientProjectRoleException: If user has insufficient role
+        """
+        if not (creator_id == user_id or assignee_id == user_id or is_admin):
+            raise InsufficientProjectRoleException(
+                "Only task creator, assignee, or project admin can update the task"
+            )
+
+    def _check_can_delete(self, creator_id: str, user_id: str, is_admin: bool) -> None:
+        """
+        Check if a user can delete a task.
+
+        Args:
+            creator_id (str): Task creator ID
+            user_id (str): User ID
+            is_admin (bool): Whether the user is a project owner or admin
+
+        Raises:
+            InsufficientProjectRoleException: If user has insufficient role
+        """
+        if not (creator_id == user_id or is_admin):
+            raise InsufficientProjectRoleException(
+                "Only task creator or project admin can delete the task"
+            )
+
+    def _check_status_transition(self, current: str, new: str) -> None:
+        """
+        Check if a task can move from one status to another.
 
-        if not project_member:
-            raise NotProjectMemberException()
+        Args:
+            current (str): Current status
+            new (str): New status
+
+        Raises:
+            InvalidTaskStatusTransitionException: If task status transition is invalid
+        """
+        # You can't move from 'todo' to 'done' directly, for example
+        if new != current and new not in VALID_STATUS_TRANSITIONS.get(current, []):
+            raise InvalidTaskStatusTransitionException(
+                f"Cannot transition from '{current}' to '{new}'"
+            )
+
+    def _count_comments(self, task_ids: List[str]) -> int:
+        """
+        Count the comments of tasks.
+
+        Args:
+            task_ids (List[str]): Task IDs
 
-        # Get task
-        task = (
-            self.db.query(Task)
-            .filter(Task.id == task_id, Task.project_id == project_id)
-            .first()
+        Returns:
+            int: Comment count
+        """
+        return self.db.scalar(
+            select(func.count()).where(TaskComment.task_id.in_(task_ids))
         )
 
-        # Check if task exists
-        if not task:
+    def get_project_tasks_etag(
+        self, project_id: str, user_id: str, variant: str = ""
+    ) -> str:
+        """
+        Get the ETag of a project's task listing without loading the tasks.
+
+        The task count and latest update, read from the project_id index,
+        change whenever a task is created, updated or deleted.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID
+            variant (str, optional): Listing parameters (filters, sort, page) the ETag is for. Defaults to "".
+
+        Returns:
+            str: ETag
+
+        Raises:
+            ProjectNotFoundException: If project not found
+            NotProjectMemberException: If user is not a project member
+        """
+        # Check if user is a project member
+        self.authorizer.authorize(project_id, user_id)
+
+        version = self.db.execute(
+            select(
+                func.count(), func.max(func.coalesce(Task.updated_at, Task.created_at))
+            ).where(Task.project_id == project_id)
+        ).one()
+        return make_etag(project_id, *version, variant)
+
+    def _filter_tasks(
+        self, statement: Select, project_id: str, filters: Optional[TaskFilterDTO]
+    ) -> Select:
+        """
+        Apply task listing filters to a select.
+
+        Args:
+            statement (Select): Task select
+            project_id (str): Project ID
+            filters (Optional[TaskFilterDTO]): Filters
+
+        Returns:
+            Select: Filtered select
+        """
+        if filters is None:
+            return statement
+
+        if filters.status:
+            statement = statement.where(
+                Task.status.in_([status.value for status in filters.status])
+            )
+        if filters.priority:
+            statement = statement.where(
+                Task.priority.in_([priority.value for priority in filters.priority])
+            )
+        if filters.assignee_id:
+            statement = statement.where(Task.assignee_id == filters.assignee_id)
+        if filters.due_before:
+            statement = statement.where(Task.due_date < filters.due_before)
+        if filters.due_after:
+            statement = statement.where(Task.due_date >= filters.due_after)
+        if filters.tags:
+            statement = statement.where(
+                Task.id.in_(tasks_with_tags(project_id, filters.tags))
+            )
+
+        return statement
+
+    def _get_sort_keys(self, sort: Optional[List[str]]) -> List[SortKey]:
+        """
+        Get the SQL sort keys of a task listing.
+
+        Args:
+            sort (Optional[List[str]]): Sort keys, '-' prefixed for descending
+
+        Returns:
+            List[SortKey]: Sort keys, ending with created_at and id so the
+                order is total
+
+        Raises:
+            InvalidTaskQueryException: If a sort key is unknown
+        """
+        names: List[str] = []
+        keys: List[SortKey] = []
+        for item in sort or []:
+            name = item.lstrip("-")
+            if name not in TASK_SORT_KEYS:
+                raise InvalidTaskQueryException(f"Cannot sort tasks by '{name}'")
+            if name in names:
+                continue
+            names.append(name)
+            keys.append(TASK_SORT_KEYS[name]._replace(descending=item.startswith("-")))
+
+        if "created_at" not in names:
+            keys.append(TASK_SORT_KEYS["created_at"])
+        keys.append(SortKey(Task.id))
+        return keys
+
+    def _new_batch_task(
+        self,
+        operation: TaskBatchOperationDTO,
+        project_id: str,
+        user_id: str,
+        now: datetime,
+    ) -> Dict[str, Any]:
+        """
+        Build the row of a task created by a batch.
+
+        Args:
+            operation (TaskBatchOperationDTO): 'create' operation
+            project_id (str): Project ID
+            user_id (str): User ID
+            now (datetime): Batch time
+
+        Returns:
+            Dict[str, Any]: Task column values
+
+        Raises:
+            InvalidTaskBatchOperationException: If the operation has no task
+        """
+        if operation.task is None:
+            raise InvalidTaskBatchOperationException(
+                "'task' is required to create a task"
+            )
+
+        task_data = operation.task
+        return {
+            "id": str(uuid.uuid4()),
+            "created_at": now,
+            "updated_at": now,
+            "title": task_data.title,
+            "description": task_data.description,
+            "project_id": project_id,
+            "creator_id": user_id,
+            "assignee_id": task_data.assignee_id,
+            "due_date": task_data.due_date,
+            "priority": task_data.priority.value,
+            "status": task_data.status.value,
+            "tags": (task_data.tags or []),
+            "meta_data": (task_data.meta_data or {}),
+        }
+
+    def _get_batch_task(
+        self, tasks: Dict[str, Dict[str, Any]], task_id: Optional[str]
+    ) -> Dict[str, Any]:
+        """
+        Get a task loaded for a batch.
+
+        Args:
+            tasks (Dict[str, Dict[str, Any]]): Tasks by ID
+            task_id (Optional[str]): Task ID
+
+        Returns:
+            Dict[str, Any]: Task column values
+
+        Raises:
+            InvalidTaskBatchOperationException: If no task ID is given
+            TaskNotFoundException: If task not found
+        """
+        if not task_id:
+            raise InvalidTaskBatchOperationException("'task_id' is required")
+
+        if task_id not in tasks:
             raise TaskNotFoundException()
 
-        # Get comments
-        comments = (
-            self.db.query(TaskComment).filter(TaskComment.task_id == task_id).all()
-        )
+        return tasks[task_id]
 
-        # Return comments
-        return [self._task_comment_to_dto(comment) for comment in comments]
+    def _get_batch_changes(
+        self, operation: TaskBatchOperationDTO
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Get the column values an update, status or assign operation sets.
+
+        Args:
+            operation (TaskBatchOperationDTO): Operation
+
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, Any]]: Column values and activity details
+
+        Raises:
+            InvalidTaskBatchOperationException: If the operation misses its data
+        """
+        if operation.action == TaskBatchAction.UPDATE:
+            if operation.changes is None:
+                raise InvalidTaskBatchOperationException(
+                    "'changes' is required to update a task"
+                )
+            changes = operation.changes.model_dump(exclude_none=True)
+            values = {
+                key: value.value if isinstance(value, Enum) else value
+                for key, value in changes.items()
+            }
+            return values, operation.changes.model_dump(mode="json", exclude_none=True)
+
+        if operation.action == TaskBatchAction.STATUS:
+            if operation.status is None:
+                raise InvalidTaskBatchOperationException(
+                    "'status' is required to change the status"
+                )
+            values = {"status": operation.status.value}
+            return values, dict(values)
+
+        values = {"assignee_id": operation.assignee_id}
+        return values, dict(values)
 
     def _task_to_dto(self, task: Task) -> TaskResponseDTO:
         """
@@ -0,0 +1,70 @@
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from api.shared.models.project import task_tags
+
+
+def set_task_tags(
+    db: Session,
+    project_id: str,
+    tags_by_task: Dict[str, Optional[List[str]]],
+    new: bool = False,
+) -> None:
+    """
+    Mirror the tags of tasks into the task_tags side table.
+
+    Must be called, in the same transaction, wherever Task.tags is written.
+
+    Args:
+        db (Session): Database session
+        project_id (str): Project ID of the tasks
+        tags_by_task (Dict[str, Optional[List[str]]]): New tags by task ID
+        new (bool, optional): Tasks were just created and have no rows to replace. Defaults to False.
+    """
+    if not tags_by_task:
+        return
+
+    if not new:
+        delete_task_tags(db, tags_by_task)
+
+    rows = [
+        {"task_id": task_id, "tag": tag, "project_id": project_id}
+        for task_id, tags in tags_by_task.items()
+        for tag in set(tags or [])
+    ]
+    if rows:
+        db.execute(insert(task_tags), rows)
+
+
+def delete_task_tags(db: Session, task_ids: Iterable[str]) -> None:
+    """
+    Delete the task_tags rows of tasks.
+
+    Args:
+        db (Session): Database session
+        task_ids (Iterable[str]): Task IDs
+    """
+    db.execute(delete(task_tags).where(task_tags.c.task_id.in_(list(task_ids))))
+
+
+def tasks_with_tags(project_id: str, tags: List[str]) -> Select:
+    """
+    Select the IDs of the tasks of a project that have all the given tags.
+
+    Args:
+        project_id (str): Project ID
+        tags (List[str]): Tags
+
+    Returns:
+        Select: Task ID subquery
+    """
+    tags = list(set(tags))
+    return (
+        select(task_tags.c.task_id)
+        .where(task_tags.c.project_id == project_id, task_tags.c.tag.in_(tags))
+        .group_by(task_tags.c.task_id)
+        .having(func.count() == len(tags))
+    )
@@ -105,6 +105,23 @@ class ConflictException(BaseAPIException):
         )
 
 
+class GoneException(BaseAPIException):
+    """Exception for resources that no longer exist"""
+
+    def __init__(
+        self,
+        detail: str = "Resource no longer available",
+        error_code: str = "GONE",
+        headers: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(
+            status_code=status.HTTP_410_GONE,
+            detail=detail,
+            error_code=error_code,
+            headers=headers,
+        )
+
+
 class InternalServerException(BaseAPIException):
     """Exception for internal server errors"""
 
@@ -159,3 +176,15 @@ class ValidationException(BaseAPIException):
             error_code=error_code,
             headers=headers,
         )
+
+
+class InvalidCursorException(BadRequestException):
+    """Exception for malformed pagination cursors"""
+
+    def __init__(
+        self,
+        detail: str = "Invalid pagination cursor",
+        error_code: str = "INVALID_CURSOR",
+        headers: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(detail=detail, error_code=error_code, headers=headers)
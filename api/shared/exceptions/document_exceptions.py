@@ -3,7 +3,9 @@ from typing import Any, Dict, Optional
 from .base_exceptions import (
     BadRequestException,
     ForbiddenException,
+    GoneException,
     NotFoundException,
+    ServiceUnavailableException,
 )
 
 
@@ -101,3 +103,39 @@ class DocumentLimitExceededException(BadRequestException):
         headers: Optional[Dict[str, Any]] = None,
     ):
         super().__init__(detail=detail, error_code=error_code, headers=headers)
+
+
+class ConversionJobNotFoundException(NotFoundException):
+    """Exception for conversion job not found"""
+
+    def __init__(
+        self,
+        detail: str = "Conversion job not found",
+        error_code: str = "CONVERSION_JOB_NOT_FOUND",
+        headers: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(detail=detail, error_code=error_code, headers=headers)
+
+
+class ConversionJobExpiredException(GoneException):
+    """Exception for conversion jobs whose output was evicted"""
+
+    def __init__(
+        self,
+        detail: str = "Converted file expired, convert the document again",
+        error_code: str = "CONVERSION_JOB_EXPIRED",
+        headers: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(detail=detail, error_code=error_code, headers=headers)
+
+
+class ConversionQueueFullException(ServiceUnavailableException):
+    """Exception for too many pending document conversions"""
+
+    def __init__(
+        self,
+        detail: str = "Too many pending conversions, try again later",
+        error_code: str = "CONVERSION_QUEUE_FULL",
+        headers: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(detail=detail, error_code=error_code, headers=headers)
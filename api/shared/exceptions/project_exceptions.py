@@ -2,6 +2,7 @@ from typing import Any, Dict, Optional
 
 from .base_exceptions import (
     BadRequestException,
+    ConflictException,
     ForbiddenException,
     NotFoundException,
 )
@@ -101,3 +102,75 @@ class InvalidTaskStatusTransitionException(BadRequestException):
         headers: Optional[Dict[str, Any]] = None,
     ):
         super().__init__(detail=detail, error_code=error_code, headers=headers)
+
+
+class NothingToUndoException(BadRequestException):
+    """Exception for undoing with an empty undo history"""
+
+    def __init__(
+        self,
+        detail: str = "No commands to undo",
+        error_code: str = "NOTHING_TO_UNDO",
+        headers: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(detail=detail, error_code=error_code, headers=headers)
+
+
+class NothingToRedoException(BadRequestException):
+    """Exception for redoing with an empty redo history"""
+
+    def __init__(
+        self,
+        detail: str = "No commands to redo",
+        error_code: str = "NOTHING_TO_REDO",
+        headers: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(detail=detail, error_code=error_code, headers=headers)
+
+
+class TaskCommandConflictException(ConflictException):
+    """Exception for undoing or redoing over a change made since the command"""
+
+    def __init__(
+        self,
+        detail: str = "Task changed since the command; it can no longer be undone or redone",
+        error_code: str = "TASK_COMMAND_CONFLICT",
+        headers: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(detail=detail, error_code=error_code, headers=headers)
+
+
+class InvalidTaskBatchOperationException(BadRequestException):
+    """Exception for a malformed task batch operation"""
+
+    def __init__(
+        self,
+        detail: str = "Invalid task batch operation",
+        error_code: str = "INVALID_TASK_BATCH_OPERATION",
+        headers: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(detail=detail, error_code=error_code, headers=headers)
+
+
+class InvalidTaskQueryException(BadRequestException):
+    """Exception for an invalid task listing sort or field"""
+
+    def __init__(
+        self,
+        detail: str = "Invalid task query",
+        error_code: str = "INVALID_TASK_QUERY",
+        headers: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(detail=detail, error_code=error_code, headers=headers)
+
+
+class InvalidSearchQueryException(BadRequestException):
+    """Exception for a search query without any searchable term"""
+
+    def __init__(
+        self,
+        detail: str = "Search query has no searchable terms",
+        error_code: str = "INVALID_SEARCH_QUERY",
+        headers: Optional[Dict[str, Any]] = None,
+    ):
+        super().__init__(detail=detail, error_code=error_code, headers=headers)
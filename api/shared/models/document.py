@@ -1,4 +1,6 @@
-from sqlalchemy import JSON, Boolean, ForeignKey, Integer, String, Text
+from datetime import datetime
+
+from sqlalchemy import JSON, Boolean, DateTime, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from typing import Any, Optional
 
@@ -9,6 +11,9 @@ class Document(BaseModel):
     """Document model"""
 
     __tablename__ = "documents"
+    __table_args__ = (
+        Index("ix_documents_project_id_parent_id", "project_id", "parent_id"),
+    )
 
     name: Mapped[str] = mapped_column(String, nullable=False)
     project_id: Mapped[str] = mapped_column(String, ForeignKey("projects.id"), nullable=False)
@@ -35,6 +40,10 @@ class DocumentVersion(BaseModel):
     """Document version model"""
 
     __tablename__ = "document_versions"
+    __table_args__ = (
+        Index("uq_document_versions_document_id_version", "document_id", "version", unique=True),
+        Index("ix_document_versions_content_hash", "content_hash"),
+    )
 
     document_id: Mapped[str] = mapped_column(String, ForeignKey("documents.id"), nullable=False)
     version: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -43,6 +52,7 @@ class DocumentVersion(BaseModel):
     url: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     creator_id: Mapped[str] = mapped_column(String, ForeignKey("users.id"), nullable=False)
     changes: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # Description of changes
+    content_hash: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # SHA-256 of the stored content, if uploaded through the API
 
     # Relationships
     document = relationship("Document", back_populates="versions")
@@ -52,6 +62,9 @@ class DocumentPermission(BaseModel):
     """Document permission model"""
 
     __tablename__ = "document_permissions"
+    __table_args__ = (
+        Index("uq_document_permissions_document_id_user_id", "document_id", "user_id", unique=True),
+    )
 
     document_id: Mapped[str] = mapped_column(String, ForeignKey("documents.id"), nullable=False)
     user_id: Mapped[Optional[str]] = mapped_column(String, ForeignKey("users.id"), nullable=True)
@@ -63,3 +76,57 @@ class DocumentPermission(BaseModel):
 
     # Relationships
     document = relationship("Document", back_populates="permissions")
+
+
+class ConversionJob(BaseModel):
+    """Document conversion run in the background"""
+
+    __tablename__ = "conversion_jobs"
+    __table_args__ = (Index("ix_conversion_jobs_content_hash", "content_hash"),)
+
+    user_id: Mapped[str] = mapped_column(String, ForeignKey("users.id"), nullable=False)
+    status: Mapped[str] = mapped_column(String, nullable=False, default="queued")  # 'queued', 'running', 'done', 'failed', 'expired'
+    filename: Mapped[str] = mapped_column(String, nullable=False)  # Uploaded file name
+    output_format: Mapped[str] = mapped_column(String, nullable=False)
+    bucket: Mapped[str] = mapped_column(String, nullable=False)
+    path: Mapped[str] = mapped_column(String, nullable=False)  # Output path in the bucket
+    url: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # Output URL once done
+    size: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # Output size in bytes
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    content_hash: Mapped[Optional[str]] = mapped_column(String, nullable=True)  # SHA-256 of the input
+    cache_hit: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)  # Served from the conversion cache
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+
+class ConversionCacheEntry(BaseModel):
+    """Converted file stored once per input content and output format"""
+
+    __tablename__ = "conversion_cache"
+    __table_args__ = (
+        Index("uq_conversion_cache_content_hash_output_format", "content_hash", "output_format", unique=True),
+        Index("ix_conversion_cache_last_accessed_at", "last_accessed_at"),
+    )
+
+    content_hash: Mapped[str] = mapped_column(String, nullable=False)  # SHA-256 of the input
+    output_format: Mapped[str] = mapped_column(String, nullable=False)
+    bucket: Mapped[str] = mapped_column(String, nullable=False)
+    path: Mapped[str] = mapped_column(String, nullable=False)
+    url: Mapped[str] = mapped_column(String, nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)  # Output size in bytes
+    hits: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_accessed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class DocumentBlob(BaseModel):
+    """Version content stored once per SHA-256, shared by every version with that content"""
+
+    __tablename__ = "document_blobs"
+    __table_args__ = (Index("uq_document_blobs_content_hash", "content_hash", unique=True),)
+
+    content_hash: Mapped[str] = mapped_column(String, nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    content_type: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    storage_key: Mapped[str] = mapped_column(String, nullable=False)
+    url: Mapped[str] = mapped_column(String, nullable=False)
+    status: Mapped[str] = mapped_column(String, nullable=False, default="pending")  # 'pending', 'stored', 'deleting'
@@ -1,4 +1,4 @@
-from sqlalchemy import JSON, Boolean, Column, DateTime, ForeignKey, String, Text
+from sqlalchemy import JSON, Boolean, Column, DateTime, ForeignKey, Index, String, Text
 from sqlalchemy.orm import relationship
 
 from .base import BaseModel
@@ -8,6 +8,18 @@ class Notification(BaseModel):
     """Notification model"""
 
     __tablename__ = "notifications"
+    __table_args__ = (
+        Index(
+            "ix_notifications_user_id_created_at_id", "user_id", "created_at", "id"
+        ),
+        Index(
+            "ix_notifications_user_id_is_read_created_at_id",
+            "user_id",
+            "is_read",
+            "created_at",
+            "id",
+        ),
+    )
 
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
     type = Column(
@@ -3,12 +3,15 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
+    Integer,
     String,
+    Table,
     Text,
 )
 from sqlalchemy.orm import relationship
 
-from .base import BaseModel
+from .base import Base, BaseModel
 
 
 class Project(BaseModel):
@@ -24,6 +27,8 @@ class Project(BaseModel):
     owner_id = Column(String, ForeignKey("users.id"), nullable=False)
     tags = Column(JSON, nullable=True)
     meta_data = Column(JSON, nullable=True)
+    # Set when the project is deleted; its rows are purged in the background
+    deleted_at = Column(DateTime, nullable=True)
 
     # Relationships
     members = relationship("ProjectMember", back_populates="project")
@@ -36,6 +41,15 @@ class ProjectMember(BaseModel):
     """Project member model"""
 
     __tablename__ = "project_members"
+    __table_args__ = (
+        Index(
+            "uq_project_members_project_id_user_id",
+            "project_id",
+            "user_id",
+            unique=True,
+        ),
+        Index("ix_project_members_user_id", "user_id"),
+    )
 
     project_id = Column(String, ForeignKey("projects.id"), nullable=False)
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -53,6 +67,11 @@ class Task(BaseModel):
     """Task model"""
 
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_project_id_created_at_id", "project_id", "created_at", "id"),
+        Index("ix_tasks_project_id_status", "project_id", "status"),
+        Index("ix_tasks_project_id_assignee_id", "project_id", "assignee_id"),
+    )
 
     title = Column(String, nullable=False)
     description = Column(Text, nullable=True)
@@ -80,10 +99,41 @@ class Task(BaseModel):
     comments = relationship("TaskComment", back_populates="task")
 
 
+# One row per tag of a task, so tasks can be filtered by tag with an index
+# instead of reading the JSON tags column of every task
+task_tags = Table(
+    "task_tags",
+    Base.metadata,
+    Column("task_id", String, ForeignKey("tasks.id"), primary_key=True),
+    Column("tag", String, primary_key=True),
+    Column("project_id", String, ForeignKey("projects.id"), nullable=False),
+    Index("ix_task_tags_project_id_tag", "project_id", "tag"),
+)
+
+
+# Dashboard counters of a project, e.g. ("status", "done") -> 12, updated in
+# the same transaction as the tasks and comments they count
+project_stats = Table(
+    "project_stats",
+    Base.metadata,
+    Column("project_id", String, ForeignKey("projects.id"), primary_key=True),
+    Column("name", String, primary_key=True),
+    Column("key", String, primary_key=True),
+    Column("value", Integer, nullable=False),
+)
+
+
 class TaskComment(BaseModel):
     """Task comment model"""
 
     __tablename__ = "task_comments"
+    __table_args__ = (
+        Index(
+            "ix_task_comments_task_id_created_at_id", "task_id", "created_at", "id"
+        ),
+        # Reply lookups when walking comment threads
+        Index("ix_task_comments_parent_id", "parent_id"),
+    )
 
     task_id = Column(String, ForeignKey("tasks.id"), nullable=False)
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -101,6 +151,24 @@ class ActivityLog(BaseModel):
     """Activity log model"""
 
     __tablename__ = "activity_logs"
+    __table_args__ = (
+        Index(
+            "ix_activity_logs_project_id_created_at_id",
+            "project_id",
+            "created_at",
+            "id",
+        ),
+        Index(
+            "ix_activity_logs_user_id_created_at_id", "user_id", "created_at", "id"
+        ),
+        Index(
+            "ix_activity_logs_entity_type_entity_id_created_at_id",
+            "entity_type",
+            "entity_id",
+            "created_at",
+            "id",
+        ),
+    )
 
     project_id = Column(String, ForeignKey("projects.id"), nullable=False)
     user_id = Column(String, ForeignKey("users.id"), nullable=False)
@@ -112,3 +180,47 @@ class ActivityLog(BaseModel):
     # Relationships
     project = relationship("Project", back_populates="activity_logs")
     user = relationship("User", back_populates="activity_logs")
+
+
+class TaskCommandHistory(BaseModel):
+    """Undo/redo history of one user's commands on one task"""
+
+    __tablename__ = "task_command_history"
+    __table_args__ = (
+        Index(
+            "uq_task_command_history_task_id_user_id",
+            "task_id",
+            "user_id",
+            unique=True,
+        ),
+        Index(
+            "ix_task_command_history_user_id_updated_at", "user_id", "updated_at"
+        ),
+    )
+
+    task_id = Column(String, ForeignKey("tasks.id"), nullable=False)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    project_id = Column(String, ForeignKey("projects.id"), nullable=False)
+    # Field diffs, oldest first: [{"field": [before, after]}, ...]
+    undo_stack = Column(JSON, nullable=False, default=list)
+    redo_stack = Column(JSON, nullable=False, default=list)
+
+
+class ProjectDeletion(BaseModel):
+    """Progress of the purge of a deleted project"""
+
+    __tablename__ = "project_deletions"
+    __table_args__ = (Index("ix_project_deletions_project_id", "project_id"),)
+
+    # No foreign key: the record outlives the project
+    project_id = Column(String, nullable=False)
+    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    status = Column(
+        String, nullable=False, default="pending"
+    )  # 'pending', 'running', 'done', 'failed'
+    # Rows deleted so far, by table
+    deleted_rows = Column(JSON, nullable=False, default=dict)
+    files_deleted = Column(Integer, nullable=False, default=0)
+    files_failed = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
@@ -0,0 +1,186 @@
+"""
+Full-text search indexes of tasks, task comments and documents.
+
+SQLite uses one external content FTS5 table per indexed table, kept in sync
+by triggers; Postgres uses a GIN index on the tsvector of each table, which
+it maintains itself. Neither can be declared on the models, so the DDL is
+attached to ``Base.metadata`` here and mirrored by migration 0006.
+"""
+from typing import List
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection
+
+from .base import Base
+
+# Indexed text columns of each table, most relevant first
+SEARCH_COLUMNS = {
+    "tasks": ("title", "description"),
+    "task_comments": ("content",),
+    "documents": ("name", "description", "tags"),
+}
+
+# Postgres text search configuration; 'simple' does not stem, so it works
+# the same for every language
+SEARCH_CONFIG = "simple"
+
+
+def fts_table(table: str) -> str:
+    """
+    Get the name of the FTS5 table indexing a table on SQLite.
+
+    Args:
+        table (str): Indexed table
+
+    Returns:
+        str: FTS5 table name
+    """
+    return f"{table}_fts"
+
+
+def search_index_name(table: str) -> str:
+    """
+    Get the name of the GIN index of a table on Postgres.
+
+    Args:
+        table (str): Indexed table
+
+    Returns:
+        str: Index name
+    """
+    return f"ix_{table}_search"
+
+
+def search_vector(table: str, qualified: bool = False) -> str:
+    """
+    Get the tsvector expression of a table on Postgres.
+
+    Queries must use this exact expression for the GIN index to serve them.
+    Columns are weighted A, B, C in SEARCH_COLUMNS order.
+
+    Args:
+        table (str): Indexed table
+        qualified (bool, optional): Prefix columns with the table name. Defaults to False.
+
+    Returns:
+        str: SQL expression
+    """
+    prefix = f"{table}." if qualified else ""
+    return " || ".join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({prefix}{column}::text, '')), "
+        f"'{weight}')"
+        for column, weight in zip(SEARCH_COLUMNS[table], "ABC")
+    )
+
+
+def is_search_object(name: str) -> bool:
+    """
+    Check if a table or index belongs to the search indexes.
+
+    Args:
+        name (str): Table or index name
+
+    Returns:
+        bool: True for FTS5 tables (and their shadow tables) and GIN indexes
+    """
+    return any(
+        name.startswith(fts_table(table)) or name == search_index_name(table)
+        for table in SEARCH_COLUMNS
+    )
+
+
+def search_index_ddl(dialect: str) -> List[str]:
+    """
+    Get the statements creating the search indexes.
+
+    Args:
+        dialect (str): Dialect name
+
+    Returns:
+        List[str]: Statements, none for dialects without full-text search
+    """
+    statements = []
+    for table, columns in SEARCH_COLUMNS.items():
+        if dialect == "sqlite":
+            fts = fts_table(table)
+            names = ", ".join(columns)
+            new = ", ".join(f"new.{column}" for column in columns)
+            old = ", ".join(f"old.{column}" for column in columns)
+            delete = (
+                f"INSERT INTO {fts}({fts}, rowid, {names}) "
+                f"VALUES ('delete', old.rowid, {old});"
+            )
+            insert = f"INSERT INTO {fts}(rowid, {names}) VALUES (new.rowid, {new});"
+            statements += [
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, "
+                f"content='{table}', content_rowid='rowid', "
+                f"tokenize='unicode61 remove_diacritics 2')",
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} "
+                f"BEGIN {insert} END",
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} "
+                f"BEGIN {delete} END",
+                # Only writes to the indexed columns touch the index
+                f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {names} ON {table} "
+                f"BEGIN {delete} {insert} END",
+            ]
+        elif dialect == "postgresql":
+            statements.append(
+                f"CREATE INDEX IF NOT EXISTS {search_index_name(table)} ON {table} "
+                f"USING gin (({search_vector(table)}))"
+            )
+    return statements
+
+
+def drop_search_index_ddl(dialect: str) -> List[str]:
+    """
+    Get the statements dropping the search indexes.
+
+    Args:
+        dialect (str): Dialect name
+
+    Returns:
+        List[str]: Statements
+    """
+    statements = []
+    for table in SEARCH_COLUMNS:
+        if dialect == "sqlite":
+            fts = fts_table(table)
+            statements += [
+                f"DROP TRIGGER IF EXISTS {fts}_{suffix}" for suffix in ("ai", "ad", "au")
+            ]
+            statements.append(f"DROP TABLE IF EXISTS {fts}")
+        elif dialect == "postgresql":
+            statements.append(f"DROP INDEX IF EXISTS {search_index_name(table)}")
+    return statements
+
+
+def rebuild_search_index(connection: Connection) -> None:
+    """
+    Re-index every row.
+
+    Needed on SQLite after VACUUM, which may renumber the rowids the FTS5
+    tables point to. Postgres indexes never need it.
+
+    Args:
+        connection (Connection): Database connection
+    """
+    if connection.dialect.name != "sqlite":
+        return
+
+    for table in SEARCH_COLUMNS:
+        fts = fts_table(table)
+        connection.exec_driver_sql(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_index(target, connection: Connection, **kw) -> None:
+    """Create the search indexes along with the tables"""
+    for statement in search_index_ddl(connection.dialect.name):
+        connection.exec_driver_sql(statement)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_search_index(target, connection: Connection, **kw) -> None:
+    """Drop the search indexes before the tables"""
+    for statement in drop_search_index_ddl(connection.dialect.name):
+        connection.exec_driver_sql(statement)
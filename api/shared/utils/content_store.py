@@ -0,0 +1,480 @@
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import exists, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.util import await_only
+from sqlalchemy.util.concurrency import in_greenlet
+
+from api.shared.models.document import DocumentBlob, DocumentVersion
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Document content storage configuration; the backend is "supabase" or "local"
+DOCUMENT_STORAGE_BACKEND = os.getenv("DOCUMENT_STORAGE_BACKEND", "supabase")
+DOCUMENT_BLOB_BUCKET = os.getenv("DOCUMENT_BLOB_BUCKET", "document-blobs")
+DOCUMENT_STORAGE_ROOT = os.getenv(
+    "DOCUMENT_STORAGE_ROOT", os.path.join(tempfile.gettempdir(), "document-blobs")
+)
+DOCUMENT_UPLOAD_TMP_DIR = os.getenv(
+    "DOCUMENT_UPLOAD_TMP_DIR", os.path.join(tempfile.gettempdir(), "document-uploads")
+)
+# Bytes read at a time when spooling uploads
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+class StagedContent(NamedTuple):
+    """An upload spooled to disk, hashed on the way"""
+
+    path: str
+    content_hash: str
+    size: int
+
+
+def blob_key(content_hash: str) -> str:
+    """
+    Get the storage key of a content hash, fanned out over two directory levels.
+
+    Args:
+        content_hash (str): Hex SHA-256 digest
+
+    Returns:
+        str: Storage key
+    """
+    return f"{content_hash[:2]}/{content_hash[2:4]}/{content_hash}"
+
+
+def _run_blocking(function: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run blocking I/O, on a worker thread when called from AsyncSession.run_sync.
+
+    A run_sync callback runs on the event loop; awaiting the thread from its
+    greenlet keeps the loop serving other requests meanwhile.
+
+    Args:
+        function (Callable[..., Any]): Blocking function
+        *args (Any): Its arguments
+
+    Returns:
+        Any: Its result
+    """
+    if in_greenlet():
+        return await_only(asyncio.to_thread(function, *args))
+    return function(*args)
+
+
+class BlobStorage(ABC):
+    """
+    Where content-addressed objects are kept.
+
+    Keys are derived from the content, so ``put`` of an existing key writes
+    the same bytes again and must overwrite rather than fail.
+    """
+
+    @abstractmethod
+    def put(self, key: str, file_path: str, content_type: Optional[str]) -> None:
+        """
+        Store a file.
+
+        Args:
+            key (str): Storage key
+            file_path (str): File on disk
+            content_type (Optional[str]): Content type
+        """
+
+    @abstractmethod
+    def delete(self, keys: List[str]) -> None:
+        """
+        Remove objects; missing keys are ignored.
+
+        Args:
+            keys (List[str]): Storage keys
+        """
+
+    @abstractmethod
+    def url(self, key: str) -> str:
+        """
+        Get the URL of an object.
+
+        Args:
+            key (str): Storage key
+
+        Returns:
+            str: URL
+        """
+
+
+class SupabaseBlobStorage(BlobStorage):
+    """Objects in a Supabase Storage bucket"""
+
+    def __init__(self, bucket: str = DOCUMENT_BLOB_BUCKET, manager: Any = None):
+        """
+        Initialize SupabaseBlobStorage.
+
+        Args:
+            bucket (str, optional): Bucket name. Defaults to DOCUMENT_BLOB_BUCKET.
+            manager (Any, optional): Storage client. Defaults to SupabaseManager, created on first use.
+        """
+        self.bucket = bucket
+        self.manager = manager
+        self._bucket_created = False
+
+    def put(self, key: str, file_path: str, content_type: Optional[str]) -> None:
+        manager = self._get_manager()
+        if not self._bucket_created:
+            try:
+                manager.create_bucket(self.bucket)
+            except Exception:
+                # Bucket may already exist
+                pass
+            self._bucket_created = True
+        # Uploaded from disk, never held in memory
+        with open(file_path, "rb") as content:
+            manager.upload_file(
+                self.bucket,
+                key,
+                content,
+                content_type or "application/octet-stream",
+                upsert=True,
+            )
+
+    def delete(self, keys: List[str]) -> None:
+        if keys:
+            self._get_manager().delete_files(self.bucket, keys)
+
+    def url(self, key: str) -> str:
+        return self._get_manager().get_file_url(self.bucket, key)
+
+    def _get_manager(self) -> Any:
+        """
+        Get the storage client, created on first use.
+
+        Returns:
+            Any: Storage client
+        """
+        if self.manager is None:
+            from api.shared.utils.supabase import SupabaseManager
+
+            self.manager = SupabaseManager()
+        return self.manager
+
+
+class LocalBlobStorage(BlobStorage):
+    """Objects in a local directory, for tests and single-host deployments"""
+
+    def __init__(self, root: str = DOCUMENT_STORAGE_ROOT):
+        """
+        Initialize LocalBlobStorage.
+
+        Args:
+            root (str, optional): Directory of the objects. Defaults to DOCUMENT_STORAGE_ROOT.
+        """
+        self.root = Path(root)
+
+    def put(self, key: str, file_path: str, content_type: Optional[str]) -> None:
+        target = self.root / key
+        target.parent.mkdir(parents=True, exist_ok=True)
+        # Copied aside then renamed, so readers never see a partial object
+        partial = target.with_name(f"{target.name}.{uuid.uuid4().hex}.part")
+        try:
+            shutil.copyfile(file_path, partial)
+            os.replace(partial, target)
+        except Exception:
+            partial.unlink(missing_ok=True)
+            raise
+
+    def delete(self, keys: List[str]) -> None:
+        for key in keys:
+            (self.root / key).unlink(missing_ok=True)
+
+    def url(self, key: str) -> str:
+        return (self.root / key).resolve().as_uri()
+
+
+class ContentStore:
+    """
+    Document version content, stored once per SHA-256.
+
+    Each distinct content is one object in the blob storage and one
+    DocumentBlob row; the DocumentVersion rows carrying its hash are its
+    references, counted rather than stored so the count can never drift.
+    Storing content that already has a blob uploads nothing. Once the last
+    version of a content is deleted, ``collect`` removes its row and object.
+
+    ``store`` and ``collect`` lock the blob row (SELECT ... FOR UPDATE), so a
+    version referencing a blob commits either before the blob is counted,
+    which keeps it, or after it is gone, which stores it again.
+
+    The row status is committed before the object changes: 'pending' before
+    an upload, so an object whose version never commits still has a row for
+    ``collect_garbage``, and 'deleting' before a removal, so a row whose
+    object may be gone is uploaded again rather than reused.
+    """
+
+    def __init__(
+        self,
+        storage: Optional[BlobStorage] = None,
+        tmp_dir: str = DOCUMENT_UPLOAD_TMP_DIR,
+    ):
+        """
+        Initialize ContentStore.
+
+        Args:
+            storage (BlobStorage, optional): Object storage. Defaults to the DOCUMENT_STORAGE_BACKEND one.
+            tmp_dir (str, optional): Directory of spooled uploads. Defaults to DOCUMENT_UPLOAD_TMP_DIR.
+        """
+        if storage is None:
+            storage = (
+                LocalBlobStorage()
+                if DOCUMENT_STORAGE_BACKEND == "local"
+                else SupabaseBlobStorage()
+            )
+        self.storage = storage
+        self.tmp_dir = tmp_dir
+        self.uploads = 0
+        self.deduplicated = 0
+        self.collected = 0
+        self._lock = threading.Lock()
+
+    def spool(self, file: BinaryIO) -> StagedContent:
+        """
+        Copy an upload to a temporary file, hashing it on the way.
+
+        Blocking; call it off the event loop, and ``discard`` the result.
+
+        Args:
+            file (BinaryIO): Uploaded file
+
+        Returns:
+            StagedContent: Spooled upload, its hash and size
+        """
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        with tempfile.NamedTemporaryFile(
+            dir=self.tmp_dir, prefix="upload-", delete=False
+        ) as tmp:
+            try:
+                for chunk in iter(lambda: file.read(UPLOAD_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+            except Exception:
+                tmp.close()
+                self.discard(tmp.name)
+                raise
+        return StagedContent(tmp.name, digest.hexdigest(), size)
+
+    def discard(self, path: str) -> None:
+        """
+        Remove a spooled upload, if it exists.
+
+        Args:
+            path (str): Spooled upload path
+        """
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Failed to remove spooled upload {path}: {e}")
+
+    def store(
+        self, db: Session, content: StagedContent, content_type: Optional[str]
+    ) -> DocumentBlob:
+        """
+        Get the blob of some content, uploading it only if it is not stored.
+
+        Commits the pending blob before uploading, so call it before writing
+        anything else in the transaction. The blob row then stays locked until
+        the caller commits the version referencing it. The upload runs off the
+        event loop when called from AsyncSession.run_sync.
+
+        Args:
+            db (Session): Database session
+            content (StagedContent): Spooled upload
+            content_type (Optional[str]): Content type
+
+        Returns:
+            DocumentBlob: Blob of the content
+        """
+        while True:
+            blob = self._lock_blob(db, content.content_hash)
+            if blob is not None and blob.status == "stored":
+                with self._lock:
+                    self.deduplicated += 1
+                return blob
+
+            key = blob_key(content.content_hash)
+            if blob is None:
+                blob = DocumentBlob(
+                    content_hash=content.content_hash,
+                    size=content.size,
+                    content_type=content_type,
+                    storage_key=key,
+                    url=self.storage.url(key),
+                )
+                try:
+                    with db.begin_nested():
+                        db.add(blob)
+                except IntegrityError:
+                    # Another request is storing the same content
+                    continue
+            blob.status = "pending"
+            db.commit()
+
+            _run_blocking(self.storage.put, key, content.path, content_type)
+            blob = self._lock_blob(db, content.content_hash)
+            if blob is None or blob.status == "deleting":
+                # Collected during the upload; claim it again
+                continue
+            blob.status = "stored"
+            with self._lock:
+                self.uploads += 1
+            return blob
+
+    def references(self, db: Session, content_hash: str) -> int:
+        """
+        Count the versions referencing some content.
+
+        Args:
+            db (Session): Database session
+            content_hash (str): Hex SHA-256 digest
+
+        Returns:
+            int: Number of versions
+        """
+        return db.scalar(
+            select(func.count(DocumentVersion.id)).where(
+                DocumentVersion.content_hash == content_hash
+            )
+        )
+
+    def collect(self, db: Session, content_hashes: Iterable[Optional[str]]) -> int:
+        """
+        Remove the blobs no version references any more.
+
+        Call once the deleted versions are committed. Each blob is committed
+        as deleting, then removed, its object before its row, unless ``store``
+        claimed it meanwhile; a blob whose object or row cannot be removed is
+        kept for ``collect_garbage`` to retry. Like ``store``, it removes
+        objects off the event loop when called from AsyncSession.run_sync.
+
+        Args:
+            db (Session): Database session
+            content_hashes (Iterable[Optional[str]]): Hashes of the deleted versions; None is ignored
+
+        Returns:
+            int: Number of blobs removed
+        """
+        collected = 0
+        for content_hash in sorted({h for h in content_hashes if h}):
+            blob = self._lock_blob(db, content_hash)
+            if blob is None or self.references(db, content_hash):
+                db.rollback()
+                continue
+            try:
+                blob.status = "deleting"
+                db.commit()
+                blob = self._lock_blob(db, content_hash)
+                if blob is None or blob.status != "deleting":
+                    db.rollback()
+                    continue
+                _run_blocking(self.storage.delete, [blob.storage_key])
+                db.delete(blob)
+                db.commit()
+            except Exception as e:
+                logger.error(f"Failed to collect document blob {content_hash}: {e}")
+                db.rollback()
+                continue
+            collected += 1
+
+        with self._lock:
+            self.collected += collected
+        return collected
+
+    def collect_garbage(self, db: Session) -> int:
+        """
+        Remove every unreferenced blob, e.g. those a failed ``collect`` or
+        an upload whose version never committed left.
+
+        Args:
+            db (Session): Database session
+
+        Returns:
+            int: Number of blobs removed
+        """
+        content_hashes = db.scalars(
+            select(DocumentBlob.content_hash).where(
+                ~exists().where(DocumentVersion.content_hash == DocumentBlob.content_hash)
+            )
+        ).all()
+        return self.collect(db, content_hashes)
+
+    def get_stats(self, db: Session) -> Dict[str, Any]:
+        """
+        Get storage metrics.
+
+        Args:
+            db (Session): Database session
+
+        Returns:
+            Dict[str, Any]: Blobs and bytes stored, versions and bytes they stand for,
+                and this worker's uploads, deduplicated stores and collected blobs
+        """
+        blobs, size = db.execute(
+            select(
+                func.count(DocumentBlob.id),
+                func.coalesce(func.sum(DocumentBlob.size), 0),
+            )
+        ).one()
+        versions, logical_size = db.execute(
+            select(
+                func.count(DocumentVersion.id),
+                func.coalesce(func.sum(DocumentBlob.size), 0),
+            ).join(DocumentBlob, DocumentBlob.content_hash == DocumentVersion.content_hash)
+        ).one()
+        return {
+            "blobs": blobs,
+            "bytes": size,
+            "versions": versions,
+            "logical_bytes": logical_size,
+            "uploads": self.uploads,
+            "deduplicated": self.deduplicated,
+            "collected": self.collected,
+        }
+
+    def _lock_blob(self, db: Session, content_hash: str) -> Optional[DocumentBlob]:
+        """
+        Get the blob of a hash, locking its row until the transaction ends.
+
+        Args:
+            db (Session): Database session
+            content_hash (str): Hex SHA-256 digest
+
+        Returns:
+            Optional[DocumentBlob]: Blob, None if the content is not stored
+        """
+        return db.scalar(
+            select(DocumentBlob)
+            .where(DocumentBlob.content_hash == content_hash)
+            .with_for_update()
+        )
+
+
+# Create global content store
+content_store = ContentStore()
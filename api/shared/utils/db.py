@@ -1,22 +1,270 @@
+import asyncio
+import logging
 import os
-from typing import Generator
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Dict, Generator, List
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Database URL
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./test.db")
 
+# Connection pool configuration
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+# Let PgBouncer (transaction pooling) own the connections instead of SQLAlchemy
+DB_USE_NULL_POOL = os.getenv("DB_USE_NULL_POOL", "false").lower() in ("1", "true", "yes")
+# Connections opened on startup, before the service accepts requests
+DB_POOL_WARMUP = int(os.getenv("DB_POOL_WARMUP", str(DB_POOL_SIZE)))
+
+# Async drivers used for each sync dialect
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """
+    Get the async driver URL for a database URL.
+
+    Args:
+        database_url (str): Database URL (e.g. postgresql://... or sqlite:///...)
+
+    Returns:
+        str: URL using an async driver (asyncpg or aiosqlite)
+    """
+    scheme, separator, rest = database_url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}{separator}{rest}"
+
+
+class PoolMetrics:
+    """Checkout latency and saturation of the connection pools"""
+
+    def __init__(self):
+        """Initialize PoolMetrics"""
+        self.pools: Dict[str, Dict[str, Any]] = {}
+        self.hooks: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+
+    def add_hook(self, hook: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Register a callback invoked after every pool checkout.
+
+        The callback receives the pool name, the wait time in seconds, the
+        checked-out connection count, the pool capacity, the saturation
+        (0.0-1.0) and whether the checkout timed out.
+
+        Args:
+            hook (Callable[[Dict[str, Any]], None]): Metrics callback
+        """
+        self.hooks.append(hook)
+
+    def remove_hook(self, hook: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Unregister a metrics callback.
+
+        Args:
+            hook (Callable[[Dict[str, Any]], None]): Metrics callback
+        """
+        if hook in self.hooks:
+            self.hooks.remove(hook)
+
+    def record_checkout(self, pool: QueuePool, wait_time: float, timed_out: bool) -> None:
+        """
+        Record a pool checkout.
+
+        Args:
+            pool (QueuePool): Pool the connection was taken from
+            wait_time (float): Seconds spent waiting for the connection
+            timed_out (bool): Whether the checkout failed with a timeout
+        """
+        name = pool.logging_name or "default"
+        capacity = pool.size() + max(pool._max_overflow, 0)
+        checked_out = pool.checkedout()
+
+        with self._lock:
+            stats = self.pools.setdefault(
+                name,
+                {
+                    "checkouts": 0,
+                    "timeouts": 0,
+                    "wait_time_total": 0.0,
+                    "wait_time_max": 0.0,
+                },
+            )
+            stats["pool"] = pool
+            stats["checkouts"] += 1
+            stats["timeouts"] += int(timed_out)
+            stats["wait_time_total"] += wait_time
+            stats["wait_time_max"] = max(stats["wait_time_max"], wait_time)
+
+        sample = {
+            "pool": name,
+            "wait_time": wait_time,
+            "checked_out": checked_out,
+            "capacity": capacity,
+            "saturation": checked_out / capacity if capacity else 1.0,
+            "timed_out": timed_out,
+        }
+        for hook in list(self.hooks):
+            hook(sample)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get metrics for every pool that has served a checkout.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Pool name -> metrics
+        """
+        result: Dict[str, Dict[str, Any]] = {}
+
+        with self._lock:
+            for name, stats in self.pools.items():
+                pool = stats["pool"]
+                capacity = pool.size() + max(pool._max_overflow, 0)
+                checked_out = pool.checkedout()
+                checkouts = stats["checkouts"]
+
+                result[name] = {
+                    "size": pool.size(),
+                    "capacity": capacity,
+                    "checked_out": checked_out,
+                    "idle": pool.checkedin(),
+                    "saturation": checked_out / capacity if capacity else 1.0,
+                    "checkouts": checkouts,
+                    "timeouts": stats["timeouts"],
+                    "wait_time_avg": (
+                        stats["wait_time_total"] / checkouts if checkouts else 0.0
+                    ),
+                    "wait_time_max": stats["wait_time_max"],
+                }
+
+        return result
+
+
+# Create global pool metrics
+pool_metrics = PoolMetrics()
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool that records checkout latency to ``pool_metrics``"""
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_checkout(self, time.perf_counter() - start, True)
+            raise
+
+        pool_metrics.record_checkout(self, time.perf_counter() - start, False)
+        return connection
+
+
+class MeteredAsyncAdaptedQueuePool(MeteredQueuePool, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout latency"""
+
+
+def get_engine_options(database_url: str, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Build engine keyword arguments from the pool configuration.
+
+    Args:
+        database_url (str): Database URL
+        is_async (bool, optional): Whether the engine uses an async driver. Defaults to False.
+
+    Returns:
+        Dict[str, Any]: Keyword arguments for create_engine/create_async_engine
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    driver = url.get_driver_name()
+    options: Dict[str, Any] = {
+        "pool_pre_ping": DB_POOL_PRE_PING,
+        "pool_logging_name": "async" if is_async else "sync",
+    }
+    connect_args: Dict[str, Any] = {}
+
+    if DB_USE_NULL_POOL:
+        options["poolclass"] = NullPool
+        if driver == "asyncpg":
+            # PgBouncer in transaction mode cannot keep named prepared statements
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_name_func"] = (
+                lambda: f"__asyncpg_{uuid.uuid4()}__"
+            )
+    elif backend == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite uses a single shared connection, not a queue pool
+        pass
+    else:
+        options.update(
+            poolclass=MeteredAsyncAdaptedQueuePool if is_async else MeteredQueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+        )
+
+    if DB_STATEMENT_TIMEOUT_MS > 0 and backend == "postgresql":
+        if driver == "asyncpg":
+            connect_args["server_settings"] = {
+                "statement_timeout": str(DB_STATEMENT_TIMEOUT_MS)
+            }
+        else:
+            connect_args["options"] = f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}"
+
+    if connect_args:
+        options["connect_args"] = connect_args
+
+    return options
+
+
+# Async database URL, defaults to DATABASE_URL with an async driver
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL", get_async_database_url(DATABASE_URL)
+)
+
 # Create database engine
-engine = create_engine(DATABASE_URL)
+engine = create_engine(DATABASE_URL, **get_engine_options(DATABASE_URL))
+
+# Create async database engine
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL, **get_engine_options(ASYNC_DATABASE_URL, is_async=True)
+)
 
 # Create session local
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create async session local
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
 
 def get_db() -> Generator[Session, None, None]:
     """
@@ -30,3 +278,90 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get async database session.
+
+    Service classes are written against a ``Session``; routes run them with
+    ``await db.run_sync(...)`` so every statement is awaited on the async
+    driver instead of blocking the event loop.
+
+    Yields:
+        AsyncSession: Async database session
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get connection pool metrics.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Pool name -> metrics
+    """
+    return pool_metrics.get_stats()
+
+
+async def warm_up_pool(
+    target: AsyncEngine = async_engine, connections: int = DB_POOL_WARMUP
+) -> int:
+    """
+    Open pooled connections ahead of the first requests.
+
+    Args:
+        target (AsyncEngine, optional): Engine to warm up. Defaults to async_engine.
+        connections (int, optional): Connections to open. Defaults to DB_POOL_WARMUP.
+
+    Returns:
+        int: Number of connections opened
+    """
+    pool: Pool = target.sync_engine.pool
+    if not isinstance(pool, QueuePool):
+        return 0
+
+    connections = min(connections, pool.size())
+    if connections <= 0:
+        return 0
+
+    async def open_connection() -> Any:
+        connection = await target.connect()
+        await connection.execute(text("SELECT 1"))
+        return connection
+
+    # Hold them all at once so each one is a distinct pooled connection
+    opened = await asyncio.gather(
+        *(open_connection() for _ in range(connections)), return_exceptions=True
+    )
+    for connection in opened:
+        if not isinstance(connection, BaseException):
+            await connection.close()
+
+    errors = [e for e in opened if isinstance(e, BaseException)]
+    if errors:
+        raise errors[0]
+
+    return connections
+
+
+@asynccontextmanager
+async def database_lifespan(app: Any) -> AsyncIterator[None]:
+    """
+    Warm up the connection pool on startup and close it on shutdown.
+
+    Args:
+        app (Any): FastAPI app
+    """
+    try:
+        opened = await warm_up_pool()
+        logger.info(f"Opened {opened} database connections")
+    except Exception as e:
+        # Connections will be opened on demand instead
+        logger.warning(f"Database pool warm-up failed: {str(e)}")
+
+    try:
+        yield
+    finally:
+        await async_engine.dispose()
@@ -0,0 +1,84 @@
+import hashlib
+from typing import Any, Callable, Optional, Tuple, TypeVar
+
+from fastapi import Response, status
+
+# Response header carrying the version of the representation
+ETAG_HEADER = "ETag"
+
+T = TypeVar("T")
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a weak ETag from the values that version a representation.
+
+    Args:
+        *parts (Any): Version values, e.g. ID and updated_at, or count and max(updated_at)
+
+    Returns:
+        str: Weak ETag, e.g. W/"3f2a..."
+    """
+    payload = "\x1f".join("" if part is None else str(part) for part in parts)
+    return f'W/"{hashlib.sha256(payload.encode()).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag, with weak comparison.
+
+    Args:
+        if_none_match (Optional[str]): If-None-Match header
+        etag (str): Current ETag
+
+    Returns:
+        bool: True if the client already has this version
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    def opaque(tag: str) -> str:
+        tag = tag.strip()
+        return tag[2:] if tag.startswith("W/") else tag
+
+    return opaque(etag) in {opaque(tag) for tag in if_none_match.split(",")}
+
+
+def get_if_modified(
+    if_none_match: Optional[str], get_etag: Callable[[], str], get: Callable[[], T]
+) -> Tuple[str, Optional[T]]:
+    """
+    Load a representation unless the client already has its current version.
+
+    ``get_etag`` must check access and compute the ETag with a query cheaper
+    than ``get``, which only runs when the ETag does not match.
+
+    Args:
+        if_none_match (Optional[str]): If-None-Match header
+        get_etag (Callable[[], str]): Computes the current ETag
+        get (Callable[[], T]): Loads the representation
+
+    Returns:
+        Tuple[str, Optional[T]]: ETag, and the representation or None if not modified
+    """
+    etag = get_etag()
+    if etag_matches(if_none_match, etag):
+        return etag, None
+    return etag, get()
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Build a 304 Not Modified response.
+
+    Args:
+        etag (str): Current ETag
+
+    Returns:
+        Response: Empty 304 response carrying the ETag
+    """
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED, headers={ETAG_HEADER: etag}
+    )
@@ -1,3 +1,4 @@
+import hashlib
 import os
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
@@ -14,6 +15,41 @@ JWT_ALGORITHM = os.getenv("JWT_ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
 
+# PEM keys used instead of JWT_SECRET_KEY for asymmetric algorithms (e.g. RS256).
+# Services that only verify tokens need just the public key.
+JWT_PRIVATE_KEY = os.getenv("JWT_PRIVATE_KEY")
+JWT_PUBLIC_KEY = os.getenv("JWT_PUBLIC_KEY")
+
+
+def _is_asymmetric() -> bool:
+    """
+    Check if the configured algorithm uses a key pair.
+
+    Returns:
+        bool: True for RS*, ES* and PS* algorithms, False for HS*
+    """
+    return not JWT_ALGORITHM.upper().startswith("HS")
+
+
+def _get_signing_key() -> Optional[str]:
+    """
+    Get the key used to sign tokens.
+
+    Returns:
+        Optional[str]: Private key for asymmetric algorithms, secret otherwise
+    """
+    return JWT_PRIVATE_KEY if _is_asymmetric() else JWT_SECRET_KEY
+
+
+def _get_verification_key() -> Optional[str]:
+    """
+    Get the key used to verify tokens.
+
+    Returns:
+        Optional[str]: Public key for asymmetric algorithms, secret otherwise
+    """
+    return JWT_PUBLIC_KEY if _is_asymmetric() else JWT_SECRET_KEY
+
 
 def create_access_token(
     data: Dict[str, Any], expires_delta: Optional[timedelta] = None
@@ -38,7 +74,7 @@ def create_access_token(
         )
 
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _get_signing_key(), algorithm=JWT_ALGORITHM)
 
     return encoded_jwt
 
@@ -64,7 +100,7 @@ def create_refresh_token(
         expire = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
 
     to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _get_signing_key(), algorithm=JWT_ALGORITHM)
 
     return encoded_jwt
 
@@ -82,7 +118,7 @@ def decode_token(token: str) -> Dict[str, Any]:
     Raises:
         JWTError: If token is invalid
     """
-    return jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
+    return jwt.decode(token, _get_verification_key(), algorithms=[JWT_ALGORITHM])
 
 
 def is_token_valid(token: str) -> bool:
@@ -122,3 +158,16 @@ def get_token_expiration(token: str) -> Optional[datetime]:
         return datetime.fromtimestamp(exp, tz=timezone.utc)
 
     return None
+
+
+def hash_token(token: str) -> str:
+    """
+    Hash a token so it can be used as a cache or revocation key.
+
+    Args:
+        token (str): JWT token
+
+    Returns:
+        str: Hex SHA-256 digest of the token
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
@@ -0,0 +1,462 @@
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from api.shared.models.project import ProjectMember
+
+# Load environment variables
+load_dotenv()
+
+# Membership cache configuration
+MEMBERSHIP_CACHE_SIZE = int(os.getenv("MEMBERSHIP_CACHE_SIZE", "10000"))
+MEMBERSHIP_CACHE_TTL = float(os.getenv("MEMBERSHIP_CACHE_TTL", "60"))
+# "local" for one process, "rabbitmq" to broadcast invalidations to every worker
+MEMBERSHIP_CACHE_BROADCAST = os.getenv("MEMBERSHIP_CACHE_BROADCAST", "local")
+MEMBERSHIP_EXCHANGE = "membership_invalidations"
+
+logger = logging.getLogger(__name__)
+
+# (project ID, user ID)
+MembershipKey = Tuple[str, str]
+
+
+class MembershipStore:
+    """
+    Out-of-process tier of the membership cache, shared by every worker.
+
+    The default implementation keeps entries in process memory, which makes it
+    the local stand-in tests share between several caches; a deployment can
+    subclass it and back ``get``/``set``/``delete`` with a shared store such
+    as Redis.
+    """
+
+    def __init__(self):
+        """Initialize MembershipStore"""
+        self._entries: Dict[MembershipKey, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: MembershipKey) -> Optional[str]:
+        """
+        Get the cached role of a member.
+
+        Args:
+            key (MembershipKey): Project ID and user ID
+
+        Returns:
+            Optional[str]: Role, None if not cached or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.time():
+                return None
+            return entry[0]
+
+    def set(self, key: MembershipKey, role: str, ttl: float) -> None:
+        """
+        Cache the role of a member.
+
+        Args:
+            key (MembershipKey): Project ID and user ID
+            role (str): Role
+            ttl (float): Seconds the entry stays valid
+        """
+        with self._lock:
+            self._entries[key] = (role, time.time() + ttl)
+
+    def delete(self, project_id: str, user_id: Optional[str] = None) -> None:
+        """
+        Drop cached roles.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str, optional): User ID. Defaults to every user of the project.
+        """
+        with self._lock:
+            for key in list(self._entries):
+                if key[0] == project_id and user_id in (None, key[1]):
+                    del self._entries[key]
+
+
+class InvalidationBroadcaster:
+    """
+    Delivers membership invalidations to the caches of every worker.
+
+    The default implementation only reaches the caches of the current
+    process; RabbitMQInvalidationBroadcaster reaches the other workers too.
+    """
+
+    def __init__(self):
+        """Initialize InvalidationBroadcaster"""
+        self._subscribers: List[Callable[[str, Optional[str]], None]] = []
+
+    def subscribe(self, callback: Callable[[str, Optional[str]], None]) -> None:
+        """
+        Register a callback for invalidations.
+
+        Args:
+            callback (Callable[[str, Optional[str]], None]): Called with the project ID and user ID
+        """
+        self._subscribers.append(callback)
+
+    def publish(self, project_id: str, user_id: Optional[str] = None) -> None:
+        """
+        Send an invalidation to every subscriber.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str, optional): User ID. Defaults to every user of the project.
+        """
+        self._deliver(project_id, user_id)
+
+    def _deliver(self, project_id: str, user_id: Optional[str]) -> None:
+        """
+        Call the subscribers of this process.
+
+        Args:
+            project_id (str): Project ID
+            user_id (Optional[str]): User ID, None for every user of the project
+        """
+        for callback in self._subscribers:
+            callback(project_id, user_id)
+
+
+class RabbitMQInvalidationBroadcaster(InvalidationBroadcaster):
+    """Broadcasts membership invalidations through a RabbitMQ fanout exchange"""
+
+    def __init__(self, exchange_name: str = MEMBERSHIP_EXCHANGE):
+        """
+        Initialize RabbitMQInvalidationBroadcaster.
+
+        Args:
+            exchange_name (str, optional): Fanout exchange. Defaults to MEMBERSHIP_EXCHANGE.
+        """
+        super().__init__()
+        self.exchange_name = exchange_name
+        self.origin = str(uuid.uuid4())
+        self._listener: Optional[threading.Thread] = None
+
+    def subscribe(self, callback: Callable[[str, Optional[str]], None]) -> None:
+        """
+        Register a callback, starting the listener on first use.
+
+        Args:
+            callback (Callable[[str, Optional[str]], None]): Called with the project ID and user ID
+        """
+        super().subscribe(callback)
+        if self._listener is None:
+            self._listener = threading.Thread(
+                target=self._listen, name="membership-invalidations", daemon=True
+            )
+            self._listener.start()
+
+    def publish(self, project_id: str, user_id: Optional[str] = None) -> None:
+        """
+        Invalidate locally, then tell the other workers.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str, optional): User ID. Defaults to every user of the project.
+        """
+        from api.shared.utils.rabbitmq import RabbitMQManager
+
+        self._deliver(project_id, user_id)
+        try:
+            manager = RabbitMQManager()
+            manager.declare_exchange(self.exchange_name, "fanout", durable=False)
+            manager.publish(
+                self.exchange_name,
+                "",
+                {"project_id": project_id, "user_id": user_id, "origin": self.origin},
+                persistent=False,
+            )
+        except Exception as e:
+            # Other workers fall back on the TTL
+            logger.error(f"Failed to broadcast membership invalidation: {e}")
+
+    def _on_message(self, body: bytes) -> None:
+        """
+        Apply an invalidation published by another worker.
+
+        Args:
+            body (bytes): JSON message with the project ID, user ID and origin
+        """
+        message = json.loads(body)
+        if message.get("origin") != self.origin:
+            self._deliver(message["project_id"], message.get("user_id"))
+
+    def _listen(self) -> None:
+        """Consume invalidations from the other workers, on a connection of its own"""
+        import pika
+
+        from api.shared.utils import rabbitmq
+
+        parameters = pika.ConnectionParameters(
+            host=rabbitmq.RABBITMQ_HOST,
+            port=rabbitmq.RABBITMQ_PORT,
+            virtual_host=rabbitmq.RABBITMQ_VHOST,
+            credentials=pika.PlainCredentials(
+                rabbitmq.RABBITMQ_USER, rabbitmq.RABBITMQ_PASSWORD
+            ),
+        )
+
+        while True:
+            try:
+                channel = pika.BlockingConnection(parameters).channel()
+                channel.exchange_declare(
+                    exchange=self.exchange_name, exchange_type="fanout", durable=False
+                )
+                queue = channel.queue_declare(queue="", exclusive=True).method.queue
+                channel.queue_bind(queue=queue, exchange=self.exchange_name)
+                channel.basic_consume(
+                    queue=queue,
+                    on_message_callback=lambda *args: self._on_message(args[-1]),
+                    auto_ack=True,
+                )
+                channel.start_consuming()
+            except Exception as e:
+                logger.error(f"Membership invalidation listener failed: {e}")
+                time.sleep(5)
+
+
+class MembershipCache:
+    """
+    Read-through cache of project roles, keyed by (project_id, user_id).
+
+    A bounded in-process LRU with a TTL sits in front of an optional shared
+    MembershipStore. Membership writes call ``invalidate`` after their commit;
+    the broadcaster drops the entries from every worker. Only members are
+    cached, so a user who just joined is never refused from the cache.
+    """
+
+    def __init__(
+        self,
+        max_size: int = MEMBERSHIP_CACHE_SIZE,
+        ttl: float = MEMBERSHIP_CACHE_TTL,
+        store: Optional[MembershipStore] = None,
+        broadcaster: Optional[InvalidationBroadcaster] = None,
+    ):
+        """
+        Initialize MembershipCache.
+
+        Args:
+            max_size (int, optional): Max roles cached in process. Defaults to MEMBERSHIP_CACHE_SIZE.
+            ttl (float, optional): Max seconds a role stays cached. Defaults to MEMBERSHIP_CACHE_TTL.
+            store (MembershipStore, optional): Shared tier. Defaults to none.
+            broadcaster (InvalidationBroadcaster, optional): Invalidation channel. Defaults to this process only.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.store = store
+        self.broadcaster = broadcaster or InvalidationBroadcaster()
+        self.broadcaster.subscribe(self._drop)
+        self._entries: "OrderedDict[MembershipKey, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @property
+    def generation(self) -> int:
+        """
+        Invalidation counter, to read before loading a role from the database.
+
+        ``set`` ignores roles loaded before an invalidation, which may be stale.
+        """
+        return self._generation
+
+    def get(self, project_id: str, user_id: str) -> Optional[str]:
+        """
+        Get the cached role of a user in a project.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID
+
+        Returns:
+            Optional[str]: Role, None if not cached
+        """
+        key = (project_id, user_id)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            generation = self._generation
+
+        role = self.store.get(key) if self.store is not None else None
+        with self._lock:
+            if role is None:
+                self.misses += 1
+                return None
+            self.store_hits += 1
+            if generation == self._generation:
+                self._put(key, role)
+        return role
+
+    def set(self, project_id: str, user_id: str, role: str, generation: int) -> None:
+        """
+        Cache the role of a user in a project.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str): User ID
+            role (str): Role read from the database
+            generation (int): ``generation`` read before the role was
+        """
+        if self.max_size <= 0:
+            return
+
+        key = (project_id, user_id)
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._put(key, role)
+        if self.store is not None:
+            self.store.set(key, role, self.ttl)
+
+    def invalidate(self, project_id: str, user_id: Optional[str] = None) -> None:
+        """
+        Drop cached roles from every worker and the shared tier.
+
+        Call after the membership change is committed.
+
+        Args:
+            project_id (str): Project ID
+            user_id (str, optional): User ID. Defaults to every user of the project.
+        """
+        if self.store is not None:
+            self.store.delete(project_id, user_id)
+        self.broadcaster.publish(project_id, user_id)
+
+    def clear(self) -> None:
+        """Remove all roles cached in process"""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache metrics.
+
+        Returns:
+            Dict[str, Any]: Size, hits (in process and shared tier), misses and invalidations
+        """
+        lookups = self.hits + self.store_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "store_hits": self.store_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.store_hits) / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+        }
+
+    def _put(self, key: MembershipKey, role: str) -> None:
+        """Store an entry in process, evicting the least recently used; lock held"""
+        self._entries[key] = (role, time.time() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _drop(self, project_id: str, user_id: Optional[str]) -> None:
+        """
+        Drop roles cached in process; the broadcaster calls it on every worker.
+
+        Args:
+            project_id (str): Project ID
+            user_id (Optional[str]): User ID, None for every user of the project
+        """
+        with self._lock:
+            self._generation += 1
+            self.invalidations += 1
+            if user_id is not None:
+                self._entries.pop((project_id, user_id), None)
+                return
+            for key in [key for key in self._entries if key[0] == project_id]:
+                del self._entries[key]
+
+
+def get_member_role(db: Session, project_id: str, user_id: str) -> Optional[str]:
+    """
+    Get the role of a user in a project, from the cache when possible.
+
+    Args:
+        db (Session): Database session
+        project_id (str): Project ID
+        user_id (str): User ID
+
+    Returns:
+        Optional[str]: Role, None if the user is not a project member
+    """
+    role = membership_cache.get(project_id, user_id)
+    if role is not None:
+        return role
+
+    generation = membership_cache.generation
+    role = db.scalar(
+        select(ProjectMember.role).where(
+            ProjectMember.project_id == project_id, ProjectMember.user_id == user_id
+        )
+    )
+    if role is not None:
+        membership_cache.set(project_id, user_id, role, generation)
+    return role
+
+
+def get_member_roles(
+    db: Session, project_ids: Iterable[str], user_id: str
+) -> Dict[str, str]:
+    """
+    Get the roles of a user in several projects, querying only the uncached ones.
+
+    Args:
+        db (Session): Database session
+        project_ids (Iterable[str]): Project IDs
+        user_id (str): User ID
+
+    Returns:
+        Dict[str, str]: Project ID -> role, for the projects the user is a member of
+    """
+    roles: Dict[str, str] = {}
+    missing: List[str] = []
+    for project_id in set(project_ids):
+        role = membership_cache.get(project_id, user_id)
+        if role is None:
+            missing.append(project_id)
+        else:
+            roles[project_id] = role
+
+    if missing:
+        generation = membership_cache.generation
+        for project_id, role in db.execute(
+            select(ProjectMember.project_id, ProjectMember.role).where(
+                ProjectMember.project_id.in_(missing), ProjectMember.user_id == user_id
+            )
+        ):
+            membership_cache.set(project_id, user_id, role, generation)
+            roles[project_id] = role
+    return roles
+
+
+# Create global membership cache
+membership_cache = MembershipCache(
+    broadcaster=RabbitMQInvalidationBroadcaster()
+    if MEMBERSHIP_CACHE_BROADCAST == "rabbitmq"
+    else None
+)
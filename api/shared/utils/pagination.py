@@ -0,0 +1,257 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, Iterable, List, NamedTuple, Optional, Sequence, Tuple, TypeVar
+
+from fastapi import Response
+from sqlalchemy import and_, or_, tuple_
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.orm import Query, Session
+from sqlalchemy.sql import ColumnElement, Select
+
+from api.shared.exceptions.base_exceptions import InvalidCursorException
+
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Largest page a client can request
+MAX_PAGE_SIZE = 1000
+
+T = TypeVar("T")
+
+
+class Page(List[T]):
+    """
+    One page of results.
+
+    A plain list, so endpoints keep returning JSON arrays, with the opaque
+    cursor of the following page attached (None on the last page).
+    """
+
+    def __init__(self, items: Iterable[T] = (), next_cursor: Optional[str] = None):
+        """
+        Initialize Page.
+
+        Args:
+            items (Iterable[T], optional): Page items
+            next_cursor (str, optional): Cursor of the next page. Defaults to None.
+        """
+        super().__init__(items)
+        self.next_cursor = next_cursor
+
+
+class SortKey(NamedTuple):
+    """One key of the order a page is read in"""
+
+    expression: ColumnElement
+    descending: bool = False
+    is_datetime: bool = False
+
+
+def _encode(values: List[Any]) -> str:
+    """Encode JSON values as an opaque, URL-safe cursor."""
+    payload = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> Any:
+    """Decode the JSON values of a cursor created by _encode."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def encode_cursor(created_at: datetime, id: str) -> str:
+    """
+    Encode a keyset position as an opaque cursor.
+
+    Args:
+        created_at (datetime): Creation time of the last item of the page
+        id (str): ID of the last item of the page
+
+    Returns:
+        str: URL-safe cursor
+    """
+    return _encode([created_at.isoformat(), id])
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """
+    Decode a cursor created by encode_cursor.
+
+    Args:
+        cursor (str): Cursor
+
+    Returns:
+        Tuple[datetime, str]: Creation time and ID of the last item seen
+
+    Raises:
+        InvalidCursorException: If the cursor is malformed
+    """
+    try:
+        created_at, id = _decode(cursor)
+        return datetime.fromisoformat(created_at), str(id)
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise InvalidCursorException()
+
+
+def paginate(
+    query: Query,
+    model: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    descending: bool = False,
+) -> Page:
+    """
+    Fetch one page of a query ordered by ``(created_at, id)``.
+
+    With a cursor the page starts right after the item it points to, which an
+    index on the filtered columns plus ``(created_at, id)`` serves without
+    reading the skipped rows. ``offset`` is still honoured when no cursor is
+    given, for clients that page by offset.
+
+    Args:
+        query (Query): Filtered query
+        model (Any): Model whose created_at/id order the results
+        limit (int): Max items in the page
+        cursor (str, optional): Cursor returned with the previous page. Defaults to None.
+        offset (int, optional): Items to skip when no cursor is given. Defaults to 0.
+        descending (bool, optional): Newest first. Defaults to False.
+
+    Returns:
+        Page: Models in the page and the cursor of the next one
+
+    Raises:
+        InvalidCursorException: If the cursor is malformed
+    """
+    key = tuple_(model.created_at, model.id)
+
+    if cursor:
+        position = decode_cursor(cursor)
+        query = query.filter(key < position if descending else key > position)
+
+    if descending:
+        query = query.order_by(model.created_at.desc(), model.id.desc())
+    else:
+        query = query.order_by(model.created_at, model.id)
+
+    if offset and not cursor:
+        query = query.offset(offset)
+
+    # One extra row tells whether there is a next page
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return Page(rows)
+
+    last = rows[limit - 1]
+    return Page(rows[:limit], encode_cursor(last.created_at, last.id))
+
+
+def paginate_select(
+    db: Session,
+    statement: Select,
+    keys: Sequence[SortKey],
+    limit: int,
+    cursor: Optional[str] = None,
+) -> Page[RowMapping]:
+    """
+    Fetch one page of a Core select in any order.
+
+    The cursor holds the sort key values of the last row, so pages stay
+    cheap however deep they are. ``keys`` must end with unique columns
+    (e.g. created_at, id) for the order to be total. Keys sorted in the same
+    direction are compared as one row value, which indexes can serve; mixed
+    directions are expanded to ``a > x OR (a = x AND b > y) ...``.
+
+    Args:
+        db (Session): Database session
+        statement (Select): Filtered select of the columns to return
+        keys (Sequence[SortKey]): Sort keys
+        limit (int): Max rows in the page
+        cursor (str, optional): Cursor returned with the previous page. Defaults to None.
+
+    Returns:
+        Page[RowMapping]: Rows in the page and the cursor of the next one
+
+    Raises:
+        InvalidCursorException: If the cursor is malformed or from another order
+    """
+    labels = [f"sort_key_{i}" for i in range(len(keys))]
+    statement = statement.add_columns(
+        *[key.expression.label(label) for key, label in zip(keys, labels)]
+    )
+
+    if cursor:
+        values = _decode_sort_cursor(cursor, keys)
+        if len({key.descending for key in keys}) == 1:
+            row = tuple_(*[key.expression for key in keys])
+            position = tuple_(*values)
+            statement = statement.where(
+                row < position if keys[0].descending else row > position
+            )
+        else:
+            conditions = []
+            for i, key in enumerate(keys):
+                after = (
+                    key.expression < values[i]
+                    if key.descending
+                    else key.expression > values[i]
+                )
+                equal = [k.expression == v for k, v in zip(keys[:i], values[:i])]
+                conditions.append(and_(*equal, after))
+            statement = statement.where(or_(*conditions))
+
+    statement = statement.order_by(
+        *[key.expression.desc() if key.descending else key.expression for key in keys]
+    )
+
+    # One extra row tells whether there is a next page
+    rows = db.execute(statement.limit(limit + 1)).mappings().all()
+    if len(rows) <= limit:
+        return Page(rows)
+
+    last = rows[limit - 1]
+    values = [
+        last[label].isoformat() if key.is_datetime else last[label]
+        for key, label in zip(keys, labels)
+    ]
+    return Page(rows[:limit], _encode(values))
+
+
+def _decode_sort_cursor(cursor: str, keys: Sequence[SortKey]) -> List[Any]:
+    """
+    Decode a cursor created by paginate_select.
+
+    Args:
+        cursor (str): Cursor
+        keys (Sequence[SortKey]): Sort keys the cursor must match
+
+    Returns:
+        List[Any]: Sort key values of the last row seen
+
+    Raises:
+        InvalidCursorException: If the cursor is malformed or from another order
+    """
+    try:
+        values = _decode(cursor)
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("Cursor does not match the sort order")
+        return [
+            datetime.fromisoformat(value) if key.is_datetime else value
+            for key, value in zip(keys, values)
+        ]
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise InvalidCursorException()
+
+
+def set_next_cursor_header(response: Response, page: Page) -> None:
+    """
+    Expose the cursor of the next page as a response header.
+
+    Args:
+        response (Response): Outgoing response
+        page (Page): Page being returned
+    """
+    if page.next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = page.next_cursor
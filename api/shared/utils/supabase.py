@@ -1,5 +1,5 @@
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from dotenv import load_dotenv
 from supabase import Client, create_client
@@ -150,7 +150,12 @@ class SupabaseManager:
         return self.storage().create_bucket(bucket_name)
 
     def upload_file(
-        self, bucket_name: str, file_path: str, file_content: Any, content_type: str
+        self,
+        bucket_name: str,
+        file_path: str,
+        file_content: Any,
+        content_type: str,
+        upsert: bool = False,
     ) -> Any:
         """
         Upload a file to storage.
@@ -160,15 +165,15 @@ class SupabaseManager:
             file_path (str): File path in the bucket
             file_content: File content
             content_type (str): File content type
+            upsert (bool, optional): Overwrite an existing file. Defaults to False.
 
         Returns:
             Dict: Supabase storage response
         """
-        return (
-            self.storage()
-            .from_(bucket_name)
-            .upload(file_path, file_content, {"content-type": content_type})
-        )
+        file_options = {"content-type": content_type}
+        if upsert:
+            file_options["upsert"] = "true"
+        return self.storage().from_(bucket_name).upload(file_path, file_content, file_options)
 
     def get_file_url(self, bucket_name: str, file_path: str) -> Any:
         """
@@ -195,3 +200,28 @@ class SupabaseManager:
             Dict: Supabase storage response
         """
         return self.storage().from_(bucket_name).remove([file_path])
+
+    def delete_files(self, bucket_name: str, file_paths: List[str]) -> Any:
+        """
+        Delete several files from storage in one request.
+
+        Args:
+            bucket_name (str): Bucket name
+            file_paths (List[str]): File paths in the bucket
+
+        Returns:
+            Dict: Supabase storage response
+        """
+        return self.storage().from_(bucket_name).remove(file_paths)
+
+    def delete_bucket(self, bucket_name: str) -> Any:
+        """
+        Delete an empty storage bucket.
+
+        Args:
+            bucket_name (str): Bucket name
+
+        Returns:
+            Dict: Supabase storage response
+        """
+        return self.storage().delete_bucket(bucket_name)
@@ -1,7 +1,10 @@
 import pytest
+from datetime import timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
-from fastapi import Request, status
+from fastapi import HTTPException, Request, status
+from api.api_gateway.middleware import auth_middleware as auth_module
 from api.api_gateway.middleware.auth_middleware import auth_middleware
+from api.api_gateway.utils.token_cache import TokenRevocationList, VerifiedTokenCache
 from typing import Any
 
 class DummyCallNext:
@@ -26,7 +29,7 @@ async def test_valid_token():
     request.headers = {'Authorization': 'Bearer validtoken'}
     dummy_response = MagicMock()
     call_next = DummyCallNext(dummy_response)
-    with patch('api.api_gateway.middleware.auth_middleware._validate_token', new=AsyncMock(return_value='user123')):
+    with patch('api.api_gateway.middleware.auth_middleware._validate_token', new=AsyncMock(return_value={'sub': 'user123', 'exp': 0})):
         response = await auth_middleware(request, call_next)
         assert response == dummy_response
         assert request.state.user_id == 'user123'
@@ -50,4 +53,78 @@ async def test_invalid_token():
     with patch('api.api_gateway.middleware.auth_middleware._validate_token', new=AsyncMock(side_effect=Exception('fail'))):
         response = await auth_middleware(request, call_next)
         assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
-        assert response.body is not None 
\ No newline at end of file
+        assert response.body is not None 
+
+@pytest.fixture
+def jwt_secret(monkeypatch: Any):
+    from api.shared.utils import jwt as jwt_utils
+    monkeypatch.setattr(jwt_utils, 'JWT_SECRET_KEY', 'testsecret')
+    monkeypatch.setattr(jwt_utils, 'JWT_ALGORITHM', 'HS256')
+    monkeypatch.setattr(auth_module, 'verified_token_cache', VerifiedTokenCache(max_size=2))
+    monkeypatch.setattr(auth_module, 'revocation_list', TokenRevocationList())
+    return jwt_utils
+
+@pytest.mark.asyncio
+async def test_validate_token_locally_and_cached(jwt_secret: Any):
+    token = jwt_secret.create_access_token({'sub': 'user123'})
+    with patch.object(auth_module, 'decode_token', wraps=jwt_secret.decode_token) as decode:
+        assert (await auth_module._validate_token(token))['sub'] == 'user123'
+        assert (await auth_module._validate_token(token))['sub'] == 'user123'
+    assert decode.call_count == 1
+    assert auth_module.verified_token_cache.get_stats()['hits'] == 1
+
+@pytest.mark.asyncio
+async def test_validate_token_rejects_bad_tokens(jwt_secret: Any):
+    expired = jwt_secret.create_access_token({'sub': 'user123'}, expires_delta=timedelta(seconds=-1))
+    no_sub = jwt_secret.create_access_token({})
+    no_exp = jwt_secret.jwt.encode({'sub': 'user123'}, 'testsecret', algorithm='HS256')
+    for token in (expired, no_sub, no_exp, 'invalid.token.value'):
+        with pytest.raises(HTTPException) as exc:
+            await auth_module._validate_token(token)
+        assert exc.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+@pytest.mark.asyncio
+async def test_validate_token_rs256(jwt_secret: Any, monkeypatch: Any):
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    monkeypatch.setattr(jwt_secret, 'JWT_ALGORITHM', 'RS256')
+    monkeypatch.setattr(jwt_secret, 'JWT_PRIVATE_KEY', key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption()).decode())
+    monkeypatch.setattr(jwt_secret, 'JWT_PUBLIC_KEY', key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo).decode())
+    token = jwt_secret.create_access_token({'sub': 'user123'})
+    assert (await auth_module._validate_token(token))['sub'] == 'user123'
+
+@pytest.mark.asyncio
+async def test_logout_revokes_token(jwt_secret: Any):
+    token = jwt_secret.create_access_token({'sub': 'user123'})
+    request = MagicMock(spec=Request)
+    request.url.path = '/auth/logout'
+    request.method = 'POST'
+    request.headers = {'Authorization': f'Bearer {token}'}
+    response = await auth_middleware(request, DummyCallNext(MagicMock(status_code=200)))
+    assert response.status_code == 200
+    assert auth_module.revocation_list.is_revoked(token)
+
+    request.url.path = '/projects'
+    request.method = 'GET'
+    response = await auth_middleware(request, DummyCallNext(MagicMock(status_code=200)))
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+@pytest.mark.asyncio
+async def test_logout_revokes_token_until_it_expires_without_the_cache(jwt_secret: Any, monkeypatch: Any):
+    monkeypatch.setattr(auth_module, 'verified_token_cache', VerifiedTokenCache(max_size=0))
+    token = jwt_secret.create_access_token({'sub': 'user123'}, expires_delta=timedelta(minutes=30))
+    exp = jwt_secret.decode_token(token)['exp']
+    request = MagicMock(spec=Request)
+    request.url.path = '/auth/logout'
+    request.method = 'POST'
+    request.headers = {'Authorization': f'Bearer {token}'}
+    await auth_middleware(request, DummyCallNext(MagicMock(status_code=200)))
+
+    # Revoked for the token's whole lifetime, not the cache TTL
+    with patch('api.api_gateway.utils.token_cache.time.time', return_value=exp - 1):
+        assert auth_module.revocation_list.is_revoked(token)
+    # Only the validation looked the token up
+    assert auth_module.verified_token_cache.get_stats()['misses'] == 1
@@ -0,0 +1,109 @@
+from typing import Any, Callable, Dict, List, Tuple
+from unittest.mock import patch
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from api.api_gateway.main import _filter_headers, forward_request
+from api.api_gateway.utils.http_client import UpstreamClientPool
+
+received: List[Dict[str, Any]] = []
+
+
+def _upstream(request: httpx.Request) -> httpx.Response:
+    received.append(
+        {
+            "headers": dict(request.headers),
+            "body": request.read(),
+            "params": request.url.params.multi_items(),
+        }
+    )
+    return httpx.Response(
+        201,
+        stream=httpx.ByteStream(b"%PDF-1.7 not json"),
+        headers={"Content-Type": "application/pdf", "Connection": "close", "X-Custom": "1"},
+    )
+
+
+def _client(
+    upstream: Callable[[httpx.Request], httpx.Response] = _upstream
+) -> Tuple[TestClient, UpstreamClientPool, Any]:
+    pool = UpstreamClientPool()
+    pool.get_client("documents")
+    pool.clients["documents"] = httpx.AsyncClient(transport=httpx.MockTransport(upstream))
+
+    app = FastAPI()
+
+    @app.api_route("/{path:path}", methods=["GET", "POST"])
+    async def proxy(request: Request, path: str) -> Any:
+        request.state.user_id = "uid"
+        return await forward_request(request, f"http://documents/{path}", "documents")
+
+    patcher = patch("api.api_gateway.main.circuit_breaker.client_pool", pool)
+    patcher.start()
+    return TestClient(app), pool, patcher
+
+
+def test_forward_request_streams_bytes_unchanged() -> None:
+    received.clear()
+    client, pool, patcher = _client()
+    try:
+        response = client.post(
+            "/documents/upload?tag=a&tag=b",
+            content=b"\x00\x01binary upload",
+            headers={"Content-Type": "application/octet-stream", "Keep-Alive": "timeout=5"},
+        )
+    finally:
+        patcher.stop()
+
+    assert response.status_code == 201
+    assert response.content == b"%PDF-1.7 not json"
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.headers["x-custom"] == "1"
+    assert received[0]["body"] == b"\x00\x01binary upload"
+    assert received[0]["headers"]["x-user-id"] == "uid"
+    assert "keep-alive" not in received[0]["headers"]
+    assert received[0]["params"] == [("tag", "a"), ("tag", "b")]
+    assert pool.get_stats()["documents"]["in_use"] == 0
+
+
+def test_forward_request_get_has_no_body() -> None:
+    received.clear()
+    client, _, patcher = _client()
+    try:
+        response = client.get("/documents/doc1")
+    finally:
+        patcher.stop()
+
+    assert response.status_code == 201
+    assert received[0]["body"] == b""
+    assert "transfer-encoding" not in received[0]["headers"]
+
+
+def test_filter_headers_drops_connection_listed_headers() -> None:
+    headers = httpx.Headers({"Connection": "close, X-Trace", "X-Trace": "1", "Host": "gw", "Accept": "*/*"})
+    assert _filter_headers(headers, extra=("host",)) == {"accept": "*/*"}
+
+
+def test_forward_request_passes_not_modified_through() -> None:
+    etag = 'W/"v1"'
+
+    def upstream(request: httpx.Request) -> httpx.Response:
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(200, stream=httpx.ByteStream(b'{"id":"doc1"}'), headers={"ETag": etag})
+
+    client, pool, patcher = _client(upstream)
+    try:
+        response = client.get("/documents/doc1")
+        assert response.status_code == 200 and response.headers["etag"] == etag
+
+        response = client.get("/documents/doc1", headers={"If-None-Match": etag})
+    finally:
+        patcher.stop()
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+    assert pool.get_stats()["documents"]["in_use"] == 0
@@ -0,0 +1,67 @@
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from api.api_gateway.middleware.circuit_breaker import CircuitBreaker
+from api.api_gateway.utils.http_client import UpstreamClientPool
+
+
+def _mock_pool(handler: httpx.MockTransport, service_name: str = "projects") -> UpstreamClientPool:
+    pool = UpstreamClientPool(max_connections=4)
+    pool.get_client(service_name)
+    pool.clients[service_name] = httpx.AsyncClient(transport=handler)
+    return pool
+
+
+def test_get_client_is_reused() -> None:
+    pool = UpstreamClientPool()
+    client = pool.get_client("projects")
+    assert pool.get_client("projects") is client
+    assert pool.get_client("documents") is not client
+
+
+def test_service_timeout_override(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("GATEWAY_TIMEOUT_EXTERNAL_TOOLS", "12.5")
+    pool = UpstreamClientPool(timeout=3.0, service_timeouts={"documents": 30.0})
+    assert pool.get_timeout("projects") == 3.0
+    assert pool.get_timeout("documents") == 30.0
+    assert pool.get_timeout("external-tools") == 12.5
+    assert pool.get_client("documents").timeout.read == 30.0
+
+
+@pytest.mark.asyncio
+async def test_request_records_metrics() -> None:
+    pool = _mock_pool(httpx.MockTransport(lambda request: httpx.Response(200, json={"ok": True})))
+    response = await pool.request("projects", "GET", "http://projects/projects")
+    assert response.json() == {"ok": True}
+    stats = pool.get_stats()["projects"]
+    assert stats["requests"] == 1
+    assert stats["in_use"] == 0
+    assert stats["max_connections"] == 4
+    await pool.close()
+    assert pool.clients == {}
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_uses_pool() -> None:
+    seen: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request.method)
+        return httpx.Response(201)
+
+    breaker = CircuitBreaker(client_pool=_mock_pool(httpx.MockTransport(handler)))
+    response = await breaker.call_service("projects", "http://projects/projects", "POST", content=b"{}")
+    assert response.status_code == 201
+    assert seen == ["POST"]
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_records_failure() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("refused")
+
+    breaker = CircuitBreaker(failure_threshold=1, client_pool=_mock_pool(httpx.MockTransport(handler)))
+    with pytest.raises(HTTPException):
+        await breaker.call_service("projects", "http://projects/projects", "GET")
+    assert breaker.is_circuit_open("projects")
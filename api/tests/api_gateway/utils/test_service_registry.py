@@ -25,4 +25,40 @@ def test_get_service_for_path_invalid(registry: ServiceRegistry) -> None:
 def test_get_all_services(registry: ServiceRegistry) -> None:
     services = registry.get_all_services()
     assert isinstance(services, list)
-    assert any(s['name'] == 'auth' for s in services) 
\ No newline at end of file
+    assert any(s['name'] == 'auth' for s in services) 
+
+def test_literal_segment_has_priority(registry: ServiceRegistry) -> None:
+    service = registry.get_service_for_path('/documents/upload', 'POST')
+    assert service['name'] == 'documents'
+    assert service['params'] == {}
+    service = registry.get_service_for_path('/documents/upload', 'GET')
+    assert service['params'] == {'document_id': 'upload'}
+
+def test_get_service_for_path_extracts_params(registry: ServiceRegistry) -> None:
+    service = registry.get_service_for_path('/projects/p1/tasks/t1/comments', 'GET')
+    assert service['name'] == 'projects'
+    assert service['params'] == {'project_id': 'p1', 'task_id': 't1'}
+
+def test_get_service_for_path_method_mismatch(registry: ServiceRegistry) -> None:
+    with pytest.raises(ValueError):
+        registry.get_service_for_path('/notifications/batch', 'GET')
+
+def test_ambiguous_routes_rejected() -> None:
+    registry = ServiceRegistry()
+    registry.services['clone'] = {
+        'url': 'http://clone',
+        'routes': [{'path': '/projects/{id}', 'methods': ['GET']}],
+    }
+    with pytest.raises(ValueError):
+        registry.build_route_table()
+    registry.services['clone']['routes'] = [{'path': '/projects/{project_id}', 'methods': ['PATCH']}]
+    registry.build_route_table()
+
+def test_route_cache_is_bounded() -> None:
+    registry = ServiceRegistry(route_cache_size=2)
+    for project_id in ('a', 'b', 'c'):
+        registry.get_service_for_path(f'/projects/{project_id}', 'GET')
+    assert list(registry.route_cache) == [('GET', '/projects/b'), ('GET', '/projects/c')]
+    service = registry.get_service_for_path('/projects/c', 'GET')
+    service['params']['project_id'] = 'changed'
+    assert registry.get_service_for_path('/projects/c', 'GET')['params'] == {'project_id': 'c'}
@@ -0,0 +1,31 @@
+import time
+
+from api.api_gateway.utils.token_cache import TokenRevocationList, VerifiedTokenCache
+
+
+def test_cache_is_bounded_lru() -> None:
+    cache = VerifiedTokenCache(max_size=2, ttl=60)
+    cache.set("a", {"sub": "1"})
+    cache.set("b", {"sub": "2"})
+    assert cache.get("a") == {"sub": "1"}
+    cache.set("c", {"sub": "3"})
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get_stats()["size"] == 2
+
+
+def test_cache_expiry_follows_exp_claim() -> None:
+    cache = VerifiedTokenCache(max_size=10, ttl=60)
+    cache.set("expired", {"sub": "1", "exp": time.time() - 1})
+    cache.set("valid", {"sub": "1", "exp": time.time() + 30})
+    assert cache.get("expired") is None
+    assert cache.get("valid") is not None
+
+
+def test_revocation_list_drops_expired_entries() -> None:
+    revoked = TokenRevocationList()
+    revoked.revoke("old", expires_at=time.time() - 1)
+    revoked.revoke("new", expires_at=time.time() + 60)
+    assert not revoked.is_revoked("old")
+    assert revoked.is_revoked("new")
+    assert len(revoked) == 1
@@ -0,0 +1,44 @@
+from typing import Iterator
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from api.document_service.app.services.document_cache import document_cache
+from api.shared.models import (  # noqa: F401
+    document,
+    external_tools,
+    notification,
+    project,
+    search,
+    user,
+)
+from api.shared.models.base import Base
+from api.shared.utils.membership_cache import membership_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_caches() -> Iterator[None]:
+    # Tests reuse project, document and user IDs across fresh databases
+    membership_cache.clear()
+    document_cache.clear()
+    yield
+    membership_cache.clear()
+    document_cache.clear()
+
+
+@pytest.fixture
+def engine() -> Iterator[Engine]:
+    # A single connection, so every session sees the same in-memory database
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine: Engine) -> Iterator[Session]:
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
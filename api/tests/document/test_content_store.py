@@ -0,0 +1,210 @@
+import io
+import os
+import threading
+from datetime import datetime
+from typing import Any, List
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
+
+from api.document_service.app.services.document_service import DocumentService
+from api.shared.exceptions.document_exceptions import DocumentStorageException
+from api.shared.models import document, external_tools, notification, project, user  # noqa: F401
+from api.shared.models.base import Base
+from api.shared.models.document import Document, DocumentBlob, DocumentVersion
+from api.shared.models.project import Project, ProjectMember
+from api.shared.utils.content_store import ContentStore, LocalBlobStorage, blob_key
+
+
+class RecordingStorage(LocalBlobStorage):
+    """Local storage that records its calls, and can fail deletes."""
+
+    def __init__(self, root: str):
+        super().__init__(root)
+        self.puts: List[str] = []
+        self.threads: List[threading.Thread] = []
+        self.fail_deletes = False
+
+    def put(self, key: str, file_path: str, content_type: Any) -> None:
+        self.puts.append(key)
+        self.threads.append(threading.current_thread())
+        super().put(key, file_path, content_type)
+
+    def delete(self, keys: List[str]) -> None:
+        self.threads.append(threading.current_thread())
+        if self.fail_deletes:
+            raise RuntimeError("storage unavailable")
+        super().delete(keys)
+
+
+def _seed(db: Session) -> None:
+    db.add(Project(id="p1", name="Project", owner_id="owner"))
+    db.add(ProjectMember(project_id="p1", user_id="owner", role="owner", joined_at=datetime(2026, 1, 1)))
+    db.add_all(
+        Document(id=document_id, name=f"{document_id}.txt", project_id="p1", type="file", creator_id="owner")
+        for document_id in ("d1", "d2")
+    )
+    db.commit()
+
+
+@pytest.fixture
+def db(db: Session) -> Session:
+    _seed(db)
+    return db
+
+
+@pytest.fixture
+def store(tmp_path: Any) -> ContentStore:
+    return ContentStore(storage=RecordingStorage(str(tmp_path / "blobs")), tmp_dir=str(tmp_path / "uploads"))
+
+
+def _add_version(db: Session, store: ContentStore, document_id: str, content: bytes) -> Any:
+    service = DocumentService(db)
+    service.content_store = store
+    staged = store.spool(io.BytesIO(content))
+    try:
+        return service.create_document_version(document_id, "text/plain", "Edit", "owner", staged)
+    finally:
+        store.discard(staged.path)
+
+
+def test_unchanged_content_is_stored_once(db: Session, store: ContentStore, tmp_path: Any) -> None:
+    first = _add_version(db, store, "d1", b"hello")
+    again = _add_version(db, store, "d1", b"hello")
+    # Other documents share the content too
+    other = _add_version(db, store, "d2", b"hello")
+    changed = _add_version(db, store, "d1", b"hello, world")
+
+    assert [version.version for version in (first, again, changed)] == [1, 2, 3]
+    assert first.url == again.url == other.url != changed.url
+    assert (first.size, changed.size) == (5, 12)
+    assert len(store.storage.puts) == 2
+    assert db.get(Document, "d1").url == changed.url and db.get(Document, "d1").size == 12
+
+    content_hash = db.get(DocumentVersion, first.id).content_hash
+    assert store.references(db, content_hash) == 3
+    blob = db.query(DocumentBlob).filter_by(content_hash=content_hash).one()
+    assert blob.storage_key == blob_key(content_hash) == f"{content_hash[:2]}/{content_hash[2:4]}/{content_hash}"
+    assert (tmp_path / "blobs" / blob.storage_key).read_bytes() == b"hello"
+    assert blob.url == (tmp_path / "blobs" / blob.storage_key).resolve().as_uri()
+    # Spooled uploads are gone
+    assert os.listdir(tmp_path / "uploads") == []
+    assert store.get_stats(db) == {
+        "blobs": 2,
+        "bytes": 17,
+        "versions": 4,
+        "logical_bytes": 27,
+        "uploads": 2,
+        "deduplicated": 2,
+        "collected": 0,
+    }
+
+
+def test_content_is_collected_with_its_last_version(db: Session, store: ContentStore, tmp_path: Any) -> None:
+    shared = _add_version(db, store, "d1", b"shared")
+    _add_version(db, store, "d2", b"shared")
+    own = _add_version(db, store, "d1", b"only d1")
+    own_key = db.query(DocumentBlob).filter_by(url=own.url).one().storage_key
+    shared_key = db.query(DocumentBlob).filter_by(url=shared.url).one().storage_key
+
+    service = DocumentService(db)
+    service.content_store = store
+    service.delete_document("d1", "owner")
+
+    # d2 still references the shared content
+    assert [blob.url for blob in db.query(DocumentBlob)] == [shared.url]
+    assert not (tmp_path / "blobs" / own_key).exists()
+    assert db.query(DocumentVersion).filter_by(document_id="d1").count() == 0
+    assert store.collected == 1
+
+    store.storage.fail_deletes = True
+    service.delete_document("d2", "owner")
+    # Kept until its object is removed, by the next sweep
+    assert db.query(DocumentBlob).count() == 1
+    store.storage.fail_deletes = False
+    assert store.collect_garbage(db) == 1
+    assert db.query(DocumentBlob).count() == 0 and not (tmp_path / "blobs" / shared_key).exists()
+
+
+def test_content_collected_before_a_new_upload_is_stored_again(db: Session, store: ContentStore) -> None:
+    first = _add_version(db, store, "d1", b"draft")
+    db.query(DocumentVersion).filter_by(id=first.id).delete()
+    db.commit()
+    assert store.collect(db, [db.query(DocumentBlob).one().content_hash, None]) == 1
+
+    again = _add_version(db, store, "d1", b"draft")
+    assert again.url == first.url and len(store.storage.puts) == 2
+    assert db.query(DocumentBlob).count() == 1
+
+
+def test_failed_uploads_create_no_version(
+    db: Session, store: ContentStore, tmp_path: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    put = store.storage.put
+
+    def lost(*args: Any) -> None:
+        # The object is written, but the upload still fails
+        put(*args)
+        raise RuntimeError("storage unavailable")
+
+    monkeypatch.setattr(store.storage, "put", lost)
+    with pytest.raises(DocumentStorageException):
+        _add_version(db, store, "d1", b"lost")
+    assert db.query(DocumentVersion).count() == 0
+    # The pending blob tracks the object until the next sweep
+    blob = db.query(DocumentBlob).one()
+    assert blob.status == "pending" and (tmp_path / "blobs" / blob.storage_key).exists()
+    assert store.collect_garbage(db) == 1
+    assert db.query(DocumentBlob).count() == 0 and not (tmp_path / "blobs" / blob.storage_key).exists()
+
+
+def test_content_whose_collection_failed_is_stored_again(
+    db: Session, store: ContentStore, tmp_path: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    first = _add_version(db, store, "d1", b"draft")
+    blob = db.query(DocumentBlob).one()
+    content_hash, key = blob.content_hash, blob.storage_key
+    db.query(DocumentVersion).filter_by(id=first.id).delete()
+    db.commit()
+
+    def unavailable(*args: Any) -> None:
+        raise RuntimeError("database unavailable")
+
+    # The object is removed, but not the row
+    with monkeypatch.context() as patch:
+        patch.setattr(db, "delete", unavailable)
+        assert store.collect(db, [content_hash]) == 0
+    assert db.query(DocumentBlob).one().status == "deleting"
+    assert not (tmp_path / "blobs" / key).exists()
+
+    again = _add_version(db, store, "d1", b"draft")
+    assert again.url == first.url and len(store.storage.puts) == 2
+    assert (tmp_path / "blobs" / key).read_bytes() == b"draft"
+    assert db.query(DocumentBlob).one().status == "stored"
+
+
+@pytest.mark.asyncio
+async def test_storage_is_called_off_the_event_loop(store: ContentStore) -> None:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    def delete_document(db: Session) -> None:
+        service = DocumentService(db)
+        service.content_store = store
+        service.delete_document("d1", "owner")
+
+    try:
+        async with AsyncSession(engine) as session:
+            await session.run_sync(_seed)
+            await session.run_sync(lambda db: _add_version(db, store, "d1", b"async"))
+            await session.run_sync(delete_document)
+            assert await session.run_sync(lambda db: db.query(DocumentBlob).count()) == 0
+    finally:
+        await engine.dispose()
+
+    # One upload and one removal, both on worker threads
+    assert len(store.storage.threads) == 2
+    assert threading.current_thread() not in store.storage.threads
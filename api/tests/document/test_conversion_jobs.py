@@ -0,0 +1,336 @@
+import io
+import os
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from api.document_service.app.services.conversion_cache import ConversionCache, file_sha256
+from api.document_service.app.services.conversion_jobs import ConversionQueue
+from api.document_service.app.services.document_service import DocumentService
+from api.external_tools_service.app.services import document_tools
+from api.shared.exceptions.document_exceptions import (
+    ConversionJobExpiredException,
+    ConversionJobNotFoundException,
+    ConversionQueueFullException,
+)
+from api.shared.models import document, external_tools, notification, project, user  # noqa: F401
+from api.shared.models.base import Base
+from api.shared.models.document import ConversionCacheEntry
+
+
+class LocalStorage:
+    """Keeps uploads in memory instead of calling Supabase."""
+
+    def __init__(self) -> None:
+        self.files: Dict[str, bytes] = {}
+        self.content_types: List[str] = []
+        self.buckets: List[str] = []
+
+    def create_bucket(self, bucket_name: str) -> None:
+        self.buckets.append(bucket_name)
+
+    def upload_file(
+        self, bucket_name: str, file_path: str, file_content: Any, content_type: str, upsert: bool = False
+    ) -> None:
+        # The queue hands over an open file, not its bytes
+        assert hasattr(file_content, "read")
+        assert upsert or f"{bucket_name}/{file_path}" not in self.files
+        self.files[f"{bucket_name}/{file_path}"] = file_content.read()
+        self.content_types.append(content_type)
+
+    def delete_files(self, bucket_name: str, file_paths: List[str]) -> None:
+        for path in file_paths:
+            del self.files[f"{bucket_name}/{path}"]
+
+    def get_file_url(self, bucket_name: str, file_path: str) -> str:
+        return f"https://storage.example.com/{bucket_name}/{file_path}"
+
+
+class Converter:
+    """Upper-cases the input, holding every conversion until released."""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.calls = 0
+        self.running = 0
+        self.max_running = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, input_path: str, output_path: str, output_format: str, timeout: float) -> int:
+        with self.lock:
+            self.calls += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        try:
+            if not self.release.wait(timeout):
+                raise TimeoutError(f"Conversion took longer than {timeout} seconds")
+            with open(input_path, "rb") as source, open(output_path, "wb") as output:
+                return output.write(source.read().upper())
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+@pytest.fixture
+def session_factory(tmp_path_factory: pytest.TempPathFactory) -> Iterator[sessionmaker]:
+    # A file, so that each worker thread gets a connection of its own
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('db') / 'jobs.db'}")
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def _queue(session_factory: sessionmaker, tmp_path: Any, **kwargs: Any) -> ConversionQueue:
+    options: Dict[str, Any] = {
+        "converter": Converter(),
+        "storage": LocalStorage(),
+        "cache": None,
+        "timeout": 5,
+    }
+    options.update(kwargs)
+    return ConversionQueue(session_factory=session_factory, tmp_dir=str(tmp_path), **options)
+
+
+def _submit(
+    queue: ConversionQueue,
+    db: Session,
+    content: bytes,
+    name: str = "report.docx",
+    output_format: str = "pdf",
+    path: Optional[str] = None,
+) -> str:
+    input_path = queue.spool(io.BytesIO(content))
+    return (
+        DocumentService(db)
+        .convert_document(input_path, name, output_format, "documents", path, "u1", queue=queue)
+        .id
+    )
+
+
+def test_submission_returns_at_once_and_workers_run_concurrently(
+    session_factory: sessionmaker, tmp_path: Any
+) -> None:
+    queue = _queue(session_factory, tmp_path, workers=2)
+    with session_factory() as db:
+        job_ids = [_submit(queue, db, f"file {i}".encode()) for i in range(3)]
+
+        # Nothing has been converted yet, but every job is recorded
+        assert {DocumentService(db).get_conversion_job(job_id, "u1").status for job_id in job_ids} <= {
+            "queued",
+            "running",
+        }
+        assert queue.wait(job_ids[0], 0.05) is False
+        queue.converter.release.set()
+        assert all(queue.wait(job_id, 5) for job_id in job_ids)
+
+        jobs = [DocumentService(db).get_conversion_job(job_id, "u1") for job_id in job_ids]
+    queue.shutdown()
+
+    assert queue.converter.max_running == 2
+    assert [job.status for job in jobs] == ["done"] * 3
+    assert jobs[0].url == f"https://storage.example.com/documents/converted/{job_ids[0]}/report.docx.pdf"
+    assert queue.storage.files[f"documents/{jobs[1].path}"] == b"FILE 1"
+    assert jobs[1].size == 6 and jobs[1].started_at is not None and jobs[1].finished_at is not None
+    assert queue.storage.content_types == ["application/pdf"] * 3
+    # Inputs and outputs are gone
+    assert os.listdir(tmp_path) == []
+    assert queue.get_stats() | {"workers": None} == {
+        "workers": None,
+        "max_pending": 32,
+        "pending": 0,
+        "submitted": 3,
+        "completed": 3,
+        "failed": 0,
+        "rejected": 0,
+    }
+
+
+def test_timeouts_and_failures_are_recorded_and_cleaned_up(
+    session_factory: sessionmaker, tmp_path: Any
+) -> None:
+    queue = _queue(session_factory, tmp_path, timeout=0.01)
+    with session_factory() as db:
+        job_id = _submit(queue, db, b"slow")
+        assert queue.wait(job_id, 5)
+        job = DocumentService(db).get_conversion_job(job_id, "u1")
+
+        assert (job.status, job.error, job.url) == (
+            "failed",
+            "Conversion took longer than 0.01 seconds",
+            None,
+        )
+        # Other users cannot see the job
+        with pytest.raises(ConversionJobNotFoundException):
+            DocumentService(db).get_conversion_job(job_id, "u2")
+    queue.shutdown()
+    assert os.listdir(tmp_path) == []
+    assert queue.get_stats()["failed"] == 1
+
+
+def test_full_queue_refuses_submissions(session_factory: sessionmaker, tmp_path: Any) -> None:
+    queue = _queue(session_factory, tmp_path, workers=1, max_pending=2)
+    with session_factory() as db:
+        job_ids = [_submit(queue, db, b"a") for _ in range(2)]
+        with pytest.raises(ConversionQueueFullException):
+            _submit(queue, db, b"b")
+        # The refused upload is not left behind
+        assert len(os.listdir(tmp_path)) == 2
+
+        queue.converter.release.set()
+        assert queue.wait(job_ids[1], 5)
+        assert queue.wait(_submit(queue, db, b"c"), 5)
+    queue.shutdown()
+    assert queue.get_stats()["rejected"] == 1 and queue.get_stats()["completed"] == 3
+
+
+def test_shutdown_fails_queued_jobs(session_factory: sessionmaker, tmp_path: Any) -> None:
+    queue = _queue(session_factory, tmp_path, workers=1)
+    with session_factory() as db:
+        running, queued = _submit(queue, db, b"a"), _submit(queue, db, b"b")
+        while queue.converter.running == 0:
+            time.sleep(0.001)
+
+        threading.Timer(0.05, queue.converter.release.set).start()
+        queue.shutdown()
+
+        assert DocumentService(db).get_conversion_job(running, "u1").status == "done"
+        job = DocumentService(db).get_conversion_job(queued, "u1")
+    assert (job.status, job.error) == ("failed", "Conversion cancelled by shutdown")
+    assert os.listdir(tmp_path) == []
+
+    # A later lifespan starts new workers, with every slot free again
+    with session_factory() as db:
+        job_id = _submit(queue, db, b"c")
+        assert queue.wait(job_id, 5)
+        assert DocumentService(db).get_conversion_job(job_id, "u1").status == "done"
+    queue.shutdown()
+    assert queue.get_stats()["pending"] == 0
+
+
+def test_repeat_conversions_are_served_from_the_cache(session_factory: sessionmaker, tmp_path: Any) -> None:
+    cache = ConversionCache(bucket="cache", max_bytes=1000)
+    queue = _queue(session_factory, tmp_path, cache=cache)
+    queue.converter.release.set()
+    with session_factory() as db:
+
+        def convert(content: bytes, **kwargs: Any) -> Any:
+            job_id = _submit(queue, db, content, **kwargs)
+            assert queue.wait(job_id, 5)
+            return DocumentService(db).get_conversion_job(job_id, "u1")
+
+        first = convert(b"template", name="a.docx")
+        # Same content under another name: no conversion
+        second = convert(b"template", name="b.docx")
+        other_format = convert(b"template", output_format="odt")
+        # An explicit path is the caller's file, never the cache's
+        explicit = convert(b"template", path="mine/template.pdf")
+
+        digest = file_sha256(str(_write(tmp_path / "probe", b"template")))
+        entry = db.query(ConversionCacheEntry).filter_by(content_hash=digest, output_format="pdf").one()
+        assert (entry.size, entry.hits, entry.last_accessed_at is not None) == (8, 1, True)
+        stats = cache.get_stats(db)
+    queue.shutdown()
+
+    assert queue.converter.calls == 3
+    assert (first.cache_hit, second.cache_hit, other_format.cache_hit, explicit.cache_hit) == (
+        False,
+        True,
+        False,
+        False,
+    )
+    assert first.url == second.url == f"https://storage.example.com/cache/{digest[:2]}/{digest}.pdf"
+    assert (second.bucket, second.path, second.size) == ("cache", f"{digest[:2]}/{digest}.pdf", 8)
+    assert explicit.url == "https://storage.example.com/documents/mine/template.pdf"
+    assert queue.storage.buckets == ["cache"]
+    assert stats == {
+        "entries": 2,
+        "bytes": 16,
+        "max_bytes": 1000,
+        "hits": 1,
+        "misses": 2,
+        "hit_rate": 1 / 3,
+        "evictions": 0,
+    }
+
+
+def test_cache_evicts_the_least_recently_accessed(session_factory: sessionmaker, tmp_path: Any) -> None:
+    cache = ConversionCache(bucket="cache", max_bytes=25)
+    storage = LocalStorage()
+    with session_factory() as db:
+        for name in ("a", "b", "c"):
+            cache.add(db, storage, name * 64, "pdf", str(_write(tmp_path / name, b"x" * 10)), 10, "application/pdf")
+            if name == "b":
+                # a is read again, so b is now the oldest
+                assert cache.lookup(db, "a" * 64, "pdf") is not None
+
+        assert {entry.content_hash[0] for entry in db.query(ConversionCacheEntry)} == {"a", "c"}
+        assert sorted(path.split("/")[1][0] for path in storage.files) == ["a", "c"]
+        assert cache.lookup(db, "b" * 64, "pdf") is None
+        # An entry over the whole budget stays until the next one is added
+        cache.add(db, storage, "d" * 64, "pdf", str(_write(tmp_path / "d", b"x" * 30)), 30, "application/pdf")
+        assert [entry.content_hash[0] for entry in db.query(ConversionCacheEntry)] == ["d"]
+        assert cache.get_stats(db)["evictions"] == 3
+
+
+def test_jobs_of_evicted_conversions_expire(session_factory: sessionmaker, tmp_path: Any) -> None:
+    cache = ConversionCache(bucket="cache", max_bytes=10)
+    queue = _queue(session_factory, tmp_path, cache=cache)
+    queue.converter.release.set()
+    with session_factory() as db:
+        first = _submit(queue, db, b"first")
+        kept = _submit(queue, db, b"kept", path="mine/kept.pdf")
+        assert queue.wait(first, 5) and queue.wait(kept, 5)
+        assert DocumentService(db).get_conversion_job(first, "u1").status == "done"
+
+        # The next conversion does not fit beside the first one
+        second = _submit(queue, db, b"second")
+        assert queue.wait(second, 5)
+        db.expire_all()
+        with pytest.raises(ConversionJobExpiredException) as error:
+            DocumentService(db).get_conversion_job(first, "u1")
+        assert error.value.status_code == 410
+        assert DocumentService(db).get_conversion_job(second, "u1").status == "done"
+        # Jobs outside the cache keep their own file
+        assert DocumentService(db).get_conversion_job(kept, "u1").status == "done"
+    queue.shutdown()
+    assert sorted(queue.storage.files) == [
+        "cache/" + cache.path(file_sha256(str(_write(tmp_path / "probe", b"second"))), "pdf"),
+        "documents/mine/kept.pdf",
+    ]
+
+
+def _write(path: Any, content: bytes) -> Any:
+    path.write_bytes(content)
+    return path
+
+
+def test_convert_document_to_file_streams_to_disk(monkeypatch: pytest.MonkeyPatch, tmp_path: Any) -> None:
+    input_path, output_path = tmp_path / "in.docx", tmp_path / "out.pdf"
+    input_path.write_bytes(b"doc")
+
+    def slow_chunks(chunk_size: int) -> Iterator[bytes]:
+        for _ in range(3):
+            time.sleep(0.02)
+            yield b"x" * 10
+
+    response = MagicMock(status_code=200)
+    response.__enter__.return_value = response
+    response.iter_content.side_effect = slow_chunks
+    monkeypatch.setattr(document_tools, "requests", MagicMock())
+    document_tools.requests.post.return_value = response
+
+    assert document_tools.convert_document_to_file(str(input_path), str(output_path), "pdf", 5) == 30
+    assert output_path.read_bytes() == b"x" * 30
+    assert document_tools.requests.post.call_args.kwargs["stream"] is True
+
+    with pytest.raises(TimeoutError):
+        document_tools.convert_document_to_file(str(input_path), str(output_path), "pdf", 0.03)
+
+    response.status_code = 500
+    with pytest.raises(RuntimeError):
+        document_tools.convert_document_to_file(str(input_path), str(output_path), "pdf", 5)
@@ -0,0 +1,126 @@
+import time
+from datetime import datetime
+from typing import Any, List
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from api.document_service.app.schemas.document import (
+    DocumentPermissionCreateDTO,
+    DocumentUpdateDTO,
+)
+from api.document_service.app.services.document_cache import DocumentCache
+from api.document_service.app.services.document_service import DocumentService
+from api.shared.exceptions.document_exceptions import InsufficientDocumentPermissionException
+from api.shared.models import document, external_tools, notification, project, user  # noqa: F401
+from api.shared.models.document import Document
+from api.shared.models.project import Project, ProjectMember
+from api.shared.utils.membership_cache import membership_cache
+
+
+@pytest.fixture
+def db(db: Session) -> Session:
+    db.add(Project(id="p1", name="Project", owner_id="owner"))
+    db.add_all(
+        ProjectMember(project_id="p1", user_id=user_id, role=role, joined_at=datetime(2026, 1, 1))
+        for user_id, role in (("owner", "owner"), ("member", "member"))
+    )
+    db.add(Document(id="d1", name="Spec", project_id="p1", type="file", creator_id="owner"))
+    db.commit()
+    return db
+
+
+def _count_queries(db: Session) -> List[str]:
+    statements: List[str] = []
+
+    def capture(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", capture)
+    return statements
+
+
+def test_lru_byte_budget_and_ttl() -> None:
+    cache = DocumentCache(max_size=2, max_bytes=10_000, ttl=60)
+    for key in ("a", "b"):
+        cache.set(key, key, key * 10, cache.generation)
+    cache.get("a")
+    cache.set("c", "c", "c" * 10, cache.generation)
+
+    # b was the least recently used
+    assert cache.get("b") == (False, None)
+    assert cache.get("a") == (True, "a" * 10)
+
+    # Entries over the byte budget are never cached; big ones evict the rest
+    cache.set("huge", "huge", "x" * 20_000, cache.generation)
+    cache.set("big", "big", "x" * 9_970, cache.generation)
+    assert cache.get("huge")[0] is False
+    assert [cache.get(key)[0] for key in ("a", "c", "big")] == [False, False, True]
+    assert cache.bytes <= cache.max_bytes
+
+    # The next entry pushes the big one out
+    cache.ttl = 0.01
+    cache.set("d", "d", "d", cache.generation)
+    time.sleep(0.02)
+    assert cache.get("d") == (False, None)
+
+    stats = cache.get_stats()
+    assert {name: stats[name] for name in ("size", "hits", "misses", "evictions", "expirations")} == {
+        "size": 0,
+        "hits": 3,
+        "misses": 5,
+        "evictions": 4,
+        "expirations": 1,
+    }
+
+
+def test_results_computed_before_an_invalidation_are_not_cached() -> None:
+    cache = DocumentCache()
+    cache.set(("get", "d1", "u1"), "d1", "v1", cache.generation)
+    cache.set(("get", "d1", "u2"), "d1", "v1", cache.generation)
+    generation = cache.generation
+
+    # A concurrent request updates the document while it is being read
+    cache.invalidate("d1")
+    cache.set(("get", "d1", "u1"), "d1", "v1", generation)
+
+    assert cache.get(("get", "d1", "u1"))[0] is False
+    assert cache.get(("get", "d1", "u2"))[0] is False
+    assert cache.get_stats()["size"] == 0 and cache.bytes == 0
+
+
+def test_get_document_is_cached_per_user_and_invalidated_by_writes(db: Session) -> None:
+    service = DocumentService(db)
+    statements = _count_queries(db)
+
+    assert service.get_document("d1", "owner").name == "Spec"
+    assert statements
+    statements.clear()
+    assert service.get_document("d1", "owner").name == "Spec"
+    assert statements == []
+
+    # Another user goes through their own permission check
+    with pytest.raises(InsufficientDocumentPermissionException):
+        service.get_document("d1", "member")
+
+    service.update_document("d1", DocumentUpdateDTO(name="Spec v2"), "owner")
+    assert service.get_document("d1", "owner").name == "Spec v2"
+
+    service.add_document_permission("d1", DocumentPermissionCreateDTO(user_id="member"), "owner")
+    assert service.get_document("d1", "member").name == "Spec v2"
+    statements.clear()
+    assert service.get_document("d1", "member").name == "Spec v2"
+    assert statements == []
+
+
+def test_membership_changes_drop_the_project_documents(db: Session) -> None:
+    service = DocumentService(db)
+    service.add_document_permission("d1", DocumentPermissionCreateDTO(user_id="member"), "owner")
+    service.get_document("d1", "member")
+    db.query(Document).filter(Document.id == "d1").update({"name": "Renamed"})
+    db.commit()
+
+    membership_cache.invalidate("p1", "member")
+
+    assert service.get_document("d1", "member").name == "Renamed"
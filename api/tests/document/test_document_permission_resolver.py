@@ -0,0 +1,150 @@
+from datetime import datetime
+from typing import Any, List
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from api.document_service.app.schemas.document import DocumentCreateDTO
+from api.document_service.app.services.document_permission_resolver import (
+    PERMISSION_TYPES,
+    DocumentPermissionResolver,
+)
+from api.document_service.app.services.document_service import DocumentService
+from api.shared.exceptions.document_exceptions import InsufficientDocumentPermissionException
+from api.shared.exceptions.project_exceptions import (
+    NotProjectMemberException,
+    ProjectNotFoundException,
+)
+from api.shared.models import document, external_tools, notification, project, user  # noqa: F401
+from api.shared.models.document import Document, DocumentPermission, DocumentVersion
+from api.shared.models.project import Project, ProjectMember
+from api.shared.utils.membership_cache import membership_cache
+
+USERS = {"owner": "owner", "admin": "admin", "member": "member", "viewer": "member"}
+
+
+@pytest.fixture
+def db(db: Session) -> Session:
+    db.add(Project(id="p1", name="Project", owner_id="owner"))
+    db.add_all(
+        ProjectMember(project_id="p1", user_id=user_id, role=role, joined_at=datetime(2026, 1, 1))
+        for user_id, role in USERS.items()
+    )
+    # 500 files in one folder: every fifth created by the member, every
+    # third shared with the viewer, every seventh editable by them
+    db.add(Document(id="folder", name="Folder", project_id="p1", type="folder", creator_id="owner"))
+    for i in range(500):
+        db.add(
+            Document(
+                id=f"d{i:03}", name=f"File {i}", project_id="p1", parent_id="folder",
+                type="file", creator_id="member" if i % 5 == 0 else "owner",
+            )
+        )
+        db.add(DocumentVersion(document_id=f"d{i:03}", version=1, creator_id="owner"))
+        if i % 3 == 0:
+            db.add(
+                DocumentPermission(document_id=f"d{i:03}", user_id="viewer", can_edit=i % 7 == 0)
+            )
+    db.commit()
+    return db
+
+
+def _count_queries(db: Session) -> List[str]:
+    statements: List[str] = []
+
+    def capture(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", capture)
+    return statements
+
+
+def _expected(document: Document, user_id: str, permission_type: str) -> bool:
+    """The rules, one document at a time."""
+    if document.creator_id == user_id or USERS.get(user_id) in ("owner", "admin"):
+        return True
+    if user_id != "viewer" or int(document.id[1:]) % 3:
+        return False
+    return permission_type == "view" or (permission_type == "edit" and int(document.id[1:]) % 7 == 0)
+
+
+def test_resolver_matches_the_rules(db: Session) -> None:
+    documents = db.query(Document).filter(Document.parent_id == "folder").all()
+    resolver = DocumentPermissionResolver(db)
+
+    for user_id in list(USERS) + ["stranger"]:
+        by_document = resolver.resolve(documents, user_id)
+        by_id = resolver.resolve_ids([document.id for document in documents] + ["missing"], user_id)
+
+        assert "missing" not in by_id
+        for document in documents:
+            for permission_type in PERMISSION_TYPES:
+                expected = _expected(document, user_id, permission_type)
+                assert by_document[document.id].allows(permission_type) == expected
+                assert by_id[document.id].allows(permission_type) == expected
+
+
+@pytest.mark.parametrize("user_id, queries", [("owner", 1), ("admin", 1), ("viewer", 2), ("member", 2)])
+def test_resolving_a_folder_takes_at_most_two_queries(db: Session, user_id: str, queries: int) -> None:
+    documents = db.query(Document).filter(Document.parent_id == "folder").all()
+    membership_cache.clear()
+    statements = _count_queries(db)
+
+    DocumentPermissionResolver(db).resolve(documents, user_id)
+
+    # Role, then direct permissions unless the role grants everything
+    assert len(statements) == queries
+    statements.clear()
+    DocumentPermissionResolver(db).resolve_ids([document.id for document in documents], user_id)
+    # Documents with direct permissions, then the role, now cached
+    assert len(statements) == 1
+
+
+def test_listing_does_not_grow_with_the_folder(db: Session) -> None:
+    service = DocumentService(db)
+    statements = _count_queries(db)
+
+    listed = service.get_project_documents("p1", "viewer", parent_id="folder")
+
+    # Project and role, documents, direct permissions
+    assert len(statements) == 3
+    assert [document.id for document in listed] == [f"d{i:03}" for i in range(0, 500, 3)]
+    statements.clear()
+    assert len(service.get_project_documents("p1", "admin", parent_id="folder")) == 500
+    assert len(statements) == 2
+    statements.clear()
+    # The role is now cached
+    assert len(service.get_project_documents("p1", "viewer", parent_id="folder")) == 167
+    assert len(statements) == 2
+
+
+def test_listing_checks_the_project_and_membership(db: Session) -> None:
+    service = DocumentService(db)
+
+    with pytest.raises(NotProjectMemberException):
+        service.get_project_documents("p1", "stranger")
+    with pytest.raises(ProjectNotFoundException):
+        service.get_project_documents("missing", "owner")
+    db.get(Project, "p1").deleted_at = datetime(2026, 2, 1)
+    db.commit()
+    with pytest.raises(ProjectNotFoundException):
+        service.create_document(DocumentCreateDTO(name="New", project_id="p1", type="file"), "owner")
+
+
+def test_versions_and_permissions_reuse_the_loaded_document(db: Session) -> None:
+    service = DocumentService(db)
+    statements = _count_queries(db)
+
+    assert len(service.get_document_versions("d003", "viewer")) == 1
+    assert [permission.user_id for permission in service.get_document_permissions("d003", "viewer")] == [
+        "viewer"
+    ]
+    # Document, direct permission, then the versions or permissions; the
+    # role is only read once
+    assert len(statements) == 7
+
+    with pytest.raises(InsufficientDocumentPermissionException):
+        service.get_document_versions("d001", "viewer")
+    with pytest.raises(InsufficientDocumentPermissionException):
+        service.get_document_permissions("d001", "stranger")
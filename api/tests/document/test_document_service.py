@@ -211,6 +211,7 @@ def test_create_document_version(document_service: DocumentService):
     with patch("api.shared.models.document.Document", MagicMock()), \
          patch("api.shared.models.document.DocumentVersion", MagicMock()), \
          patch.object(document_service.db, "query") as mock_query, \
+         patch.object(document_service, "_has_permission", return_value=True), \
          patch.object(document_service.supabase_manager, "get_file_url", return_value="http://url"), \
          patch.object(document_service, "_document_version_to_dto", return_value=MagicMock(id="ver1")), \
          patch.object(document_service.db, "add"), \
@@ -226,6 +227,7 @@ def test_get_document_versions(document_service: DocumentService):
     with patch("api.shared.models.document.Document", MagicMock()), \
          patch("api.shared.models.document.DocumentVersion", MagicMock()), \
          patch.object(document_service.db, "query") as mock_query, \
+         patch.object(document_service, "_has_permission", return_value=True), \
          patch.object(document_service, "_document_version_to_dto", return_value=DocumentVersionDTO(
             id="ver1", document_id="doc1", version=1, size=None, content_type=None, url=None, creator_id="user1", changes=None, created_at=datetime.now())):
         mock_doc = MagicMock(type=DocumentType.FILE)
@@ -239,6 +241,7 @@ def test_get_document_version(document_service: DocumentService):
     with patch("api.shared.models.document.Document", MagicMock()), \
          patch("api.shared.models.document.DocumentVersion", MagicMock()), \
          patch.object(document_service.db, "query") as mock_query, \
+         patch.object(document_service, "_has_permission", return_value=True), \
          patch.object(document_service, "_document_version_to_dto", return_value=MagicMock(id="ver1")):
         mock_doc = MagicMock(type=DocumentType.FILE)
         mock_query.return_value.filter.return_value.first.return_value = mock_doc
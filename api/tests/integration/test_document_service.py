@@ -1,8 +1,16 @@
+import asyncio
 from fastapi.testclient import TestClient
-from api.document_service.app.main import app
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from api.document_service.app.main import app, get_async_db, get_current_user
+from api.shared.models import document, external_tools, notification, project, user  # noqa: F401
+from api.shared.models.base import Base
+from api.shared.models.document import Document
+from api.shared.models.project import Project, ProjectMember
 from api.document_service.app.schemas.document import DocumentType
 from unittest.mock import patch, MagicMock
 from typing import Any
+from datetime import datetime
 
 def _pass_auth_middleware(req: Any, call_next: Any) -> Any:
     setattr(req.state, "user_id", "uid")  # Set a mock user ID using setattr
@@ -46,4 +54,101 @@ def test_create_document(mock_create_document: MagicMock, mock_db: Any, mock_use
     data = response.json()
     assert data["name"] == "TestDoc"
     assert data["project_id"] == "pid"
-    assert data["type"] == "file"
\ No newline at end of file
+    assert data["type"] == "file"
+
+
+def test_get_document_conditional() -> None:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def setup() -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with session_factory() as db:
+            db.add(Project(id="pid", name="Project", owner_id="uid"))
+            db.add(ProjectMember(project_id="pid", user_id="uid", role="owner", joined_at=datetime(2026, 1, 1)))
+            db.add(Document(id="docid", name="Doc", project_id="pid", type="file", creator_id="uid", version=1))
+            await db.commit()
+
+    async def bump_version() -> None:
+        async with session_factory() as db:
+            (await db.get(Document, "docid")).version = 2
+            await db.commit()
+
+    async def get_db() -> Any:
+        async with session_factory() as db:
+            yield db
+
+    asyncio.run(setup())
+    app.dependency_overrides[get_async_db] = get_db
+    app.dependency_overrides[get_current_user] = lambda: "uid"
+    try:
+        client = TestClient(app)
+        response = client.get("/documents/docid")
+        assert response.status_code == 200
+        etag = response.headers["etag"]
+
+        response = client.get("/documents/docid", headers={"If-None-Match": etag})
+        assert response.status_code == 304 and response.headers["etag"] == etag
+
+        asyncio.run(bump_version())
+        response = client.get("/documents/docid", headers={"If-None-Match": etag})
+        assert response.status_code == 200 and response.json()["version"] == 2
+
+        app.dependency_overrides[get_current_user] = lambda: "stranger"
+        assert client.get("/documents/docid", headers={"If-None-Match": etag}).status_code == 403
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_convert_document_runs_as_a_job(tmp_path: Any, monkeypatch: Any) -> None:
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from api.document_service.app.services.conversion_jobs import conversion_queue
+
+    database = tmp_path / "jobs.db"
+    engine = create_engine(f"sqlite:///{database}")
+    Base.metadata.create_all(engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database}")
+    session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def get_db() -> Any:
+        async with session_factory() as db:
+            yield db
+
+    def convert(input_path: str, output_path: str, output_format: str, timeout: float) -> int:
+        with open(input_path, "rb") as source, open(output_path, "wb") as output:
+            return output.write(b"%PDF " + source.read())
+
+    storage = MagicMock()
+    storage.get_file_url.side_effect = lambda bucket, path: f"https://storage.example.com/{bucket}/{path}"
+    monkeypatch.setattr(conversion_queue, "session_factory", sessionmaker(bind=engine))
+    monkeypatch.setattr(conversion_queue, "converter", convert)
+    monkeypatch.setattr(conversion_queue, "storage", storage)
+    monkeypatch.setattr(conversion_queue, "tmp_dir", str(tmp_path / "spool"))
+    app.dependency_overrides[get_async_db] = get_db
+    app.dependency_overrides[get_current_user] = lambda: "uid"
+    try:
+        client = TestClient(app)
+        response = client.post(
+            "/documents/convert",
+            files={"file": ("notes.docx", b"hello")},
+            params={"supabase_path": "out/notes.pdf"},
+        )
+        assert response.status_code == 202
+        job_id = response.json()["id"]
+
+        job = client.get(f"/documents/convert/{job_id}", params={"wait": 5}).json()
+        assert (job["status"], job["url"], job["size"]) == (
+            "done",
+            "https://storage.example.com/documents/out/notes.pdf",
+            10,
+        )
+        assert (tmp_path / "spool").exists() and list((tmp_path / "spool").iterdir()) == []
+
+        app.dependency_overrides[get_current_user] = lambda: "stranger"
+        assert client.get(f"/documents/convert/{job_id}").status_code == 404
+    finally:
+        app.dependency_overrides.clear()
+        asyncio.run(async_engine.dispose())
+        engine.dispose()
@@ -1,8 +1,14 @@
+import asyncio
 from fastapi.testclient import TestClient
-from api.project_service.app.main import app
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from api.project_service.app.main import app, get_async_db, get_current_user
+from api.shared.models import document, external_tools, notification, project, user  # noqa: F401
+from api.shared.models.base import Base
 from api.shared.dtos.project_dtos import ProjectStatus
 from unittest.mock import patch, MagicMock
-from typing import Any
+from typing import Any, List, Optional
 from datetime import datetime
 
 def _pass_auth_middleware(req: Any, call_next: Any) -> Any:
@@ -44,4 +50,351 @@ def test_create_project(mock_create_project: MagicMock, mock_db: Any, mock_user:
     data = response.json()
     assert data["name"] == "TestProject"
     assert data["status"] == "planning"
-    assert data["owner_id"] == "uid"
\ No newline at end of file
+    assert data["owner_id"] == "uid"
+
+def _async_db_override(engine: Optional[AsyncEngine] = None) -> Any:
+    """In-memory aiosqlite database with all tables, shared by one client."""
+    if engine is None:
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+
+    async def create_tables() -> None:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def get_async_db() -> Any:
+        async with session_factory() as db:
+            yield db
+
+    return get_async_db
+
+
+def test_project_routes_use_async_session() -> None:
+    app.dependency_overrides[get_async_db] = _async_db_override()
+    app.dependency_overrides[get_current_user] = lambda: "uid"
+    try:
+        client = TestClient(app)
+        project = client.post("/projects", json={"name": "Async project"}).json()
+        task = client.post(f"/projects/{project['id']}/tasks", json={"title": "First task"}).json()
+        response = client.post(f"/projects/{project['id']}/tasks/{task['id']}/status", params={"status": "in_progress"})
+        assert response.status_code == 200
+        assert response.json()["status"] == "in_progress"
+        assert [p["id"] for p in client.get("/projects").json()] == [project["id"]]
+        activities = client.get(f"/projects/{project['id']}/activities").json()
+        assert {a["action"] for a in activities} >= {"create", "change_status"}
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_task_list_cursor_pagination() -> None:
+    app.dependency_overrides[get_async_db] = _async_db_override()
+    app.dependency_overrides[get_current_user] = lambda: "uid"
+    try:
+        client = TestClient(app)
+        project = client.post("/projects", json={"name": "Paged project"}).json()
+        created = [
+            client.post(f"/projects/{project['id']}/tasks", json={"title": f"Task {i}"}).json()["id"]
+            for i in range(5)
+        ]
+
+        seen = []
+        params = {"limit": 2}
+        while True:
+            response = client.get(f"/projects/{project['id']}/tasks", params=params)
+            assert response.status_code == 200
+            seen.extend(task["id"] for task in response.json())
+            if "x-next-cursor" not in response.headers:
+                break
+            params["cursor"] = response.headers["x-next-cursor"]
+
+        assert seen == created
+        response = client.get(f"/projects/{project['id']}/tasks", params={"cursor": "bogus"})
+        assert response.status_code == 400
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_task_list_filters_sort_and_fields() -> None:
+    app.dependency_overrides[get_async_db] = _async_db_override()
+    app.dependency_overrides[get_current_user] = lambda: "uid"
+    try:
+        client = TestClient(app)
+        project = client.post("/projects", json={"name": "Filtered project"}).json()
+        url = f"/projects/{project['id']}/tasks"
+        client.post(url, json={"title": "Low task", "priority": "low", "tags": ["api"]})
+        client.post(url, json={"title": "High task", "priority": "high", "tags": ["api", "ui"]})
+        client.post(url, json={"title": "Other task", "priority": "medium"})
+
+        response = client.get(
+            url,
+            params={"tag": ["api"], "priority": ["low", "high"], "sort": "-priority", "fields": "title"},
+        )
+        assert response.status_code == 200
+        assert [task["title"] for task in response.json()] == ["High task", "Low task"]
+        assert set(response.json()[0]) == {"id", "title"}
+
+        response = client.get(url, params={"sort": "password"})
+        assert response.status_code == 400
+        assert response.json()["detail"]["error_code"] == "INVALID_TASK_QUERY"
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_search_route() -> None:
+    app.dependency_overrides[get_async_db] = _async_db_override()
+    app.dependency_overrides[get_current_user] = lambda: "uid"
+    try:
+        client = TestClient(app)
+        project = client.post("/projects", json={"name": "Search project"}).json()
+        url = f"/projects/{project['id']}"
+        for i in range(3):
+            client.post(f"{url}/tasks", json={"title": f"Flaky deploy {i}"})
+
+        response = client.get(f"{url}/search", params={"q": "deploy", "limit": 2})
+        assert response.status_code == 200
+        assert [r["entity_type"] for r in response.json()] == ["task", "task"]
+        assert "<b>deploy</b>" in response.json()[0]["snippet"]
+
+        response = client.get(
+            f"{url}/search",
+            params={"q": "deploy", "cursor": response.headers["x-next-cursor"]},
+        )
+        assert len(response.json()) == 1 and "x-next-cursor" not in response.headers
+
+        response = client.get(f"{url}/search", params={"q": "deploy", "type": "document"})
+        assert response.json() == []
+        response = client.get(f"{url}/search", params={"q": "()"})
+        assert response.status_code == 400
+        assert response.json()["detail"]["error_code"] == "INVALID_SEARCH_QUERY"
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_project_stats_routes() -> None:
+    app.dependency_overrides[get_async_db] = _async_db_override()
+    app.dependency_overrides[get_current_user] = lambda: "uid"
+    try:
+        client = TestClient(app)
+        project = client.post("/projects", json={"name": "Stats project"}).json()
+        url = f"/projects/{project['id']}"
+        task = client.post(f"{url}/tasks", json={"title": "First task", "due_date": "2020-01-01T00:00:00"}).json()
+        client.post(f"{url}/tasks", json={"title": "Second task", "assignee_id": "uid"})
+        client.post(f"{url}/tasks/{task['id']}/status", params={"status": "in_progress"})
+        client.post(f"{url}/tasks/{task['id']}/comments", json={"content": "Looking into it"})
+
+        expected = {
+            "project_id": project["id"],
+            "task_count": 2,
+            "comment_count": 1,
+            "overdue_count": 1,
+            "unassigned_count": 1,
+            "status_counts": {"in_progress": 1, "todo": 1},
+            "assignee_counts": {"uid": 1},
+        }
+        response = client.get(f"{url}/stats")
+        assert response.status_code == 200
+        assert response.json() == expected
+
+        response = client.post(f"{url}/stats:rebuild")
+        assert response.status_code == 200
+        assert response.json() == expected
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_delete_project_purges_it() -> None:
+    app.dependency_overrides[get_async_db] = _async_db_override()
+    app.dependency_overrides[get_current_user] = lambda: "uid"
+    try:
+        client = TestClient(app)
+        project = client.post("/projects", json={"name": "Doomed project"}).json()
+        url = f"/projects/{project['id']}"
+        task = client.post(f"{url}/tasks", json={"title": "First task"}).json()
+        client.post(f"{url}/tasks/{task['id']}/comments", json={"content": "Bye"})
+
+        response = client.delete(url, params={"background": False})
+        assert response.status_code == 200
+        assert client.get(url).status_code == 404
+
+        deletion = client.get(f"{url}/deletion").json()
+        assert deletion["id"] == response.json()["deletion_id"]
+        assert deletion["status"] == "done"
+        assert deletion["deleted_rows"]["projects"] == 1
+        assert deletion["deleted_rows"]["task_comments"] == 1
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_task_comment_threads_route() -> None:
+    app.dependency_overrides[get_async_db] = _async_db_override()
+    app.dependency_overrides[get_current_user] = lambda: "uid"
+    try:
+        client = TestClient(app)
+        project = client.post("/projects", json={"name": "Thread project"}).json()
+        task = client.post(f"/projects/{project['id']}/tasks", json={"title": "First task"}).json()
+        url = f"/projects/{project['id']}/tasks/{task['id']}/comments"
+        first = client.post(url, json={"content": "First"}).json()
+        reply = client.post(url, json={"content": "Reply", "parent_id": first["id"]}).json()
+        client.post(url, json={"content": "Nested", "parent_id": reply["id"]})
+        client.post(url, json={"content": "Second"})
+
+        response = client.get(url, params={"threaded": True, "limit": 1, "depth": 1})
+        assert response.status_code == 200
+        [thread] = response.json()
+        assert thread["content"] == "First" and thread["depth"] == 0
+        assert [(r["content"], r["depth"], r["replies"]) for r in thread["replies"]] == [
+            ("Reply", 1, [])
+        ]
+
+        response = client.get(
+            url, params={"threaded": True, "cursor": response.headers["x-next-cursor"]}
+        )
+        assert [t["content"] for t in response.json()] == ["Second"]
+
+        # Without threaded the flat list is unchanged
+        response = client.get(url)
+        assert [c["content"] for c in response.json()] == ["First", "Reply", "Nested", "Second"]
+        assert "replies" not in response.json()[0]
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_conditional_get_of_project_and_tasks() -> None:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    app.dependency_overrides[get_async_db] = _async_db_override(engine)
+    app.dependency_overrides[get_current_user] = lambda: "uid"
+    try:
+        client = TestClient(app)
+        project = client.post("/projects", json={"name": "Polled project"}).json()
+        url = f"/projects/{project['id']}"
+        task = client.post(f"{url}/tasks", json={"title": "First task"}).json()
+
+        response = client.get(url)
+        etag = response.headers["etag"]
+        response = client.get(url, headers={"If-None-Match": etag})
+        assert response.status_code == 304 and response.content == b""
+        assert response.headers["etag"] == etag
+        client.put(url, json={"description": "Changed"})
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+        response = client.get(f"{url}/tasks")
+        etag = response.headers["etag"]
+        assert client.get(f"{url}/tasks", params={"sort": "title"}).headers["etag"] != etag
+
+        statements: List[str] = []
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        response = client.get(f"{url}/tasks", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        # Only the count/max(updated_at) of the tasks is read; the role is cached
+        assert len(statements) == 1 and "tasks.title" not in statements[0]
+
+        client.put(f"{url}/tasks/{task['id']}", json={"priority": "high"})
+        response = client.get(f"{url}/tasks", headers={"If-None-Match": etag})
+        assert response.status_code == 200 and response.headers["etag"] != etag
+        etag = response.headers["etag"]
+        client.delete(f"{url}/tasks/{task['id']}")
+        assert client.get(f"{url}/tasks", headers={"If-None-Match": etag}).json() == []
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_task_undo_redo_routes() -> None:
+    app.dependency_overrides[get_async_db] = _async_db_override()
+    app.dependency_overrides[get_current_user] = lambda: "uid"
+    try:
+        client = TestClient(app)
+        project = client.post("/projects", json={"name": "Undo project"}).json()
+        task = client.post(
+            f"/projects/{project['id']}/tasks",
+            json={"title": "First task", "meta_data": {"sprint": 3}},
+        ).json()
+        task_url = f"/projects/{project['id']}/tasks/{task['id']}"
+
+        assert client.post(f"{task_url}/undo").status_code == 400
+        client.post(f"{task_url}/status", params={"status": "in_progress"})
+
+        response = client.post(f"{task_url}/undo")
+        assert response.status_code == 200
+        assert response.json()["status"] == "todo"
+        assert response.json()["meta_data"] == {"sprint": 3}
+        response = client.post(f"{task_url}/redo")
+        assert response.status_code == 200
+        assert response.json()["status"] == "in_progress"
+        assert client.post(f"{task_url}/redo").status_code == 400
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_update_task_route_is_one_transaction() -> None:
+    engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+    app.dependency_overrides[get_async_db] = _async_db_override(engine)
+    app.dependency_overrides[get_current_user] = lambda: "uid"
+    try:
+        client = TestClient(app)
+        project = client.post("/projects", json={"name": "Counted project"}).json()
+        task = client.post(f"/projects/{project['id']}/tasks", json={"title": "First task"}).json()
+        task_url = f"/projects/{project['id']}/tasks/{task['id']}"
+
+        statements: List[str] = []
+        commits: List[bool] = []
+
+        def capture(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+            statements.append(statement.split()[0])
+
+        event.listen(engine.sync_engine, "before_cursor_execute", capture)
+        event.listen(engine.sync_engine, "commit", lambda conn: commits.append(True))
+
+        response = client.put(task_url, json={"status": "in_progress", "priority": "high"})
+        assert response.status_code == 200
+        assert response.json()["status"] == "in_progress"
+        # Task and role, undo history, LRU check, then the writes and the
+        # project counters upsert
+        assert sorted(statements) == [
+            "INSERT", "INSERT", "INSERT", "SELECT", "SELECT", "SELECT", "UPDATE"
+        ]
+        assert len(commits) == 1
+
+        statements.clear()
+        commits.clear()
+        response = client.put(task_url, json={"status": "review"})
+        assert response.status_code == 200
+        # The history now exists: no LRU check and an UPDATE instead of an INSERT
+        assert sorted(statements) == ["INSERT", "INSERT", "SELECT", "SELECT", "UPDATE", "UPDATE"]
+        assert len(commits) == 1
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_task_batch_route() -> None:
+    app.dependency_overrides[get_async_db] = _async_db_override()
+    app.dependency_overrides[get_current_user] = lambda: "uid"
+    try:
+        client = TestClient(app)
+        project = client.post("/projects", json={"name": "Batch project"}).json()
+        task = client.post(f"/projects/{project['id']}/tasks", json={"title": "First task"}).json()
+
+        response = client.post(
+            f"/projects/{project['id']}/tasks:batch",
+            json={
+                "operations": [
+                    {"action": "create", "task": {"title": "Second task"}},
+                    {"action": "status", "task_id": task["id"], "status": "done"},
+                ]
+            },
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert (body["succeeded"], body["failed"]) == (1, 1)
+        assert body["results"][1]["error_code"] == "INVALID_TASK_STATUS_TRANSITION"
+        assert len(client.get(f"/projects/{project['id']}/tasks").json()) == 2
+
+        response = client.post(f"/projects/{project['id']}/tasks:batch", json={"operations": []})
+        assert response.status_code == 422
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,147 @@
+import asyncio
+from typing import Any, List
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import Session
+
+from api.project_service.app.schemas.project import ProjectCreateDTO
+from api.project_service.app.schemas.task import TaskCreateDTO
+from api.project_service.app.services.activity_service import ActivityService
+from api.project_service.app.services.activity_writer import (
+    PENDING_ACTIVITIES_KEY,
+    BufferedActivityWriter,
+    activity_writer,
+)
+from api.project_service.app.services.project_service import ProjectService
+from api.project_service.app.services.task_service import TaskService
+from api.shared.models import document, external_tools, notification, project, user  # noqa: F401
+from api.shared.models.base import Base, get_utc_now
+from api.shared.models.project import ActivityLog
+
+
+def _log(db: Session, entity_id: str = "t1") -> None:
+    ActivityService(db).log_activity("p1", "u1", "update", "task", entity_id)
+
+
+def _count_activities(db: Session) -> int:
+    return db.query(ActivityLog).count()
+
+
+def test_log_activity_joins_caller_transaction(db: Session) -> None:
+    statements: List[str] = []
+
+    def capture(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", capture)
+    activity = ActivityService(db).log_activity("p1", "u1", "update", "task", "t1")
+    event.remove(db.get_bind(), "before_cursor_execute", capture)
+
+    # Nothing is written until the caller commits
+    assert statements == []
+    assert activity.id and activity.created_at
+
+    db.commit()
+    assert _count_activities(db) == 1
+
+
+def test_log_activity_rolls_back_with_caller(db: Session) -> None:
+    _log(db)
+    db.rollback()
+
+    assert _count_activities(db) == 0
+
+
+def test_service_logs_in_same_commit(db: Session) -> None:
+    project = ProjectService(db).create_project(ProjectCreateDTO(name="Project"), "owner")
+    TaskService(db).create_task(project.id, TaskCreateDTO(title="First task"), "owner")
+
+    actions = [row.action for row in db.query(ActivityLog).order_by(ActivityLog.created_at)]
+    assert actions == ["create", "create_task"]
+
+
+def _writer(tmp_path: Any, batch_size: int = 500) -> BufferedActivityWriter:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'activity.db'}")
+    return BufferedActivityWriter(engine, batch_size=batch_size, flush_interval=60)
+
+
+def _file_db(tmp_path: Any) -> Session:
+    engine = create_engine(f"sqlite:///{tmp_path / 'activity.db'}")
+    Base.metadata.create_all(engine)
+    return Session(engine)
+
+
+def test_buffered_writer_writes_committed_rows_on_stop(
+    tmp_path: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    db = _file_db(tmp_path)
+    writer = _writer(tmp_path)
+    monkeypatch.setattr(activity_writer, "add", writer.add)
+
+    async def scenario() -> None:
+        await writer.start()
+        monkeypatch.setattr(type(activity_writer), "running", property(lambda self: True))
+
+        _log(db, "committed")
+        db.commit()
+        _log(db, "rolled back")
+        db.rollback()
+
+        assert PENDING_ACTIVITIES_KEY not in db.info
+        assert writer.get_stats()["buffered"] == 1
+        assert _count_activities(db) == 0
+
+        await writer.stop()
+        await writer.engine.dispose()
+
+    asyncio.run(scenario())
+
+    assert [row.entity_id for row in db.query(ActivityLog)] == ["committed"]
+    assert writer.get_stats()["written"] == 1
+    db.close()
+
+
+def test_buffered_writer_flushes_full_batches(tmp_path: Any) -> None:
+    db = _file_db(tmp_path)
+    writer = _writer(tmp_path, batch_size=10)
+    rows = [
+        {
+            "id": f"a{i}",
+            "created_at": get_utc_now(),
+            "project_id": "p1",
+            "user_id": "u1",
+            "action": "update",
+            "entity_type": "task",
+            "entity_id": f"t{i}",
+        }
+        for i in range(25)
+    ]
+
+    async def scenario() -> None:
+        await writer.start()
+        writer.add(rows)
+        # A full batch wakes the writer without waiting for the interval
+        for _ in range(100):
+            if writer.get_stats()["written"] == 25:
+                break
+            await asyncio.sleep(0.01)
+        assert writer.get_stats()["written"] == 25
+        assert writer.get_stats()["buffered"] == 0
+
+        await writer.stop()
+        await writer.engine.dispose()
+
+    asyncio.run(scenario())
+
+    assert _count_activities(db) == 25
+    db.close()
+
+
+def test_buffered_writer_drops_oldest_rows_beyond_max_buffer(tmp_path: Any) -> None:
+    writer = BufferedActivityWriter(_writer(tmp_path).engine, max_buffer=3)
+    writer.add([{"id": str(i)} for i in range(5)])
+
+    assert [row["id"] for row in writer._buffer] == ["2", "3", "4"]
+    assert writer.get_stats()["dropped"] == 2
@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import pytest
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from api.project_service.app.schemas.task import TaskCommentThreadDTO
+from api.project_service.app.services.task_service import TaskService
+from api.shared.exceptions.base_exceptions import InvalidCursorException
+from api.shared.models import document, external_tools, notification, project, user  # noqa: F401
+from api.shared.models.project import Project, ProjectMember, Task, TaskComment
+
+START = datetime(2026, 1, 1)
+
+
+@pytest.fixture
+def db(db: Session) -> Session:
+    db.add(Project(id="p1", name="Project", owner_id="u1"))
+    db.add(ProjectMember(project_id="p1", user_id="u1", role="owner", joined_at=START))
+    db.add(Task(id="t1", title="Task", project_id="p1", creator_id="u1"))
+    db.commit()
+    return db
+
+
+def _add_comments(db: Session, parents: Dict[str, Optional[str]]) -> None:
+    """Add comments by ID and parent ID, created in the given order."""
+    db.execute(
+        insert(TaskComment),
+        [
+            {
+                "id": comment_id,
+                "task_id": "t1",
+                "user_id": "u1",
+                "content": f"Comment {comment_id}",
+                "parent_id": parent_id,
+                "created_at": START + timedelta(minutes=i),
+            }
+            for i, (comment_id, parent_id) in enumerate(parents.items())
+        ],
+    )
+    db.commit()
+
+
+def _tree(comments: List[TaskCommentThreadDTO]) -> List[Any]:
+    return [
+        (comment.id, comment.depth, _tree(comment.replies)) if comment.replies else comment.id
+        for comment in comments
+    ]
+
+
+def _threads(db: Session, **kwargs: Any) -> Any:
+    return TaskService(db).get_task_comment_threads("p1", "t1", "u1", **kwargs)
+
+
+def test_threads_are_nested_and_ordered(db: Session) -> None:
+    # Created out of tree order, so replies of different threads interleave
+    _add_comments(
+        db,
+        {"a": None, "b": None, "a1": "a", "b1": "b", "a2": "a", "a1x": "a1", "c": None, "a1y": "a1"},
+    )
+
+    assert _tree(_threads(db)) == [
+        ("a", 0, [("a1", 1, ["a1x", "a1y"]), "a2"]),
+        ("b", 0, ["b1"]),
+        "c",
+    ]
+
+
+def test_thread_depth_limit(db: Session) -> None:
+    _add_comments(db, {"a": None, "a1": "a", "a1x": "a1", "b": None})
+
+    assert _tree(_threads(db, max_depth=1)) == [("a", 0, ["a1"]), "b"]
+    assert _tree(_threads(db, max_depth=0)) == ["a", "b"]
+
+
+def test_thread_pages_walk_top_level_comments(db: Session) -> None:
+    _add_comments(db, {f"r{i}": None for i in range(5)} | {f"r{i}-reply": f"r{i}" for i in range(5)})
+
+    seen: List[Any] = []
+    cursor = None
+    while True:
+        page = _threads(db, limit=2, cursor=cursor)
+        seen += _tree(page)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == [(f"r{i}", 0, [f"r{i}-reply"]) for i in range(5)]
+    with pytest.raises(InvalidCursorException):
+        _threads(db, cursor="bogus")
+
+
+def test_large_thread_is_one_query(db: Session) -> None:
+    # A 50 deep chain and a thread with 2000 direct replies
+    chain = {"c0": None} | {f"c{i}": f"c{i - 1}" for i in range(1, 50)}
+    _add_comments(db, chain | {"wide": None} | {f"w{i:04}": "wide" for i in range(2000)})
+    db.info.clear()
+    statements: List[str] = []
+
+    def capture(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", capture)
+    threads = _threads(db)
+
+    # Role, then the threads
+    assert len(statements) == 2
+    assert "WITH RECURSIVE" in statements[1]
+    deepest = threads[0]
+    while deepest.replies:
+        deepest = deepest.replies[0]
+    assert (deepest.id, deepest.depth) == ("c49", 49)
+    assert [reply.id for reply in threads[1].replies] == [f"w{i:04}" for i in range(2000)]
@@ -0,0 +1,134 @@
+from typing import Any, List
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from api.project_service.app.schemas.project import ProjectCreateDTO, ProjectMemberCreateDTO
+from api.project_service.app.schemas.task import TaskCreateDTO
+from api.project_service.app.services.project_authorizer import ProjectAuthorizer
+from api.project_service.app.services.project_service import ProjectService
+from api.project_service.app.services.task_service import TaskService
+from api.shared.exceptions.project_exceptions import (
+    NotProjectMemberException,
+    ProjectNotFoundException,
+    TaskNotFoundException,
+)
+from api.shared.models import document, external_tools, notification, project, user  # noqa: F401
+from api.shared.utils.membership_cache import membership_cache
+
+
+def _count_queries(session: Session) -> List[str]:
+    statements: List[str] = []
+
+    def capture(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    event.listen(session.get_bind(), "before_cursor_execute", capture)
+    return statements
+
+
+def _setup(db: Session) -> Any:
+    project = ProjectService(db).create_project(ProjectCreateDTO(name="Project"), "owner")
+    task = TaskService(db).create_task(project.id, TaskCreateDTO(title="First task"), "owner")
+    db.info.clear()
+    membership_cache.clear()
+    return project, task
+
+
+def test_authorize_resolves_role_in_one_query(db: Session) -> None:
+    project, _ = _setup(db)
+    statements = _count_queries(db)
+
+    access = ProjectAuthorizer(db).authorize(project.id, "owner")
+
+    assert access.role == "owner"
+    assert access.is_owner and access.is_admin
+    assert len(statements) == 1
+
+
+def test_authorize_is_cached_per_session(db: Session) -> None:
+    project, _ = _setup(db)
+    statements = _count_queries(db)
+
+    ProjectAuthorizer(db).authorize(project.id, "owner")
+    ProjectAuthorizer(db).authorize(project.id, "owner")
+
+    assert len(statements) == 1
+
+
+def test_authorize_reuses_roles_across_sessions(db: Session) -> None:
+    project, _ = _setup(db)
+    ProjectAuthorizer(db).authorize(project.id, "owner")
+    db.info.clear()
+    statements = _count_queries(db)
+
+    assert ProjectAuthorizer(db).authorize(project.id, "owner").role == "owner"
+    assert statements == []
+
+    # Membership changes drop the role everywhere
+    member = ProjectService(db).add_project_member(
+        project.id, ProjectMemberCreateDTO(user_id="member", role="admin"), "owner"
+    )
+    ProjectAuthorizer(db).authorize(project.id, "member")
+    ProjectService(db).remove_project_member(project.id, member.id, "owner")
+    db.info.clear()
+    with pytest.raises(NotProjectMemberException):
+        ProjectAuthorizer(db).authorize(project.id, "member")
+
+
+def test_authorize_errors(db: Session) -> None:
+    project, _ = _setup(db)
+    authorizer = ProjectAuthorizer(db)
+
+    with pytest.raises(ProjectNotFoundException):
+        authorizer.authorize("missing", "owner")
+    with pytest.raises(NotProjectMemberException):
+        authorizer.authorize(project.id, "stranger")
+
+
+def test_authorize_task_loads_task_in_one_query(db: Session) -> None:
+    project, task = _setup(db)
+    statements = _count_queries(db)
+
+    access = ProjectAuthorizer(db).authorize_task(project.id, task.id, "owner")
+
+    assert access.task.id == task.id
+    assert access.role == "owner"
+    assert len(statements) == 1
+
+
+def test_authorize_task_errors(db: Session) -> None:
+    project, task = _setup(db)
+    authorizer = ProjectAuthorizer(db)
+
+    with pytest.raises(TaskNotFoundException):
+        authorizer.authorize_task(project.id, "missing", "owner")
+    with pytest.raises(ProjectNotFoundException):
+        authorizer.authorize_task("missing", task.id, "owner")
+    with pytest.raises(NotProjectMemberException):
+        authorizer.authorize_task(project.id, task.id, "stranger")
+
+
+def test_member_changes_invalidate_cache(db: Session) -> None:
+    project, _ = _setup(db)
+    service = ProjectService(db)
+
+    with pytest.raises(NotProjectMemberException):
+        service.authorizer.authorize(project.id, "member")
+
+    member = service.add_project_member(project.id, ProjectMemberCreateDTO(user_id="member"), "owner")
+    assert service.authorizer.authorize(project.id, "member").role == "member"
+
+    service.remove_project_member(project.id, member.id, "owner")
+    with pytest.raises(NotProjectMemberException):
+        service.authorizer.authorize(project.id, "member")
+
+
+def test_get_task_uses_one_query(db: Session) -> None:
+    project, task = _setup(db)
+    statements = _count_queries(db)
+
+    TaskService(db).get_task(project.id, task.id, "owner")
+
+    assert len(statements) == 1
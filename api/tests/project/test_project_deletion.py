@@ -0,0 +1,278 @@
+import threading
+from typing import Any, Dict, List
+
+import pytest
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from api.project_service.app.commands.task_commands import (
+    ChangeTaskStatusCommand,
+    CommandInvoker,
+)
+from api.project_service.app.schemas.project import ProjectCreateDTO, ProjectMemberCreateDTO
+from api.project_service.app.schemas.task import TaskCommentCreateDTO, TaskCreateDTO
+from api.project_service.app.services.project_deletion import ProjectPurger, storage_path
+from api.project_service.app.services.project_service import ProjectService
+from api.project_service.app.services.task_service import TaskService
+from api.shared.exceptions.project_exceptions import (
+    InsufficientProjectRoleException,
+    ProjectNotFoundException,
+)
+from api.shared.models import document, external_tools, notification, project, user  # noqa: F401
+from api.shared.models.base import Base
+from api.shared.models.document import Document, DocumentBlob, DocumentPermission, DocumentVersion
+from api.shared.models.external_tools import (
+    ExternalResource,
+    ExternalToolConnection,
+    OAuthProvider,
+)
+from api.shared.models.project import Project, ProjectDeletion, Task
+from api.shared.models.user import User
+from api.shared.utils.content_store import ContentStore, LocalBlobStorage
+
+STORAGE_URL = "https://storage.example.com/storage/v1/object/public"
+
+
+class LocalStorage:
+    """Records deleted files instead of calling Supabase."""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.deleted: List[str] = []
+        self.buckets: List[str] = []
+        self.threads: set = set()
+
+    def delete_files(self, bucket_name: str, file_paths: List[str]) -> None:
+        self.threads.add(threading.current_thread().name)
+        if self.fail:
+            raise RuntimeError("storage unavailable")
+        self.deleted += [f"{bucket_name}/{path}" for path in file_paths]
+
+    def delete_bucket(self, bucket_name: str) -> None:
+        self.buckets.append(bucket_name)
+
+
+@pytest.fixture
+def engine(engine: Engine) -> Engine:
+    # Enforce the foreign keys the purge must respect
+    event.listen(
+        engine, "connect", lambda connection, record: connection.execute("PRAGMA foreign_keys=ON")
+    )
+    return engine
+
+
+@pytest.fixture
+def db(db: Session) -> Session:
+    db.add_all(
+        User(id=user_id, email=f"{user_id}@example.com", full_name=user_id, supabase_uid=user_id)
+        for user_id in ("owner", "member")
+    )
+    db.add(
+        OAuthProvider(
+            id="github", name="GitHub", type="github", auth_url="a", token_url="t",
+            scope="s", client_id="c", client_secret="s", redirect_uri="r",
+        )
+    )
+    db.add(
+        ExternalToolConnection(
+            id="conn", user_id="owner", provider_id="github", access_token="token"
+        )
+    )
+    db.commit()
+    return db
+
+
+def _create_project(db: Session, name: str, tasks: int = 7, documents: int = 5) -> str:
+    """Create a project with tasks, comments, history, documents and files."""
+    project_id = ProjectService(db).create_project(ProjectCreateDTO(name=name), "owner").id
+    ProjectService(db).add_project_member(project_id, ProjectMemberCreateDTO(user_id="member"), "owner")
+
+    service = TaskService(db)
+    for i in range(tasks):
+        task = service.create_task(project_id, TaskCreateDTO(title=f"Task {i}", tags=["tag"]), "owner")
+        comment = service.add_task_comment(
+            project_id, task.id, TaskCommentCreateDTO(content="Comment"), "owner"
+        )
+        service.add_task_comment(
+            project_id, task.id, TaskCommentCreateDTO(content="Reply", parent_id=comment.id), "member"
+        )
+        CommandInvoker(db, "owner").execute_command(ChangeTaskStatusCommand(db, task.id, "in_progress"))
+        db.commit()
+
+    bucket = f"{STORAGE_URL}/project-{project_id}"
+    parent_id = None
+    for i in range(documents):
+        # Each document nested in the previous one, so parents and children
+        # land in different batches
+        doc = Document(
+            name=f"doc{i}.txt", project_id=project_id, parent_id=parent_id, type="file",
+            url=f"{bucket}/d{i}/v2/doc{i}.txt", version=2, creator_id="owner",
+        )
+        db.add(doc)
+        db.flush()
+        db.add_all(
+            [
+                DocumentVersion(document_id=doc.id, version=1, url=f"{bucket}/d{i}/doc{i}.txt", creator_id="owner"),
+                DocumentVersion(document_id=doc.id, version=2, url=doc.url, creator_id="owner"),
+                DocumentPermission(document_id=doc.id, user_id="member", can_edit=True),
+            ]
+        )
+        parent_id = doc.id
+    db.add(
+        ExternalResource(
+            connection_id="conn", resource_id="r", name="Repo", type="repository",
+            project_id=project_id, document_id=parent_id,
+        )
+    )
+    db.commit()
+    return project_id
+
+
+def _count_rows(db: Session, project_id: str) -> Dict[str, int]:
+    tables = Base.metadata.tables
+    task_ids = select(Task.id).where(Task.project_id == project_id)
+    document_ids = select(Document.id).where(Document.project_id == project_id)
+    conditions = {
+        "projects": tables["projects"].c.id == project_id,
+        "project_members": tables["project_members"].c.project_id == project_id,
+        "project_stats": tables["project_stats"].c.project_id == project_id,
+        "activity_logs": tables["activity_logs"].c.project_id == project_id,
+        "tasks": tables["tasks"].c.project_id == project_id,
+        "task_tags": tables["task_tags"].c.project_id == project_id,
+        "task_command_history": tables["task_command_history"].c.project_id == project_id,
+        "task_comments": tables["task_comments"].c.task_id.in_(task_ids),
+        "documents": tables["documents"].c.project_id == project_id,
+        "document_versions": tables["document_versions"].c.document_id.in_(document_ids),
+        "document_permissions": tables["document_permissions"].c.document_id.in_(document_ids),
+    }
+    return {
+        name: db.scalar(select(func.count()).select_from(tables[name]).where(condition))
+        for name, condition in conditions.items()
+    }
+
+
+def test_delete_hides_the_project_at_once(db: Session) -> None:
+    project_id = _create_project(db, "Doomed")
+    task_id = db.scalar(select(Task.id).where(Task.project_id == project_id))
+    ProjectService(db).get_project(project_id, "member")
+
+    with pytest.raises(InsufficientProjectRoleException):
+        ProjectService(db).delete_project(project_id, "member")
+    response = ProjectService(db).delete_project(project_id, "owner")
+
+    for user_id in ("owner", "member"):
+        with pytest.raises(ProjectNotFoundException):
+            ProjectService(db).get_project(project_id, user_id)
+        with pytest.raises(ProjectNotFoundException):
+            TaskService(db).get_task(project_id, task_id, user_id)
+        assert list(ProjectService(db).get_user_projects(user_id)) == []
+
+    deletion = ProjectService(db).get_project_deletion(project_id, "owner")
+    assert (deletion.id, deletion.status) == (response["deletion_id"], "pending")
+    with pytest.raises(ProjectNotFoundException):
+        ProjectService(db).get_project_deletion(project_id, "member")
+
+
+def test_purge_deletes_everything_in_batches(db: Session) -> None:
+    project_id = _create_project(db, "Doomed")
+    kept_id = _create_project(db, "Kept", tasks=2, documents=2)
+    kept = _count_rows(db, kept_id)
+    before = _count_rows(db, project_id)
+    deletion_id = ProjectService(db).delete_project(project_id, "owner")["deletion_id"]
+    db.info.clear()
+
+    statements: List[str] = []
+
+    def capture(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement.split()[0])
+
+    event.listen(db.get_bind(), "before_cursor_execute", capture)
+    storage = LocalStorage()
+    deletion = ProjectPurger(db, storage=storage, batch_size=3, storage_workers=4).purge(deletion_id)
+
+    assert deletion.status == "done" and deletion.error is None
+    assert set(_count_rows(db, project_id).values()) == {0}
+    assert _count_rows(db, kept_id) == kept
+    # Members went with the soft delete; the rest is reported by the purge
+    assert deletion.deleted_rows == {
+        name: count for name, count in before.items() if name != "project_members"
+    } | {"project_members": 0}
+    # One DELETE per table and batch, however many rows each batch holds:
+    # 3 batches of tasks, 2 of documents, the activities, then the project
+    activity_batches = -(-before["activity_logs"] // 3)
+    assert statements.count("DELETE") == 3 * 4 + 2 * 3 + activity_batches + 3
+
+    assert deletion.files_deleted == 10 and deletion.files_failed == 0
+    assert sorted(storage.deleted) == sorted(
+        f"project-{project_id}/d{i}/{path}"
+        for i in range(5)
+        for path in (f"doc{i}.txt", f"v2/doc{i}.txt")
+    )
+    assert all(name.startswith("project-purge") for name in storage.threads)
+    assert storage.buckets == [f"project-{project_id}"]
+    assert db.scalar(select(ExternalResource.document_id).where(ExternalResource.project_id.is_(None))) is None
+
+
+def test_failed_purge_can_be_rerun(db: Session, monkeypatch: pytest.MonkeyPatch) -> None:
+    project_id = _create_project(db, "Doomed", tasks=2, documents=2)
+    deletion_id = ProjectService(db).delete_project(project_id, "owner")["deletion_id"]
+    purger = ProjectPurger(db, storage=LocalStorage(fail=True), batch_size=1)
+    delete_rows = purger._delete
+
+    def fail_on_activities(deletion: ProjectDeletion, conditions: Dict[Any, Any]) -> None:
+        if any(getattr(target, "__tablename__", None) == "activity_logs" for target in conditions):
+            raise RuntimeError("connection lost")
+        delete_rows(deletion, conditions)
+
+    monkeypatch.setattr(purger, "_delete", fail_on_activities)
+    deletion = purger.purge(deletion_id)
+
+    assert (deletion.status, deletion.error) == ("failed", "connection lost")
+    assert deletion.files_failed == 4
+    # Committed batches stay deleted
+    assert deletion.deleted_rows["tasks"] == 2 and deletion.deleted_rows["documents"] == 2
+    assert db.get(Project, project_id) is not None
+
+    monkeypatch.setattr(purger, "_delete", delete_rows)
+    purger.storage = LocalStorage()
+    deletion = purger.purge(deletion_id)
+    assert deletion.status == "done" and deletion.error is None
+    assert db.get(Project, project_id) is None
+    assert set(_count_rows(db, project_id).values()) == {0}
+
+
+def test_purge_collects_content_no_other_project_references(db: Session, tmp_path: Any) -> None:
+    project_id = _create_project(db, "Doomed", tasks=0, documents=2)
+    kept_id = _create_project(db, "Kept", tasks=0, documents=1)
+    content = ContentStore(storage=LocalBlobStorage(str(tmp_path / "blobs")))
+    for name in ("shared", "own"):
+        (tmp_path / name).write_bytes(name.encode())
+        content.storage.put(name, str(tmp_path / name), "text/plain")
+        db.add(DocumentBlob(content_hash=name, size=len(name), storage_key=name, url=name))
+    documents = {
+        doc.project_id: doc.id for doc in db.scalars(select(Document).order_by(Document.created_at))
+    }
+    db.add_all(
+        [
+            DocumentVersion(document_id=documents[project_id], version=3, content_hash="shared", creator_id="owner"),
+            DocumentVersion(document_id=documents[project_id], version=4, content_hash="own", creator_id="owner"),
+            DocumentVersion(document_id=documents[kept_id], version=3, content_hash="shared", creator_id="owner"),
+        ]
+    )
+    db.commit()
+    deletion_id = ProjectService(db).delete_project(project_id, "owner")["deletion_id"]
+
+    deletion = ProjectPurger(db, storage=LocalStorage(), batch_size=1, content=content).purge(deletion_id)
+
+    assert deletion.status == "done"
+    assert db.scalars(select(DocumentBlob.content_hash)).all() == ["shared"]
+    assert (tmp_path / "blobs" / "shared").exists() and not (tmp_path / "blobs" / "own").exists()
+    assert content.collected == 1
+
+
+def test_storage_path() -> None:
+    bucket = "project-p1"
+    assert storage_path(f"{STORAGE_URL}/{bucket}/d1/v2/a.txt?", bucket) == "d1/v2/a.txt"
+    assert storage_path("https://example.com/elsewhere.txt", bucket) is None
+    assert storage_path(None, bucket) is None
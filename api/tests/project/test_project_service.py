@@ -7,7 +7,9 @@ from datetime import datetime
 
 @pytest.fixture
 def mock_db():
-    return MagicMock()
+    db = MagicMock()
+    db.info = {}
+    return db
 
 @pytest.fixture
 def project_service(mock_db):
@@ -107,8 +109,8 @@ def test_add_project_member_success(project_service: ProjectService):
          patch.object(project_service.db, "add", MagicMock()), \
          patch.object(project_service.db, "commit", MagicMock()), \
          patch.object(project_service.db, "refresh", MagicMock()):
-        # Simular proyecto y miembro actual con rol owner
-        mock_query.return_value.filter.return_value.first.side_effect = [MagicMock(), MagicMock(role="owner"), None]
+        # Simular proyecto con el rol owner del usuario actual
+        mock_query.return_value.filter.return_value.first.side_effect = [MagicMock(role="owner"), None]
         mock_activity_service.log_activity.return_value = MagicMock()
         result = project_service.add_project_member("proj1", member_data, "user1")
         assert result.id == "mem1"
@@ -118,8 +120,8 @@ def test_add_project_member_insufficient_role(project_service: ProjectService):
     with patch("api.shared.models.project.Project", MagicMock()), \
          patch("api.shared.models.project.ProjectMember", MagicMock()), \
          patch.object(project_service.db, "query") as mock_query:
-        # Simular proyecto y miembro actual con rol member (no owner/admin)
-        mock_query.return_value.filter.return_value.first.side_effect = [MagicMock(), MagicMock(role="member")]
+        # Simular proyecto con el rol member del usuario actual (no owner/admin)
+        mock_query.return_value.filter.return_value.first.side_effect = [MagicMock(role="member")]
         with pytest.raises(InsufficientProjectRoleException):
             project_service.add_project_member("proj1", member_data, "user1")
 
@@ -132,8 +134,8 @@ def test_update_project_member_success(project_service: ProjectService):
          patch.object(project_service, "_project_member_to_dto", return_value=MagicMock(id="mem1")), \
          patch.object(project_service.db, "commit", MagicMock()), \
          patch.object(project_service.db, "refresh", MagicMock()):
-        # Simular proyecto, miembro actual owner/admin y miembro a actualizar
-        mock_query.return_value.filter.return_value.first.side_effect = [MagicMock(), MagicMock(role="owner"), MagicMock(role="member")]
+        # Simular proyecto con rol owner del usuario actual y miembro a actualizar
+        mock_query.return_value.filter.return_value.first.side_effect = [MagicMock(role="owner"), MagicMock(role="member")]
         mock_activity_service.log_activity.return_value = MagicMock()
         result = project_service.update_project_member("proj1", "mem1", member_data, "user1")
         assert result.id == "mem1"
@@ -145,8 +147,8 @@ def test_remove_project_member_success(project_service: ProjectService):
          patch.object(project_service, "activity_service", create=True) as mock_activity_service, \
          patch.object(project_service.db, "delete", MagicMock()), \
          patch.object(project_service.db, "commit", MagicMock()):
-        # Simular proyecto, miembro actual owner/admin y miembro a eliminar
-        mock_query.return_value.filter.return_value.first.side_effect = [MagicMock(), MagicMock(role="owner"), MagicMock(role="member")]
+        # Simular proyecto con rol owner del usuario actual y miembro a eliminar
+        mock_query.return_value.filter.return_value.first.side_effect = [MagicMock(role="owner"), MagicMock(role="member")]
         mock_activity_service.log_activity.return_value = MagicMock()
         result = project_service.remove_project_member("proj1", "mem1", "user1")
         assert "message" in result
@@ -156,8 +158,8 @@ def test_get_project_members_success(project_service: ProjectService):
          patch("api.shared.models.project.ProjectMember", MagicMock()), \
          patch.object(project_service.db, "query") as mock_query, \
          patch.object(project_service, "_project_member_to_dto", return_value=MagicMock(id="mem1")):
-        # Simular proyecto y miembro actual
-        mock_query.return_value.filter.return_value.first.side_effect = [MagicMock(), MagicMock(role="owner")]
+        # Simular proyecto con el rol del usuario actual
+        mock_query.return_value.filter.return_value.first.side_effect = [MagicMock(role="owner")]
         mock_query.return_value.filter.return_value.all.return_value = [MagicMock()]
         result = project_service.get_project_members("proj1", "user1")
         assert isinstance(result, list)
@@ -0,0 +1,190 @@
+import random
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from api.project_service.app.commands.task_commands import (
+    AssignTaskCommand,
+    ChangeTaskStatusCommand,
+    CommandInvoker,
+)
+from api.project_service.app.schemas.project import (
+    ProjectCreateDTO,
+    ProjectMemberCreateDTO,
+    ProjectStatsDTO,
+)
+from api.project_service.app.schemas.task import (
+    TaskBatchDTO,
+    TaskCommentCreateDTO,
+    TaskCreateDTO,
+    TaskUpdateDTO,
+)
+from api.project_service.app.services.project_service import ProjectService
+from api.project_service.app.services.project_stats import get_project_stats
+from api.project_service.app.services.task_service import (
+    VALID_STATUS_TRANSITIONS,
+    TaskService,
+)
+from api.shared.exceptions.base_exceptions import BaseAPIException
+from api.shared.exceptions.project_exceptions import (
+    InsufficientProjectRoleException,
+    NotProjectMemberException,
+)
+from api.shared.models import document, external_tools, notification, project, user  # noqa: F401
+from api.shared.models.project import Task, TaskComment, project_stats
+
+USERS = ["owner", "member"]
+TODAY = datetime.now(timezone.utc).replace(hour=12, minute=0, second=0, microsecond=0)
+DUE_DATES = [None] + [TODAY + timedelta(days=days) for days in (-3, -1, 0, 2)]
+
+
+@pytest.fixture
+def project_id(db: Session) -> str:
+    project_id = ProjectService(db).create_project(ProjectCreateDTO(name="Project"), "owner").id
+    ProjectService(db).add_project_member(
+        project_id, ProjectMemberCreateDTO(user_id="member"), "owner"
+    )
+    return project_id
+
+
+def _brute_force_stats(db: Session, project_id: str) -> ProjectStatsDTO:
+    """Count everything the slow way, straight from the tasks and comments."""
+    db.expire_all()
+    tasks = db.query(Task).filter(Task.project_id == project_id).all()
+    today = TODAY.date()
+    assignees = Counter(task.assignee_id for task in tasks if task.assignee_id)
+    return ProjectStatsDTO(
+        project_id=project_id,
+        task_count=len(tasks),
+        comment_count=db.query(TaskComment)
+        .filter(TaskComment.task_id.in_([task.id for task in tasks]))
+        .count(),
+        overdue_count=sum(
+            1
+            for task in tasks
+            if task.status != "done" and task.due_date and task.due_date.date() < today
+        ),
+        unassigned_count=sum(1 for task in tasks if not task.assignee_id),
+        status_counts=Counter(task.status for task in tasks),
+        assignee_counts=assignees,
+    )
+
+
+def _random_operation(db: Session, project_id: str, rng: random.Random) -> None:
+    service = TaskService(db)
+    task_ids: List[str] = [
+        task_id for (task_id,) in db.query(Task.id).filter(Task.project_id == project_id)
+    ]
+    action = rng.choice(
+        ["create", "create", "update", "status", "assign", "undo", "redo", "batch", "delete", "comment"]
+    )
+    if action == "create" or not task_ids:
+        service.create_task(
+            project_id,
+            TaskCreateDTO(
+                title=f"Task {rng.random()}",
+                assignee_id=rng.choice(USERS + [None]),
+                due_date=rng.choice(DUE_DATES),
+            ),
+            "owner",
+        )
+        return
+
+    task = db.get(Task, rng.choice(task_ids))
+    next_status = rng.choice(VALID_STATUS_TRANSITIONS[task.status])
+    if action == "update":
+        service.update_task(
+            project_id,
+            task.id,
+            TaskUpdateDTO(status=next_status, due_date=rng.choice(DUE_DATES[1:])),
+            "owner",
+        )
+    elif action == "status":
+        CommandInvoker(db, "owner").execute_command(
+            ChangeTaskStatusCommand(db, task.id, next_status)
+        )
+        db.commit()
+    elif action == "assign":
+        CommandInvoker(db, "owner").execute_command(
+            AssignTaskCommand(db, task.id, rng.choice(USERS + [None]))
+        )
+        db.commit()
+    elif action in ("undo", "redo"):
+        getattr(CommandInvoker(db, "owner"), action)(project_id, task.id)
+        db.commit()
+    elif action == "batch":
+        service.batch_tasks(
+            project_id,
+            TaskBatchDTO(
+                operations=[
+                    {"action": "create", "task": {"title": "Batch task", "due_date": DUE_DATES[1]}},
+                    {"action": "status", "task_id": task.id, "status": next_status},
+                    {"action": "assign", "task_id": task.id, "assignee_id": "member"},
+                    {"action": "delete", "task_id": rng.choice(task_ids)},
+                ]
+            ),
+            "owner",
+        )
+    elif action == "delete":
+        service.delete_task(project_id, task.id, "owner")
+    else:
+        service.add_task_comment(
+            project_id, task.id, TaskCommentCreateDTO(content="A comment"), "owner"
+        )
+
+
+def test_stats_match_brute_force_count(db: Session, project_id: str) -> None:
+    rng = random.Random(7)
+    for _ in range(300):
+        try:
+            _random_operation(db, project_id, rng)
+        except (BaseAPIException, IntegrityError):
+            # Invalid transitions, and deleting a task that has comments
+            db.rollback()
+        assert ProjectService(db).get_project_stats(project_id, "member") == _brute_force_stats(
+            db, project_id
+        )
+
+    stats = ProjectService(db).get_project_stats(project_id, "owner")
+    assert stats.task_count > 10 and stats.comment_count > 0 and stats.overdue_count > 0
+
+
+def test_rebuild_repairs_drifted_counters(db: Session, project_id: str) -> None:
+    service = TaskService(db)
+    for due_date in DUE_DATES:
+        task = service.create_task(project_id, TaskCreateDTO(title="Task", due_date=due_date), "owner")
+        service.add_task_comment(project_id, task.id, TaskCommentCreateDTO(content="Hi"), "owner")
+    counters = get_project_stats(db, project_id)
+
+    # Writes that bypass the services leave the counters behind
+    db.execute(update(Task).values(status="done"))
+    db.execute(update(project_stats).where(project_stats.c.name == "tasks").values(value=99))
+    db.commit()
+    assert ProjectService(db).get_project_stats(project_id, "owner").task_count == 99
+
+    with pytest.raises(InsufficientProjectRoleException):
+        ProjectService(db).rebuild_project_stats(project_id, "member")
+    stats = ProjectService(db).rebuild_project_stats(project_id, "owner")
+
+    assert stats == _brute_force_stats(db, project_id)
+    assert stats.overdue_count == 0 and stats.status_counts == {"done": 5}
+    assert ProjectService(db).get_project_stats(project_id, "owner") == stats
+
+    # Rebuilding consistent counters changes nothing
+    db.execute(update(Task).values(status="todo"))
+    db.commit()
+    ProjectService(db).rebuild_project_stats(project_id, "owner")
+    assert get_project_stats(db, project_id) == counters
+
+
+def test_stats_require_membership(db: Session, project_id: str) -> None:
+    assert ProjectService(db).get_project_stats(project_id, "owner") == ProjectStatsDTO(
+        project_id=project_id
+    )
+    with pytest.raises(NotProjectMemberException):
+        ProjectService(db).get_project_stats(project_id, "stranger")
@@ -0,0 +1,150 @@
+from typing import Any, List
+
+import pytest
+from sqlalchemy.orm import Session
+
+from api.project_service.app.schemas.project import ProjectCreateDTO, ProjectMemberCreateDTO
+from api.project_service.app.schemas.search import SearchEntityType
+from api.project_service.app.schemas.task import TaskCommentCreateDTO, TaskCreateDTO, TaskUpdateDTO
+from api.project_service.app.services.project_service import ProjectService
+from api.project_service.app.services.search_service import SearchService
+from api.project_service.app.services.task_service import TaskService
+from api.shared.exceptions.project_exceptions import (
+    InvalidSearchQueryException,
+    NotProjectMemberException,
+)
+from api.shared.models import (  # noqa: F401
+    document,
+    external_tools,
+    notification,
+    project,
+    search,
+    user,
+)
+from api.shared.models.document import Document, DocumentPermission
+
+
+@pytest.fixture
+def project_id(db: Session) -> str:
+    project_id = ProjectService(db).create_project(ProjectCreateDTO(name="Project"), "owner").id
+    ProjectService(db).add_project_member(
+        project_id, ProjectMemberCreateDTO(user_id="member"), "owner"
+    )
+    task = TaskService(db).create_task(
+        project_id,
+        TaskCreateDTO(title="Login page crashes", description="Crash on submit"),
+        "owner",
+    )
+    TaskService(db).create_task(
+        project_id, TaskCreateDTO(title="Write release notes", description="Mention login"), "owner"
+    )
+    TaskService(db).add_task_comment(
+        project_id, task.id, TaskCommentCreateDTO(content="The login crash is in the form"), "owner"
+    )
+    db.add(
+        Document(
+            name="Crash report",
+            description="Stack trace of the login crash",
+            project_id=project_id,
+            type="file",
+            creator_id="owner",
+            tags=["incident"],
+        )
+    )
+    db.commit()
+    return project_id
+
+
+def _search(
+    db: Session, project_id: str, query: str, user_id: str = "owner", **kwargs: Any
+) -> List[Any]:
+    return list(SearchService(db).search(project_id, user_id, query, **kwargs))
+
+
+def test_search_finds_every_entity_type(db: Session, project_id: str) -> None:
+    results = _search(db, project_id, "login crash")
+
+    assert sorted((r.entity_type.value, r.title) for r in results) == [
+        ("comment", "Login page crashes"),
+        ("document", "Crash report"),
+        ("task", "Login page crashes"),
+    ]
+    assert results == sorted(results, key=lambda r: r.score, reverse=True)
+    comment = next(r for r in results if r.entity_type == SearchEntityType.COMMENT)
+    task = next(r for r in results if r.entity_type == SearchEntityType.TASK)
+    assert comment.snippet == "The <b>login</b> <b>crash</b> is in the form"
+    assert comment.task_id == task.entity_id == task.task_id
+
+
+def test_snippets_escape_the_indexed_text(db: Session, project_id: str) -> None:
+    TaskService(db).create_task(
+        project_id,
+        TaskCreateDTO(title="<img src=x onerror=alert(1)> payload & \"quotes\""),
+        "owner",
+    )
+
+    [result] = _search(db, project_id, "payload")
+    assert result.snippet == (
+        "&lt;img src=x onerror=alert(1)&gt; <b>payload</b> &amp; &quot;quotes&quot;"
+    )
+
+
+def test_search_requires_every_term(db: Session, project_id: str) -> None:
+    assert [r.title for r in _search(db, project_id, "release login")] == ["Write release notes"]
+    assert _search(db, project_id, "release missing") == []
+
+
+def test_search_ignores_query_syntax(db: Session, project_id: str) -> None:
+    # Operators are searched as plain terms
+    assert len(_search(db, project_id, 'login" (crash*:')) == 3
+    assert _search(db, project_id, "release OR crash") == []
+    with pytest.raises(InvalidSearchQueryException):
+        _search(db, project_id, '"*" - ()')
+
+
+def test_search_index_follows_writes(db: Session, project_id: str) -> None:
+    task_id = _search(db, project_id, "release")[0].entity_id
+
+    TaskService(db).update_task(
+        project_id, task_id, TaskUpdateDTO(title="Write changelog"), "owner"
+    )
+    assert _search(db, project_id, "release") == []
+    assert [r.entity_id for r in _search(db, project_id, "changelog")] == [task_id]
+
+    TaskService(db).delete_task(project_id, task_id, "owner")
+    assert _search(db, project_id, "changelog") == []
+
+
+def test_search_filters_documents_by_permission(db: Session, project_id: str) -> None:
+    def document_titles(user_id: str) -> List[str]:
+        return [
+            r.title
+            for r in _search(db, project_id, "crash", user_id, types=[SearchEntityType.DOCUMENT])
+        ]
+
+    assert document_titles("owner") == ["Crash report"]
+    assert document_titles("member") == []
+
+    db.add(DocumentPermission(document_id=db.query(Document.id).scalar(), user_id="member"))
+    db.commit()
+    assert document_titles("member") == ["Crash report"]
+
+    with pytest.raises(NotProjectMemberException):
+        _search(db, project_id, "crash", "stranger")
+
+
+def test_search_pages_walk_every_result(db: Session, project_id: str) -> None:
+    for i in range(7):
+        TaskService(db).create_task(project_id, TaskCreateDTO(title=f"Crash {i}"), "owner")
+
+    seen: List[str] = []
+    cursor = None
+    while True:
+        page = SearchService(db).search(project_id, "owner", "crash", limit=3, cursor=cursor)
+        seen += [r.entity_id for r in page]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert seen == [r.entity_id for r in _search(db, project_id, "crash", limit=100)]
+    assert len(set(seen)) == 10
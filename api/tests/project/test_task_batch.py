@@ -0,0 +1,196 @@
+from typing import Any, List
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from api.project_service.app.schemas.project import ProjectCreateDTO, ProjectMemberCreateDTO
+from api.project_service.app.commands.task_commands import CommandInvoker
+from api.project_service.app.schemas.task import (
+    TaskBatchDTO,
+    TaskCommentCreateDTO,
+    TaskCreateDTO,
+    TaskUpdateDTO,
+)
+from api.project_service.app.services.project_service import ProjectService
+from api.project_service.app.services.task_service import TaskService
+from api.shared.exceptions.project_exceptions import NotProjectMemberException
+from api.shared.models import document, external_tools, notification, project, user  # noqa: F401
+from api.shared.models.project import ActivityLog, Task, TaskComment
+
+
+def _setup(db: Session) -> Any:
+    project = ProjectService(db).create_project(ProjectCreateDTO(name="Project"), "owner")
+    ProjectService(db).add_project_member(
+        project.id, ProjectMemberCreateDTO(user_id="member"), "owner"
+    )
+    tasks = [
+        TaskService(db).create_task(project.id, TaskCreateDTO(title=f"Task {i}"), "owner")
+        for i in range(3)
+    ]
+    return project, tasks
+
+
+def _batch(db: Session, project_id: str, operations: List[Any], user_id: str = "owner") -> Any:
+    return TaskService(db).batch_tasks(
+        project_id, TaskBatchDTO.model_validate({"operations": operations}), user_id
+    )
+
+
+def test_batch_applies_every_action(db: Session) -> None:
+    project, tasks = _setup(db)
+
+    response = _batch(
+        db,
+        project.id,
+        [
+            {"action": "create", "task": {"title": "New task", "priority": "high"}},
+            {"action": "update", "task_id": tasks[0].id, "changes": {"title": "Renamed"}},
+            {"action": "status", "task_id": tasks[0].id, "status": "in_progress"},
+            {"action": "assign", "task_id": tasks[1].id, "assignee_id": "member"},
+            {"action": "delete", "task_id": tasks[2].id},
+        ],
+    )
+
+    assert response.failed == 0 and response.succeeded == 5
+    assert response.results[0].task.priority == "high"
+    assert response.results[2].task.title == "Renamed"
+
+    db.expire_all()
+    renamed = db.get(Task, tasks[0].id)
+    assert (renamed.title, renamed.status) == ("Renamed", "in_progress")
+    assert db.get(Task, tasks[1].id).assignee_id == "member"
+    assert db.get(Task, tasks[2].id) is None
+    assert db.get(Task, response.results[0].task_id).creator_id == "owner"
+
+    actions = db.query(ActivityLog.action).filter(ActivityLog.entity_type == "task")
+    assert sorted(action for (action,) in actions) == [
+        "assign", "change_status", "create_task", "create_task", "create_task",
+        "create_task", "delete_task", "update_task",
+    ]
+
+
+def test_batch_reports_failures_per_item(db: Session) -> None:
+    project, tasks = _setup(db)
+
+    response = _batch(
+        db,
+        project.id,
+        [
+            {"action": "status", "task_id": tasks[0].id, "status": "done"},
+            {"action": "status", "task_id": tasks[0].id, "status": "in_progress"},
+            {"action": "status", "task_id": tasks[0].id, "status": "review"},
+            {"action": "update", "task_id": "missing", "changes": {"title": "Nope"}},
+            {"action": "assign", "task_id": tasks[1].id, "assignee_id": "stranger"},
+            {"action": "status", "task_id": tasks[1].id},
+        ],
+    )
+
+    assert [r.success for r in response.results] == [False, True, True, False, False, False]
+    assert [r.error_code for r in response.results if not r.success] == [
+        "INVALID_TASK_STATUS_TRANSITION",
+        "TASK_NOT_FOUND",
+        "NOT_PROJECT_MEMBER",
+        "INVALID_TASK_BATCH_OPERATION",
+    ]
+    db.expire_all()
+    assert db.get(Task, tasks[0].id).status == "review"
+
+
+def test_batch_checks_task_roles(db: Session) -> None:
+    project, tasks = _setup(db)
+
+    response = _batch(
+        db,
+        project.id,
+        [
+            {"action": "create", "task": {"title": "Member task"}},
+            {"action": "delete", "task_id": tasks[0].id},
+        ],
+        user_id="member",
+    )
+
+    assert [r.success for r in response.results] == [True, False]
+    assert response.results[1].error_code == "INSUFFICIENT_PROJECT_ROLE"
+
+
+def test_batch_requires_membership(db: Session) -> None:
+    project, _ = _setup(db)
+
+    with pytest.raises(NotProjectMemberException):
+        _batch(db, project.id, [{"action": "create", "task": {"title": "Nope"}}], "stranger")
+
+
+def test_batch_uses_bulk_statements(db: Session) -> None:
+    project, tasks = _setup(db)
+    db.info.clear()
+    statements: List[str] = []
+
+    def capture(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement.split()[0])
+
+    event.listen(db.get_bind(), "before_cursor_execute", capture)
+    _batch(
+        db,
+        project.id,
+        [{"action": "create", "task": {"title": f"New task {i}"}} for i in range(50)]
+        + [{"action": "status", "task_id": task.id, "status": "in_progress"} for task in tasks]
+        + [{"action": "assign", "task_id": tasks[0].id, "assignee_id": "member"}],
+    )
+
+    # Tasks, assignees (the role is cached), then one INSERT for tasks, one
+    # UPDATE executemany per column set, one upsert for the project counters,
+    # the undo histories (existing ones, least recently used ones, one INSERT)
+    # and one INSERT for activities
+    assert statements == [
+        "SELECT", "SELECT", "INSERT", "UPDATE", "UPDATE", "INSERT",
+        "SELECT", "SELECT", "INSERT", "INSERT",
+    ]
+
+
+def test_batch_updates_can_be_undone(db: Session) -> None:
+    project, tasks = _setup(db)
+    TaskService(db).update_task(project.id, tasks[0].id, TaskUpdateDTO(title="Edited"), "owner")
+
+    _batch(
+        db,
+        project.id,
+        [
+            {"action": "status", "task_id": tasks[0].id, "status": "in_progress"},
+            {"action": "assign", "task_id": tasks[0].id, "assignee_id": "member"},
+            {"action": "status", "task_id": tasks[1].id, "status": "in_progress"},
+        ],
+    )
+
+    # The batch is undone first, as one entry per task
+    invoker = CommandInvoker(db, "owner")
+    undone = invoker.undo(project.id, tasks[0].id)
+    assert (undone.title, undone.status, undone.assignee_id) == ("Edited", "todo", None)
+    assert invoker.undo(project.id, tasks[0].id).title == "Task 0"
+    assert invoker.undo(project.id, tasks[1].id).status == "todo"
+    db.commit()
+    assert invoker.redo(project.id, tasks[1].id).status == "in_progress"
+
+
+def test_batch_deletes_comment_threads(db: Session) -> None:
+    project, tasks = _setup(db)
+    service = TaskService(db)
+    parent_id = None
+    # A thread three levels deep, and a comment on a task that stays
+    for content in ("Comment", "Reply", "Reply to reply"):
+        parent_id = service.add_task_comment(
+            project.id,
+            tasks[0].id,
+            TaskCommentCreateDTO(content=content, parent_id=parent_id),
+            "owner",
+        ).id
+    kept = service.add_task_comment(
+        project.id, tasks[1].id, TaskCommentCreateDTO(content="Kept"), "owner"
+    )
+
+    response = _batch(db, project.id, [{"action": "delete", "task_id": tasks[0].id}])
+
+    assert response.succeeded == 1
+    assert [comment.id for comment in db.query(TaskComment)] == [kept.id]
+    stats = ProjectService(db).get_project_stats(project.id, "owner")
+    assert (stats.task_count, stats.comment_count) == (2, 1)
@@ -1,39 +1,185 @@
+from typing import Any, List
 from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
 from api.project_service.app.commands.task_commands import (
     UpdateTaskCommand, AssignTaskCommand, ChangeTaskStatusCommand, CommandInvoker
 )
+from api.shared.exceptions.project_exceptions import (
+    NothingToRedoException,
+    NothingToUndoException,
+    TaskCommandConflictException,
+)
+from api.shared.models import document, external_tools, notification, project, user  # noqa: F401
+from api.shared.models.project import Project, Task, TaskCommandHistory
 
 def test_update_task_command_execute_and_undo():
     db = MagicMock()
-    cmd = UpdateTaskCommand(db, 'tid', {'title': 'New'})
     db.query().filter().first.return_value = MagicMock(id='tid', title='Old')
+    cmd = UpdateTaskCommand(db, 'tid', {'title': 'New'})
     result = cmd.execute()
-    assert result.title == 'Old' or hasattr(result, 'title')
+    assert result.title == 'New'
+    assert cmd.changes == {'title': ['Old', 'New']}
     undo_result = cmd.undo()
-    assert hasattr(undo_result, 'title')
+    assert undo_result.title == 'Old'
 
 def test_assign_task_command_execute_and_undo():
     db = MagicMock()
-    cmd = AssignTaskCommand(db, 'tid', 'uid')
     db.query().filter().first.return_value = MagicMock(id='tid', assignee_id=None)
+    cmd = AssignTaskCommand(db, 'tid', 'uid')
     result = cmd.execute()
-    assert hasattr(result, 'assignee_id')
+    assert result.assignee_id == 'uid'
     undo_result = cmd.undo()
-    assert hasattr(undo_result, 'assignee_id')
+    assert undo_result.assignee_id is None
 
 def test_change_task_status_command_execute_and_undo():
     db = MagicMock()
-    cmd = ChangeTaskStatusCommand(db, 'tid', 'done')
     db.query().filter().first.return_value = MagicMock(id='tid', status='todo')
+    cmd = ChangeTaskStatusCommand(db, 'tid', 'done')
     result = cmd.execute()
-    assert hasattr(result, 'status')
+    assert result.status == 'done'
     undo_result = cmd.undo()
-    assert hasattr(undo_result, 'status')
+    assert undo_result.status == 'todo'
 
-def test_command_invoker_execute_undo_redo():
-    db = MagicMock()
-    cmd = UpdateTaskCommand(db, 'tid', {'title': 'New'})
-    invoker = CommandInvoker()
-    invoker.execute_command(cmd)
-    invoker.undo()
-    invoker.redo() 
\ No newline at end of file
+
+@pytest.fixture
+def db(db: Session) -> Session:
+    db.add(Project(id="p1", name="Project", owner_id="u1"))
+    db.add_all(
+        Task(id=f"t{i}", title=f"Task {i}", project_id="p1", creator_id="u1")
+        for i in range(3)
+    )
+    db.commit()
+    return db
+
+
+def _change_status(db: Session, user_id: str, task_id: str, status: str, **kwargs: Any) -> Task:
+    invoker = CommandInvoker(db, user_id, **kwargs)
+    task = invoker.execute_command(ChangeTaskStatusCommand(db, task_id, status))
+    db.commit()
+    return task
+
+
+def test_command_invoker_execute_undo_redo(db: Session) -> None:
+    _change_status(db, "u1", "t0", "in_progress")
+    _change_status(db, "u1", "t0", "review")
+    invoker = CommandInvoker(db, "u1")
+
+    assert invoker.undo("p1", "t0").status == "in_progress"
+    assert invoker.undo("p1", "t0").status == "todo"
+    with pytest.raises(NothingToUndoException):
+        invoker.undo("p1", "t0")
+
+    assert invoker.redo("p1", "t0").status == "in_progress"
+    db.commit()
+
+    # A new command clears what is left to redo
+    _change_status(db, "u1", "t0", "todo")
+    with pytest.raises(NothingToRedoException):
+        CommandInvoker(db, "u1").redo("p1", "t0")
+
+
+def test_command_history_is_per_user_and_task(db: Session) -> None:
+    _change_status(db, "u1", "t0", "in_progress")
+    _change_status(db, "u1", "t1", "in_progress")
+
+    with pytest.raises(NothingToUndoException):
+        CommandInvoker(db, "u2").undo("p1", "t0")
+    with pytest.raises(NothingToUndoException):
+        CommandInvoker(db, "u1").undo("other-project", "t0")
+
+    assert CommandInvoker(db, "u1").undo("p1", "t1").status == "todo"
+    assert db.get(Task, "t0").status == "in_progress"
+
+
+def test_command_history_survives_new_session(db: Session) -> None:
+    _change_status(db, "u1", "t0", "in_progress")
+
+    with Session(db.get_bind()) as other:
+        assert CommandInvoker(other, "u1").undo("p1", "t0").status == "todo"
+
+
+def test_command_history_depth_limit(db: Session) -> None:
+    for status in ("in_progress", "review", "done", "review"):
+        _change_status(db, "u1", "t0", status, max_depth=2)
+
+    history = db.query(TaskCommandHistory).one()
+    assert history.undo_stack == [{"status": ["review", "done"]}, {"status": ["done", "review"]}]
+
+
+def test_command_history_evicts_least_recently_used_tasks(db: Session) -> None:
+    _change_status(db, "u1", "t0", "in_progress", max_tasks=2)
+    _change_status(db, "u1", "t1", "in_progress", max_tasks=2)
+    _change_status(db, "u1", "t0", "review", max_tasks=2)
+    _change_status(db, "u1", "t2", "in_progress", max_tasks=2)
+
+    histories = db.query(TaskCommandHistory.task_id).order_by(TaskCommandHistory.task_id)
+    assert [task_id for (task_id,) in histories] == ["t0", "t2"]
+
+
+def test_undo_is_a_single_row_update(db: Session) -> None:
+    _change_status(db, "u1", "t0", "in_progress")
+    statements: List[str] = []
+
+    def capture(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement.split()[0])
+
+    event.listen(db.get_bind(), "before_cursor_execute", capture)
+    CommandInvoker(db, "u1").undo("p1", "t0")
+    db.commit()
+
+    # Read the history and the counted fields, update the task and the
+    # project counters, update the history
+    assert statements == ["SELECT", "SELECT", "UPDATE", "INSERT", "UPDATE"]
+
+
+def test_undo_and_redo_never_overwrite_later_changes(db: Session) -> None:
+    _change_status(db, "u1", "t0", "in_progress")
+    # Another user moves the task in between
+    _change_status(db, "u2", "t0", "review")
+
+    with pytest.raises(TaskCommandConflictException):
+        CommandInvoker(db, "u1").undo("p1", "t0")
+    db.commit()
+    assert db.get(Task, "t0").status == "review"
+    # The stale entry is gone
+    with pytest.raises(NothingToUndoException):
+        CommandInvoker(db, "u1").undo("p1", "t0")
+
+    assert CommandInvoker(db, "u2").undo("p1", "t0").status == "in_progress"
+    db.commit()
+    _change_status(db, "u1", "t0", "done")
+    with pytest.raises(TaskCommandConflictException):
+        CommandInvoker(db, "u2").redo("p1", "t0")
+    assert db.get(Task, "t0").status == "done"
+
+
+def test_undo_checks_json_fields_on_the_locked_row(db: Session) -> None:
+    for user_id, tags in (("u1", ["a"]), ("u2", ["b"])):
+        CommandInvoker(db, user_id).execute_command(UpdateTaskCommand(db, "t1", {"tags": tags}))
+        db.commit()
+
+    with pytest.raises(TaskCommandConflictException):
+        CommandInvoker(db, "u1").undo("p1", "t1")
+    assert db.get(Task, "t1").tags == ["b"]
+    assert CommandInvoker(db, "u2").undo("p1", "t1").tags == ["a"]
+
+
+def test_recorded_changes_follow_the_history_limits(db: Session) -> None:
+    _change_status(db, "u1", "t0", "in_progress")
+    invoker = CommandInvoker(db, "u1", max_depth=1, max_tasks=2)
+    invoker.record_changes("p1", {"t1": {"status": ["todo", "review"]}, "t2": {}})
+    invoker.record_changes("p1", {"t1": {"status": ["review", "done"]}})
+    db.commit()
+
+    histories = {history.task_id: history for history in db.query(TaskCommandHistory)}
+    assert sorted(histories) == ["t0", "t1"]
+    assert histories["t1"].undo_stack == [{"status": ["review", "done"]}]
+
+    # Two new tasks push out the least recently used one
+    invoker.record_changes("p1", {"t2": {"title": ["Task 2", "B"]}, "t0": {"title": ["Task 0", "A"]}})
+    db.commit()
+    assert sorted(task_id for (task_id,) in db.query(TaskCommandHistory.task_id)) == ["t0", "t2"]
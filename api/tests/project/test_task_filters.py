@@ -0,0 +1,120 @@
+from datetime import datetime
+from typing import Any, List
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from api.project_service.app.commands.task_commands import CommandInvoker
+from api.project_service.app.schemas.project import ProjectCreateDTO
+from api.project_service.app.schemas.task import (
+    TaskCreateDTO,
+    TaskFilterDTO,
+    TaskUpdateDTO,
+)
+from api.project_service.app.services.project_service import ProjectService
+from api.project_service.app.services.task_service import TaskService
+from api.shared.exceptions.project_exceptions import InvalidTaskQueryException
+from api.shared.models import document, external_tools, notification, project, user  # noqa: F401
+from api.shared.models.project import Task
+
+TASKS = [
+    # title, status, priority, due date, tags
+    ("Alpha", "todo", "high", datetime(2026, 1, 10), ["api", "bug"]),
+    ("Bravo", "in_progress", "low", None, ["api"]),
+    ("Charlie", "done", "urgent", datetime(2026, 1, 5), ["bug"]),
+    ("Delta", "todo", "medium", datetime(2026, 1, 20), []),
+    ("Echo", "review", "high", datetime(2026, 1, 10), ["api", "bug", "ui"]),
+]
+
+
+@pytest.fixture
+def project_id(db: Session) -> str:
+    project_id = ProjectService(db).create_project(ProjectCreateDTO(name="Project"), "owner").id
+    for title, status, priority, due_date, tags in TASKS:
+        TaskService(db).create_task(
+            project_id,
+            TaskCreateDTO(title=title, priority=priority, due_date=due_date, tags=tags),
+            "owner",
+        )
+    for title, status, *_ in TASKS:
+        db.query(Task).filter(Task.title == title).update({"status": status})
+    db.commit()
+    return project_id
+
+
+def _titles(db: Session, project_id: str, **kwargs: Any) -> List[str]:
+    return [task.title for task in TaskService(db).get_project_tasks(project_id, "owner", **kwargs)]
+
+
+def test_filters(db: Session, project_id: str) -> None:
+    def titles(**filters: Any) -> List[str]:
+        return _titles(db, project_id, filters=TaskFilterDTO(**filters), sort=["title"])
+
+    assert titles(status=["todo", "review"]) == ["Alpha", "Delta", "Echo"]
+    assert titles(priority=["high"], status=["review"]) == ["Echo"]
+    assert titles(due_before=datetime(2026, 1, 10)) == ["Charlie"]
+    assert titles(due_after=datetime(2026, 1, 10)) == ["Alpha", "Delta", "Echo"]
+    assert titles(tags=["api", "bug"]) == ["Alpha", "Echo"]
+    assert titles(tags=["ui", "missing"]) == []
+
+
+def test_tag_filter_follows_updates_and_undo(db: Session, project_id: str) -> None:
+    service = TaskService(db)
+    task_b = service.get_project_tasks(project_id, "owner", sort=["title"])[1]
+    service.update_task(project_id, task_b.id, TaskUpdateDTO(tags=["api", "bug"]), "owner")
+
+    bug_tasks = TaskFilterDTO(tags=["bug", "api"])
+    assert _titles(db, project_id, filters=bug_tasks, sort=["title"]) == ["Alpha", "Bravo", "Echo"]
+
+    CommandInvoker(db, "owner").undo(project_id, task_b.id)
+    db.commit()
+    assert _titles(db, project_id, filters=bug_tasks, sort=["title"]) == ["Alpha", "Echo"]
+
+
+@pytest.mark.parametrize(
+    "sort, expected",
+    [
+        (["-priority", "title"], ["Charlie", "Alpha", "Echo", "Delta", "Bravo"]),
+        (["status", "-title"], ["Delta", "Alpha", "Bravo", "Echo", "Charlie"]),
+        (["due_date", "-title"], ["Charlie", "Echo", "Alpha", "Delta", "Bravo"]),
+        (["-due_date"], ["Bravo", "Delta", "Alpha", "Echo", "Charlie"]),
+    ],
+)
+def test_sort_pages_walk_every_task(
+    db: Session, project_id: str, sort: List[str], expected: List[str]
+) -> None:
+    titles: List[str] = []
+    cursor = None
+    while True:
+        page = TaskService(db).get_project_tasks(
+            project_id, "owner", limit=2, cursor=cursor, sort=sort
+        )
+        titles += [task.title for task in page]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert titles == expected
+
+
+def test_fields_select_only_requested_columns(db: Session, project_id: str) -> None:
+    statements: List[str] = []
+
+    def capture(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", capture)
+    tasks = TaskService(db).get_project_tasks(
+        project_id, "owner", sort=["title"], fields=["title", "status"]
+    )
+
+    assert [sorted(task) for task in tasks] == [["id", "status", "title"]] * len(TASKS)
+    assert tasks[0]["title"] == "Alpha"
+    assert "description" not in statements[-1]
+
+
+@pytest.mark.parametrize("kwargs", [{"sort": ["owner"]}, {"fields": ["password"]}])
+def test_invalid_sort_or_fields(db: Session, project_id: str, kwargs: Any) -> None:
+    with pytest.raises(InvalidTaskQueryException):
+        TaskService(db).get_project_tasks(project_id, "owner", **kwargs)
@@ -6,7 +6,9 @@ from api.shared.exceptions.project_exceptions import InsufficientProjectRoleExce
 
 @pytest.fixture
 def mock_db() -> MagicMock:
-    return MagicMock()
+    db = MagicMock()
+    db.info = {}
+    return db
 
 @pytest.fixture
 def task_service(mock_db: MagicMock) -> TaskService:
@@ -66,7 +68,7 @@ def test_delete_task_success(task_service: TaskService) -> None:
          patch.object(task_service, "_task_to_dto", return_value=MagicMock(id="task1")), \
          patch.object(task_service.db, "delete", MagicMock()), \
          patch.object(task_service.db, "commit", MagicMock()):
-        mock_query.return_value.filter.return_value.first.return_value = MagicMock(creator_id="user1")
+        mock_query.return_value.filter.return_value.first.return_value = MagicMock(Task=MagicMock(creator_id="user1"))
         result = task_service.delete_task("proj1", "task1", "user1")
         assert "message" in result
 
@@ -79,7 +81,7 @@ def test_delete_task_permission_denied(task_service: TaskService) -> None:
          patch("api.shared.models.document.Document", MagicMock()), \
          patch.object(task_service.db, "query") as mock_query, \
          patch.object(task_service, "_task_to_dto", return_value=MagicMock(id="task1")):
-        mock_query.return_value.filter.return_value.first.return_value = MagicMock(creator_id="other_user")
+        mock_query.return_value.filter.return_value.first.return_value = MagicMock(Task=MagicMock(creator_id="other_user"), role="member")
         with pytest.raises(InsufficientProjectRoleException):
             task_service.delete_task("proj1", "task1", "user1")
 
@@ -106,9 +108,10 @@ def test_get_project_tasks(task_service: TaskService):
          patch("api.shared.models.project.ProjectMember", MagicMock()), \
          patch("api.shared.models.project.Task", MagicMock()), \
          patch.object(task_service.db, "query") as mock_query, \
+         patch.object(task_service.db, "execute") as mock_execute, \
          patch.object(task_service, "_task_to_dto", return_value=MagicMock(id="task1")):
         mock_query.return_value.filter.return_value.first.return_value = MagicMock()
-        mock_query.return_value.filter.return_value.all.return_value = [MagicMock()]
+        mock_execute.return_value.mappings.return_value.all.return_value = [MagicMock()]
         result = task_service.get_project_tasks("proj1", "user1")
         assert isinstance(result, list)
         assert result[0].id == "task1"
@@ -139,7 +142,7 @@ def test_get_task_comments(task_service: TaskService):
          patch.object(task_service, "_task_comment_to_dto", return_value=MagicMock(id="c1")):
         mock_query.return_value.filter.return_value.first.return_value = MagicMock()
         mock_query.return_value.filter.return_value.filter.return_value.first.return_value = MagicMock()
-        mock_query.return_value.filter.return_value.all.return_value = [MagicMock()]
+        mock_query.return_value.filter.return_value.order_by.return_value.limit.return_value.all.return_value = [MagicMock()]
         result = task_service.get_task_comments("proj1", "task1", "user1")
         assert isinstance(result, list)
         assert result[0].id == "c1" 
\ No newline at end of file
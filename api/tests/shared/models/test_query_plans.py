@@ -0,0 +1,218 @@
+"""
+Query-plan regression tests for the hot service queries.
+
+The schema is built with the Alembic migrations, the service methods are run
+against it, and every statement they issue is explained. None of them may
+fall back to a full scan of a hot table. Runs on SQLite by default; set
+QUERY_PLAN_DATABASE_URL to an empty Postgres database to check it as well.
+"""
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator, List, Tuple
+from unittest.mock import MagicMock, patch
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from api.document_service.app.schemas.document import (
+    DocumentCreateDTO,
+    DocumentPermissionCreateDTO,
+    DocumentType,
+)
+from api.document_service.app.services.document_service import DocumentService
+from api.notification_service.app.schemas.notification import (
+    NotificationChannel,
+    NotificationCreateDTO,
+    NotificationType,
+)
+from api.notification_service.app.services.notification_service import (
+    NotificationService,
+)
+from api.project_service.app.schemas.project import (
+    ProjectCreateDTO,
+    ProjectMemberCreateDTO,
+)
+from api.project_service.app.schemas.task import (
+    TaskCommentCreateDTO,
+    TaskCreateDTO,
+    TaskFilterDTO,
+    TaskUpdateDTO,
+)
+from api.project_service.app.services.activity_service import ActivityService
+from api.project_service.app.services.project_service import ProjectService
+from api.project_service.app.services.search_service import SearchService
+from api.project_service.app.services.task_service import TaskService
+from api.shared.models.user import User
+from api.shared.utils.pagination import encode_cursor
+
+ALEMBIC_INI = Path(__file__).resolve().parents[4] / "alembic.ini"
+
+HOT_TABLES = {
+    "project_members",
+    "tasks",
+    "task_comments",
+    "activity_logs",
+    "notifications",
+    "documents",
+    "document_permissions",
+    "document_versions",
+}
+
+
+def _database_urls() -> List[str]:
+    urls = ["sqlite"]
+    if os.getenv("QUERY_PLAN_DATABASE_URL"):
+        urls.append(os.environ["QUERY_PLAN_DATABASE_URL"])
+    return urls
+
+
+@pytest.fixture(params=_database_urls())
+def engine(request: Any, tmp_path: Path) -> Iterator[Engine]:
+    url = f"sqlite:///{tmp_path}/plans.db" if request.param == "sqlite" else request.param
+    engine = create_engine(url)
+
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    # Not engine.begin(): the index migration needs its own autocommit block
+    with engine.connect() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+        connection.commit()
+
+    yield engine
+
+    with engine.connect() as connection:
+        config.attributes["connection"] = connection
+        command.downgrade(config, "base")
+        connection.commit()
+    engine.dispose()
+
+
+def _full_scans(engine: Engine, statements: List[Tuple[str, Any]]) -> List[str]:
+    """Explain every statement and return the ones scanning a hot table."""
+    scans: List[str] = []
+
+    with engine.connect() as connection:
+        if engine.dialect.name == "postgresql":
+            # Tiny tables are always cheaper to scan; force the planner's hand
+            connection.exec_driver_sql("SET enable_seqscan = off")
+            prefix, pattern = "EXPLAIN ", r"Seq Scan on (\w+)"
+        else:
+            prefix, pattern = "EXPLAIN QUERY PLAN ", r"^SCAN (\w+)"
+
+        for statement, parameters in statements:
+            for row in connection.exec_driver_sql(prefix + statement, parameters):
+                detail = row[-1]
+                match = re.search(pattern, detail)
+                if match and match.group(1) in HOT_TABLES:
+                    scans.append(f"{detail}: {statement}")
+
+    return scans
+
+
+def test_service_queries_use_indexes(engine: Engine) -> None:
+    statements: List[Tuple[str, Any]] = []
+
+    def capture(conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool) -> None:
+        if not executemany and statement.lstrip().upper().startswith(("SELECT", "WITH", "UPDATE", "DELETE")):
+            statements.append((statement, parameters))
+
+    with Session(engine) as db, \
+         patch("api.document_service.app.services.document_service.SupabaseManager", MagicMock()), \
+         patch("api.notification_service.app.services.notification_service.RabbitMQManager", MagicMock()), \
+         patch.object(NotificationService, "_send_notification", MagicMock()):
+        db.add_all([
+            User(id=uid, email=f"{uid}@example.com", full_name=uid, supabase_uid=uid)
+            for uid in ("owner", "member")
+        ])
+        db.commit()
+
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            projects = ProjectService(db)
+            project = projects.create_project(ProjectCreateDTO(name="Indexed project"), "owner")
+            projects.add_project_member(project.id, ProjectMemberCreateDTO(user_id="member"), "owner")
+            projects.get_project(project.id, "member")
+            projects.get_user_projects("member")
+            projects.get_project_members(project.id, "owner")
+
+            tasks = TaskService(db)
+            task = tasks.create_task(project.id, TaskCreateDTO(title="Indexed task"), "owner")
+            tasks.get_task(project.id, task.id, "member")
+            tasks.get_project_tasks(project.id, "member")
+            tasks.update_task(project.id, task.id, TaskUpdateDTO(title="Renamed task"), "owner")
+            tasks.add_task_comment(project.id, task.id, TaskCommentCreateDTO(content="Comment"), "member")
+            tasks.get_task_comments(project.id, task.id, "member")
+            tasks.get_task_comment_threads(project.id, task.id, "member")
+            tasks.get_project_tasks(
+                project.id, "member", filters=TaskFilterDTO(status=["todo"], tags=["api"])
+            )
+
+            search = SearchService(db)
+            search.search(project.id, "member", "renamed task")
+
+            activities = ActivityService(db)
+            activities.get_project_activities(project.id)
+            activities.get_entity_activities("task", task.id)
+            activities.get_user_activities("owner")
+
+            documents = DocumentService(db)
+            folder = documents.create_document(
+                DocumentCreateDTO(name="Specs", project_id=project.id, type=DocumentType.FOLDER), "owner"
+            )
+            document = documents.create_document(
+                DocumentCreateDTO(
+                    name="Spec",
+                    project_id=project.id,
+                    parent_id=folder.id,
+                    type=DocumentType.FILE,
+                    content_type="text/plain",
+                ),
+                "owner",
+            )
+            documents.add_document_permission(
+                document.id, DocumentPermissionCreateDTO(user_id="member", can_view=True), "owner"
+            )
+            documents.get_document(document.id, "member")
+            documents.get_project_documents(project.id, "member")
+            documents.get_document_permissions(document.id, "owner")
+            documents.get_document_versions(document.id, "member")
+            documents.get_document_version(document.id, 1, "member")
+
+            notifications = NotificationService(db)
+            notifications.create_notification(
+                NotificationCreateDTO(
+                    user_id="member",
+                    type=NotificationType.SYSTEM,
+                    title="Hello",
+                    message="Indexed",
+                    channels=[NotificationChannel.IN_APP],
+                )
+            )
+            notifications.get_user_notifications("member")
+            notifications.get_unread_notifications("member")
+            notifications.mark_all_notifications_as_read("member")
+
+            # Keyset pages further down the lists
+            oldest, newest = encode_cursor(datetime(2000, 1, 1), ""), encode_cursor(datetime(2100, 1, 1), "")
+            projects.get_user_projects("member", cursor=oldest)
+            tasks.get_project_tasks(project.id, "member", cursor=oldest)
+            tasks.get_task_comments(project.id, task.id, "member", cursor=oldest)
+            tasks.get_task_comment_threads(project.id, task.id, "member", cursor=oldest)
+            activities.get_project_activities(project.id, cursor=newest)
+            activities.get_entity_activities("task", task.id, cursor=newest)
+            activities.get_user_activities("owner", cursor=newest)
+            notifications.get_user_notifications("member", cursor=newest)
+            notifications.get_unread_notifications("member", cursor=newest)
+            search.search(project.id, "member", "spec", limit=1)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+
+    assert len(statements) > 30
+    assert _full_scans(engine, statements) == []
@@ -1,3 +1,7 @@
+from typing import Any, Dict, List
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.pool import NullPool
 from api.shared.utils.db import get_db
 from sqlalchemy.orm import Session
 
@@ -9,4 +13,91 @@ def test_get_db_returns_session() -> None:
     try:
         next(gen)
     except StopIteration:
-        pass 
\ No newline at end of file
+        pass 
+
+def test_get_async_database_url() -> None:
+    from api.shared.utils.db import get_async_database_url
+    assert get_async_database_url('sqlite:///./test.db') == 'sqlite+aiosqlite:///./test.db'
+    assert get_async_database_url('postgresql://u:p@host/db') == 'postgresql+asyncpg://u:p@host/db'
+    assert get_async_database_url('postgresql+asyncpg://u:p@host/db') == 'postgresql+asyncpg://u:p@host/db'
+
+@pytest.mark.asyncio
+async def test_get_async_db_returns_async_session() -> None:
+    from api.shared.utils.db import get_async_db
+    gen = get_async_db()
+    db = await gen.__anext__()
+    assert isinstance(db, AsyncSession)
+    await gen.aclose()
+
+def test_engine_options_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    from api.shared.utils import db as db_utils
+    monkeypatch.setattr(db_utils, 'DB_POOL_SIZE', 7)
+    monkeypatch.setattr(db_utils, 'DB_STATEMENT_TIMEOUT_MS', 5000)
+    options = db_utils.get_engine_options('postgresql://u:p@host/db')
+    assert options['pool_size'] == 7
+    assert options['poolclass'] is db_utils.MeteredQueuePool
+    assert options['connect_args'] == {'options': '-c statement_timeout=5000'}
+    options = db_utils.get_engine_options('postgresql+asyncpg://u:p@host/db', is_async=True)
+    assert options['poolclass'] is db_utils.MeteredAsyncAdaptedQueuePool
+    assert options['connect_args']['server_settings'] == {'statement_timeout': '5000'}
+    assert 'pool_size' not in db_utils.get_engine_options('sqlite://')
+
+def test_engine_options_null_pool(monkeypatch: pytest.MonkeyPatch) -> None:
+    from api.shared.utils import db as db_utils
+    monkeypatch.setattr(db_utils, 'DB_USE_NULL_POOL', True)
+    options = db_utils.get_engine_options('postgresql+asyncpg://u:p@host/db', is_async=True)
+    assert options['poolclass'] is NullPool
+    assert options['connect_args']['statement_cache_size'] == 0
+    assert 'pool_size' not in options
+
+@pytest.mark.asyncio
+async def test_warm_up_pool_and_metrics_hook(tmp_path: Any) -> None:
+    from api.shared.utils import db as db_utils
+    url = f'sqlite+aiosqlite:///{tmp_path}/pool.db'
+    options = db_utils.get_engine_options(url, is_async=True)
+    options['pool_logging_name'] = 'warmup-test'
+    engine = create_async_engine(url, **options)
+    samples: List[Dict[str, Any]] = []
+    db_utils.pool_metrics.add_hook(samples.append)
+    try:
+        assert await db_utils.warm_up_pool(engine, 3) == 3
+        assert engine.sync_engine.pool.checkedin() == 3
+        assert max(s['checked_out'] for s in samples) == 3
+        stats = db_utils.get_pool_stats()['warmup-test']
+        assert stats['checkouts'] == 3
+        assert stats['checked_out'] == 0
+        assert stats['saturation'] == 0.0
+    finally:
+        db_utils.pool_metrics.remove_hook(samples.append)
+        await engine.dispose()
+
+def test_pool_metrics_count_only_checkout_timeouts(tmp_path: Any) -> None:
+    from sqlalchemy import create_engine
+    from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+    from api.shared.utils import db as db_utils
+    engine = create_engine(
+        f'sqlite:///{tmp_path}/pool.db',
+        poolclass=db_utils.MeteredQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+        pool_logging_name='timeout-test',
+    )
+    missing = create_engine(
+        f'sqlite:///{tmp_path}/missing/pool.db',
+        poolclass=db_utils.MeteredQueuePool,
+        pool_logging_name='timeout-test-missing',
+    )
+    try:
+        with engine.connect():
+            with pytest.raises(PoolTimeoutError):
+                engine.connect()
+        # Failing to connect is not a timeout, and not a checkout
+        with pytest.raises(OperationalError):
+            missing.connect()
+        stats = db_utils.get_pool_stats()
+        assert (stats['timeout-test']['checkouts'], stats['timeout-test']['timeouts']) == (2, 1)
+        assert 'timeout-test-missing' not in stats
+    finally:
+        engine.dispose()
+        missing.dispose()
@@ -0,0 +1,53 @@
+from datetime import datetime
+from typing import List
+
+from api.shared.utils.etag import (
+    ETAG_HEADER,
+    etag_matches,
+    get_if_modified,
+    make_etag,
+    not_modified,
+)
+
+
+def test_make_etag_is_weak_and_stable() -> None:
+    etag = make_etag("id", datetime(2026, 1, 1), None)
+
+    assert etag.startswith('W/"') and etag.endswith('"')
+    assert etag == make_etag("id", datetime(2026, 1, 1), None)
+    assert etag != make_etag("id", datetime(2026, 1, 2), None)
+    # Parts are delimited, so shifting characters between them changes the tag
+    assert make_etag("ab", "c") != make_etag("a", "bc")
+
+
+def test_etag_matches() -> None:
+    etag = make_etag("id", 1)
+    strong = etag[2:]
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(strong, etag)
+    assert etag_matches(f'W/"other", {etag}', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches(None, etag)
+    assert not etag_matches('W/"other"', etag)
+
+
+def test_get_if_modified_skips_loading_matching_versions() -> None:
+    loads: List[bool] = []
+
+    def get() -> str:
+        loads.append(True)
+        return "representation"
+
+    etag = make_etag("id", 1)
+    assert get_if_modified(None, lambda: etag, get) == (etag, "representation")
+    assert get_if_modified(etag, lambda: etag, get) == (etag, None)
+    assert len(loads) == 1
+
+
+def test_not_modified() -> None:
+    response = not_modified('W/"v1"')
+
+    assert response.status_code == 304
+    assert response.headers[ETAG_HEADER] == 'W/"v1"'
+    assert response.body == b""
@@ -0,0 +1,97 @@
+import json
+import time
+from typing import Any, Dict, List
+from unittest.mock import MagicMock, patch
+
+from api.shared.utils.membership_cache import (
+    InvalidationBroadcaster,
+    MembershipCache,
+    MembershipStore,
+    RabbitMQInvalidationBroadcaster,
+)
+
+
+def test_lru_and_ttl() -> None:
+    cache = MembershipCache(max_size=2, ttl=60)
+    for user_id in ("u1", "u2"):
+        cache.set("p1", user_id, "member", cache.generation)
+    cache.get("p1", "u1")
+    cache.set("p1", "u3", "admin", cache.generation)
+
+    # u2 was the least recently used
+    assert cache.get("p1", "u2") is None
+    assert (cache.get("p1", "u1"), cache.get("p1", "u3")) == ("member", "admin")
+
+    cache.ttl = 0.01
+    cache.set("p2", "u1", "owner", cache.generation)
+    time.sleep(0.02)
+    assert cache.get("p2", "u1") is None
+    assert cache.get_stats() == {
+        "size": 1,
+        "max_size": 2,
+        "hits": 3,
+        "store_hits": 0,
+        "misses": 2,
+        "hit_rate": 0.6,
+        "invalidations": 0,
+    }
+
+
+def test_invalidation_reaches_every_worker_and_the_store() -> None:
+    store = MembershipStore()
+    broadcaster = InvalidationBroadcaster()
+    workers = [MembershipCache(store=store, broadcaster=broadcaster) for _ in range(2)]
+
+    workers[0].set("p1", "u1", "admin", workers[0].generation)
+    workers[0].set("p1", "u2", "member", workers[0].generation)
+    # The second worker finds the role in the shared tier
+    assert workers[1].get("p1", "u1") == "admin"
+    assert workers[1].get_stats()["store_hits"] == 1
+
+    workers[1].invalidate("p1", "u1")
+    assert [worker.get("p1", "u1") for worker in workers] == [None, None]
+    assert workers[0].get("p1", "u2") == "member"
+
+    workers[0].invalidate("p1")
+    assert [worker.get("p1", "u2") for worker in workers] == [None, None]
+    assert store.get(("p1", "u2")) is None
+
+
+def test_roles_read_before_an_invalidation_are_not_cached() -> None:
+    cache = MembershipCache()
+    generation = cache.generation
+
+    # A concurrent request demotes the user while the old role is being read
+    cache.invalidate("p1", "u1")
+    cache.set("p1", "u1", "admin", generation)
+
+    assert cache.get("p1", "u1") is None
+
+
+def test_rabbitmq_broadcast_skips_its_own_messages() -> None:
+    published: List[Dict[str, Any]] = []
+    manager = MagicMock()
+    manager.publish.side_effect = lambda exchange, key, message, persistent: published.append(
+        message
+    )
+
+    with patch.object(RabbitMQInvalidationBroadcaster, "_listen"), patch(
+        "api.shared.utils.rabbitmq.RabbitMQManager", return_value=manager
+    ):
+        workers = [
+            MembershipCache(broadcaster=RabbitMQInvalidationBroadcaster()) for _ in range(2)
+        ]
+        for worker in workers:
+            worker.set("p1", "u1", "admin", worker.generation)
+
+        workers[0].invalidate("p1", "u1")
+
+    assert published == [
+        {"project_id": "p1", "user_id": "u1", "origin": workers[0].broadcaster.origin}
+    ]
+    # The second worker only drops the role once the message arrives
+    assert workers[1].get("p1", "u1") == "admin"
+    for worker in workers:
+        worker.broadcaster._on_message(json.dumps(published[0]).encode())
+    assert [worker.get("p1", "u1") for worker in workers] == [None, None]
+    assert [worker.get_stats()["invalidations"] for worker in workers] == [1, 1]
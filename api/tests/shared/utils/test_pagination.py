@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+from typing import List
+
+import pytest
+from fastapi import Response
+from sqlalchemy.orm import Session
+
+from api.shared.exceptions.base_exceptions import InvalidCursorException
+from api.shared.models import document, external_tools, notification, project, user  # noqa: F401
+from api.shared.models.project import ActivityLog
+from api.shared.utils.pagination import (
+    NEXT_CURSOR_HEADER,
+    Page,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+    set_next_cursor_header,
+)
+
+
+@pytest.fixture
+def db(db: Session) -> Session:
+    start = datetime(2026, 1, 1)
+    # Pairs of rows share a timestamp so the id tie-breaker matters
+    db.add_all(
+        ActivityLog(
+            id=f"a{i:02d}",
+            project_id="p1",
+            user_id="u1",
+            action="update",
+            entity_type="task",
+            entity_id="t1",
+            created_at=start + timedelta(seconds=i // 2),
+        )
+        for i in range(25)
+    )
+    db.commit()
+    return db
+
+
+def _walk(db: Session, limit: int, descending: bool) -> List[List[str]]:
+    pages = []
+    cursor = None
+    while True:
+        query = db.query(ActivityLog).filter(ActivityLog.project_id == "p1")
+        page = paginate(query, ActivityLog, limit, cursor, descending=descending)
+        pages.append([row.id for row in page])
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip() -> None:
+    created_at = datetime(2026, 3, 4, 5, 6, 7, 890)
+    cursor = encode_cursor(created_at, "id-1")
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, "id-1")
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "e30", "WyJ4IiwiYSJd"])
+def test_decode_invalid_cursor(cursor: str) -> None:
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(cursor)
+
+
+def test_paginate_ascending_visits_every_row_once(db: Session) -> None:
+    pages = _walk(db, 10, descending=False)
+
+    assert [len(page) for page in pages] == [10, 10, 5]
+    assert sum(pages, []) == [f"a{i:02d}" for i in range(25)]
+
+
+def test_paginate_descending_visits_every_row_once(db: Session) -> None:
+    pages = _walk(db, 7, descending=True)
+
+    assert [len(page) for page in pages] == [7, 7, 7, 4]
+    assert sum(pages, []) == [f"a{i:02d}" for i in reversed(range(25))]
+
+
+def test_paginate_exact_last_page_has_no_cursor(db: Session) -> None:
+    pages = _walk(db, 25, descending=False)
+    assert [len(page) for page in pages] == [25]
+
+
+def test_paginate_offset_without_cursor(db: Session) -> None:
+    query = db.query(ActivityLog)
+    page = paginate(query, ActivityLog, 5, offset=20)
+
+    assert [row.id for row in page] == ["a20", "a21", "a22", "a23", "a24"]
+    assert page.next_cursor is None
+
+
+def test_set_next_cursor_header() -> None:
+    response = Response()
+    set_next_cursor_header(response, Page([1], "abc"))
+    assert response.headers[NEXT_CURSOR_HEADER] == "abc"
+
+    response = Response()
+    set_next_cursor_header(response, Page([1]))
+    assert NEXT_CURSOR_HEADER not in response.headers
@@ -0,0 +1,130 @@
+"""
+Benchmark: sync sessions in async routes vs. the async session dependency.
+
+Serves a project listing route backed by SQLite twice: once with the sync
+``Session`` (what every route used before) and once with ``AsyncSession`` and
+``run_sync``. Each request also runs ``SELECT pause(ms)`` to stand in for the
+round trip to a remote database. Requests/sec is reported for increasing
+numbers of in-flight requests; only the async variant should scale.
+
+Usage:
+    python -m benchmarks.bench_db_concurrency [--requests 400] [--latency-ms 5]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Any, List
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from api.project_service.app.schemas.project import ProjectCreateDTO
+from api.project_service.app.services.project_service import ProjectService
+from api.shared.models.base import Base
+from api.shared.models import document, external_tools, notification, project, user  # noqa: F401
+
+USER_ID = "bench-user"
+
+
+def _pause(ms: float) -> int:
+    time.sleep(ms / 1000)
+    return 0
+
+
+def build_app(database_url: str, latency_ms: float) -> FastAPI:
+    """Create an app exposing the same query through both session types."""
+    engine = create_engine(database_url, pool_size=64, max_overflow=0)
+    async_engine = create_async_engine(
+        database_url.replace("sqlite://", "sqlite+aiosqlite://"),
+        pool_size=64,
+        max_overflow=0,
+    )
+
+    for sync_engine in (engine, async_engine.sync_engine):
+        event.listen(
+            sync_engine,
+            "connect",
+            lambda dbapi_connection, _: dbapi_connection.create_function(
+                "pause", 1, _pause
+            ),
+        )
+
+    SyncSessionLocal = sessionmaker(bind=engine, autoflush=False)
+    AsyncSessionLocal = async_sessionmaker(
+        bind=async_engine, autoflush=False, expire_on_commit=False
+    )
+
+    def get_db() -> Any:
+        db = SyncSessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    async def get_async_db() -> Any:
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    def list_projects(db: Session) -> List[Any]:
+        db.execute(text("SELECT pause(:ms)"), {"ms": latency_ms})
+        return ProjectService(db).get_user_projects(USER_ID)
+
+    app = FastAPI()
+
+    @app.get("/sync/projects")
+    async def sync_projects(db: Session = Depends(get_db)) -> Any:
+        return list_projects(db)
+
+    @app.get("/async/projects")
+    async def async_projects(db: AsyncSession = Depends(get_async_db)) -> Any:
+        return await db.run_sync(list_projects)
+
+    Base.metadata.create_all(engine)
+    with SyncSessionLocal() as db:
+        for i in range(5):
+            ProjectService(db).create_project(
+                ProjectCreateDTO(name=f"Project {i}", tags=[]), USER_ID
+            )
+
+    return app
+
+
+async def run(app: FastAPI, path: str, requests: int, concurrency: int) -> float:
+    """Send ``requests`` requests with ``concurrency`` in flight, return req/s."""
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def one() -> None:
+            async with semaphore:
+                response = await client.get(path)
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        return requests / (time.perf_counter() - start)
+
+
+async def main(requests: int, latency_ms: float) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        app = build_app(f"sqlite:///{os.path.join(tmp, 'bench.db')}", latency_ms)
+
+        print(f"{'in flight':>9}  {'sync Session':>14}  {'AsyncSession':>14}")
+        for concurrency in (1, 4, 16, 64):
+            sync_rps = await run(app, "/sync/projects", requests, concurrency)
+            async_rps = await run(app, "/async/projects", requests, concurrency)
+            print(f"{concurrency:>9}  {sync_rps:>10.0f} r/s  {async_rps:>10.0f} r/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.latency_ms))
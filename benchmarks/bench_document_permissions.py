@@ -0,0 +1,142 @@
+"""
+Benchmark: per-document permission checks vs. the batch resolver.
+
+Fills a file-backed SQLite database with one folder of N files, a third of
+them shared with a plain project member. Then lists the folder as that
+member twice: once calling _has_permission for every document, the way the
+listing used to, and once through DocumentService.get_project_documents,
+which resolves the whole folder with DocumentPermissionResolver. The
+per-document path costs a query per file (three before the resolver, which
+now also serves single checks); the batched one does not grow with the
+folder.
+
+Usage:
+    python -m benchmarks.bench_document_permissions [--documents 500] [--repeat 5]
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, List
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session
+
+from api.document_service.app.services.document_service import DocumentService
+from api.shared.models import document, external_tools, notification, project, user  # noqa: F401
+from api.shared.models.base import Base
+from api.shared.models.document import Document, DocumentPermission
+from api.shared.models.project import Project, ProjectMember
+from api.shared.utils.membership_cache import membership_cache
+
+OWNER_ID = "bench-owner"
+USER_ID = "bench-user"
+PROJECT_ID = "bench-project"
+FOLDER_ID = "bench-folder"
+
+
+def setup(db: Session, documents: int) -> None:
+    """Create a project with one folder of ``documents`` files."""
+    now = datetime.now(timezone.utc)
+    db.add(Project(id=PROJECT_ID, name="Bench project", owner_id=OWNER_ID))
+    db.add_all(
+        ProjectMember(project_id=PROJECT_ID, user_id=user_id, role=role, joined_at=now)
+        for user_id, role in ((OWNER_ID, "owner"), (USER_ID, "member"))
+    )
+    db.add(
+        Document(
+            id=FOLDER_ID, name="Folder", project_id=PROJECT_ID, type="folder", creator_id=OWNER_ID
+        )
+    )
+    db.flush()
+    db.execute(
+        insert(Document),
+        [
+            {
+                "id": f"doc-{i}",
+                "name": f"File {i}.pdf",
+                "project_id": PROJECT_ID,
+                "parent_id": FOLDER_ID,
+                "type": "file",
+                "version": 1,
+                "creator_id": OWNER_ID,
+                "created_at": now,
+            }
+            for i in range(documents)
+        ],
+    )
+    db.execute(
+        insert(DocumentPermission),
+        [
+            {"id": f"perm-{i}", "document_id": f"doc-{i}", "user_id": USER_ID, "created_at": now}
+            for i in range(0, documents, 3)
+        ],
+    )
+    db.commit()
+
+
+def per_document(service: DocumentService) -> int:
+    """List the folder checking one document at a time."""
+    documents = (
+        service.db.query(Document)
+        .filter(Document.project_id == PROJECT_ID, Document.parent_id == FOLDER_ID)
+        .all()
+    )
+    allowed = [
+        document
+        for document in documents
+        if service._has_permission(document.id, USER_ID, "view")
+    ]
+    return len(allowed)
+
+
+def batched(service: DocumentService) -> int:
+    """List the folder through the batch resolver."""
+    return len(service.get_project_documents(PROJECT_ID, USER_ID, parent_id=FOLDER_ID))
+
+
+def bench(documents: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+        statements: List[str] = []
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+
+        with Session(engine) as db:
+            setup(db, documents)
+
+            def run(list_folder: Callable[[DocumentService], int]) -> Any:
+                best = float("inf")
+                for _ in range(repeat):
+                    # Every run pays for the role, as a cold request would
+                    membership_cache.clear()
+                    db.expire_all()
+                    statements.clear()
+                    start = time.perf_counter()
+                    listed = list_folder(DocumentService(db))
+                    best = min(best, time.perf_counter() - start)
+                return best, len(statements), listed
+
+            single_s, single_statements, single_listed = run(per_document)
+            batch_s, batch_statements, batch_listed = run(batched)
+            assert single_listed == batch_listed
+
+        engine.dispose()
+
+    print(f"{documents} documents, {batch_listed} visible to the member")
+    print(f"{'per document':<14} {single_s * 1000:>10.1f} ms  {single_statements:>7} statements")
+    print(f"{'batched':<14} {batch_s * 1000:>10.1f} ms  {batch_statements:>7} statements")
+    print(f"speedup: {single_s / batch_s:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    bench(args.documents, args.repeat)
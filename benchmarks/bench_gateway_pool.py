@@ -0,0 +1,102 @@
+"""
+Benchmark: per-request httpx clients vs. the gateway's pooled keep-alive clients.
+
+Starts a local stub service with uvicorn and sends the same sequence of
+requests through both strategies, reporting p50/p99 latency.
+
+Usage:
+    python -m benchmarks.bench_gateway_pool [--requests 2000] [--concurrency 20]
+"""
+import argparse
+import asyncio
+import socket
+import statistics
+import threading
+import time
+from typing import Awaitable, Callable, List
+
+import httpx
+import uvicorn
+from fastapi import FastAPI
+
+from api.api_gateway.utils.http_client import UpstreamClientPool
+
+stub_app = FastAPI()
+
+
+@stub_app.get("/projects")
+async def list_projects() -> List[dict]:
+    return [{"id": str(i), "name": f"Project {i}"} for i in range(10)]
+
+
+def start_stub_service() -> str:
+    """Run the stub service in a background thread and return its base URL."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(
+        uvicorn.Config(stub_app, host="127.0.0.1", port=port, log_level="error")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+
+    while not server.started:
+        time.sleep(0.05)
+
+    return f"http://127.0.0.1:{port}"
+
+
+async def run(
+    send: Callable[[], Awaitable[httpx.Response]], requests: int, concurrency: int
+) -> List[float]:
+    """Send ``requests`` requests with at most ``concurrency`` in flight."""
+    latencies: List[float] = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            response = await send()
+            latencies.append(time.perf_counter() - start)
+            response.raise_for_status()
+
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return latencies
+
+
+def report(name: str, latencies: List[float]) -> None:
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name:<20} p50={quantiles[49] * 1000:7.2f} ms  "
+        f"p99={quantiles[98] * 1000:7.2f} ms  n={len(latencies)}"
+    )
+
+
+async def main(requests: int, concurrency: int) -> None:
+    url = f"{start_stub_service()}/projects"
+
+    async def per_request_client() -> httpx.Response:
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            return await client.get(url)
+
+    pool = UpstreamClientPool(max_connections=concurrency)
+
+    async def pooled_client() -> httpx.Response:
+        return await pool.request("projects", "GET", url)
+
+    # Warm up both paths so neither pays first-import costs
+    await run(per_request_client, concurrency, concurrency)
+    await run(pooled_client, concurrency, concurrency)
+
+    report("per-request client", await run(per_request_client, requests, concurrency))
+    report("pooled client", await run(pooled_client, requests, concurrency))
+    print(f"pool stats: {pool.get_stats()['projects']}")
+    await pool.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
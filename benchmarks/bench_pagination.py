@@ -0,0 +1,114 @@
+"""
+Benchmark: OFFSET pagination vs. keyset (cursor) pagination.
+
+Fills the activity log of one project with 10k, 100k and 1M rows and fetches
+a page of activities at increasing depths, once by offset and once by the
+cursor pointing at the same position. Offset pages get slower the deeper they
+are because every skipped row is read; cursor pages should take the same time
+at any depth.
+
+Usage:
+    python -m benchmarks.bench_pagination [--sizes 10000 100000 1000000] [--limit 50]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, List
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from api.project_service.app.services.activity_service import ActivityService
+from api.shared.models import document, external_tools, notification, project, user  # noqa: F401
+from api.shared.models.base import Base
+from api.shared.models.project import ActivityLog
+from api.shared.utils.pagination import encode_cursor
+
+PROJECT_ID = "bench-project"
+DEPTHS = (0.0, 0.1, 0.5, 0.9)
+
+
+def fill(db: Session, rows: int) -> None:
+    """Insert ``rows`` activities, plus the same amount for another project."""
+    start = datetime(2026, 1, 1)
+    batch = 50_000
+
+    for project_id in (PROJECT_ID, "other-project"):
+        for first in range(0, rows, batch):
+            db.execute(
+                insert(ActivityLog),
+                [
+                    {
+                        "id": f"{project_id}-{i:08d}",
+                        "project_id": project_id,
+                        "user_id": "bench-user",
+                        "action": "update",
+                        "entity_type": "task",
+                        "entity_id": f"task-{i % 1000}",
+                        "created_at": start + timedelta(seconds=i),
+                    }
+                    for i in range(first, min(first + batch, rows))
+                ],
+            )
+    db.commit()
+
+
+def time_ms(fn: Callable[[], object], repeat: int) -> float:
+    """Median wall time of ``fn`` in milliseconds."""
+    samples: List[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def bench(rows: int, limit: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+
+        with Session(engine) as db:
+            fill(db, rows)
+            service = ActivityService(db)
+
+            for depth in DEPTHS:
+                offset = int(rows * depth)
+
+                # Cursor of the row just before the page, as a client would hold it
+                cursor = None
+                if offset:
+                    previous = service.get_project_activities(PROJECT_ID, 1, offset - 1)[0]
+                    cursor = encode_cursor(previous.created_at, previous.id)
+
+                offset_ms = time_ms(
+                    lambda: service.get_project_activities(PROJECT_ID, limit, offset),
+                    repeat,
+                )
+                cursor_ms = time_ms(
+                    lambda: service.get_project_activities(PROJECT_ID, limit, cursor=cursor),
+                    repeat,
+                )
+                print(
+                    f"{rows:>9}  {offset:>9}  {offset_ms:>9.2f} ms  {cursor_ms:>9.2f} ms"
+                )
+
+        engine.dispose()
+
+
+def main(sizes: List[int], limit: int, repeat: int) -> None:
+    print(f"{'rows':>9}  {'depth':>9}  {'OFFSET':>12}  {'cursor':>12}")
+    for rows in sizes:
+        bench(rows, limit, repeat)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    main(args.sizes, args.limit, args.repeat)
@@ -0,0 +1,105 @@
+"""
+Benchmark: linear route matching vs. the gateway's compiled route table.
+
+Registers several hundred synthetic routes next to the real ones and resolves
+a mix of request paths with the old linear scan, the trie lookup without the
+resolution cache, and the trie lookup with the cache, reporting lookups/sec.
+
+Usage:
+    python -m benchmarks.bench_route_table [--routes 500] [--lookups 200000]
+"""
+import argparse
+import random
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from api.api_gateway.utils.service_registry import ServiceRegistry
+
+
+def build_registry(routes: int, cache_size: int) -> ServiceRegistry:
+    """Create a registry with ``routes`` extra synthetic routes."""
+    registry = ServiceRegistry(route_cache_size=cache_size)
+    synthetic: List[Dict[str, Any]] = []
+
+    for i in range(routes):
+        resource = f"resource{i // 5}"
+        shape = i % 5
+        if shape == 0:
+            path = f"/{resource}"
+        elif shape == 1:
+            path = f"/{resource}/{{item_id}}"
+        elif shape == 2:
+            path = f"/{resource}/{{item_id}}/children"
+        elif shape == 3:
+            path = f"/{resource}/{{item_id}}/children/{{child_id}}"
+        else:
+            path = f"/{resource}/{{item_id}}/children/{{child_id}}/history"
+        synthetic.append({"path": path, "methods": ["GET", "POST"]})
+
+    registry.services["synthetic"] = {"url": "http://synthetic", "routes": synthetic}
+    registry.route_table = registry.build_route_table()
+    return registry
+
+
+def linear_lookup(registry: ServiceRegistry, path: str, method: str) -> str:
+    """The previous strategy: scan every route of every service in order."""
+    path_parts = path.strip("/").split("/")
+    for name, service in registry.services.items():
+        for route in service["routes"]:
+            route_parts = route["path"].strip("/").split("/")
+            if len(route_parts) != len(path_parts) or method not in route["methods"]:
+                continue
+            if all(
+                (part.startswith("{") and part.endswith("}")) or part == path_parts[i]
+                for i, part in enumerate(route_parts)
+            ):
+                return name
+    raise ValueError(f"No service found for path {path} and method {method}")
+
+
+def sample_paths(routes: int, count: int, distinct: int) -> List[Tuple[str, str]]:
+    """Pick ``count`` request paths drawn from ``distinct`` unique ones."""
+    rng = random.Random(42)
+    pool: List[Tuple[str, str]] = []
+    for _ in range(distinct):
+        resource = f"resource{rng.randrange(routes // 5)}"
+        pool.append(
+            rng.choice(
+                [
+                    (f"/{resource}/{rng.randrange(10**6)}/children", "GET"),
+                    (f"/{resource}/{rng.randrange(10**6)}/children/{rng.randrange(100)}/history", "GET"),
+                    (f"/projects/{rng.randrange(10**6)}/tasks/{rng.randrange(10**6)}", "PUT"),
+                    (f"/notifications/{rng.randrange(10**6)}/read", "PUT"),
+                ]
+            )
+        )
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def measure(name: str, lookup: Callable[[str, str], Any], paths: List[Tuple[str, str]]) -> None:
+    start = time.perf_counter()
+    for path, method in paths:
+        lookup(path, method)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<24} {len(paths) / elapsed:12,.0f} lookups/s")
+
+
+def main(routes: int, lookups: int, distinct: int) -> None:
+    uncached = build_registry(routes, cache_size=0)
+    cached = build_registry(routes, cache_size=1024)
+    total = sum(len(service["routes"]) for service in uncached.services.values())
+    paths = sample_paths(routes, lookups, distinct)
+
+    print(f"{total} routes, {lookups} lookups over {distinct} distinct paths")
+    measure("linear scan", lambda p, m: linear_lookup(uncached, p, m), paths[: lookups // 10])
+    measure("route table", uncached.get_service_for_path, paths)
+    measure("route table + cache", cached.get_service_for_path, paths)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--routes", type=int, default=500)
+    parser.add_argument("--lookups", type=int, default=200000)
+    parser.add_argument("--distinct", type=int, default=500)
+    args = parser.parse_args()
+    main(args.routes, args.lookups, args.distinct)
@@ -0,0 +1,166 @@
+"""
+Benchmark: project search on the full-text index vs. a LIKE scan.
+
+Fills a file-backed SQLite database with N indexed rows (tasks, task comments
+and documents, 6:3:1) in one project, going through the FTS5 triggers like any
+write. Then runs GET /projects/{project_id}/search queries of decreasing
+selectivity through SearchService, and the same queries as the LIKE scan
+clients had to fall back on. The index answers rare terms without reading
+the rows that do not match; ranking common terms still has to score every
+match, which is what the last queries measure.
+
+Usage:
+    python -m benchmarks.bench_search [--rows 1000000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import create_engine, insert, or_, select
+from sqlalchemy.orm import Session
+
+from api.project_service.app.services.search_service import SearchService
+from api.shared.models import document, external_tools, notification, project, search, user  # noqa: F401
+from api.shared.models.base import Base
+from api.shared.models.document import Document
+from api.shared.models.project import Project, ProjectMember, Task, TaskComment
+
+USER_ID = "bench-user"
+PROJECT_ID = "bench-project"
+BATCH_SIZE = 10000
+
+# Common words fill the text; each rare word is in about 1 row in 10000
+WORDS = (
+    "task fix update page user login deploy review api release build test data "
+    "report error form button server client cache query index crash slow"
+).split()
+RARE_WORDS = [f"zebra{i}" for i in range(100)]
+
+QUERIES = ["zebra7", "crash zebra7", "deploy crash", "login"]
+
+
+def _text(rng: random.Random, words: int) -> str:
+    text = [rng.choice(WORDS) for _ in range(words)]
+    if rng.random() < 0.01:
+        text.append(rng.choice(RARE_WORDS))
+    return " ".join(text)
+
+
+def setup(db: Session, rows: int) -> None:
+    """Fill the database with ``rows`` indexed rows in one project."""
+    rng = random.Random(42)
+    now = datetime.now(timezone.utc)
+    db.add(Project(id=PROJECT_ID, name="Bench project", owner_id=USER_ID))
+    db.add(ProjectMember(project_id=PROJECT_ID, user_id=USER_ID, role="owner", joined_at=now))
+    db.commit()
+
+    tasks = rows * 6 // 10
+    comments = rows * 3 // 10
+    task_ids: List[str] = []
+
+    def fill(model: Any, count: int, row: Callable[[int], Dict[str, Any]]) -> None:
+        for start in range(0, count, BATCH_SIZE):
+            db.execute(
+                insert(model),
+                [
+                    {"id": str(uuid.uuid4()), "created_at": now, **row(i)}
+                    for i in range(start, min(start + BATCH_SIZE, count))
+                ],
+            )
+            db.commit()
+
+    def task(i: int) -> Dict[str, Any]:
+        return {
+            "title": _text(rng, 5),
+            "description": _text(rng, 30),
+            "project_id": PROJECT_ID,
+            "creator_id": USER_ID,
+            "priority": "medium",
+            "status": "todo",
+        }
+
+    fill(Task, tasks, task)
+    task_ids = list(db.scalars(select(Task.id)))
+    fill(
+        TaskComment,
+        comments,
+        lambda i: {
+            "task_id": task_ids[i % len(task_ids)],
+            "user_id": USER_ID,
+            "content": _text(rng, 20),
+        },
+    )
+    fill(
+        Document,
+        rows - tasks - comments,
+        lambda i: {
+            "name": _text(rng, 4),
+            "description": _text(rng, 20),
+            "project_id": PROJECT_ID,
+            "type": "file",
+            "creator_id": USER_ID,
+            "version": 1,
+            "tags": [rng.choice(WORDS)],
+        },
+    )
+
+
+def like_scan(db: Session, query: str) -> int:
+    """Search the way clients did: every row, every column, substring match."""
+    found = 0
+    for model, columns in (
+        (Task, (Task.title, Task.description)),
+        (TaskComment, (TaskComment.content,)),
+        (Document, (Document.name, Document.description)),
+    ):
+        statement = select(model.id)
+        for term in query.split():
+            statement = statement.where(or_(*[column.like(f"%{term}%") for column in columns]))
+        found += len(db.execute(statement).all())
+    return found
+
+
+def timed(repeat: int, run: Callable[[], Any]) -> float:
+    """Best time of ``repeat`` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def bench(rows: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        Base.metadata.create_all(engine)
+
+        with Session(engine) as db:
+            start = time.perf_counter()
+            setup(db, rows)
+            print(f"indexed {rows} rows in {time.perf_counter() - start:.1f} s")
+
+            print(f"{'query':<16} {'LIKE hits':>9} {'search':>12} {'LIKE scan':>12}")
+            for query in QUERIES:
+                matches = like_scan(db, query)
+                search_ms = timed(
+                    repeat,
+                    lambda: SearchService(db).search(PROJECT_ID, USER_ID, query, 20),
+                )
+                like_ms = timed(1, lambda: like_scan(db, query))
+                print(f"{query:<16} {matches:>9} {search_ms:>9.1f} ms {like_ms:>9.1f} ms")
+
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    bench(args.rows, args.repeat)
@@ -0,0 +1,118 @@
+"""
+Benchmark: per-task API vs. POST /projects/{project_id}/tasks:batch.
+
+Creates a project with N tasks, then moves every task to "in_progress" and
+assigns it, once with one POST .../status and one POST .../assign request per
+task, and once with a single tasks:batch request holding the same operations.
+Both go through the project service app on a file-backed SQLite database.
+Every per-task request pays its own membership check, transaction and activity
+INSERT; the batch pays them once.
+
+Usage:
+    python -m benchmarks.bench_task_batch [--tasks 500]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Any, List
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from api.project_service.app.main import app, get_async_db, get_current_user
+from api.shared.models import document, external_tools, notification, project, user  # noqa: F401
+from api.shared.models.base import Base
+
+USER_ID = "bench-user"
+
+
+def setup(client: TestClient, tasks: int) -> List[str]:
+    """Create a project with ``tasks`` tasks and return the project and task IDs."""
+    project_id = client.post("/projects", json={"name": "Bench project"}).json()["id"]
+    response = client.post(
+        f"/projects/{project_id}/tasks:batch",
+        json={
+            "operations": [
+                {"action": "create", "task": {"title": f"Task {i}"}}
+                for i in range(tasks)
+            ]
+        },
+    )
+    return [project_id] + [result["task_id"] for result in response.json()["results"]]
+
+
+def bench(tasks: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        )
+
+        async def create_tables() -> None:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+
+        asyncio.run(create_tables())
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+        async def get_bench_db() -> Any:
+            async with session_factory() as db:
+                yield db
+
+        statements: List[str] = []
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+
+        app.dependency_overrides[get_async_db] = get_bench_db
+        app.dependency_overrides[get_current_user] = lambda: USER_ID
+        try:
+            with TestClient(app) as client:
+                project_id, *task_ids = setup(client, tasks)
+
+                statements.clear()
+                start = time.perf_counter()
+                for task_id in task_ids:
+                    url = f"/projects/{project_id}/tasks/{task_id}"
+                    client.post(f"{url}/status", params={"status": "in_progress"})
+                    client.post(f"{url}/assign", params={"assignee_id": USER_ID})
+                single_s = time.perf_counter() - start
+                single_statements = len(statements)
+
+                project_id, *task_ids = setup(client, tasks)
+                statements.clear()
+                start = time.perf_counter()
+                response = client.post(
+                    f"/projects/{project_id}/tasks:batch",
+                    json={
+                        "operations": [
+                            operation
+                            for task_id in task_ids
+                            for operation in (
+                                {"action": "status", "task_id": task_id, "status": "in_progress"},
+                                {"action": "assign", "task_id": task_id, "assignee_id": USER_ID},
+                            )
+                        ]
+                    },
+                )
+                batch_s = time.perf_counter() - start
+                batch_statements = len(statements)
+                assert response.json()["failed"] == 0
+        finally:
+            app.dependency_overrides.clear()
+            asyncio.run(engine.dispose())
+
+        print(f"{'per-task API':<14} {single_s * 1000:>10.1f} ms  {single_statements:>7} statements")
+        print(f"{'tasks:batch':<14} {batch_s * 1000:>10.1f} ms  {batch_statements:>7} statements")
+        print(f"speedup: {single_s / batch_s:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=500)
+    args = parser.parse_args()
+    bench(args.tasks)